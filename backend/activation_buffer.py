@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import replace
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from backend.license_store import StoredActivation
+
+
+class ActivationBuffer:
+    """Buffers device activation heartbeats and writes them in batches.
+
+    Verification only records the heartbeat in memory. Repeated heartbeats from
+    the same (license key, device) are coalesced into one row carrying the
+    latest device details and last_seen_at. A background thread writes the
+    batch with the store's upsert_activations every `flush_interval` seconds,
+    or sooner once `max_pending` devices are waiting.
+    """
+
+    def __init__(self, store: Any, *, flush_interval: float = 5.0, max_pending: int = 500) -> None:
+        self.store = store
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: Dict[Tuple[str, str], StoredActivation] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.recorded = 0
+        self.rows_written = 0
+        self.flushes = 0
+        self.flush_errors = 0
+
+    def record(
+        self,
+        *,
+        license_key: str,
+        subscription_id: str,
+        customer_email: str,
+        device_id: str,
+        device_fingerprint_hash: str,
+        device_name: Optional[str] = None,
+        platform: Optional[str] = None,
+        app_version: Optional[str] = None,
+    ) -> None:
+        now = datetime.utcnow().isoformat()
+        activation = StoredActivation(
+            license_key=license_key,
+            subscription_id=subscription_id,
+            customer_email=customer_email,
+            device_id=device_id,
+            device_fingerprint_hash=device_fingerprint_hash,
+            device_name=device_name,
+            platform=platform,
+            app_version=app_version,
+            created_at=now,
+            last_seen_at=now,
+        )
+
+        with self._lock:
+            key = (license_key, device_id)
+            previous = self._pending.get(key)
+            if previous is not None:
+                # created_at only applies if the row is new; keep the first one
+                activation = replace(activation, created_at=previous.created_at)
+            self._pending[key] = activation
+            self.recorded += 1
+            pending = len(self._pending)
+
+        self._ensure_thread()
+        if pending >= self.max_pending:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """Write all pending heartbeats now. Returns the number of rows written."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+
+            try:
+                self.store.upsert_activations(list(batch.values()))
+            except Exception:
+                # Put the batch back unless newer heartbeats replaced it
+                self.flush_errors += 1
+                with self._lock:
+                    for key, activation in batch.items():
+                        self._pending.setdefault(key, activation)
+                return 0
+
+            self.flushes += 1
+            self.rows_written += len(batch)
+            return len(batch)
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="activation-flusher", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def close(self) -> None:
+        """Stop the background thread and write what is left."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 1)
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "pending": pending,
+            "recorded": self.recorded,
+            "rows_written": self.rows_written,
+            "flushes": self.flushes,
+            "flush_errors": self.flush_errors,
+            "coalesced": self.recorded - self.rows_written - pending,
+        }
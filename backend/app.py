@@ -8,6 +8,8 @@ This server handles:
 - Subscription management
 """
 
+import atexit
+import hashlib
 import os
 import sys
 from datetime import datetime, timedelta
@@ -25,9 +27,12 @@ load_dotenv()
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from backend.stripe_handler import StripeWebhookHandler
+from backend.activation_buffer import ActivationBuffer
 from backend.email_sender import EmailSender
 from backend.license_generator import LicenseKeyGenerator
+from backend.license_cache import VerifiedLicenseCache
 from backend.license_store import LicenseStore, StoredLicense
+from backend.rate_limiter import build_rate_limiter
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -69,6 +74,25 @@ stripe.api_key = STRIPE_SECRET_KEY or "sk_test_testing"
 # Durable storage
 license_store = LicenseStore(LICENSE_DB_PATH, db_url=LICENSE_DB_URL)
 
+# Licenses that passed verification recently (skips DB read + HMACs)
+verified_license_cache = VerifiedLicenseCache(
+    max_entries=int(os.getenv("LICENSE_CACHE_SIZE", "10000") or "10000"),
+    ttl_seconds=float(os.getenv("LICENSE_CACHE_TTL", "300") or "300"),
+)
+license_store.add_change_listener(verified_license_cache.invalidate_subscription)
+
+# Rate limiting (in-process buckets, periodically reconciled with the DB)
+rate_limiter = build_rate_limiter(license_store)
+atexit.register(rate_limiter.flush)
+
+# Device heartbeats are coalesced in memory and written in batches
+activation_buffer = ActivationBuffer(
+    license_store,
+    flush_interval=float(os.getenv("ACTIVATION_FLUSH_SECONDS", "5") or "5"),
+    max_pending=int(os.getenv("ACTIVATION_MAX_PENDING", "500") or "500"),
+)
+atexit.register(activation_buffer.close)
+
 # Initialize handlers
 webhook_handler = StripeWebhookHandler(
     license_generator=LicenseKeyGenerator(secret_key=FLACO_LICENSE_SECRET),
@@ -95,6 +119,13 @@ def _secrets_for_verification() -> list[str]:
 
 
 def _verify_license_record(email: str, license_key: str) -> Tuple[Optional[StoredLicense], Optional[datetime]]:
+    secrets = _secrets_for_verification()
+    # Identifies the secret set without keeping the secrets in cache keys
+    generation = hashlib.sha256("\0".join(secrets).encode("utf-8")).hexdigest()
+    cached = verified_license_cache.get(email, license_key, generation)
+    if cached:
+        return cached
+
     stored = license_store.get_license_by_email_and_key(email, license_key)
     if not stored:
         return None, None
@@ -108,9 +139,10 @@ def _verify_license_record(email: str, license_key: str) -> Tuple[Optional[Store
         return None, expires_dt
 
     # Signature check (protects against DB corruption / tampering)
-    for secret in _secrets_for_verification():
+    for secret in secrets:
         gen = LicenseKeyGenerator(secret_key=secret)
         if gen.verify_license_key(stored.customer_email, stored.license_key, tier=stored.tier, expires=expires_dt):
+            verified_license_cache.put(email, license_key, generation, stored, expires_dt)
             return stored, expires_dt
 
     return None, expires_dt
@@ -140,7 +172,11 @@ def health():
     return jsonify({
         "status": "healthy",
         "service": "flaco-license-server",
-        "version": "3.0.0"
+        "version": "3.0.0",
+        "db_pool": license_store.pool_stats(),
+        "rate_limiter": rate_limiter.stats(),
+        "license_cache": verified_license_cache.stats(),
+        "activations": activation_buffer.stats(),
     })
 
 
@@ -301,9 +337,9 @@ def verify_license():
             return jsonify({"error": "email and license_key are required"}), 400
 
         ip = _client_ip()
-        if not license_store.allow_request(f"verify:ip:{ip}", limit=60, window_seconds=60):
+        if not rate_limiter.allow(f"verify:ip:{ip}", limit=60, window_seconds=60):
             return jsonify({"success": False, "error": "rate_limited"}), 429
-        if not license_store.allow_request(f"verify:email:{email.lower()}", limit=30, window_seconds=60):
+        if not rate_limiter.allow(f"verify:email:{email.lower()}", limit=30, window_seconds=60):
             return jsonify({"success": False, "error": "rate_limited"}), 429
 
         stored, expires_dt = _verify_license_record(email, license_key)
@@ -313,19 +349,16 @@ def verify_license():
         device_id = (data.get("device_id") or "").strip()
         device_fingerprint_hash = (data.get("device_fingerprint_hash") or "").strip()
         if device_id and device_fingerprint_hash:
-            try:
-                license_store.upsert_activation(
-                    license_key=stored.license_key,
-                    subscription_id=stored.subscription_id,
-                    customer_email=stored.customer_email,
-                    device_id=device_id,
-                    device_fingerprint_hash=device_fingerprint_hash,
-                    device_name=(data.get("device_name") or "").strip() or None,
-                    platform=(data.get("platform") or "").strip() or None,
-                    app_version=(data.get("app_version") or "").strip() or None,
-                )
-            except Exception:
-                pass
+            activation_buffer.record(
+                license_key=stored.license_key,
+                subscription_id=stored.subscription_id,
+                customer_email=stored.customer_email,
+                device_id=device_id,
+                device_fingerprint_hash=device_fingerprint_hash,
+                device_name=(data.get("device_name") or "").strip() or None,
+                platform=(data.get("platform") or "").strip() or None,
+                app_version=(data.get("app_version") or "").strip() or None,
+            )
 
         return jsonify(
             {
@@ -354,9 +387,9 @@ def examples_pro():
             return jsonify({"error": "email and license_key are required"}), 400
 
         ip = _client_ip()
-        if not license_store.allow_request(f"examples:ip:{ip}", limit=60, window_seconds=60):
+        if not rate_limiter.allow(f"examples:ip:{ip}", limit=60, window_seconds=60):
             return jsonify({"success": False, "error": "rate_limited"}), 429
-        if not license_store.allow_request(f"examples:email:{email.lower()}", limit=30, window_seconds=60):
+        if not rate_limiter.allow(f"examples:email:{email.lower()}", limit=30, window_seconds=60):
             return jsonify({"success": False, "error": "rate_limited"}), 429
 
         stored, _expires_dt = _verify_license_record(email, license_key)
@@ -0,0 +1,102 @@
+"""Benchmark: write amplification of device activation heartbeats.
+
+Simulates clients re-verifying their license (each verify is a heartbeat for
+one device) against a temporary SQLite store, and compares writing each
+heartbeat directly with buffering them in an ActivationBuffer. Reports rows
+written, write statements issued and the per-heartbeat latency seen by the
+request path.
+
+    python -m backend.benchmarks.activation_writes --heartbeats 20000 --devices 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from backend.activation_buffer import ActivationBuffer
+from backend.license_store import LicenseStore
+
+
+class CountingStore:
+    """Wraps a store and counts activation rows and write statements."""
+
+    def __init__(self, store):
+        self.store = store
+        self.rows_written = 0
+        self.statements = 0
+        self._lock = threading.Lock()
+
+    def upsert_activation(self, **kwargs):
+        with self._lock:
+            self.rows_written += 1
+            self.statements += 1
+        return self.store.upsert_activation(**kwargs)
+
+    def upsert_activations(self, activations):
+        with self._lock:
+            self.rows_written += len(activations)
+            self.statements += 1
+        return self.store.upsert_activations(activations)
+
+
+def run(mode: str, heartbeats: int, devices: int, flush_interval: float, seed: int) -> None:
+    tmp_dir = tempfile.mkdtemp(prefix="flaco-activations-")
+    store = CountingStore(LicenseStore(os.path.join(tmp_dir, "licenses.sqlite3")))
+    buffer = ActivationBuffer(store, flush_interval=flush_interval) if mode == "buffered" else None
+    write = buffer.record if buffer is not None else store.upsert_activation
+
+    rng = random.Random(seed)
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(heartbeats):
+        device = rng.randrange(devices)
+        started = time.perf_counter()
+        write(
+            license_key=f"FLACO-{device % 50:08d}-00000000-00000000",
+            subscription_id=f"sub_{device % 50}",
+            customer_email=f"user{device % 50}@example.com",
+            device_id=f"device-{device}",
+            device_fingerprint_hash=f"fp-{device}",
+            device_name="bench",
+            platform="darwin",
+            app_version="1.0.0",
+        )
+        latencies.append(time.perf_counter() - started)
+    if buffer is not None:
+        buffer.close()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"mode:            {mode}")
+    print(f"heartbeats:      {heartbeats} in {elapsed:.2f}s ({heartbeats / elapsed:.0f}/s)")
+    print(f"record latency:  median {statistics.median(latencies) * 1e6:.1f}us, p99 {p99 * 1e6:.1f}us")
+    print(f"rows written:    {store.rows_written}")
+    print(f"statements:      {store.statements}")
+    if buffer is not None:
+        print(f"stats:           {buffer.stats()}")
+    print()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--heartbeats", type=int, default=20000)
+    parser.add_argument("--devices", type=int, default=200)
+    parser.add_argument("--flush-interval", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    for mode in ("direct", "buffered"):
+        run(mode, args.heartbeats, args.devices, args.flush_interval, args.seed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
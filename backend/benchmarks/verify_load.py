@@ -0,0 +1,131 @@
+"""Load benchmark: /api/verify-license through the Flask test client.
+
+Issues a batch of licenses into a temporary SQLite DB, then hammers
+/api/verify-license from several threads and reports throughput, latency
+and connection pool stats. Run with --unpooled to measure the old
+connect-per-call behaviour for comparison.
+
+    python -m backend.benchmarks.verify_load --requests 2000 --threads 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+
+def _setup_env(tmp_dir: str) -> None:
+    os.environ.setdefault("FLACO_TESTING", "1")
+    os.environ.setdefault("STRIPE_SECRET_KEY", "sk_test_benchmark")
+    os.environ.setdefault("STRIPE_WEBHOOK_SECRET", "whsec_benchmark")
+    os.environ.setdefault("FLACO_LICENSE_SECRET", "benchmark_secret")
+    os.environ.pop("DATABASE_URL", None)
+    os.environ["LICENSE_DB_PATH"] = os.path.join(tmp_dir, "licenses.sqlite3")
+
+
+def _connect_per_call(store):
+    """Restore the pre-pool behaviour: a new connection (and pragmas) per call."""
+
+    def _connect():
+        conn = sqlite3.connect(store.db_path, timeout=15)
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA synchronous=NORMAL;")
+        return conn
+
+    store._connect = _connect
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--licenses", type=int, default=200)
+    parser.add_argument("--unpooled", action="store_true", help="open a connection per store call")
+    args = parser.parse_args(argv)
+
+    tmp_dir = tempfile.mkdtemp(prefix="flaco-bench-")
+    _setup_env(tmp_dir)
+
+    from backend.app import app, license_store
+    from backend.license_generator import LicenseKeyGenerator
+
+    impl = license_store._impl
+    if args.unpooled:
+        _connect_per_call(impl)
+
+    gen = LicenseKeyGenerator(secret_key=os.environ["FLACO_LICENSE_SECRET"])
+    expires = datetime.now() + timedelta(days=30)
+    licenses = []
+    for i in range(args.licenses):
+        email = f"user{i}@example.com"
+        key = gen.generate_license_key(email=email, tier="pro", expires=expires)
+        license_store.create_license_if_missing(
+            subscription_id=f"sub_{i}",
+            customer_email=email,
+            tier="pro",
+            billing="monthly",
+            license_key=key,
+            expires_iso=expires.isoformat(),
+        )
+        licenses.append((email, key))
+
+    app.config.update(TESTING=True)
+    per_thread = args.requests // args.threads
+    latencies = []
+    statuses = {}
+    lock = threading.Lock()
+
+    def worker(worker_id: int) -> None:
+        local_latencies = []
+        local_statuses = {}
+        with app.test_client() as client:
+            for n in range(per_thread):
+                email, key = licenses[(worker_id * per_thread + n) % len(licenses)]
+                start = time.perf_counter()
+                resp = client.post(
+                    "/api/verify-license",
+                    json={
+                        "email": email,
+                        "license_key": key,
+                        "device_id": f"device-{worker_id}",
+                        "device_fingerprint_hash": "f" * 64,
+                    },
+                    # Spread requests over many client IPs to stay under the rate limit
+                    headers={"X-Forwarded-For": f"10.{worker_id}.{n // 50}.{n % 50}"},
+                )
+                local_latencies.append(time.perf_counter() - start)
+                local_statuses[resp.status_code] = local_statuses.get(resp.status_code, 0) + 1
+        with lock:
+            latencies.extend(local_latencies)
+            for code, count in local_statuses.items():
+                statuses[code] = statuses.get(code, 0) + count
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    mode = "unpooled" if args.unpooled else "pooled"
+    print(f"mode:        {mode}")
+    print(f"requests:    {len(latencies)} in {elapsed:.2f}s ({len(latencies) / elapsed:.0f} req/s)")
+    print(f"latency p50: {statistics.median(latencies) * 1000:.2f} ms")
+    print(f"latency p95: {latencies[int(len(latencies) * 0.95) - 1] * 1000:.2f} ms")
+    print(f"statuses:    {statuses}")
+    if not args.unpooled:
+        print(f"pool:        {license_store.pool_stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+
+class SqliteConnectionPool:
+    """One long-lived SQLite connection per thread.
+
+    Connections are opened (and the WAL/synchronous pragmas applied) once per
+    thread instead of once per store call. Each connection keeps sqlite3's
+    prepared-statement cache, so the store's fixed SQL is compiled once.
+    Connections are never shared between threads or across a fork.
+    """
+
+    def __init__(self, db_path: str, *, timeout: float = 15, cached_statements: int = 256) -> None:
+        self.db_path = db_path
+        self.timeout = timeout
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # thread ident -> (thread, connection), so connections of finished
+        # threads can be closed
+        self._connections: Dict[int, Tuple[threading.Thread, sqlite3.Connection]] = {}
+        self.opened = 0
+        self.checkouts = 0
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, cached_statements=self.cached_statements)
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA synchronous=NORMAL;")
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        pid = os.getpid()
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != pid:
+            conn = self._open()
+            self._local.conn = conn
+            self._local.pid = pid
+            with self._lock:
+                self._prune()
+                self._connections[threading.get_ident()] = (threading.current_thread(), conn)
+                self.opened += 1
+
+        self.checkouts += 1
+        return conn
+
+    def _prune(self) -> None:
+        for ident, (thread, conn) in list(self._connections.items()):
+            if not thread.is_alive():
+                del self._connections[ident]
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+    def close_all(self) -> None:
+        """Close every connection (threads reopen theirs on next use)."""
+        with self._lock:
+            for _thread, conn in self._connections.values():
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            self._connections.clear()
+        self._local = threading.local()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._prune()
+            open_connections = len(self._connections)
+        return {
+            "backend": "sqlite",
+            "open": open_connections,
+            "opened": self.opened,
+            "checkouts": self.checkouts,
+            "reuse_ratio": round(1 - self.opened / self.checkouts, 4) if self.checkouts else 0.0,
+        }
+
+
+class PostgresConnectionPool:
+    """Bounded, thread-safe pool of autocommit Postgres connections.
+
+    Like psycopg2.pool.ThreadedConnectionPool, but a checkout waits (up to
+    `timeout` seconds) for a free connection instead of failing as soon as
+    `maxconn` connections are in use, and broken connections are replaced.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        *,
+        minconn: int = 1,
+        maxconn: int = 10,
+        timeout: float = 10,
+    ) -> None:
+        if maxconn < 1 or minconn > maxconn:
+            raise ValueError("need 1 <= maxconn and minconn <= maxconn")
+
+        self._connect = connect
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self.size = 0
+        self.opened = 0
+        self.checkouts = 0
+        self.waits = 0
+        self.discarded = 0
+
+        for _ in range(minconn):
+            self._idle.put(self._open())
+
+    def _open(self):
+        conn = self._connect()
+        with self._lock:
+            self.size += 1
+            self.opened += 1
+        return conn
+
+    def _discard(self, conn) -> None:
+        with self._lock:
+            self.size -= 1
+            self.discarded += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _reset_after_fork(self) -> None:
+        # Sockets inherited from the parent must not be used by the child
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.maxconn)
+        self._pid = os.getpid()
+        self.size = 0
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Check out a connection for the duration of the with-block."""
+        if self._pid != os.getpid():
+            self._reset_after_fork()
+
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.waits += 1
+            if not self._slots.acquire(timeout=self.timeout):
+                raise TimeoutError(f"No database connection available within {self.timeout}s")
+
+        conn = None
+        try:
+            try:
+                conn = self._idle.get_nowait()
+                if getattr(conn, "closed", False):
+                    self._discard(conn)
+                    conn = self._open()
+            except queue.Empty:
+                conn = self._open()
+
+            with self._lock:
+                self.checkouts += 1
+
+            try:
+                yield conn
+            except Exception:
+                # A dropped server connection is unusable; anything else leaves
+                # the autocommit connection in a clean state
+                if getattr(conn, "closed", False):
+                    self._discard(conn)
+                    conn = None
+                raise
+        finally:
+            if conn is not None:
+                self._idle.put(conn)
+            self._slots.release()
+
+    def close_all(self) -> None:
+        """Close idle connections."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        idle = self._idle.qsize()
+        return {
+            "backend": "postgres",
+            "size": self.size,
+            "idle": idle,
+            "in_use": max(0, self.size - idle),
+            "max": self.maxconn,
+            "opened": self.opened,
+            "checkouts": self.checkouts,
+            "waits": self.waits,
+            "discarded": self.discarded,
+        }
+
+
+def pool_size_from_env(default: int = 10) -> int:
+    try:
+        return max(1, int(os.getenv("LICENSE_DB_POOL_SIZE", "") or default))
+    except ValueError:
+        return default
+
+
+def pool_timeout_from_env(default: float = 10) -> float:
+    try:
+        return float(os.getenv("LICENSE_DB_POOL_TIMEOUT", "") or default)
+    except ValueError:
+        return default
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
+
+from backend.license_store import StoredLicense
+
+CacheKey = Tuple[str, str, Hashable]
+
+
+class VerifiedLicenseCache:
+    """Bounded TTL cache of licenses that passed verification.
+
+    Entries are keyed on (email, license key, secret generation) and hold the
+    stored row (tier, expiry) and parsed expiry, so a hit skips the database
+    read and the HMAC checks. A new secret generation (rotation) empties the
+    cache. Entries are dropped per subscription when the license changes,
+    e.g. an email update or a subscription webhook.
+    """
+
+    def __init__(self, *, max_entries: int = 10_000, ttl_seconds: float = 300, clock=time.monotonic) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[CacheKey, Tuple[StoredLicense, datetime, float]]" = OrderedDict()
+        self._by_subscription: Dict[str, Set[CacheKey]] = {}
+        self._generation: Optional[Hashable] = None
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _key(email: str, license_key: str, generation: Hashable) -> CacheKey:
+        return ((email or "").strip().lower(), (license_key or "").strip().upper(), generation)
+
+    def get(self, email: str, license_key: str, generation: Hashable) -> Optional[Tuple[StoredLicense, datetime]]:
+        """Return (stored, expires_dt) for a verified license, or None on a miss."""
+        key = self._key(email, license_key, generation)
+        now = self._clock()
+        with self._lock:
+            self._check_generation(generation)
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored, expires_dt, cached_at = entry
+                if now - cached_at <= self.ttl_seconds and datetime.now() <= expires_dt:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return stored, expires_dt
+                self._remove(key)
+            self.misses += 1
+            return None
+
+    def put(self, email: str, license_key: str, generation: Hashable, stored: StoredLicense, expires_dt: datetime) -> None:
+        key = self._key(email, license_key, generation)
+        with self._lock:
+            self._check_generation(generation)
+            self._remove(key)
+            self._entries[key] = (stored, expires_dt, self._clock())
+            self._by_subscription.setdefault(stored.subscription_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate_subscription(self, subscription_id: Optional[str]) -> None:
+        """Drop every cached verification for a subscription."""
+        if not subscription_id:
+            return
+        with self._lock:
+            for key in list(self._by_subscription.get(subscription_id, ())):
+                self._remove(key)
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._by_subscription.clear()
+
+    def _check_generation(self, generation: Hashable) -> None:
+        if generation != self._generation:
+            # Secrets rotated: entries verified with the old ones are unreachable
+            self._entries.clear()
+            self._by_subscription.clear()
+            self._generation = generation
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._by_subscription.get(entry[0].subscription_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_subscription[entry[0].subscription_id]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            size = len(self._entries)
+        lookups = self.hits + self.misses
+        return {
+            "size": size,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
@@ -5,7 +5,26 @@ import sqlite3
 import time
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend.db_pool import (
+    PostgresConnectionPool,
+    SqliteConnectionPool,
+    pool_size_from_env,
+    pool_timeout_from_env,
+)
+
+
+# Atomic rate-limit upsert: add to the current window or start a new one
+_SQLITE_RATE_UPSERT = """
+    INSERT INTO rate_limits(key, window_start, count) VALUES (?, ?, ?)
+    ON CONFLICT(key) DO UPDATE SET
+        count = CASE WHEN rate_limits.window_start = excluded.window_start
+                     THEN rate_limits.count + excluded.count
+                     ELSE excluded.count END,
+        window_start = excluded.window_start
+"""
+_SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
 
 
 @dataclass(frozen=True)
@@ -35,6 +54,21 @@ class StoredActivation:
     last_seen_at: str
 
 
+def _activation_params(activation: StoredActivation) -> Tuple:
+    return (
+        activation.license_key,
+        activation.subscription_id,
+        activation.customer_email,
+        activation.device_id,
+        activation.device_fingerprint_hash,
+        activation.device_name,
+        activation.platform,
+        activation.app_version,
+        activation.created_at,
+        activation.last_seen_at,
+    )
+
+
 class LicenseStore:
     """Durable storage for issued licenses, device activations, and rate limiting.
 
@@ -51,9 +85,23 @@ class LicenseStore:
         else:
             self._impl = SqliteLicenseStore(db_path)
 
+        self._change_listeners: List[Callable[[str], None]] = []
+
     def __getattr__(self, name: str) -> Any:
         return getattr(self._impl, name)
 
+    def add_change_listener(self, callback: Callable[[str], None]) -> None:
+        """Call `callback(subscription_id)` whenever a license row may have changed."""
+        self._change_listeners.append(callback)
+
+    def notify_license_changed(self, subscription_id: str) -> None:
+        for callback in self._change_listeners:
+            callback(subscription_id)
+
+    def update_license_email(self, subscription_id: str, new_email: str) -> None:
+        self._impl.update_license_email(subscription_id, new_email)
+        self.notify_license_changed(subscription_id)
+
 
 class SqliteLicenseStore:
     """Durable SQLite storage.
@@ -68,13 +116,18 @@ class SqliteLicenseStore:
         if db_dir:
             os.makedirs(db_dir, exist_ok=True)
 
+        self._pool = SqliteConnectionPool(db_path, timeout=15)
         self._init_db()
 
     def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path, timeout=15)
-        conn.execute("PRAGMA journal_mode=WAL;")
-        conn.execute("PRAGMA synchronous=NORMAL;")
-        return conn
+        # Per-thread connection; `with` commits or rolls back but keeps it open
+        return self._pool.connection()
+
+    def pool_stats(self) -> Dict[str, Any]:
+        return self._pool.stats()
+
+    def close(self) -> None:
+        self._pool.close_all()
 
     def _init_db(self) -> None:
         with self._connect() as conn:
@@ -319,25 +372,29 @@ class SqliteLicenseStore:
         now = int(time.time())
         window_start = now - (now % window_seconds)
 
-        with self._connect() as conn:
-            row = conn.execute(
-                "SELECT window_start, count FROM rate_limits WHERE key = ?",
-                (key,),
-            ).fetchone()
+        counts = self.add_rate_counts([(key, window_start, 1)])
+        return counts[key] <= limit
 
-            if not row or int(row[0]) != window_start:
-                conn.execute(
-                    "INSERT OR REPLACE INTO rate_limits(key, window_start, count) VALUES (?, ?, ?)",
-                    (key, window_start, 1),
-                )
-                return True
+    def add_rate_counts(self, entries: List[Tuple[str, int, int]]) -> Dict[str, int]:
+        """Add request counts to fixed rate-limit windows in one transaction.
 
-            count = int(row[1]) + 1
-            conn.execute(
-                "UPDATE rate_limits SET count = ? WHERE key = ?",
-                (count, key),
-            )
-            return count <= limit
+        Each (key, window_start, count) is a single atomic upsert: the count is
+        added to the key's current window, or starts a new window. Returns the
+        resulting count per key.
+        """
+        totals: Dict[str, int] = {}
+        if not entries:
+            return totals
+
+        with self._connect() as conn:
+            for key, window_start, count in entries:
+                if _SQLITE_HAS_RETURNING:
+                    row = conn.execute(_SQLITE_RATE_UPSERT + " RETURNING count", (key, window_start, count)).fetchone()
+                else:
+                    conn.execute(_SQLITE_RATE_UPSERT, (key, window_start, count))
+                    row = conn.execute("SELECT count FROM rate_limits WHERE key = ?", (key,)).fetchone()
+                totals[key] = int(row[0])
+        return totals
 
     # -------------------------
     # Device activations
@@ -356,8 +413,29 @@ class SqliteLicenseStore:
         app_version: Optional[str] = None,
     ) -> None:
         now = datetime.utcnow().isoformat()
+        self.upsert_activations(
+            [
+                StoredActivation(
+                    license_key=license_key,
+                    subscription_id=subscription_id,
+                    customer_email=customer_email,
+                    device_id=device_id,
+                    device_fingerprint_hash=device_fingerprint_hash,
+                    device_name=device_name,
+                    platform=platform,
+                    app_version=app_version,
+                    created_at=now,
+                    last_seen_at=now,
+                )
+            ]
+        )
+
+    def upsert_activations(self, activations: List[StoredActivation]) -> None:
+        """Insert or refresh many device activations in one executemany batch."""
+        if not activations:
+            return
         with self._connect() as conn:
-            conn.execute(
+            conn.executemany(
                 """
                 INSERT INTO device_activations(
                     license_key, subscription_id, customer_email, device_id,
@@ -373,18 +451,7 @@ class SqliteLicenseStore:
                     app_version=excluded.app_version,
                     last_seen_at=excluded.last_seen_at
                 """,
-                (
-                    license_key,
-                    subscription_id,
-                    customer_email,
-                    device_id,
-                    device_fingerprint_hash,
-                    device_name,
-                    platform,
-                    app_version,
-                    now,
-                    now,
-                ),
+                [_activation_params(a) for a in activations],
             )
 
     def list_activations(self, *, customer_email: str, license_key: str) -> List[StoredActivation]:
@@ -488,6 +555,11 @@ class PostgresLicenseStore:
     def __init__(self, db_url: str) -> None:
         self.db_url = db_url
         self._psycopg2 = None
+        self._pool = PostgresConnectionPool(
+            self._new_connection,
+            maxconn=pool_size_from_env(),
+            timeout=pool_timeout_from_env(),
+        )
         self._init_db()
 
     def _pg(self):
@@ -497,12 +569,22 @@ class PostgresLicenseStore:
             self._psycopg2 = psycopg2
         return self._psycopg2
 
-    def _connect(self):
+    def _new_connection(self):
         pg = self._pg()
         conn = pg.connect(self.db_url, connect_timeout=10)
         conn.autocommit = True
         return conn
 
+    def _connect(self):
+        # Checked out from the pool for the duration of the `with` block
+        return self._pool.connection()
+
+    def pool_stats(self) -> Dict[str, Any]:
+        return self._pool.stats()
+
+    def close(self) -> None:
+        self._pool.close_all()
+
     def _init_db(self) -> None:
         with self._connect() as conn:
             with conn.cursor() as cur:
@@ -743,31 +825,33 @@ class PostgresLicenseStore:
         now = int(time.time())
         window_start = now - (now % window_seconds)
 
+        counts = self.add_rate_counts([(key, window_start, 1)])
+        return counts[key] <= limit
+
+    def add_rate_counts(self, entries: List[Tuple[str, int, int]]) -> Dict[str, int]:
+        """Add request counts to fixed rate-limit windows (see SqliteLicenseStore)."""
+        totals: Dict[str, int] = {}
+        if not entries:
+            return totals
+
         with self._connect() as conn:
             with conn.cursor() as cur:
-                cur.execute(
-                    "SELECT window_start, count FROM rate_limits WHERE key = %s",
-                    (key,),
-                )
-                row = cur.fetchone()
-
-                if (not row) or int(row[0]) != window_start:
+                for key, window_start, count in entries:
                     cur.execute(
                         """
                         INSERT INTO rate_limits(key, window_start, count)
                         VALUES (%s, %s, %s)
-                        ON CONFLICT (key) DO UPDATE SET window_start = EXCLUDED.window_start, count = EXCLUDED.count
+                        ON CONFLICT (key) DO UPDATE SET
+                            count = CASE WHEN rate_limits.window_start = EXCLUDED.window_start
+                                         THEN rate_limits.count + EXCLUDED.count
+                                         ELSE EXCLUDED.count END,
+                            window_start = EXCLUDED.window_start
+                        RETURNING count
                         """,
-                        (key, window_start, 1),
+                        (key, window_start, count),
                     )
-                    return True
-
-                count = int(row[1]) + 1
-                cur.execute(
-                    "UPDATE rate_limits SET count = %s WHERE key = %s",
-                    (count, key),
-                )
-                return count <= limit
+                    totals[key] = int(cur.fetchone()[0])
+        return totals
 
     # -------------------------
     # Device activations
@@ -786,9 +870,33 @@ class PostgresLicenseStore:
         app_version: Optional[str] = None,
     ) -> None:
         now = datetime.utcnow().isoformat()
+        self.upsert_activations(
+            [
+                StoredActivation(
+                    license_key=license_key,
+                    subscription_id=subscription_id,
+                    customer_email=customer_email,
+                    device_id=device_id,
+                    device_fingerprint_hash=device_fingerprint_hash,
+                    device_name=device_name,
+                    platform=platform,
+                    app_version=app_version,
+                    created_at=now,
+                    last_seen_at=now,
+                )
+            ]
+        )
+
+    def upsert_activations(self, activations: List[StoredActivation]) -> None:
+        """Insert or refresh many device activations in one batch."""
+        if not activations:
+            return
+        from psycopg2.extras import execute_batch  # type: ignore
+
         with self._connect() as conn:
             with conn.cursor() as cur:
-                cur.execute(
+                execute_batch(
+                    cur,
                     """
                     INSERT INTO device_activations(
                         license_key, subscription_id, customer_email, device_id,
@@ -804,18 +912,7 @@ class PostgresLicenseStore:
                         app_version=EXCLUDED.app_version,
                         last_seen_at=EXCLUDED.last_seen_at
                     """,
-                    (
-                        license_key,
-                        subscription_id,
-                        customer_email,
-                        device_id,
-                        device_fingerprint_hash,
-                        device_name,
-                        platform,
-                        app_version,
-                        now,
-                        now,
-                    ),
+                    [_activation_params(a) for a in activations],
                 )
 
     def list_activations(self, *, customer_email: str, license_key: str) -> List[StoredActivation]:
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+
+class DatabaseRateLimiter:
+    """Fixed-window limits counted directly in the store (one upsert per call)."""
+
+    def __init__(self, store: Any) -> None:
+        self.store = store
+
+    def allow(self, key: str, *, limit: int, window_seconds: int) -> bool:
+        return self.store.allow_request(key, limit=limit, window_seconds=window_seconds)
+
+    def flush(self) -> None:
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "database"}
+
+
+@dataclass
+class _Bucket:
+    tokens: float
+    updated: float
+    limit: int
+    window_seconds: int
+    # Set when the shared DB count shows other workers used up the window
+    blocked_until: float = 0.0
+
+
+class TokenBucketRateLimiter:
+    """In-process token buckets, reconciled with the store in batches.
+
+    Each key gets a bucket of `limit` tokens refilled at limit/window_seconds
+    per second, so decisions never touch the database. Buckets are kept in an
+    LRU of at most `max_keys` entries, so a flood of distinct keys cannot grow
+    memory without bound.
+
+    Allowed requests are counted and flushed to the store's fixed-window table
+    every `flush_interval` seconds (or once `max_pending` keys are waiting)
+    with one batched upsert. The returned totals include other workers'
+    requests, and a key that is over its limit there is blocked locally until
+    its window ends. Denied requests are never written, so abusive traffic
+    adds no database load.
+    """
+
+    def __init__(
+        self,
+        store: Any = None,
+        *,
+        max_keys: int = 100_000,
+        flush_interval: float = 5.0,
+        max_pending: int = 1_000,
+        clock=time.monotonic,
+        wall_clock=time.time,
+    ) -> None:
+        self.store = store
+        self.max_keys = max_keys
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._buckets: "OrderedDict[str, _Bucket]" = OrderedDict()
+        # key -> (window_start, window_seconds, limit, count) not yet written
+        self._pending: Dict[str, Tuple[int, int, int, int]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._last_flush = clock()
+
+        self.allowed = 0
+        self.denied = 0
+        self.evicted = 0
+        self.flushes = 0
+        self.flushed_keys = 0
+        self.flush_errors = 0
+
+    def allow(self, key: str, *, limit: int, window_seconds: int) -> bool:
+        key = (key or "").strip()
+        if not key or limit <= 0 or window_seconds <= 0:
+            return True
+
+        now = self._clock()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = _Bucket(tokens=float(limit), updated=now, limit=limit, window_seconds=window_seconds)
+                self._buckets[key] = bucket
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+                    self.evicted += 1
+            else:
+                self._buckets.move_to_end(key)
+                bucket.limit = limit
+                bucket.window_seconds = window_seconds
+                refill = (now - bucket.updated) * limit / window_seconds
+                bucket.tokens = min(float(limit), bucket.tokens + refill)
+                bucket.updated = now
+
+            allowed = now >= bucket.blocked_until and bucket.tokens >= 1
+            if allowed:
+                bucket.tokens -= 1
+                self.allowed += 1
+                if self.store is not None:
+                    self._record(key, limit, window_seconds)
+            else:
+                self.denied += 1
+
+            flush_due = self.store is not None and self._pending and (
+                now - self._last_flush >= self.flush_interval or len(self._pending) >= self.max_pending
+            )
+
+        if flush_due:
+            self.flush(blocking=False)
+        return allowed
+
+    def _record(self, key: str, limit: int, window_seconds: int) -> None:
+        now = int(self._wall_clock())
+        window_start = now - (now % window_seconds)
+        pending = self._pending.get(key)
+        if pending and pending[0] == window_start:
+            self._pending[key] = (window_start, window_seconds, limit, pending[3] + 1)
+        else:
+            if pending:
+                # The old window is over; its count no longer matters
+                self._pending.pop(key)
+            self._pending[key] = (window_start, window_seconds, limit, 1)
+
+    def flush(self, blocking: bool = True) -> None:
+        """Write pending counts to the store and apply the shared totals."""
+        if self.store is None:
+            return
+        if not self._flush_lock.acquire(blocking=blocking):
+            return  # another thread is already flushing
+
+        try:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                self._last_flush = self._clock()
+            if not pending:
+                return
+
+            entries = [(key, window_start, count) for key, (window_start, _, _, count) in pending.items()]
+            try:
+                totals = self.store.add_rate_counts(entries)
+            except Exception:
+                # Keep deciding locally; the counts are retried with the next flush
+                self.flush_errors += 1
+                with self._lock:
+                    for key, value in pending.items():
+                        current = self._pending.get(key)
+                        if current is None:
+                            self._pending[key] = value
+                        elif current[0] == value[0]:
+                            self._pending[key] = (value[0], value[1], value[2], value[3] + current[3])
+                return
+
+            self.flushes += 1
+            self.flushed_keys += len(entries)
+            now = self._clock()
+            wall = self._wall_clock()
+            with self._lock:
+                for key, (window_start, window_seconds, limit, _count) in pending.items():
+                    if totals.get(key, 0) < limit:
+                        continue
+                    bucket = self._buckets.get(key)
+                    if bucket is not None:
+                        bucket.tokens = 0.0
+                        bucket.blocked_until = now + max(0.0, window_start + window_seconds - wall)
+        finally:
+            self._flush_lock.release()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            keys = len(self._buckets)
+            pending = len(self._pending)
+        return {
+            "backend": "token_bucket",
+            "keys": keys,
+            "pending_keys": pending,
+            "allowed": self.allowed,
+            "denied": self.denied,
+            "evicted": self.evicted,
+            "flushes": self.flushes,
+            "flushed_keys": self.flushed_keys,
+            "flush_errors": self.flush_errors,
+        }
+
+
+def build_rate_limiter(store: Any, kind: Optional[str] = None):
+    """Create the limiter selected by RATE_LIMITER ("memory", the default, or "database")."""
+    kind = (kind or os.getenv("RATE_LIMITER") or "memory").strip().lower()
+    if kind in ("db", "database"):
+        return DatabaseRateLimiter(store)
+    return TokenBucketRateLimiter(
+        store,
+        max_keys=int(os.getenv("RATE_LIMITER_MAX_KEYS", "100000") or "100000"),
+        flush_interval=float(os.getenv("RATE_LIMITER_FLUSH_SECONDS", "5") or "5"),
+    )
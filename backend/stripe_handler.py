@@ -271,12 +271,14 @@ class StripeWebhookHandler:
         subscription_id = subscription.get("id")
         status = subscription.get("status")
         self.logger.info(f"Subscription updated: {subscription_id}, status={status}")
+        self.license_store.notify_license_changed(subscription_id)
         return {"success": True, "message": f"Subscription {subscription_id} updated"}
 
     def _handle_subscription_deleted(self, event: Dict[str, Any]) -> Dict[str, Any]:
         subscription = event["data"]["object"]
         subscription_id = subscription.get("id")
         self.logger.info(f"Subscription deleted: {subscription_id}")
+        self.license_store.notify_license_changed(subscription_id)
         return {"success": True, "message": f"Subscription {subscription_id} deleted"}
 
     def _handle_payment_succeeded(self, event: Dict[str, Any]) -> Dict[str, Any]:
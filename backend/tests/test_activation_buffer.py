@@ -0,0 +1,68 @@
+from backend.activation_buffer import ActivationBuffer
+from backend.license_store import LicenseStore
+
+
+def _heartbeat(buffer, device_id, *, app_version="1.0.0"):
+    buffer.record(
+        license_key="FLACO-KEY",
+        subscription_id="sub_1",
+        customer_email="dev@example.com",
+        device_id=device_id,
+        device_fingerprint_hash=f"fp-{device_id}",
+        platform="darwin",
+        app_version=app_version,
+    )
+
+
+def test_heartbeats_are_coalesced_per_device(tmp_path):
+    store = LicenseStore(str(tmp_path / "licenses.sqlite3"))
+    buffer = ActivationBuffer(store, flush_interval=60)
+
+    for version in ("1.0.0", "1.0.1", "1.0.2"):
+        _heartbeat(buffer, "mac-1", app_version=version)
+    _heartbeat(buffer, "mac-2")
+
+    assert store.list_activations(customer_email="dev@example.com", license_key="FLACO-KEY") == []
+    assert buffer.flush() == 2
+
+    rows = {a.device_id: a for a in store.list_activations(customer_email="dev@example.com", license_key="FLACO-KEY")}
+    assert set(rows) == {"mac-1", "mac-2"}
+    assert rows["mac-1"].app_version == "1.0.2"
+
+    stats = buffer.stats()
+    assert stats["recorded"] == 4
+    assert stats["rows_written"] == 2
+    assert stats["coalesced"] == 2
+    assert stats["flushes"] == 1
+
+
+def test_flush_updates_last_seen_and_keeps_created_at(tmp_path):
+    store = LicenseStore(str(tmp_path / "licenses.sqlite3"))
+    buffer = ActivationBuffer(store, flush_interval=60)
+
+    _heartbeat(buffer, "mac-1")
+    buffer.flush()
+    (first,) = store.list_activations(customer_email="dev@example.com", license_key="FLACO-KEY")
+
+    _heartbeat(buffer, "mac-1", app_version="2.0.0")
+    buffer.flush()
+    (second,) = store.list_activations(customer_email="dev@example.com", license_key="FLACO-KEY")
+
+    assert second.created_at == first.created_at
+    assert second.last_seen_at >= first.last_seen_at
+    assert second.app_version == "2.0.0"
+
+
+def test_failed_flush_is_retried(tmp_path):
+    store = LicenseStore(str(tmp_path / "licenses.sqlite3"))
+    buffer = ActivationBuffer(store, flush_interval=60)
+    _heartbeat(buffer, "mac-1")
+
+    real = store.upsert_activations
+    store.upsert_activations = lambda activations: (_ for _ in ()).throw(RuntimeError("db down"))
+    assert buffer.flush() == 0
+    assert buffer.stats()["pending"] == 1
+
+    store.upsert_activations = real
+    assert buffer.flush() == 1
+    assert len(store.list_activations(customer_email="dev@example.com", license_key="FLACO-KEY")) == 1
@@ -55,6 +55,7 @@ def test_health(client):
     assert resp.status_code == 200
     data = resp.get_json()
     assert data["status"] == "healthy"
+    assert data["db_pool"]["backend"] == "sqlite"
 
 
 def test_examples_pro_requires_email_and_key(client):
@@ -89,3 +90,38 @@ def test_verify_license_returns_tier_and_expires(client):
     assert data["valid"] is True
     assert data["tier"] == "enterprise"
     assert data["email"] == email
+
+
+def test_verify_license_is_cached_until_the_license_changes(client, monkeypatch):
+    from backend import app as app_module
+
+    email = "cached@example.com"
+    key = _issue_license(subscription_id="sub_cached", email=email)
+
+    reads = []
+    lookup = app_module.license_store.get_license_by_email_and_key
+    monkeypatch.setattr(
+        app_module.license_store,
+        "get_license_by_email_and_key",
+        lambda *args: reads.append(args) or lookup(*args),
+    )
+
+    for _ in range(3):
+        assert client.post("/api/verify-license", json={"email": email, "license_key": key}).get_json()["valid"]
+    assert len(reads) == 1
+
+    app_module.license_store.update_license_email("sub_cached", email)
+    assert client.post("/api/verify-license", json={"email": email, "license_key": key}).get_json()["valid"]
+    assert len(reads) == 2
+
+    event = {
+        "id": "evt_cancel_cached",
+        "type": "customer.subscription.deleted",
+        "data": {"object": {"id": "sub_cached"}},
+    }
+    assert app_module.webhook_handler.handle_event(event)["success"]
+    client.post("/api/verify-license", json={"email": email, "license_key": key})
+    assert len(reads) == 3
+
+    stats = client.get("/health").get_json()["license_cache"]
+    assert stats["hits"] >= 2
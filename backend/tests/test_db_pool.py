@@ -0,0 +1,71 @@
+import threading
+
+import pytest
+
+from backend.db_pool import PostgresConnectionPool, SqliteConnectionPool
+from backend.license_store import LicenseStore
+
+
+def test_sqlite_pool_reuses_connection_per_thread(tmp_path):
+    pool = SqliteConnectionPool(str(tmp_path / "db.sqlite3"))
+    assert pool.connection() is pool.connection()
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(pool.connection()))
+    thread.start()
+    thread.join()
+
+    assert other[0] is not pool.connection()
+    stats = pool.stats()
+    assert stats["opened"] == 2
+    assert stats["open"] == 1  # the finished thread's connection was closed
+
+
+def test_store_calls_share_one_connection(tmp_path):
+    store = LicenseStore(str(tmp_path / "licenses.sqlite3"))
+    for i in range(5):
+        assert store.allow_request(f"k{i}", limit=10, window_seconds=60)
+        store.is_event_processed(f"evt_{i}")
+
+    stats = store.pool_stats()
+    assert stats["opened"] == 1
+    assert stats["checkouts"] >= 10
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_postgres_pool_is_bounded():
+    pool = PostgresConnectionPool(FakeConnection, minconn=0, maxconn=2, timeout=0.05)
+
+    with pool.connection() as a, pool.connection() as b:
+        assert a is not b
+        with pytest.raises(TimeoutError):
+            with pool.connection():
+                pass
+
+    with pool.connection() as c:
+        assert c in (a, b)
+
+    stats = pool.stats()
+    assert stats["opened"] == 2
+    assert stats["idle"] == 2
+    assert stats["waits"] == 1
+
+
+def test_postgres_pool_replaces_broken_connections():
+    pool = PostgresConnectionPool(FakeConnection, minconn=1, maxconn=1)
+
+    with pytest.raises(RuntimeError):
+        with pool.connection() as conn:
+            conn.closed = True
+            raise RuntimeError("server closed the connection")
+
+    with pool.connection() as fresh:
+        assert fresh is not conn and not fresh.closed
+    assert pool.stats()["discarded"] == 1
@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+
+from backend.license_cache import VerifiedLicenseCache
+from backend.license_store import StoredLicense
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _stored(subscription_id="sub_1", email="a@example.com", key="FLACO-1"):
+    expires = datetime.now() + timedelta(days=30)
+    return StoredLicense(
+        subscription_id=subscription_id,
+        customer_email=email,
+        tier="pro",
+        billing="monthly",
+        license_key=key,
+        expires_iso=expires.isoformat(),
+        created_at=datetime.now().isoformat(),
+    ), expires
+
+
+def test_hit_miss_and_ttl():
+    clock = FakeClock()
+    cache = VerifiedLicenseCache(ttl_seconds=10, clock=clock)
+    stored, expires = _stored()
+
+    assert cache.get("A@example.com", "flaco-1", "g1") is None
+    cache.put("a@example.com", "FLACO-1", "g1", stored, expires)
+    assert cache.get("A@example.com", "flaco-1", "g1") == (stored, expires)
+
+    clock.now = 11
+    assert cache.get("a@example.com", "FLACO-1", "g1") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_expired_license_is_not_served():
+    cache = VerifiedLicenseCache()
+    stored, _ = _stored()
+    cache.put("a@example.com", "FLACO-1", "g1", stored, datetime.now() - timedelta(seconds=1))
+    assert cache.get("a@example.com", "FLACO-1", "g1") is None
+
+
+def test_lru_bound_and_invalidation():
+    cache = VerifiedLicenseCache(max_entries=2)
+    for i in range(3):
+        stored, expires = _stored(subscription_id=f"sub_{i}", email=f"{i}@example.com")
+        cache.put(stored.customer_email, "FLACO-1", "g1", stored, expires)
+    assert cache.stats()["size"] == 2
+    assert cache.stats()["evictions"] == 1
+
+    cache.invalidate_subscription("sub_2")
+    assert cache.get("2@example.com", "FLACO-1", "g1") is None
+    assert cache.get("1@example.com", "FLACO-1", "g1") is not None
+
+
+def test_secret_rotation_empties_cache():
+    cache = VerifiedLicenseCache()
+    stored, expires = _stored()
+    cache.put("a@example.com", "FLACO-1", "g1", stored, expires)
+
+    assert cache.get("a@example.com", "FLACO-1", "g2") is None
+    assert cache.get("a@example.com", "FLACO-1", "g1") is None
+    assert cache.stats()["size"] == 0
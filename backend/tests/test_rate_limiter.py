@@ -0,0 +1,68 @@
+from backend.license_store import LicenseStore
+from backend.rate_limiter import DatabaseRateLimiter, TokenBucketRateLimiter, build_rate_limiter
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_store_allow_request_is_a_single_upsert(tmp_path):
+    store = LicenseStore(str(tmp_path / "licenses.sqlite3"))
+    results = [store.allow_request("k", limit=3, window_seconds=60) for _ in range(5)]
+    assert results == [True, True, True, False, False]
+
+    totals = store.add_rate_counts([("k", 0, 2), ("other", 0, 4)])
+    assert totals == {"k": 2, "other": 4}  # a new window restarts the count
+
+
+def test_token_bucket_limits_and_refills():
+    clock = FakeClock()
+    limiter = TokenBucketRateLimiter(clock=clock, wall_clock=clock)
+
+    assert [limiter.allow("ip", limit=3, window_seconds=60) for _ in range(4)] == [True, True, True, False]
+
+    clock.now += 20  # one token refilled (3 per 60s)
+    assert limiter.allow("ip", limit=3, window_seconds=60)
+    assert not limiter.allow("ip", limit=3, window_seconds=60)
+
+
+def test_keys_are_lru_bounded():
+    limiter = TokenBucketRateLimiter(max_keys=2)
+    for key in ("a", "b", "c"):
+        limiter.allow(key, limit=1, window_seconds=60)
+    assert limiter.stats()["keys"] == 2
+    assert limiter.stats()["evicted"] == 1
+
+    # "a" was evicted, so it starts with a full bucket again
+    assert limiter.allow("a", limit=1, window_seconds=60)
+
+
+def test_flush_batches_counts_and_applies_shared_totals(tmp_path):
+    store = LicenseStore(str(tmp_path / "licenses.sqlite3"))
+    clock = FakeClock()
+    limiter = TokenBucketRateLimiter(store, flush_interval=60, clock=clock, wall_clock=clock)
+
+    for _ in range(3):
+        assert limiter.allow("email", limit=5, window_seconds=60)
+
+    # Another worker already used the rest of this window
+    window_start = int(clock.now) - int(clock.now) % 60
+    store.add_rate_counts([("email", window_start, 2)])
+
+    limiter.flush()
+    assert limiter.stats()["flushes"] == 1
+    assert not limiter.allow("email", limit=5, window_seconds=60)
+
+    # Denied requests are not written to the store
+    assert store.add_rate_counts([("email", window_start, 0)]) == {"email": 5}
+
+
+def test_build_rate_limiter(monkeypatch):
+    monkeypatch.setenv("RATE_LIMITER", "database")
+    assert isinstance(build_rate_limiter(object()), DatabaseRateLimiter)
+    monkeypatch.delenv("RATE_LIMITER")
+    assert isinstance(build_rate_limiter(object()), TokenBucketRateLimiter)
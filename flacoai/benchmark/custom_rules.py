@@ -0,0 +1,98 @@
+"""Benchmark: custom rules analyzer with a large rules file.
+
+Generates a rules file of N rules (regex, contains and not_contains rules
+over a mix of extensions and identifiers, as a team's accumulated rules
+tend to be) and times loading it and checking every Python file of this
+repository. Rules are compiled once into a rule pack; a literal prefilter
+and per-extension dispatch keep most rules from running on most files.
+
+    python -m benchmark.custom_rules --rules 100 500 1000
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+from flacoai.analyzers import CustomRulesAnalyzer
+
+IDENTIFIERS = [
+    "eval", "exec", "pickle.loads", "yaml.load", "subprocess", "os.system", "print",
+    "TODO", "FIXME", "password", "secret", "token", "assert", "global", "lambda",
+    "sleep", "requests.get", "urlopen", "shell=True", "md5", "sha1", "random.random",
+]
+EXTENSIONS = ["py", "swift", "ts", "js", "kt", "go", None, None]
+
+
+def generate_rules(count: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    rules = []
+    for i in range(count):
+        name = rng.choice(IDENTIFIERS)
+        suffix = f"{name}_{i}" if rng.random() < 0.8 else name
+        rule = {"name": f"Rule {i}", "severity": rng.choice(["low", "medium", "high"])}
+        kind = rng.random()
+        if kind < 0.6:
+            rule.update(mode="regex", pattern=r"\b" + re.escape(suffix) + r"\s*\(")
+        elif kind < 0.9:
+            rule.update(mode="contains", pattern=suffix)
+        else:
+            rule.update(mode="not_contains", pattern=f"License-{i}")
+        ext = rng.choice(EXTENSIONS)
+        if ext:
+            rule["file_extension"] = ext
+        rules.append(rule)
+    return {"rules": rules}
+
+
+def load_sources(root: Path) -> dict:
+    files = {}
+    for path in sorted(root.rglob("*.py")):
+        try:
+            files[str(path.relative_to(root))] = path.read_text()
+        except (OSError, UnicodeDecodeError):
+            continue
+    return files
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rules", type=int, nargs="+", default=[100, 500, 1000])
+    parser.add_argument("--root", default=str(Path(__file__).resolve().parent.parent / "flacoai"))
+    args = parser.parse_args(argv)
+
+    files = load_sources(Path(args.root))
+    size = sum(len(content) for content in files.values())
+    print(f"{len(files)} files, {size / 1e6:.1f} MB")
+    print(f"{'rules':>6} {'first load':>12} {'reload':>10} {'analyze':>10} {'findings':>9}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in args.rules:
+            rules_file = os.path.join(tmp, f"rules-{count}.yaml")
+            with open(rules_file, "w") as f:
+                yaml.dump(generate_rules(count), f)
+
+            start = time.perf_counter()
+            CustomRulesAnalyzer(rules_file=rules_file)
+            first_load = time.perf_counter() - start
+
+            start = time.perf_counter()
+            analyzer = CustomRulesAnalyzer(rules_file=rules_file)
+            reload = time.perf_counter() - start
+
+            start = time.perf_counter()
+            findings = sum(len(analyzer.analyze_file(path, content)) for path, content in files.items())
+            elapsed = time.perf_counter() - start
+
+            print(f"{count:>6} {first_load:>11.3f}s {reload:>9.4f}s {elapsed:>9.3f}s {findings:>9}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
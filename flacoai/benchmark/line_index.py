@@ -0,0 +1,122 @@
+"""Benchmark: analyzer time on large generated Swift files.
+
+Generates Swift files of increasing size, full of code the iOS, premium and
+custom-rule analyzers report on, and times each analyzer. Line numbers and
+snippets come from the shared per-file LineIndex, so time per 1k lines
+should stay flat as files grow; per-match re-splitting of the file made it
+grow with the file size.
+
+    python -m benchmark.line_index --lines 10000 25000 50000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from flacoai.analyzers import (
+    ArchitectureAnalyzer,
+    CustomRulesAnalyzer,
+    IOSHIGAnalyzer,
+    IOSSymbolsAnalyzer,
+    IOSVersionAnalyzer,
+    ParsedSource,
+)
+from flacoai.premium import (
+    CrashPredictionAnalyzer,
+    MemoryLeakAnalyzer,
+    PerformanceProfilerAnalyzer,
+    SecurityScoringAnalyzer,
+    TechnicalDebtAnalyzer,
+)
+
+CUSTOM_RULES = """rules:
+  - name: Force unwrap
+    pattern: '\\w+!'
+    mode: regex
+    severity: low
+  - name: Print statement
+    pattern: 'print('
+    mode: contains
+    severity: info
+"""
+
+SNIPPETS = [
+    "        let value = cache[key]!",
+    "        print(\"loaded \\(items.count) items\")",
+    "        DispatchQueue.main.async { self.tableView.reloadData() }",
+    "        timer = Timer.scheduledTimer(withTimeInterval: 1, repeats: true) { _ in self.tick() }",
+    "        NotificationCenter.default.addObserver(self, selector: #selector(refresh), name: .didUpdate, object: nil)",
+    "        UserDefaults.standard.set(token, forKey: \"authToken\")",
+    "        let request = URLRequest(url: URL(string: \"http://api.example.com/v1\")!)",
+    "        for item in items { total += item.price }",
+    "        label.font = UIFont.systemFont(ofSize: 11)",
+    "        if #available(iOS 13.0, *) { view.backgroundColor = .systemBackground }",
+    "        let data = try! JSONSerialization.data(withJSONObject: payload)",
+    "        array[index] = value",
+    "        // TODO: handle the error",
+]
+
+
+def generate_swift(lines: int, seed: int = 0) -> str:
+    """Swift source of about `lines` lines: classes of methods of noisy statements."""
+    rng = random.Random(seed)
+    out = ["import UIKit", ""]
+    n = 0
+    while len(out) < lines:
+        out.append(f"class Screen{n}ViewController: UIViewController {{")
+        out.append("    var items: [Item] = []")
+        out.append("    weak var delegate: ScreenDelegate?")
+        for m in range(8):
+            out.append(f"    func update{m}(items: [Item], key: String) {{")
+            out.extend(rng.choice(SNIPPETS) for _ in range(10))
+            out.append("    }")
+            out.append("")
+        out.append("}")
+        out.append("")
+        n += 1
+    return "\n".join(out[:lines]) + "\n"
+
+
+def run(sizes, rules_file):
+    analyzers = [
+        IOSHIGAnalyzer, IOSSymbolsAnalyzer, IOSVersionAnalyzer, ArchitectureAnalyzer,
+        MemoryLeakAnalyzer, SecurityScoringAnalyzer, PerformanceProfilerAnalyzer,
+        CrashPredictionAnalyzer, TechnicalDebtAnalyzer,
+    ]
+
+    print(f"{'analyzer':<30}" + "".join(f"{size:>10} lines" for size in sizes) + "   ms per 1k lines")
+    for analyzer_class in analyzers + [CustomRulesAnalyzer]:
+        timings = []
+        for size in sizes:
+            content = ParsedSource(generate_swift(size), "Screen.swift")
+            if analyzer_class is CustomRulesAnalyzer:
+                analyzer = CustomRulesAnalyzer(rules_file=rules_file)
+            else:
+                analyzer = analyzer_class()
+            start = time.perf_counter()
+            analyzer.analyze_file("Screen.swift", content)
+            analyzer.finalize()
+            timings.append(time.perf_counter() - start)
+
+        per_k = " / ".join(f"{t * 1000 / (size / 1000):.1f}" for t, size in zip(timings, sizes))
+        print(f"{analyzer_class.__name__:<30}" + "".join(f"{t:>15.3f}s" for t in timings) + f"   {per_k}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, nargs="+", default=[10000, 25000, 50000])
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rules_file = os.path.join(tmp, "rules.yaml")
+        with open(rules_file, "w") as f:
+            f.write(CUSTOM_RULES)
+        run(args.lines, rules_file)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
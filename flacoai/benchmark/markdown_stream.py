@@ -0,0 +1,117 @@
+"""Benchmark: per-update render latency while streaming a long markdown reply.
+
+Streams a generated reply (prose, lists, headings and code fences) into the
+incremental renderer MarkdownStream uses, a few tokens per update, and
+reports render latency per update. Finished blocks are frozen, so latency
+should stay flat from the start of the reply to the end; re-rendering the
+whole reply on each update (as MarkdownStream used to) grows with its
+length, which --compare measures on a sample of the same updates.
+
+    python -m benchmark.markdown_stream --tokens 20000 --compare
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+
+from flacoai.mdstream import IncrementalMarkdownRenderer
+
+WORDS = (
+    "the renderer keeps each finished block and only redraws the open tail of the reply while "
+    "tokens stream in from the model so long answers stay smooth instead of stuttering"
+).split()
+
+CODE_LINES = [
+    "def handler(request):",
+    "    data = json.loads(request.body)",
+    "    for item in data['items']:",
+    "        total += item['price'] * item['quantity']",
+    "    if total > LIMIT:",
+    "        raise ValueError(f'total {total} over limit')",
+    "    return JsonResponse({'total': total})",
+]
+
+
+def generate_reply(tokens: int, seed: int = 0) -> str:
+    """Markdown of about `tokens` tokens (4 characters each)."""
+    rng = random.Random(seed)
+    parts = []
+    size = 0
+    section = 0
+    while size < tokens * 4:
+        kind = rng.random()
+        if kind < 0.1:
+            section += 1
+            block = f"## Section {section}\n"
+        elif kind < 0.5:
+            block = " ".join(rng.choice(WORDS) for _ in range(rng.randint(30, 90))) + ".\n"
+        elif kind < 0.7:
+            block = "".join(
+                f"- {' '.join(rng.choice(WORDS) for _ in range(rng.randint(4, 12)))}\n"
+                for _ in range(rng.randint(2, 6))
+            )
+        else:
+            body = "\n".join(rng.choice(CODE_LINES) for _ in range(rng.randint(5, 30)))
+            block = f"```python\n{body}\n```\n"
+        parts.append(block)
+        size += len(block) + 1
+    return "\n".join(parts)
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def report(name, latencies):
+    tenth = max(1, len(latencies) // 10)
+    print(
+        f"{name:<14} {len(latencies):>7} {percentile(latencies, 50) * 1000:>9.2f}"
+        f" {percentile(latencies, 95) * 1000:>9.2f} {max(latencies) * 1000:>9.2f}"
+        f" {statistics.mean(latencies[:tenth]) * 1000:>11.2f} {statistics.mean(latencies[-tenth:]) * 1000:>11.2f}"
+    )
+
+
+def run(tokens, tokens_per_update, compare, sample_every):
+    reply = generate_reply(tokens)
+    step = tokens_per_update * 4
+    ends = list(range(step, len(reply), step)) + [len(reply)]
+    print(f"{len(reply)} characters (~{len(reply) // 4} tokens), {len(ends)} updates\n")
+    print(f"{'renderer':<14} {'updates':>7} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'first 10%':>11} {'last 10%':>11}")
+
+    renderer = IncrementalMarkdownRenderer()
+    latencies = []
+    for end in ends:
+        start = time.perf_counter()
+        renderer.render(reply[:end])
+        latencies.append(time.perf_counter() - start)
+    report("incremental", latencies)
+    print(f"{'':<14} total {sum(latencies):.2f}s")
+
+    if compare:
+        full = IncrementalMarkdownRenderer()
+        sampled = []
+        for end in ends[::sample_every]:
+            start = time.perf_counter()
+            full.render_lines(reply[:end])
+            sampled.append(time.perf_counter() - start)
+        report("full re-render", sampled)
+        print(f"{'':<14} total ~{statistics.mean(sampled) * len(ends):.2f}s (from every {sample_every}th update)")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=20000, help="Length of the reply")
+    parser.add_argument("--tokens-per-update", type=int, default=10)
+    parser.add_argument("--compare", action="store_true", help="Also time full re-renders")
+    parser.add_argument("--sample-every", type=int, default=50, help="Updates between full re-renders")
+    args = parser.parse_args(argv)
+
+    run(args.tokens, args.tokens_per_update, args.compare, args.sample_every)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
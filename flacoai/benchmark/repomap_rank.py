@@ -0,0 +1,115 @@
+"""Benchmark: the repo map's PageRank backends on synthetic repos.
+
+Builds the reference graph get_ranked_tags() would build for a made-up repo
+of the given size: idents defined in a few files and referenced from many,
+with the same edge weights. Each backend in repomap.RANKING_BACKENDS then
+ranks it, and the report shows the best time of each and how far the
+sparse backend's ranks are from networkx's.
+
+    python -m benchmark.repomap_rank
+    python -m benchmark.repomap_rank --files 20000 --idents 200000 --runs 1
+"""
+
+import argparse
+import math
+import random
+import sys
+import time
+from collections import Counter
+
+from flacoai.repomap import RANKING_BACKENDS, TagGraph, rank_networkx, rank_sparse
+
+RANKERS = {
+    "networkx": rank_networkx,
+    "sparse": rank_sparse,
+}
+
+
+def synthetic_graph(num_files, num_idents, seed=0):
+    """A TagGraph and personalization shaped like a real repo's.
+
+    A few files are popular to reference, most idents have one definer, and
+    a handful of files are "in the chat" and personalized.
+    """
+    rng = random.Random(seed)
+    files = [f"pkg{i % 50}/mod{i}.py" for i in range(num_files)]
+    chat = set(rng.sample(files, min(5, num_files)))
+    popular = [files[int(num_files * rng.paretovariate(1.5)) % num_files] for _ in range(256)]
+
+    graph = TagGraph()
+    for i in range(num_idents):
+        ident = f"ident_name_{i}" if i % 3 else f"f{i}"
+        definers = set(rng.sample(files, min(num_files, rng.choice([1, 1, 1, 2, 3, 7]))))
+
+        mul = 1.0
+        if len(ident) >= 8:
+            mul *= 10
+        if len(definers) > 5:
+            mul *= 0.1
+
+        refs = [rng.choice(popular) if rng.random() < 0.3 else rng.choice(files)]
+        refs *= rng.randint(1, 4)
+        refs += rng.choices(files, k=rng.randint(0, 6))
+        if not rng.randint(0, 20):
+            for definer in definers:
+                graph.add_edge(definer, definer, 0.1, ident)
+            continue
+
+        for referencer, num_refs in Counter(refs).items():
+            for definer in definers:
+                use_mul = mul * 50 if referencer in chat else mul
+                num_refs = math.sqrt(num_refs)
+                graph.add_edge(referencer, definer, use_mul * num_refs, ident)
+
+    personalization = {fname: 100 / num_files for fname in chat}
+    return graph, personalization
+
+
+def max_diff(a, b):
+    return max((abs(a[key] - b.get(key, 0.0)) for key in a), default=0.0)
+
+
+def top_agreement(a, b, k):
+    """Share of a's top k definitions that are also in b's top k."""
+
+    def top(ranks):
+        return set(sorted(ranks, key=lambda key: (ranks[key], key), reverse=True)[:k])
+
+    return len(top(a) & top(b)) / max(1, min(k, len(a)))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, action="append", help="Default: 1000, 5000, 20000")
+    parser.add_argument("--idents", type=int, default=10, help="Idents per file (default: 10)")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per backend; the best is kept")
+    parser.add_argument("--top", type=int, default=1000, help="Top definitions to compare")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    for num_files in args.files or [1000, 5000, 20000]:
+        graph, personalization = synthetic_graph(num_files, num_files * args.idents, args.seed)
+        print(f"{num_files} files, {len(graph.idents)} idents, {len(graph)} edges")
+
+        results = {}
+        for name in RANKING_BACKENDS:
+            times = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                results[name] = RANKERS[name](graph, personalization)
+                times.append(time.perf_counter() - start)
+            print(f"    {name:<9} {min(times) * 1000:9.1f}ms")
+
+        ranked, definitions = results["networkx"]
+        sparse_ranked, sparse_definitions = results["sparse"]
+        print(
+            f"    max diff: files {max_diff(ranked, sparse_ranked):.2e},"
+            f" definitions {max_diff(definitions, sparse_definitions):.2e};"
+            f" top {args.top} agree {top_agreement(definitions, sparse_definitions, args.top):.1%}"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
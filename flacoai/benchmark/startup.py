@@ -0,0 +1,141 @@
+"""Benchmark: CLI cold-start time, measured with ``python -X importtime``.
+
+Runs each scenario in a fresh interpreter several times and reports the
+best wall time, the total import time, how many modules were imported, and
+the slowest imports. ``--check`` exits non-zero when a scenario's import
+time is over its budget; tests/basic/test_startup.py enforces the same
+budgets in the test suite.
+
+Scenarios:
+    help          flacoai --help
+    first-prompt  flacoai --exit: all startup work up to the first prompt
+                  (needs the full requirements, litellm included)
+
+    python -m benchmark.startup --runs 5
+    python -m benchmark.startup --scenario help --check
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Import time budgets (ms)
+BUDGETS = {
+    "help": 1000,
+    "first-prompt": 2500,
+}
+
+FIRST_PROMPT_ARGS = [
+    "--exit",
+    "--no-git",
+    "--model",
+    "gpt-4o",
+    "--openai-api-key",
+    "sk-startup-benchmark",
+    "--no-check-update",
+    "--no-show-release-notes",
+    "--no-analytics",
+    "--no-pretty",
+    "--yes-always",
+]
+
+# The checkout, so the flacoai under test is imported wherever the CLI runs
+ROOT = Path(__file__).resolve().parent.parent
+
+SCENARIOS = {
+    "help": ["--help"],
+    "first-prompt": FIRST_PROMPT_ARGS,
+}
+
+
+def parse_importtime(stderr):
+    """Imports listed by -X importtime.
+
+    Returns:
+        List of (module, self us, cumulative us, depth), in import order
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or line.endswith("| imported package"):
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:") :].split("|")
+            self_us, cumulative_us = int(self_us), int(cumulative_us)
+        except ValueError:
+            continue
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((name.strip(), self_us, cumulative_us, depth))
+    return imports
+
+
+def total_import_ms(imports):
+    """Time spent importing: the cumulative time of the top-level imports."""
+    shallowest = min((depth for *_, depth in imports), default=0)
+    return sum(cumulative for _, _, cumulative, depth in imports if depth == shallowest) / 1000
+
+
+def run_scenario(args, cwd):
+    """Run the CLI once; returns (wall seconds, imports, exit code)."""
+    env = dict(os.environ, HOME=cwd, FLACO_ANALYTICS="false")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT), env.get("PYTHONPATH")]))
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "flacoai"] + args,
+        cwd=cwd,
+        env=env,
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - start
+    return wall, parse_importtime(result.stderr), result.returncode
+
+
+def report(name, runs, top):
+    wall = min(run[0] for run in runs)
+    # The run with the least import time, to leave out a noisy machine
+    imports = min((run[1] for run in runs), key=total_import_ms)
+    imported_ms = total_import_ms(imports)
+    budget = BUDGETS[name]
+    print(
+        f"{name:<13} wall {wall * 1000:7.0f}ms  imports {imported_ms:7.0f}ms"
+        f" / {budget}ms budget  {len(imports)} modules"
+    )
+    slowest = sorted(
+        (entry for entry in imports if entry[0].startswith("flacoai") or entry[3] <= 1),
+        key=lambda entry: -entry[2],
+    )
+    for module, self_us, cumulative_us, _ in slowest[:top]:
+        print(f"    {cumulative_us / 1000:8.1f}ms  (self {self_us / 1000:6.1f}ms)  {module}")
+    return imported_ms <= budget
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scenario", choices=sorted(SCENARIOS), action="append", help="Default: all of them"
+    )
+    parser.add_argument("--runs", type=int, default=5, help="Runs per scenario; the best is kept")
+    parser.add_argument("--top", type=int, default=12, help="Slowest imports to list")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if over a budget")
+    args = parser.parse_args(argv)
+
+    ok = True
+    with tempfile.TemporaryDirectory() as cwd:
+        for name in args.scenario or list(SCENARIOS):
+            runs = [run_scenario(SCENARIOS[name], cwd) for _ in range(args.runs)]
+            failed = [code for *_, code in runs if code]
+            if failed:
+                print(f"{name:<13} flacoai exited with {failed[0]}, skipped")
+                continue
+            ok = report(name, runs, args.top) and ok
+
+    return 0 if ok or not args.check else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
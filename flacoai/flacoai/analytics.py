@@ -5,9 +5,6 @@ import time
 import uuid
 from pathlib import Path
 
-from mixpanel import MixpanelException
-from posthog import Posthog
-
 from flacoai import __version__
 from flacoai.dump import dump  # noqa: F401
 from flacoai.models import model_info_manager
@@ -98,6 +95,8 @@ class Analytics:
             self.disable(False)
             return
 
+        from posthog import Posthog
+
         # self.mp = Mixpanel(mixpanel_project_token)
         self.ph = Posthog(
             project_api_key=self.custom_posthog_project_api_key or posthog_project_api_key,
@@ -231,6 +230,8 @@ class Analytics:
                 properties[key] = str(value)
 
         if self.mp:
+            from mixpanel import MixpanelException
+
             try:
                 self.mp.track(self.user_id, event_name, dict(properties))
             except MixpanelException:
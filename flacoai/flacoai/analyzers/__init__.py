@@ -1,41 +1,47 @@
-"""Code analysis framework for FlacoAI."""
+"""Code analysis framework for FlacoAI.
 
-from .base_analyzer import (
-    BaseAnalyzer,
-    AnalysisResult,
-    AnalysisReport,
-    Severity,
-    Category,
-)
-from .security_analyzer import SecurityAnalyzer
-from .performance_analyzer import PerformanceAnalyzer
-from .quality_analyzer import QualityAnalyzer
-from .architecture_analyzer import ArchitectureAnalyzer
-from .ios_symbols_analyzer import IOSSymbolsAnalyzer
-from .ios_hig_analyzer import IOSHIGAnalyzer
-from .ios_plist_analyzer import IOSPlistAnalyzer
-from .swiftui_analyzer import SwiftUIAnalyzer
-from .ios_version_analyzer import IOSVersionAnalyzer
-from .spm_analyzer import SPMAnalyzer
-from .documentation_analyzer import DocumentationAnalyzer
-from .custom_rules_analyzer import CustomRulesAnalyzer
+Analyzers are imported on first use, not with the package: the CLI imports
+this package for a handful of types, and loading every analyzer (with its
+rule files and YAML parser) would put them all on that path.
+"""
 
-__all__ = [
-    "BaseAnalyzer",
-    "AnalysisResult",
-    "AnalysisReport",
-    "Severity",
-    "Category",
-    "SecurityAnalyzer",
-    "PerformanceAnalyzer",
-    "QualityAnalyzer",
-    "ArchitectureAnalyzer",
-    "IOSSymbolsAnalyzer",
-    "IOSHIGAnalyzer",
-    "IOSPlistAnalyzer",
-    "SwiftUIAnalyzer",
-    "IOSVersionAnalyzer",
-    "SPMAnalyzer",
-    "DocumentationAnalyzer",
-    "CustomRulesAnalyzer",
-]
+# Exported name -> submodule defining it
+_EXPORTS = {
+    "BaseAnalyzer": "base_analyzer",
+    "AnalysisResult": "base_analyzer",
+    "AnalysisReport": "base_analyzer",
+    "Severity": "base_analyzer",
+    "Category": "base_analyzer",
+    "SecurityAnalyzer": "security_analyzer",
+    "PerformanceAnalyzer": "performance_analyzer",
+    "QualityAnalyzer": "quality_analyzer",
+    "ArchitectureAnalyzer": "architecture_analyzer",
+    "IOSSymbolsAnalyzer": "ios_symbols_analyzer",
+    "IOSHIGAnalyzer": "ios_hig_analyzer",
+    "IOSPlistAnalyzer": "ios_plist_analyzer",
+    "SwiftUIAnalyzer": "swiftui_analyzer",
+    "IOSVersionAnalyzer": "ios_version_analyzer",
+    "SPMAnalyzer": "spm_analyzer",
+    "DocumentationAnalyzer": "documentation_analyzer",
+    "CustomRulesAnalyzer": "custom_rules_analyzer",
+    "AnalyzerScheduler": "scheduler",
+    "AnalyzerSpec": "scheduler",
+    "ParsedSource": "parsed_source",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # __import__ rather than importlib.import_module, so these imports show
+    # up in -X importtime (benchmark/startup.py)
+    value = getattr(__import__(module, globals(), None, [name], 1), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
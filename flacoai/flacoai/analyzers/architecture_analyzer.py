@@ -1,17 +1,33 @@
 """Architecture analyzer for detecting design and dependency issues."""
 
+import os
 import re
-from typing import List, Dict, Set
-from collections import defaultdict
+from typing import List, Optional, Set
 from .base_analyzer import BaseAnalyzer, AnalysisResult, Severity, Category
+from .import_graph import ImportGraph
+
+# AnalysisCache state name for the import graph saved between runs
+IMPORT_GRAPH_STATE = "architecture.import_graph"
+
+PY_FROM_IMPORT = re.compile(r'^[ \t]*from[ \t]+([\w.]+)[ \t]+import[ \t]+(?:\(([^)]*)\)|([\w \t,]+))', re.MULTILINE)
+PY_IMPORT = re.compile(r'^[ \t]*import[ \t]+([\w.]+(?:[ \t]*,[ \t]*[\w.]+)*)', re.MULTILINE)
+JS_IMPORT = re.compile(
+    r'(?:\b(?:import|export)\s+(?:[^\'";]*?\s+from\s+)?|\brequire\(\s*|\bimport\(\s*)["\']([^"\']+)["\']'
+)
+JVM_IMPORT = re.compile(r'^[ \t]*import[ \t]+(?:static[ \t]+)?([\w.]+)', re.MULTILINE)
 
 
 class ArchitectureAnalyzer(BaseAnalyzer):
     """Analyzes code architecture, dependencies, and design patterns."""
 
+    # Circular dependency detection needs every file's imports in one graph
+    shardable = False
+
     def __init__(self, io=None, verbose=False):
         super().__init__(io, verbose)
-        self.import_graph: Dict[str, Set[str]] = defaultdict(set)
+        # Loaded from the analysis cache on first use, when there is one
+        self.import_graph: Optional[ImportGraph] = None
+        self._graph_files: Set[str] = set()
 
         # iOS/Swift-specific architecture patterns
         self.ios_mvc_patterns = [
@@ -49,7 +65,7 @@ class ArchitectureAnalyzer(BaseAnalyzer):
 
         # Track imports for dependency analysis
         imports = self._extract_imports(content)
-        self.import_graph[file_path] = imports
+        self._record_imports(file_path, content)
 
         # Check for God Class
         results.extend(self._check_god_class(file_path, content))
@@ -89,26 +105,98 @@ class ArchitectureAnalyzer(BaseAnalyzer):
 
         return results
 
-    def analyze_files(self, files: Dict[str, str]):
-        """Override to add circular dependency detection."""
-        report = super().analyze_files(files)
+    def finalize(self) -> List[AnalysisResult]:
+        """Detect circular dependencies across all analyzed files.
+
+        Each import cycle (strongly connected component of the file import
+        graph) is reported once, on its first analyzed file, with one
+        shortest cycle through it as the example path. With an analysis
+        cache the graph is kept between runs, so files outside this run
+        still close cycles and only files whose imports changed cost work.
+        """
+        results = []
+        graph = self._get_import_graph()
+
+        if self.cache is not None:
+            # Forget files deleted since the graph was saved
+            for file_path in graph.files():
+                if file_path not in self._graph_files and not os.path.exists(
+                    os.path.join(self.cache.root, file_path)
+                ):
+                    graph.remove(file_path)
+
+        for component in self._find_circular_dependencies():
+            analyzed = [path for path in component if path in self._graph_files]
+            if not analyzed:
+                continue
+
+            cycle = graph.cycle_path(component)
+            file_path = cycle[0] if cycle[0] in self._graph_files else analyzed[0]
+            description = "Circular dependency: " + " -> ".join(cycle)
+            if len(component) > len(cycle) - 1:
+                description += f" ({len(component)} files are in this cycle)"
 
-        # Detect circular dependencies across all files
-        circular_deps = self._find_circular_dependencies()
-        for file_path, circular_with in circular_deps:
             result = AnalysisResult(
                 file=file_path,
                 line=1,
                 severity=Severity.HIGH,
                 category=Category.ARCHITECTURE,
                 title="Circular Dependency",
-                description=f"Circular dependency with {circular_with}",
+                description=description,
                 recommendation="Refactor to remove circular dependencies, consider dependency inversion",
                 code_snippet="",
             )
-            report.add_result(result)
+            results.append(result)
+
+        if self.cache is not None:
+            self.cache.set_state(IMPORT_GRAPH_STATE, graph.to_dict())
 
-        return report
+        return results
+
+    def on_cached_file(self, file_path: str, content: str):
+        """Keep the import graph complete when findings come from the cache."""
+        if self._is_code_file(file_path):
+            self._record_imports(file_path, content)
+
+    def _get_import_graph(self) -> ImportGraph:
+        """The import graph, starting from the saved one when there is a cache."""
+        if self.import_graph is None:
+            saved = self.cache.get_state(IMPORT_GRAPH_STATE) if self.cache is not None else None
+            self.import_graph = ImportGraph.from_dict(saved) if saved else ImportGraph()
+        return self.import_graph
+
+    def _record_imports(self, file_path: str, content: str):
+        self._get_import_graph().update(file_path, self._extract_import_targets(file_path, content))
+        self._graph_files.add(file_path)
+
+    def _extract_import_targets(self, file_path: str, content: str) -> Set[str]:
+        """Extract imports as written, to be resolved to files by the import graph.
+
+        Unlike _extract_imports this keeps full module names and relative
+        imports, which is what is needed to tell which file is imported.
+        """
+        targets = set()
+        ext = self.get_file_extension(file_path)
+
+        if ext == 'py':
+            for match in PY_FROM_IMPORT.finditer(content):
+                module = match.group(1)
+                targets.add(module)
+                # "from pkg import mod" may import the module pkg/mod.py
+                separator = '' if module.endswith('.') else '.'
+                for name in (match.group(2) or match.group(3)).split(','):
+                    name = name.split()[0] if name.split() else ''
+                    if name.isidentifier():
+                        targets.add(module + separator + name)
+            for match in PY_IMPORT.finditer(content):
+                for module in match.group(1).split(','):
+                    targets.add(module.strip())
+        elif ext in ('js', 'jsx', 'ts', 'tsx', 'mjs', 'cjs'):
+            targets.update(match.group(1) for match in JS_IMPORT.finditer(content))
+        elif ext in ('java', 'kt'):
+            targets.update(match.group(1) for match in JVM_IMPORT.finditer(content))
+
+        return targets
 
     def _extract_imports(self, content: str) -> Set[str]:
         """Extract import statements from content."""
@@ -163,7 +251,7 @@ class ArchitectureAnalyzer(BaseAnalyzer):
 
             # God class indicators
             if method_count > 20 or line_count > 500:
-                line_num = content[:class_start].count('\n') + 1
+                line_num = self.line_index(content).line_of(class_start)
 
                 result = AnalysisResult(
                     file=file_path,
@@ -308,32 +396,9 @@ class ArchitectureAnalyzer(BaseAnalyzer):
 
         return results
 
-    def _find_circular_dependencies(self) -> List[tuple]:
-        """Find circular dependencies in the import graph."""
-        circular = []
-
-        def has_path(start: str, end: str, visited: Set[str]) -> bool:
-            """Check if there's a path from start to end."""
-            if start == end:
-                return True
-            if start in visited:
-                return False
-
-            visited.add(start)
-
-            for neighbor in self.import_graph.get(start, set()):
-                if has_path(neighbor, end, visited.copy()):
-                    return True
-
-            return False
-
-        # Check each edge for circularity
-        for file_a in self.import_graph:
-            for file_b in self.import_graph[file_a]:
-                if has_path(file_b, file_a, set()):
-                    circular.append((file_a, file_b))
-
-        return circular
+    def _find_circular_dependencies(self) -> List[List[str]]:
+        """Find import cycles, one strongly connected component of files each."""
+        return self._get_import_graph().cycles()
 
     def _check_massive_view_controller(self, file_path: str, content: str) -> List[AnalysisResult]:
         """Check for Massive View Controller anti-pattern."""
@@ -365,7 +430,7 @@ class ArchitectureAnalyzer(BaseAnalyzer):
 
             # Massive VC indicators
             if line_count > 300 or method_count > 15:
-                line_num = content[:vc_start].count('\n') + 1
+                line_num = self.line_index(content).line_of(vc_start)
 
                 result = AnalysisResult(
                     file=file_path,
@@ -7,6 +7,9 @@ from pathlib import Path
 from typing import List, Optional, Dict, Any
 import re
 
+from .parsed_source import ParsedSource
+from .rule_engine import LineIndex, get_rule_set
+
 
 class Severity(Enum):
     """Severity levels for analysis findings."""
@@ -69,6 +72,8 @@ class AnalysisReport:
     results: List[AnalysisResult] = field(default_factory=list)
     files_analyzed: int = 0
     duration_seconds: float = 0.0
+    analyzer_timings: Dict[str, float] = field(default_factory=dict)
+    metadata: Dict[str, Any] = field(default_factory=dict)
 
     def add_result(self, result: AnalysisResult):
         """Add a finding to the report."""
@@ -103,6 +108,8 @@ class AnalysisReport:
             "results": [r.to_dict() for r in self.results],
             "files_analyzed": self.files_analyzed,
             "duration_seconds": self.duration_seconds,
+            "analyzer_timings": self.analyzer_timings,
+            "metadata": self.metadata,
             "stats": self.get_stats(),
         }
 
@@ -110,6 +117,15 @@ class AnalysisReport:
 class BaseAnalyzer(ABC):
     """Abstract base class for all code analyzers."""
 
+    # Analyzers whose findings depend only on the file being analyzed can be
+    # split across worker processes. Analyzers that correlate files (e.g. an
+    # import graph built up across analyze_file calls) must set this to False.
+    shardable = True
+
+    # Part of the findings cache key. Bump when an analyzer's rules change so
+    # cached findings from the old rules are not reused.
+    RULES_VERSION = 4
+
     def __init__(self, io=None, verbose=False):
         """Initialize the analyzer.
 
@@ -120,6 +136,8 @@ class BaseAnalyzer(ABC):
         self.io = io
         self.verbose = verbose
         self.results: List[AnalysisResult] = []
+        self.cache = None  # Optional AnalysisCache, assigned by the caller
+        self._line_index: Optional[LineIndex] = None
 
     @abstractmethod
     def analyze_file(self, file_path: str, content: str) -> List[AnalysisResult]:
@@ -127,7 +145,8 @@ class BaseAnalyzer(ABC):
 
         Args:
             file_path: Path to the file being analyzed
-            content: File contents as string
+            content: File contents, as a plain string or a ParsedSource
+                shared with the other analyzers (see parse_source)
 
         Returns:
             List of AnalysisResult objects
@@ -154,16 +173,102 @@ class BaseAnalyzer(ABC):
                 self.io.tool_output(f"Analyzing {file_path}...")
 
             try:
-                results = self.analyze_file(file_path, content)
+                results = self.analyze_file_cached(file_path, ParsedSource.of(content, file_path))
                 for result in results:
                     report.add_result(result)
             except Exception as e:
                 if self.io:
                     self.io.tool_error(f"Error analyzing {file_path}: {e}")
 
+        for result in self.finalize():
+            report.add_result(result)
+
         report.duration_seconds = time.time() - start_time
         return report
 
+    def analyze_file_cached(self, file_path: str, content: str) -> List[AnalysisResult]:
+        """Analyze a file, reusing cached findings when content and rules are unchanged.
+
+        Args:
+            file_path: Path to the file being analyzed
+            content: File contents as string
+
+        Returns:
+            List of AnalysisResult objects
+        """
+        if self.cache is None:
+            return self.analyze_file(file_path, content)
+
+        key = self.cache.make_key(self, file_path, content)
+        results = self.cache.get(key)
+        if results is not None:
+            self.on_cached_file(file_path, content)
+            return results
+
+        results = self.analyze_file(file_path, content)
+        self.cache.set(key, results)
+        return results
+
+    def finalize(self) -> List[AnalysisResult]:
+        """Report findings that need every file, after the last one is analyzed.
+
+        Override in analyzers that correlate files (set shardable = False).
+
+        Returns:
+            List of AnalysisResult objects
+        """
+        return []
+
+    def cache_key_parts(self) -> List[str]:
+        """Extra inputs that affect findings, added to the cache key.
+
+        Returns:
+            List of strings (e.g. a hash of a rules file)
+        """
+        return []
+
+    def on_cached_file(self, file_path: str, content: str):
+        """Called instead of analyze_file on a cache hit.
+
+        Analyzers that build cross-file state inside analyze_file override
+        this to rebuild that state without recomputing findings.
+        """
+        pass
+
+    def parse_source(self, file_path: str, content: str) -> ParsedSource:
+        """Get the parsed view of a file.
+
+        Returns content itself when the caller already passed a ParsedSource,
+        so line splits, comment masks and function spans are computed once
+        per file no matter how many analyzers look at it.
+
+        Args:
+            file_path: Path to the file
+            content: File content (str or ParsedSource)
+
+        Returns:
+            ParsedSource for the file
+        """
+        return ParsedSource.of(content, file_path)
+
+    def line_index(self, content: str) -> LineIndex:
+        """Get the newline-offset index for content.
+
+        The index for the most recent content is kept, so the many pattern
+        checks an analyzer runs over one file share a single index.
+
+        Args:
+            content: File content
+
+        Returns:
+            LineIndex for content
+        """
+        if isinstance(content, ParsedSource):
+            return content.line_index
+        if self._line_index is None or self._line_index.content is not content:
+            self._line_index = LineIndex(content)
+        return self._line_index
+
     def get_lines_context(self, content: str, line_num: int, context_lines: int = 2) -> str:
         """Get lines of code around a specific line number.
 
@@ -175,14 +280,14 @@ class BaseAnalyzer(ABC):
         Returns:
             Code snippet as string
         """
-        lines = content.split('\n')
-        start = max(0, line_num - context_lines - 1)
-        end = min(len(lines), line_num + context_lines)
-        return '\n'.join(lines[start:end])
+        return self.line_index(content).context(line_num, context_lines)
 
     def find_pattern(self, content: str, pattern: str, flags=0) -> List[tuple]:
         """Find all matches of a regex pattern in content.
 
+        The pattern is matched one line at a time, unless it spells out a
+        newline (\\n) to span lines; see rule_engine.rule_scope().
+
         Args:
             content: File content
             pattern: Regex pattern
@@ -191,14 +296,56 @@ class BaseAnalyzer(ABC):
         Returns:
             List of (line_number, column, matched_text) tuples
         """
-        results = []
-        lines = content.split('\n')
+        return [
+            (line_num, column, matched_text)
+            for _, line_num, column, matched_text in self.find_patterns(content, [pattern], flags)
+        ]
 
-        for line_num, line in enumerate(lines, 1):
-            for match in re.finditer(pattern, line, flags):
-                results.append((line_num, match.start(), match.group()))
+    def find_patterns(self, content: str, patterns: List[str], flags=0) -> List[tuple]:
+        """Find all matches of several regex patterns in one shared scan.
 
-        return results
+        Equivalent to calling find_pattern for each pattern, but rules that
+        do not match cost a single combined pass over the file.
+
+        Args:
+            content: File content
+            patterns: Regex patterns
+            flags: Regex flags
+
+        Returns:
+            List of (pattern_index, line_number, column, matched_text) tuples,
+            ordered by pattern then position
+        """
+        rule_set = get_rule_set(tuple(patterns), flags | re.MULTILINE)
+        return [
+            (m.rule, m.line, m.column, m.text)
+            for m in rule_set.scan(content, self.line_index(content))
+        ]
+
+    def find_pattern_groups(self, content: str, groups: List[List[tuple]], flags=0) -> List[List[tuple]]:
+        """Match several groups of (pattern, description) checks in one scan.
+
+        Args:
+            content: File content
+            groups: Lists of (pattern, description) tuples
+            flags: Regex flags
+
+        Returns:
+            One list per group of (description, line_number, column, matched_text)
+            tuples, in pattern order then position
+        """
+        flat = []
+        for group_index, group in enumerate(groups):
+            for pattern, description in group:
+                flat.append((group_index, pattern, description))
+
+        grouped = [[] for _ in groups]
+        matches = self.find_patterns(content, [pattern for _, pattern, _ in flat], flags)
+        for rule, line_num, column, matched_text in matches:
+            group_index, _, description = flat[rule]
+            grouped[group_index].append((description, line_num, column, matched_text))
+
+        return grouped
 
     def is_supported_file(self, file_path: str) -> bool:
         """Check if this analyzer supports the given file type.
@@ -0,0 +1,196 @@
+"""Persistent findings cache so unchanged files are not re-analyzed."""
+
+import hashlib
+import shutil
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from diskcache import Cache
+
+from flacoai import __version__
+
+SQLITE_ERRORS = (sqlite3.OperationalError, sqlite3.DatabaseError, OSError)
+
+ANALYSIS_CACHE_VERSION = 1
+ANALYSIS_CACHE_DIR = f".flacoai.analysis.cache.v{ANALYSIS_CACHE_VERSION}"
+
+# Findings are small, but a monorepo x 18 analyzers adds up; evict beyond this
+DEFAULT_SIZE_LIMIT = 256 * 1024 * 1024
+
+
+def content_hash(content: str) -> str:
+    """Stable hash of file content used as the primary cache key."""
+    return hashlib.sha256(content.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def file_hash(path: str) -> str:
+    """Hash a file on disk (e.g. a custom rules file), empty string if unreadable."""
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except OSError:
+        return ""
+
+
+class AnalysisCache:
+    """On-disk cache of per-file analyzer findings.
+
+    Entries are keyed by the file's content hash, the analyzer class, the
+    analyzer's RULES_VERSION and any analyzer-specific inputs (such as the
+    custom rules file hash), so a hit is only possible when re-running the
+    same rules over the same bytes. Uses diskcache like RepoMap's tags cache,
+    with a size limit and LRU eviction, and falls back to an in-memory dict
+    if SQLite is unusable.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        size_limit: int = DEFAULT_SIZE_LIMIT,
+        io=None,
+        verbose=False,
+        persist_state=True,
+    ):
+        """Initialize the cache.
+
+        Args:
+            root: Project root; the cache lives in ANALYSIS_CACHE_DIR below it
+            size_limit: Maximum cache size in bytes before eviction
+            io: IO object for output (optional)
+            verbose: Enable verbose logging
+            persist_state: Load and save cross-run analyzer state. Without it
+                only findings are cached, for reviews of something other than
+                the working tree, whose state must not replace the tree's
+        """
+        self.root = root
+        self.size_limit = size_limit
+        self.persist_state = persist_state
+        self.io = io
+        self.verbose = verbose
+        self.hits = 0
+        self.misses = 0
+        self.load_cache()
+
+    @property
+    def path(self) -> Path:
+        return Path(self.root) / ANALYSIS_CACHE_DIR
+
+    def load_cache(self):
+        try:
+            self.cache = Cache(
+                str(self.path),
+                size_limit=self.size_limit,
+                eviction_policy="least-recently-used",
+            )
+        except SQLITE_ERRORS as e:
+            self.cache_error(e)
+
+    def cache_error(self, original_error=None):
+        """Handle SQLite errors by recreating the cache, falling back to dict if needed."""
+        if self.verbose and self.io and original_error:
+            self.io.tool_warning(f"Analysis cache error: {original_error}")
+
+        if isinstance(getattr(self, "cache", None), dict):
+            return
+
+        try:
+            if self.path.exists():
+                shutil.rmtree(self.path)
+            self.cache = Cache(
+                str(self.path),
+                size_limit=self.size_limit,
+                eviction_policy="least-recently-used",
+            )
+            return
+        except SQLITE_ERRORS as e:
+            if self.io:
+                self.io.tool_warning(
+                    f"Unable to use analysis cache at {self.path}, falling back to memory cache"
+                )
+                if self.verbose:
+                    self.io.tool_warning(f"Cache recreation error: {e}")
+
+        self.cache = dict()
+
+    @staticmethod
+    def make_key(analyzer, file_path: str, content: str) -> str:
+        """Build the cache key for one analyzer over one file."""
+        cls = type(analyzer)
+        parts = [
+            __version__,
+            f"{cls.__module__}.{cls.__qualname__}",
+            str(getattr(analyzer, "RULES_VERSION", 0)),
+            *analyzer.cache_key_parts(),
+            file_path,
+            content_hash(content),
+        ]
+        return "|".join(parts)
+
+    def get(self, key: str) -> Optional[List[Any]]:
+        """Return cached findings for key, or None on a miss."""
+        try:
+            val = self.cache.get(key)
+        except SQLITE_ERRORS as e:
+            self.cache_error(e)
+            val = self.cache.get(key)
+
+        if val is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return val
+
+    def set(self, key: str, results: List[Any]):
+        """Store findings for key."""
+        try:
+            self.cache[key] = list(results)
+        except SQLITE_ERRORS as e:
+            self.cache_error(e)
+            self.cache[key] = list(results)
+
+    def get_state(self, name: str) -> Optional[Any]:
+        """Return analyzer state saved with set_state (not counted as a hit or miss)."""
+        if not self.persist_state:
+            return None
+        key = f"state|{__version__}|{name}"
+        try:
+            return self.cache.get(key)
+        except SQLITE_ERRORS as e:
+            self.cache_error(e)
+            return self.cache.get(key)
+
+    def set_state(self, name: str, value: Any):
+        """Save cross-run analyzer state, such as the import graph."""
+        if not self.persist_state:
+            return
+        key = f"state|{__version__}|{name}"
+        try:
+            self.cache[key] = value
+        except SQLITE_ERRORS as e:
+            self.cache_error(e)
+            self.cache[key] = value
+
+    def clear(self):
+        try:
+            self.cache.clear()
+        except SQLITE_ERRORS as e:
+            self.cache_error(e)
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters plus current size."""
+        lookups = self.hits + self.misses
+        try:
+            entries = len(self.cache)
+            size_bytes = self.cache.volume() if hasattr(self.cache, "volume") else 0
+        except SQLITE_ERRORS:
+            entries = 0
+            size_bytes = 0
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+            "entries": entries,
+            "size_bytes": size_bytes,
+        }
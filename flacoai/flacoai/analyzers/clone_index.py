@@ -0,0 +1,325 @@
+"""Cross-file code clone detection with winnowed token fingerprints."""
+
+import re
+import zlib
+from array import array
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .cache import content_hash
+
+# Bump when tokenizing, normalization or fingerprint parameters change
+CLONE_INDEX_VERSION = 1
+
+# Fingerprints are hashes of K_GRAM normalized tokens; winnowing keeps the
+# smallest hash of every WINDOW consecutive ones, so any match of at least
+# K_GRAM + WINDOW - 1 tokens shares a fingerprint
+K_GRAM = 15
+WINDOW = 8
+
+# Shortest clone worth reporting, in tokens (about 5-6 lines of Swift)
+MIN_CLONE_TOKENS = 50
+
+# Fingerprints found in more places than this are boilerplate (imports,
+# common closing braces) and would make matching quadratic; skip them
+MAX_POSTINGS = 64
+
+_MOD = (1 << 61) - 1
+_BASE = 1_000_003
+
+TOKEN_RE = re.compile(
+    r'(?P<space>\s+)'
+    r'|(?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))'
+    r'|(?P<string>"""(?:.|\n)*?(?:"""|\Z)|"(?:\\.|[^"\\\n])*"?|\'(?:\\.|[^\'\\\n])*\'?)'
+    r'|(?P<number>\d[\w.]*)'
+    r'|(?P<word>[@#]?[A-Za-z_$][\w$]*)'
+    r'|(?P<punct>\S)',
+    re.DOTALL,
+)
+
+KEYWORDS = frozenset("""
+    associatedtype break case catch class continue default defer deinit do else enum extension
+    fallthrough false fileprivate final for func guard if import in init inout internal is let
+    nil open operator override private protocol public repeat rethrows return self Self static
+    struct subscript super switch throw throws true try typealias var weak unowned where while
+    async await actor lazy mutating nonmutating some any convenience required dynamic indirect
+    get set willSet didSet new this const function def elif except lambda pass raise yield with
+    not and or None True False package implements interface extends instanceof void null
+""".split())
+
+
+def tokenize(content: str) -> Tuple[List[str], List[int]]:
+    """Split source into normalized tokens for clone matching.
+
+    Identifiers become "$id", literals "$str"/"$num", comments and
+    whitespace are dropped, so copies that only renamed variables or changed
+    constants (Type-2 clones) produce the same stream. Keywords, punctuation
+    and member names after a "." are kept: those are what a copy-paste
+    leaves alone, and keeping them avoids matching unrelated code that
+    merely has the same shape.
+
+    Returns:
+        (tokens, line of each token)
+    """
+    tokens: List[str] = []
+    lines: List[int] = []
+    line = 1
+    previous = ""
+
+    for match in TOKEN_RE.finditer(content):
+        kind = match.lastgroup
+        text = match.group()
+        if kind == "space" or kind == "comment":
+            line += text.count("\n")
+            continue
+
+        if kind == "word":
+            if text in KEYWORDS or text[0] in "@#" or previous == ".":
+                token = text
+            else:
+                token = "$id"
+        elif kind == "string":
+            token = "$str"
+        elif kind == "number":
+            token = "$num"
+        else:
+            token = text
+
+        tokens.append(token)
+        lines.append(line)
+        previous = token
+        if kind == "string":
+            line += text.count("\n")
+
+    return tokens, lines
+
+
+def winnow(tokens: List[str], k: int = K_GRAM, window: int = WINDOW) -> List[Tuple[int, int]]:
+    """Winnowed fingerprints of the token stream.
+
+    Rabin-Karp hashes every k-gram, then keeps the rightmost minimum of each
+    window of consecutive hashes (Schleimer et al., 2003), in one pass.
+
+    Returns:
+        (hash, position of the k-gram's first token) pairs in position order
+    """
+    if len(tokens) < k:
+        return []
+
+    values = [zlib.crc32(token.encode()) for token in tokens]
+    top = pow(_BASE, k - 1, _MOD)
+    h = 0
+    for value in values[:k]:
+        h = (h * _BASE + value) % _MOD
+    hashes = [h]
+    for i in range(k, len(values)):
+        h = ((h - values[i - k] * top) * _BASE + values[i]) % _MOD
+        hashes.append(h)
+
+    if len(hashes) <= window:
+        position = min(range(len(hashes)), key=lambda i: (hashes[i], -i))
+        return [(hashes[position], position)]
+
+    fingerprints = []
+    candidates: deque = deque()  # positions with increasing hashes
+    last = -1
+    for i, h in enumerate(hashes):
+        while candidates and hashes[candidates[-1]] >= h:
+            candidates.pop()
+        candidates.append(i)
+        if candidates[0] <= i - window:
+            candidates.popleft()
+        if i >= window - 1 and candidates[0] != last:
+            last = candidates[0]
+            fingerprints.append((hashes[last], last))
+    return fingerprints
+
+
+@dataclass
+class FileFingerprints:
+    """Winnowed fingerprints of one file, as compact arrays."""
+
+    digest: str
+    hashes: array = field(default_factory=lambda: array("q"))
+    positions: array = field(default_factory=lambda: array("l"))
+    start_lines: array = field(default_factory=lambda: array("l"))
+    end_lines: array = field(default_factory=lambda: array("l"))
+
+    @classmethod
+    def of(cls, content: str, digest: Optional[str] = None) -> "FileFingerprints":
+        tokens, lines = tokenize(content)
+        prints = cls(digest or content_hash(content))
+        for h, position in winnow(tokens):
+            prints.hashes.append(h)
+            prints.positions.append(position)
+            prints.start_lines.append(lines[position])
+            prints.end_lines.append(lines[position + K_GRAM - 1])
+        return prints
+
+
+@dataclass
+class Clone:
+    """A span of one file duplicated elsewhere."""
+
+    file: str
+    start_line: int
+    end_line: int
+    # (file, start line, end line) of each copy
+    copies: List[Tuple[str, int, int]]
+    tokens: int
+
+
+class CloneIndex:
+    """Inverted index from fingerprint to the files containing it.
+
+    Files are added or replaced one at a time (update), so keeping the index
+    current only costs fingerprinting the files that changed; unchanged files
+    are recognized by content hash. Matching a file looks up each of its
+    fingerprints once and chains hits that stay on the same token offset,
+    so the work is linear in the file size plus the number of hits. The
+    index round-trips through to_dict()/from_dict() for persistence.
+    """
+
+    def __init__(self):
+        self._files: Dict[str, FileFingerprints] = {}
+        # fingerprint hash -> [(file, token position, fingerprint index in that file)]
+        self._postings: Dict[int, List[Tuple[str, int, int]]] = defaultdict(list)
+
+    def __contains__(self, file_path: str) -> bool:
+        return file_path in self._files
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def files(self) -> List[str]:
+        return list(self._files)
+
+    def is_current(self, file_path: str, digest: str) -> bool:
+        """Whether file_path is indexed with content matching digest."""
+        prints = self._files.get(file_path)
+        return prints is not None and prints.digest == digest
+
+    def update(self, file_path: str, content: str, digest: Optional[str] = None):
+        """Index file_path, replacing its old fingerprints if its content changed."""
+        digest = digest or content_hash(content)
+        if self.is_current(file_path, digest):
+            return
+        self.remove(file_path)
+        self._add(file_path, FileFingerprints.of(content, digest))
+
+    def remove(self, file_path: str):
+        prints = self._files.pop(file_path, None)
+        if prints is None:
+            return
+        for h in set(prints.hashes):
+            kept = [entry for entry in self._postings[h] if entry[0] != file_path]
+            if kept:
+                self._postings[h] = kept
+            else:
+                del self._postings[h]
+
+    def _add(self, file_path: str, prints: FileFingerprints):
+        self._files[file_path] = prints
+        for index, (h, position) in enumerate(zip(prints.hashes, prints.positions)):
+            self._postings[h].append((file_path, position, index))
+
+    def find_clones(self, file_path: str, min_tokens: int = MIN_CLONE_TOKENS) -> List[Clone]:
+        """Spans of file_path that also appear elsewhere (or later in the same file).
+
+        Returns:
+            Clones sorted by start line; overlapping spans are merged into one
+            clone listing every copy
+        """
+        prints = self._files.get(file_path)
+        if prints is None:
+            return []
+
+        # (other file, token offset) -> [(fingerprint index here, index there)]
+        diagonals: Dict[Tuple[str, int], List[Tuple[int, int]]] = defaultdict(list)
+        for index, (h, position) in enumerate(zip(prints.hashes, prints.positions)):
+            postings = self._postings.get(h, ())
+            if len(postings) > MAX_POSTINGS:
+                continue
+            for other, other_position, other_index in postings:
+                offset = other_position - position
+                if other == file_path and offset <= 0:
+                    continue
+                diagonals[(other, offset)].append((index, other_index))
+
+        # A match of min_tokens tokens holds at least this many fingerprints
+        min_hits = max(1, (min_tokens - K_GRAM + 1) // WINDOW)
+
+        spans = []
+        for (other, offset), hits in diagonals.items():
+            if len(hits) < min_hits:
+                continue
+            other_prints = self._files[other]
+            run = [hits[0]]
+            for hit in hits[1:] + [None]:
+                if hit is not None and prints.positions[hit[0]] - prints.positions[run[-1][0]] <= WINDOW + K_GRAM:
+                    run.append(hit)
+                    continue
+
+                first, last = run[0], run[-1]
+                length = prints.positions[last[0]] + K_GRAM - prints.positions[first[0]]
+                # A copy must not overlap the original
+                if length >= min_tokens and not (other == file_path and offset < length):
+                    spans.append((
+                        prints.start_lines[first[0]],
+                        prints.end_lines[last[0]],
+                        (other, other_prints.start_lines[first[1]], other_prints.end_lines[last[1]]),
+                        length,
+                    ))
+                run = [hit]
+
+        clones: List[Clone] = []
+        for start, end, copy, length in sorted(spans):
+            if clones and start <= clones[-1].end_line:
+                clone = clones[-1]
+                clone.end_line = max(clone.end_line, end)
+                clone.tokens = max(clone.tokens, length)
+                if copy not in clone.copies:
+                    clone.copies.append(copy)
+            else:
+                clones.append(Clone(file_path, start, end, [copy], length))
+        return clones
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": CLONE_INDEX_VERSION,
+            "files": {
+                path: (p.digest, p.hashes, p.positions, p.start_lines, p.end_lines)
+                for path, p in self._files.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "CloneIndex":
+        """Rebuild an index saved by to_dict(); empty if saved by another version."""
+        index = cls()
+        if not isinstance(data, dict) or data.get("version") != CLONE_INDEX_VERSION:
+            return index
+        for path, (digest, hashes, positions, start_lines, end_lines) in data.get("files", {}).items():
+            index._add(path, FileFingerprints(digest, hashes, positions, start_lines, end_lines))
+        return index
+
+
+def find_all_clones(index: CloneIndex, files: Iterable[str]) -> Dict[str, List[Clone]]:
+    """Clones of each of files, each reported only once.
+
+    A clone is reported on the first file (in path order) among files that
+    contain a copy, so a pair of copied files gives one finding, not two.
+    """
+    files = sorted(set(files))
+    analyzed: Set[str] = set(files)
+    results: Dict[str, List[Clone]] = {}
+    for file_path in files:
+        clones = []
+        for clone in index.find_clones(file_path):
+            if any(other < file_path and other in analyzed for other, _, _ in clone.copies):
+                continue
+            clones.append(clone)
+        if clones:
+            results[file_path] = clones
+    return results
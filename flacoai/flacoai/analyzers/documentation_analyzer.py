@@ -3,6 +3,7 @@
 import re
 from typing import List, Dict, Set
 from .base_analyzer import BaseAnalyzer, AnalysisResult, Severity, Category
+from .parsed_source import ParsedSource
 
 
 class DocumentationAnalyzer(BaseAnalyzer):
@@ -34,6 +35,7 @@ class DocumentationAnalyzer(BaseAnalyzer):
         results = []
 
         ext = self.get_file_extension(file_path)
+        content = self.parse_source(file_path, content)
 
         if ext == 'swift':
             results.extend(self._analyze_swift_docs(file_path, content))
@@ -44,7 +46,7 @@ class DocumentationAnalyzer(BaseAnalyzer):
 
         return results
 
-    def _analyze_swift_docs(self, file_path: str, content: str) -> List[AnalysisResult]:
+    def _analyze_swift_docs(self, file_path: str, content: ParsedSource) -> List[AnalysisResult]:
         """Analyze Swift documentation."""
         results = []
 
@@ -64,7 +66,7 @@ class DocumentationAnalyzer(BaseAnalyzer):
 
             for match in matches:
                 name = match.group(2)
-                line_num = content[:match.start()].count('\n') + 1
+                line_num = content.line_of(match.start())
 
                 # Check if documented
                 has_doc = self._has_swift_documentation(content, match.start())
@@ -95,13 +97,13 @@ class DocumentationAnalyzer(BaseAnalyzer):
 
         return results
 
-    def _has_swift_documentation(self, content: str, declaration_pos: int) -> bool:
+    def _has_swift_documentation(self, content: ParsedSource, declaration_pos: int) -> bool:
         """Check if Swift declaration has documentation."""
         # Look backwards for /// comments or /** */ blocks
-        lines_before = content[:declaration_pos].split('\n')
+        lines_before = content.lines_before(declaration_pos, 5)
 
         # Check last few lines
-        for line in reversed(lines_before[-5:]):
+        for line in reversed(lines_before):
             stripped = line.strip()
             if stripped.startswith('///'):
                 return True
@@ -113,7 +115,7 @@ class DocumentationAnalyzer(BaseAnalyzer):
 
         return False
 
-    def _analyze_python_docs(self, file_path: str, content: str) -> List[AnalysisResult]:
+    def _analyze_python_docs(self, file_path: str, content: ParsedSource) -> List[AnalysisResult]:
         """Analyze Python documentation."""
         results = []
 
@@ -133,7 +135,7 @@ class DocumentationAnalyzer(BaseAnalyzer):
                 if name.startswith('_') and not name.startswith('__'):
                     continue
 
-                line_num = content[:match.start()].count('\n') + 1
+                line_num = content.line_of(match.start())
 
                 # Check for docstring
                 has_doc = self._has_python_docstring(content, match.end())
@@ -168,7 +170,7 @@ class DocumentationAnalyzer(BaseAnalyzer):
 
         return False
 
-    def _analyze_js_docs(self, file_path: str, content: str) -> List[AnalysisResult]:
+    def _analyze_js_docs(self, file_path: str, content: ParsedSource) -> List[AnalysisResult]:
         """Analyze JavaScript/TypeScript documentation."""
         results = []
 
@@ -184,7 +186,7 @@ class DocumentationAnalyzer(BaseAnalyzer):
 
             for match in matches:
                 name = match.group(1)
-                line_num = content[:match.start()].count('\n') + 1
+                line_num = content.line_of(match.start())
 
                 # Check for JSDoc
                 has_doc = self._has_jsdoc(content, match.start())
@@ -208,11 +210,11 @@ class DocumentationAnalyzer(BaseAnalyzer):
 
         return results
 
-    def _has_jsdoc(self, content: str, declaration_pos: int) -> bool:
+    def _has_jsdoc(self, content: ParsedSource, declaration_pos: int) -> bool:
         """Check if declaration has JSDoc."""
-        lines_before = content[:declaration_pos].split('\n')
+        lines_before = content.lines_before(declaration_pos, 5)
 
-        for line in reversed(lines_before[-5:]):
+        for line in reversed(lines_before):
             stripped = line.strip()
             if '/**' in stripped:
                 return True
@@ -221,7 +223,7 @@ class DocumentationAnalyzer(BaseAnalyzer):
 
         return False
 
-    def _check_todos(self, file_path: str, content: str) -> List[AnalysisResult]:
+    def _check_todos(self, file_path: str, content: ParsedSource) -> List[AnalysisResult]:
         """Check for TODO/FIXME comments."""
         results = []
 
@@ -238,8 +240,8 @@ class DocumentationAnalyzer(BaseAnalyzer):
             matches = list(re.finditer(pattern, content, re.IGNORECASE))
 
             for match in matches:
-                line_num = content[:match.start()].count('\n') + 1
-                line = content.split('\n')[line_num - 1]
+                line_num = content.line_of(match.start())
+                line = content.lines[line_num - 1]
 
                 # Check if it has a description after the marker
                 after_marker = line[match.end():].strip()
@@ -261,7 +263,7 @@ class DocumentationAnalyzer(BaseAnalyzer):
 
         return results
 
-    def _check_doc_quality_swift(self, file_path: str, content: str) -> List[AnalysisResult]:
+    def _check_doc_quality_swift(self, file_path: str, content: ParsedSource) -> List[AnalysisResult]:
         """Check quality of existing Swift documentation."""
         results = []
 
@@ -271,7 +273,7 @@ class DocumentationAnalyzer(BaseAnalyzer):
 
         for match in matches:
             doc_text = match.group(1).strip()
-            line_num = content[:match.start()].count('\n') + 1
+            line_num = content.line_of(match.start())
 
             # Check for too short docs
             if len(doc_text) < 15 and not doc_text.startswith('-'):
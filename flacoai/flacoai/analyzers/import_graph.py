@@ -0,0 +1,425 @@
+"""File-level import graph with incremental strongly connected components."""
+
+import posixpath
+from collections import deque
+from typing import Callable, Dict, FrozenSet, Hashable, Iterable, List, Optional, Set
+
+# Bump when the snapshot layout or module resolution changes
+IMPORT_GRAPH_VERSION = 1
+
+# Above this share of changed files a full Tarjan pass is cheaper than
+# updating components one file at a time
+FULL_REBUILD_RATIO = 0.05
+MIN_FULL_REBUILD = 64
+
+_SOURCE_EXTENSIONS = ("py", "js", "jsx", "ts", "tsx", "mjs", "cjs", "java", "kt")
+
+
+def strongly_connected_components(
+    nodes: Iterable[Hashable],
+    successors: Callable[[Hashable], Iterable[Hashable]],
+) -> List[List[Hashable]]:
+    """Tarjan's algorithm without recursion, so deep import chains are safe.
+
+    Args:
+        nodes: Nodes to visit
+        successors: Function returning a node's outgoing neighbours; neighbours
+            not in nodes are ignored
+
+    Returns:
+        Components in reverse topological order, each a list of nodes
+    """
+    nodes = list(nodes)
+    members = set(nodes)
+    index: Dict[Hashable, int] = {}
+    lowlink: Dict[Hashable, int] = {}
+    on_stack: Set[Hashable] = set()
+    stack: List[Hashable] = []
+    components: List[List[Hashable]] = []
+    counter = 0
+
+    for root in nodes:
+        if root in index:
+            continue
+
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(successors(root)))]
+
+        while work:
+            node, neighbours = work[-1]
+            descended = False
+            for neighbour in neighbours:
+                if neighbour not in members:
+                    continue
+                if neighbour not in index:
+                    index[neighbour] = lowlink[neighbour] = counter
+                    counter += 1
+                    stack.append(neighbour)
+                    on_stack.add(neighbour)
+                    work.append((neighbour, iter(successors(neighbour))))
+                    descended = True
+                    break
+                if neighbour in on_stack:
+                    lowlink[node] = min(lowlink[node], index[neighbour])
+            if descended:
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+            if lowlink[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+
+    return components
+
+
+def module_keys(file_path: str) -> List[str]:
+    """Names other files can use to import file_path.
+
+    Python, Java and Kotlin files are known by every dotted suffix of their
+    path ("pkg/sub/mod.py" is "pkg.sub.mod", "sub.mod" and "mod"; a package
+    __init__ is its directory). JavaScript/TypeScript files are known by
+    their path without extension, and index files also by their directory.
+    """
+    path = file_path.replace("\\", "/")
+    stem, _, ext = path.rpartition(".")
+    if not stem or ext not in _SOURCE_EXTENSIONS:
+        return []
+
+    if ext in ("py", "java", "kt"):
+        parts = [part for part in stem.split("/") if part and part != "."]
+        if parts and parts[-1] == "__init__":
+            parts.pop()
+        return [".".join(parts[i:]) for i in range(len(parts))]
+
+    stem = posixpath.normpath(stem)
+    keys = ["/" + stem.lstrip("/")]
+    if posixpath.basename(stem) == "index":
+        keys.append("/" + posixpath.dirname(stem).lstrip("/"))
+    return keys
+
+
+def resolve_target(file_path: str, target: str) -> Optional[str]:
+    """Turn an import as written in file_path into a lookup key for module_keys.
+
+    Relative imports ("./util", "..models") are resolved against the
+    importing file; absolute names are returned unchanged. Returns None for
+    imports that can never name a file in the repo.
+    """
+    path = file_path.replace("\\", "/")
+    if target.startswith("./") or target.startswith("../"):
+        joined = posixpath.normpath(posixpath.join(posixpath.dirname(path), target))
+        stem, dot, ext = joined.rpartition(".")
+        if dot and ext in _SOURCE_EXTENSIONS:
+            joined = stem
+        return "/" + joined.lstrip("/")
+
+    if target.startswith("."):
+        level = len(target) - len(target.lstrip("."))
+        package = [part for part in posixpath.dirname(path).split("/") if part and part != "."]
+        if level - 1 > len(package):
+            return None
+        if level > 1:
+            package = package[: len(package) - (level - 1)]
+        rest = target[level:]
+        return ".".join(package + ([rest] if rest else [])) or None
+
+    return target or None
+
+
+class ImportGraph:
+    """Which repo files import which, with its import cycles.
+
+    Files are added with the imports they contain (as written in the file);
+    those are resolved to other files in the graph by module name or
+    relative path, and ambiguous names are ignored. Cycles are kept as
+    strongly connected components. After the first full pass, changing one
+    file's imports only revisits the component(s) that file belongs to, so
+    re-running over a large repo where few files changed is cheap. The graph
+    round-trips through to_dict()/from_dict() for persistence.
+    """
+
+    def __init__(self):
+        self._targets: Dict[str, FrozenSet[str]] = {}
+        # lookup key -> files known by that key
+        self._modules: Dict[str, Set[str]] = {}
+        # lookup key -> files whose imports use that key
+        self._dependents: Dict[str, Set[str]] = {}
+        self._edges: Dict[str, Set[str]] = {}
+        self._reverse: Dict[str, Set[str]] = {}
+
+        # file -> component id; only maintained once _components_ready
+        self._component: Dict[str, int] = {}
+        self._members: Dict[int, Set[str]] = {}
+        self._next_component = 0
+        self._components_ready = False
+        self._changed: Set[str] = set()
+
+        self.full_rebuilds = 0
+        self.incremental_updates = 0
+
+    def __contains__(self, file_path: str) -> bool:
+        return file_path in self._targets
+
+    def __len__(self) -> int:
+        return len(self._targets)
+
+    def files(self) -> List[str]:
+        return list(self._targets)
+
+    def edges(self, file_path: str) -> Set[str]:
+        """Files that file_path imports."""
+        return set(self._edges.get(file_path, ()))
+
+    def update(self, file_path: str, targets: Iterable[str]):
+        """Add a file, or replace its imports.
+
+        Args:
+            file_path: Path of the importing file
+            targets: Imports as written in the file (module names or relative paths)
+        """
+        targets = frozenset(targets)
+        is_new = file_path not in self._targets
+        if not is_new and self._targets[file_path] == targets:
+            return
+
+        for key in self._lookup_keys(file_path, self._targets.get(file_path, ())):
+            self._discard(self._dependents, key, file_path)
+        self._targets[file_path] = targets
+        for key in self._lookup_keys(file_path, targets):
+            self._dependents.setdefault(key, set()).add(file_path)
+
+        if is_new:
+            self._edges[file_path] = set()
+            self._reverse.setdefault(file_path, set())
+            if self._components_ready:
+                self._add_component({file_path})
+            for key in module_keys(file_path):
+                self._modules.setdefault(key, set()).add(file_path)
+                self._reresolve(key)
+
+        self._set_edges(file_path, self._resolve(file_path))
+
+    def remove(self, file_path: str):
+        """Drop a file and every import edge into or out of it."""
+        if file_path not in self._targets:
+            return
+
+        self._set_edges(file_path, set())
+        for key in self._lookup_keys(file_path, self._targets[file_path]):
+            self._discard(self._dependents, key, file_path)
+        for key in module_keys(file_path):
+            self._discard(self._modules, key, file_path)
+            self._reresolve(key)
+
+        del self._targets[file_path]
+        del self._edges[file_path]
+        self._reverse.pop(file_path, None)
+        self._changed.discard(file_path)
+        if self._components_ready:
+            self._split(self._members.pop(self._component.pop(file_path)) - {file_path})
+
+    def cycles(self) -> List[List[str]]:
+        """Import cycles, one per strongly connected component of 2+ files.
+
+        Returns:
+            Sorted list of components, each a sorted list of files
+        """
+        self._refresh()
+        cycles = [sorted(members) for members in self._members.values() if len(members) > 1]
+        return sorted(cycles)
+
+    def cycle_path(self, component: Iterable[str]) -> List[str]:
+        """A shortest import cycle through the component's first file.
+
+        Returns:
+            Files along the cycle, starting and ending with the same file
+        """
+        members = set(component)
+        start = min(members)
+        parents: Dict[str, str] = {}
+        queue = deque([start])
+
+        while queue:
+            node = queue.popleft()
+            for neighbour in sorted(self._edges.get(node, ())):
+                if neighbour == start:
+                    path = [start]
+                    while node != start:
+                        path.append(node)
+                        node = parents[node]
+                    path.append(start)
+                    path[1:-1] = reversed(path[1:-1])
+                    return path
+                if neighbour in members and neighbour not in parents:
+                    parents[neighbour] = node
+                    queue.append(neighbour)
+
+        return [start]
+
+    def to_dict(self) -> Dict:
+        """Snapshot of the files, their imports and the current components."""
+        self._refresh()
+        return {
+            "version": IMPORT_GRAPH_VERSION,
+            "files": {path: sorted(targets) for path, targets in self._targets.items()},
+            "components": [
+                sorted(members) for members in self._members.values() if len(members) > 1
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ImportGraph":
+        """Rebuild a graph saved by to_dict() without recomputing its components.
+
+        Returns an empty graph if the snapshot is from another version.
+        """
+        graph = cls()
+        if not isinstance(data, dict) or data.get("version") != IMPORT_GRAPH_VERSION:
+            return graph
+
+        for file_path, targets in data.get("files", {}).items():
+            graph.update(file_path, targets)
+
+        # Trust the saved components: only files changed after this point
+        # need their components revisited
+        graph._component.clear()
+        graph._members.clear()
+        for members in data.get("components", []):
+            graph._add_component({path for path in members if path in graph._targets})
+        for file_path in graph._targets:
+            if file_path not in graph._component:
+                graph._add_component({file_path})
+        graph._components_ready = True
+        graph._changed.clear()
+        return graph
+
+    # Resolution
+
+    def _lookup_keys(self, file_path: str, targets: Iterable[str]) -> Set[str]:
+        keys = set()
+        for target in targets:
+            key = resolve_target(file_path, target)
+            if key:
+                keys.add(key)
+        return keys
+
+    def _resolve(self, file_path: str) -> Set[str]:
+        edges = set()
+        for key in self._lookup_keys(file_path, self._targets[file_path]):
+            candidates = self._modules.get(key, ())
+            if len(candidates) == 1:
+                (target,) = candidates
+                if target != file_path:
+                    edges.add(target)
+        return edges
+
+    def _reresolve(self, key: str):
+        """Re-resolve the importers of key after the files known by it changed."""
+        for importer in list(self._dependents.get(key, ())):
+            if importer in self._targets:
+                self._set_edges(importer, self._resolve(importer))
+
+    @staticmethod
+    def _discard(index: Dict[str, Set[str]], key: str, value: str):
+        values = index.get(key)
+        if values is not None:
+            values.discard(value)
+            if not values:
+                del index[key]
+
+    def _set_edges(self, file_path: str, edges: Set[str]):
+        old = self._edges.get(file_path, set())
+        if edges == old:
+            return
+        for target in old - edges:
+            self._reverse[target].discard(file_path)
+        for target in edges - old:
+            self._reverse.setdefault(target, set()).add(file_path)
+        self._edges[file_path] = edges
+        self._changed.add(file_path)
+
+    # Components
+
+    def _add_component(self, members: Set[str]) -> int:
+        component = self._next_component
+        self._next_component += 1
+        self._members[component] = members
+        for member in members:
+            self._component[member] = component
+        return component
+
+    def _refresh(self):
+        if not self._changed and self._components_ready:
+            return
+
+        threshold = max(MIN_FULL_REBUILD, int(len(self._targets) * FULL_REBUILD_RATIO))
+        if not self._components_ready or len(self._changed) > threshold:
+            self._rebuild()
+        else:
+            for file_path in sorted(self._changed):
+                if file_path in self._targets:
+                    self._update_component(file_path)
+                    self.incremental_updates += 1
+        self._changed.clear()
+
+    def _rebuild(self):
+        self._component.clear()
+        self._members.clear()
+        for members in strongly_connected_components(self._targets, self._edges.__getitem__):
+            self._add_component(set(members))
+        self._components_ready = True
+        self.full_rebuilds += 1
+
+    def _update_component(self, file_path: str):
+        """Fix up components after file_path's outgoing edges changed.
+
+        Any new cycle must pass through file_path, and a removed edge can only
+        split the component file_path was in. So: split the old component
+        with Tarjan over just its members, then merge everything that both
+        reaches and is reached from file_path.
+        """
+        self._split(self._members.pop(self._component[file_path]))
+
+        forward = self._reachable(file_path, self._edges, None)
+        merged = self._reachable(file_path, self._reverse, forward)
+        if len(merged) > 1:
+            absorbed = {self._component[member] for member in merged}
+            leftovers = set()
+            for component in absorbed:
+                leftovers |= self._members.pop(component) - merged
+            self._add_component(merged)
+            # What is left of a partly absorbed component may no longer be
+            # strongly connected
+            self._split(leftovers)
+
+    def _split(self, members: Set[str]):
+        """Replace the components of members by the SCCs among just them."""
+        for component in strongly_connected_components(sorted(members), self._edges.__getitem__):
+            self._add_component(set(component))
+
+    @staticmethod
+    def _reachable(
+        start: str, adjacency: Dict[str, Set[str]], within: Optional[Set[str]]
+    ) -> Set[str]:
+        seen = {start}
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            for neighbour in adjacency.get(node, ()):
+                if neighbour not in seen and (within is None or neighbour in within):
+                    seen.add(neighbour)
+                    stack.append(neighbour)
+        return seen
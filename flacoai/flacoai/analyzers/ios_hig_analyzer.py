@@ -56,7 +56,7 @@ class IOSHIGAnalyzer(BaseAnalyzer):
                     height = int(match.group(2))
 
                     # Check if this is a Button or interactive element
-                    line_num = content[:match.start()].count('\n') + 1
+                    line_num = self.line_index(content).line_of(match.start())
                     line_start = content.rfind('\n', 0, match.start()) + 1
                     line_end = content.find('\n', match.end())
                     if line_end == -1:
@@ -105,7 +105,7 @@ class IOSHIGAnalyzer(BaseAnalyzer):
             tab_count = tab_content.count('.tag(') or tab_content.count('TabItem')
 
             if tab_count > 5:
-                line_num = content[:match.start()].count('\n') + 1
+                line_num = self.line_index(content).line_of(match.start())
                 code_snippet = self.get_lines_context(content, line_num, context_lines=1)
 
                 result = AnalysisResult(
@@ -173,7 +173,7 @@ class IOSHIGAnalyzer(BaseAnalyzer):
                     if value not in self.standard_spacing and value > 0 and value < 50:
                         # Only flag if it's not a multiple of 4 (8-point grid)
                         if value % 4 != 0:
-                            line_num = content[:match.start()].count('\n') + 1
+                            line_num = self.line_index(content).line_of(match.start())
                             code_snippet = self.get_lines_context(content, line_num, context_lines=1)
 
                             result = AnalysisResult(
@@ -222,7 +222,7 @@ class IOSHIGAnalyzer(BaseAnalyzer):
         matches = list(re.finditer(semantic_pattern, content))
 
         for match in matches:
-            line_num = content[:match.start()].count('\n') + 1
+            line_num = self.line_index(content).line_of(match.start())
             code_snippet = self.get_lines_context(content, line_num, context_lines=1)
 
             result = AnalysisResult(
@@ -251,7 +251,7 @@ class IOSHIGAnalyzer(BaseAnalyzer):
         for match in matches:
             try:
                 size = int(match.group(1))
-                line_num = content[:match.start()].count('\n') + 1
+                line_num = self.line_index(content).line_of(match.start())
 
                 # Suggest using text styles instead
                 suggested_style = self._suggest_text_style(size)
@@ -292,7 +292,7 @@ class IOSHIGAnalyzer(BaseAnalyzer):
             action_count = alert_content.count('Button(')
 
             if action_count > 3:
-                line_num = content[:match.start()].count('\n') + 1
+                line_num = self.line_index(content).line_of(match.start())
                 code_snippet = self.get_lines_context(content, line_num, context_lines=2)
 
                 result = AnalysisResult(
@@ -205,7 +205,7 @@ class IOSSymbolsAnalyzer(BaseAnalyzer):
 
             for match in matches:
                 symbol_name = match.group(1)
-                line_num = content[:match.start()].count('\n') + 1
+                line_num = self.line_index(content).line_of(match.start())
 
                 # Check if symbol name looks valid (matches common patterns)
                 is_valid = any(re.match(p, symbol_name) for p in self.valid_symbol_patterns)
@@ -239,7 +239,7 @@ class IOSSymbolsAnalyzer(BaseAnalyzer):
             if deprecated in content:
                 # Find exact occurrences
                 for match in re.finditer(re.escape(deprecated), content):
-                    line_num = content[:match.start()].count('\n') + 1
+                    line_num = self.line_index(content).line_of(match.start())
                     code_snippet = self.get_lines_context(content, line_num, context_lines=1)
 
                     result = AnalysisResult(
@@ -275,7 +275,7 @@ class IOSSymbolsAnalyzer(BaseAnalyzer):
 
                 # Check if it's a common mistake
                 if name in self.common_mistakes:
-                    line_num = content[:match.start()].count('\n') + 1
+                    line_num = self.line_index(content).line_of(match.start())
                     code_snippet = self.get_lines_context(content, line_num, context_lines=1)
 
                     result = AnalysisResult(
@@ -77,7 +77,7 @@ class IOSVersionAnalyzer(BaseAnalyzer):
 
             for line_num, column, matched_text in matches:
                 # Skip if it's in a comment
-                line = content.split('\n')[line_num - 1]
+                line = self.line_index(content).lines[line_num - 1]
                 if '//' in line and line.index('//') < column:
                     continue
 
@@ -125,7 +125,7 @@ class IOSVersionAnalyzer(BaseAnalyzer):
 
                 for line_num in line_nums[:3]:  # Limit to 3 per API
                     # Check if this specific usage has an availability check nearby
-                    context_lines = content.split('\n')[max(0, line_num-5):line_num]
+                    context_lines = self.line_index(content).lines[max(0, line_num-5):line_num]
                     has_local_check = any('@available' in line or '#available' in line
                                          for line in context_lines)
 
@@ -156,7 +156,7 @@ class IOSVersionAnalyzer(BaseAnalyzer):
 
         for match in matches:
             availability_text = match.group(1)
-            line_num = content[:match.start()].count('\n') + 1
+            line_num = self.line_index(content).line_of(match.start())
 
             # Check for common mistakes
             issues = []
@@ -204,7 +204,7 @@ class IOSVersionAnalyzer(BaseAnalyzer):
 
         for match in matches:
             version = match.group(1)
-            line_num = content[:match.start()].count('\n') + 1
+            line_num = self.line_index(content).line_of(match.start())
 
             # Parse version
             try:
@@ -0,0 +1,452 @@
+"""Parsed view of a source file, built once and shared by every analyzer.
+
+Analyzers used to re-derive the same facts from raw content on every file:
+line splits, comment and string positions, brace nesting and function
+boundaries. ParsedSource computes each of these lazily, at most once per
+file, and because it *is* a str, it can be passed to any existing
+``analyze_file(file_path, content)`` unchanged.
+"""
+
+import re
+import warnings
+from bisect import bisect_right
+from collections import namedtuple
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .rule_engine import LineIndex
+
+Span = namedtuple("Span", "kind name start end start_line end_line")
+
+# Languages whose comments and strings follow C conventions, and which
+# delimit blocks with braces
+BRACE_LANGUAGES = {
+    "swift", "m", "mm", "h", "c", "cc", "cpp", "hpp", "java", "kt", "kts",
+    "js", "jsx", "ts", "tsx", "go", "rs", "cs", "scala", "php", "dart",
+}
+
+# Languages with # comments and indentation (or keyword) delimited blocks
+HASH_COMMENT_LANGUAGES = {"py", "rb", "sh", "bash", "pl", "yaml", "yml", "toml"}
+
+# Tree-sitter node types that are named functions or anonymous closures
+FUNCTION_NODE_TYPES = {
+    "function_definition", "function_declaration", "function_item",
+    "method_definition", "method_declaration", "constructor_declaration",
+    "init_declaration", "deinit_declaration", "subscript_declaration",
+}
+CLOSURE_NODE_TYPES = {
+    "lambda", "lambda_literal", "lambda_expression", "closure_expression",
+    "arrow_function", "function_expression", "anonymous_function", "func_literal",
+}
+# Tree-sitter node types that are classes and other named type bodies
+CLASS_NODE_TYPES = {
+    "class_definition", "class_declaration", "struct_declaration", "struct_item",
+    "enum_declaration", "interface_declaration", "protocol_declaration", "impl_item",
+    "object_declaration", "trait_item",
+}
+_SPAN_KINDS = {
+    **{node_type: "class" for node_type in CLASS_NODE_TYPES},
+    **{node_type: "closure" for node_type in CLOSURE_NODE_TYPES},
+    **{node_type: "function" for node_type in FUNCTION_NODE_TYPES},
+}
+
+_BLANK = re.compile(r"[^\n]")
+_BRACES = re.compile(r"[{}]")
+
+_C_COMMENT = r"(?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))"
+_HASH_COMMENT = r"(?P<comment>#[^\n]*)"
+_TRIPLE_STRING = r'"""(?:\\.|[^\\])*?(?:"""|\Z)'
+_DOUBLE_STRING = r'"(?:\\.|[^"\\\n])*"'
+_SINGLE_STRING = r"'(?:\\.|[^'\\\n])*'"
+_TEMPLATE_STRING = r"`(?:\\.|[^`\\])*(?:`|\Z)"
+_PY_STRING = (
+    r"(?:(?<!\w)[rRbBuUfF]{1,2})?(?:'''(?:\\.|[^\\])*?(?:'''|\Z)|"
+    + "|".join((_TRIPLE_STRING, _DOUBLE_STRING, _SINGLE_STRING)) + ")"
+)
+
+
+def _token_pattern(language: str) -> Optional[re.Pattern]:
+    if language == "py":
+        strings = _PY_STRING
+    elif language in ("swift", "kt", "kts"):
+        # No single-quoted strings; ' would swallow the rest of the line
+        strings = _TRIPLE_STRING + "|" + _DOUBLE_STRING
+    elif language == "rs":
+        # 'a is a lifetime, not the start of a string
+        strings = _DOUBLE_STRING
+    elif language in ("js", "jsx", "ts", "tsx", "go"):
+        strings = "|".join((_DOUBLE_STRING, _SINGLE_STRING, _TEMPLATE_STRING))
+    else:
+        strings = _DOUBLE_STRING + "|" + _SINGLE_STRING
+
+    if language in BRACE_LANGUAGES:
+        comment = _C_COMMENT
+    elif language in HASH_COMMENT_LANGUAGES:
+        comment = _HASH_COMMENT
+    else:
+        return None
+    return re.compile(f"{comment}|(?P<string>{strings})", re.DOTALL)
+
+
+_TOKEN_PATTERNS = {}
+
+
+def token_pattern(language: str) -> Optional[re.Pattern]:
+    """Compiled comment/string tokenizer for a language, or None if unknown."""
+    if language not in _TOKEN_PATTERNS:
+        _TOKEN_PATTERNS[language] = _token_pattern(language)
+    return _TOKEN_PATTERNS[language]
+
+
+# Function headers used when no tree-sitter grammar is available. The name
+# is in group 1 where the language has one.
+_FUNCTION_HEADERS = {
+    "swift": r"\bfunc\s+([^\s(<]+)|\b(init|deinit|subscript)\b[?!]?\s*[(<{]",
+    "kt": r"\bfun\s+(?:<[^>]*>\s*)?(?:[\w.]+\.)?(\w+)",
+    "go": r"\bfunc\s+(?:\([^)]*\)\s*)?(\w+)",
+    "rs": r"\bfn\s+(\w+)",
+    "js": r"\bfunction\b\s*\*?\s*(\w*)",
+    "php": r"\bfunction\s+&?(\w+)",
+    "scala": r"\bdef\s+(\w+)",
+}
+_FUNCTION_HEADERS.update(kts=_FUNCTION_HEADERS["kt"], jsx=_FUNCTION_HEADERS["js"],
+                         ts=_FUNCTION_HEADERS["js"], tsx=_FUNCTION_HEADERS["js"])
+
+# C-family methods: an identifier, a parameter list, then a body
+_C_FUNCTION_HEADER = (
+    r"\b(?!(?:if|for|while|switch|catch|return|else|do|try|using|lock|foreach|"
+    r"synchronized|sizeof|new)\b)([A-Za-z_]\w*)\s*\([^;{}()]*(?:\([^;{}()]*\)[^;{}()]*)*\)"
+    r"\s*(?:const\s*)?(?:throws\s+[\w.,\s]+)?(?=\{)"
+)
+
+# '.isOn {' on an if/guard/while line opens a block, not a trailing closure
+_CONTROL_LINE = re.compile(r"\s*\}?\s*(?:else\s+)?(?:if|guard|while|for|switch)\b")
+
+_PY_FUNCTION = re.compile(r"^([ \t]*)(?:async[ \t]+)?def[ \t]+(\w+)", re.MULTILINE)
+_PY_CLASS = re.compile(r"^([ \t]*)class[ \t]+(\w+)", re.MULTILINE)
+
+# Type declarations in brace languages; 'class func' and the like are members
+_CLASS_HEADER = re.compile(
+    r"\b(?:class|struct|enum|actor|interface|protocol|object|trait)\s+(?!(?:func|var|let)\b)(\w+)"
+)
+_PY_LAMBDA = re.compile(r"\blambda\b[^\n]*")
+
+# Closure openers; each match ends just past the closure's opening brace
+_CLOSURE_HEADERS = {
+    # { [weak self] (a, b) -> T in ... } and trailing closures: .onAppear { ... }
+    "swift": r"\{(?=\s*(?:\[[^\]\n]*\]\s*)?(?:\([^)\n]*\)|[\w\s,]*?)\s*(?:throws\s*)?"
+             r"(?:->\s*[^{}\n]+?\s*)?\bin\b)|\.\w+\s*(?:\([^()\n]*\))?\s*\{",
+    "kt": r"\{(?=\s*[A-Za-z_][\w\s,:<>?]*->)",
+    "js": r"=>\s*\{",
+}
+_CLOSURE_HEADERS.update(kts=_CLOSURE_HEADERS["kt"], jsx=_CLOSURE_HEADERS["js"],
+                        ts=_CLOSURE_HEADERS["js"], tsx=_CLOSURE_HEADERS["js"])
+
+# Tree-sitter parsers by language name; None once a grammar failed to load
+_PARSERS: Dict[str, Any] = {}
+
+
+def _get_parser(lang: str):
+    if lang not in _PARSERS:
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", category=FutureWarning)
+                from grep_ast.tsl import get_parser
+
+                _PARSERS[lang] = get_parser(lang)
+        except Exception:
+            _PARSERS[lang] = None
+    return _PARSERS[lang]
+
+
+class ParsedSource(str):
+    """A file's content plus lazily computed structure.
+
+    Every derived view (line index, comment/string masks, function and
+    closure spans, tree-sitter AST) is computed on first access and then
+    reused by all analyzers that receive the same object.
+    """
+
+    def __new__(cls, content: str, path: str = ""):
+        source = super().__new__(cls, content)
+        source.path = path
+        return source
+
+    def __reduce__(self):
+        # Send only the text to worker processes; derived views are rebuilt lazily
+        return (ParsedSource, (str(self), self.path))
+
+    @classmethod
+    def of(cls, content: str, path: str = "") -> "ParsedSource":
+        """Wrap content, reusing it if it is already a ParsedSource."""
+        if isinstance(content, ParsedSource):
+            return content
+        return cls(content, path)
+
+    @cached_property
+    def language(self) -> str:
+        """Lowercase file extension, used to pick comment and block syntax."""
+        return Path(self.path).suffix.lstrip(".").lower()
+
+    # Lines
+
+    @cached_property
+    def line_index(self) -> LineIndex:
+        return LineIndex(self)
+
+    @property
+    def lines(self) -> List[str]:
+        """Lines of the file, split on newline."""
+        return self.line_index.lines
+
+    def line_of(self, offset: int) -> int:
+        """1-indexed line number containing offset."""
+        return self.line_index.line_of(offset)
+
+    def lines_before(self, offset: int, count: int) -> List[str]:
+        """The last count lines up to offset, the final one cut at offset.
+
+        Same as ``content[:offset].split('\\n')[-count:]`` without copying
+        everything before offset.
+        """
+        line_num = self.line_of(offset)
+        head = self[self.line_index.line_start(line_num):offset]
+        return self.lines[max(0, line_num - count):line_num - 1] + [head]
+
+    # Comments and strings
+
+    @cached_property
+    def _tokens(self) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+        comments = []
+        strings = []
+        pattern = token_pattern(self.language)
+        if pattern is not None:
+            for match in pattern.finditer(self):
+                spans = comments if match.lastgroup == "comment" else strings
+                spans.append(match.span())
+        return comments, strings
+
+    @property
+    def comment_spans(self) -> List[Tuple[int, int]]:
+        """(start, end) offsets of every comment, in order."""
+        return self._tokens[0]
+
+    @property
+    def string_spans(self) -> List[Tuple[int, int]]:
+        """(start, end) offsets of every string literal, in order."""
+        return self._tokens[1]
+
+    @staticmethod
+    def _in_spans(spans: List[Tuple[int, int]], offset: int) -> bool:
+        i = bisect_right(spans, (offset, float("inf"))) - 1
+        return i >= 0 and spans[i][0] <= offset < spans[i][1]
+
+    def in_comment(self, offset: int) -> bool:
+        return self._in_spans(self.comment_spans, offset)
+
+    def in_string(self, offset: int) -> bool:
+        return self._in_spans(self.string_spans, offset)
+
+    def is_code(self, offset: int) -> bool:
+        """Whether offset is outside every comment and string literal."""
+        return not (self.in_comment(offset) or self.in_string(offset))
+
+    @cached_property
+    def code(self) -> str:
+        """Content with comments and strings blanked to spaces.
+
+        Offsets and line breaks are preserved, so positions found in code
+        are valid positions in the original content.
+        """
+        spans = sorted(self.comment_spans + self.string_spans)
+        if not spans:
+            return str(self)
+
+        pieces = []
+        pos = 0
+        for start, end in spans:
+            pieces.append(self[pos:start])
+            pieces.append(_BLANK.sub(" ", self[start:end]))
+            pos = end
+        pieces.append(self[pos:])
+        return "".join(pieces)
+
+    # Blocks
+
+    def block_end(self, start: int) -> int:
+        """Find the end of the brace block whose opening brace precedes start.
+
+        Braces inside comments and strings are ignored.
+
+        Args:
+            start: Offset just past the opening '{'
+
+        Returns:
+            Offset just past the matching '}', or len(self) if unbalanced
+        """
+        depth = 1
+        for match in _BRACES.finditer(self.code, start):
+            depth += 1 if match.group() == "{" else -1
+            if depth == 0:
+                return match.end()
+        return len(self)
+
+    # Functions and closures
+
+    @property
+    def functions(self) -> List[Span]:
+        """Named function and method spans, in source order."""
+        return [span for span in self._spans if span.kind == "function"]
+
+    @property
+    def closures(self) -> List[Span]:
+        """Anonymous function, lambda and closure spans, in source order."""
+        return [span for span in self._spans if span.kind == "closure"]
+
+    @property
+    def classes(self) -> List[Span]:
+        """Class, struct, enum and other type body spans, in source order."""
+        return [span for span in self._spans if span.kind == "class"]
+
+    def enclosing_function(self, offset: int) -> Optional[Span]:
+        """Innermost named function containing offset, if any."""
+        best = None
+        for span in self.functions:
+            if span.start <= offset < span.end:
+                best = span
+            elif span.start > offset:
+                break
+        return best
+
+    @cached_property
+    def _spans(self) -> List[Span]:
+        spans = None
+        if self.tree is not None:
+            try:
+                spans = self._tree_spans()
+            except Exception:
+                spans = None
+        if spans is None:
+            if self.language == "py":
+                spans = self._indent_spans()
+            elif self.language in BRACE_LANGUAGES:
+                spans = self._brace_spans()
+            else:
+                spans = []
+        spans.sort(key=lambda span: (span.start, -span.end))
+        return spans
+
+    def _span(self, kind: str, name: str, start: int, end: int) -> Span:
+        return Span(kind, name, start, end, self.line_of(start), self.line_of(max(start, end - 1)))
+
+    def _brace_spans(self) -> List[Span]:
+        code = self.code
+        spans = []
+
+        header = _FUNCTION_HEADERS.get(self.language, _C_FUNCTION_HEADER)
+        headers = list(re.finditer(header, code))
+        for i, match in enumerate(headers):
+            # The body is the first brace after the header, unless a ';' or
+            # '}' (a declaration without a body) or the next header comes first
+            limit = headers[i + 1].start() if i + 1 < len(headers) else len(code)
+            opener = re.compile(r"[{};]").search(code, match.end(), limit)
+            if not opener or opener.group() != "{":
+                continue
+            name = next((g for g in match.groups() if g), "")
+            spans.append(self._span("function", name, match.start(), self.block_end(opener.end())))
+
+        for match in _CLASS_HEADER.finditer(code):
+            opener = re.compile(r"[{};]").search(code, match.end())
+            if opener and opener.group() == "{":
+                spans.append(
+                    self._span("class", match.group(1), match.start(), self.block_end(opener.end()))
+                )
+
+        closure = _CLOSURE_HEADERS.get(self.language)
+        if closure:
+            for match in re.finditer(closure, code):
+                if match.group().startswith("."):
+                    line_start = code.rfind("\n", 0, match.start()) + 1
+                    if _CONTROL_LINE.match(code, line_start, match.start()):
+                        continue
+                brace = code.rfind("{", match.start(), match.end())
+                brace = brace if brace != -1 else match.start()
+                spans.append(self._span("closure", "", brace, self.block_end(brace + 1)))
+
+        return spans
+
+    def _indent_spans(self) -> List[Span]:
+        code = self.code
+        code_lines = code.split("\n")
+        spans = []
+
+        for kind, pattern in (("function", _PY_FUNCTION), ("class", _PY_CLASS)):
+            for match in pattern.finditer(code):
+                end = self._indent_block_end(code_lines, match)
+                spans.append(self._span(kind, match.group(2), match.start(), end))
+
+        for match in _PY_LAMBDA.finditer(code):
+            spans.append(self._span("closure", "", match.start(), match.end()))
+
+        return spans
+
+    def _indent_block_end(self, code_lines: List[str], header: re.Match) -> int:
+        """End offset of the indented block under a header whose group 1 is its indent."""
+        indent = len(header.group(1).expandtabs())
+        line_num = self.line_of(header.start())
+        end_line = line_num
+        for i in range(line_num, len(code_lines)):
+            text = code_lines[i].expandtabs()
+            if not text.strip():
+                continue
+            if len(text) - len(text.lstrip()) <= indent:
+                break
+            end_line = i + 1
+        return self.line_index.line_start(end_line) + len(code_lines[end_line - 1])
+
+    # Syntax tree
+
+    @cached_property
+    def tree(self):
+        """Tree-sitter syntax tree, or None if no grammar is available."""
+        if not self.path:
+            return None
+        try:
+            from grep_ast import filename_to_lang
+        except ImportError:
+            return None
+
+        lang = filename_to_lang(self.path)
+        parser = _get_parser(lang) if lang else None
+        if parser is None:
+            return None
+        try:
+            return parser.parse(bytes(self, "utf-8"))
+        except Exception:
+            return None
+
+    def _point_offset(self, point) -> int:
+        """Convert a tree-sitter (row, byte column) point to a str offset."""
+        row, column = point
+        if row >= len(self.lines):
+            return len(self)
+        line = self.lines[row]
+        if not line.isascii():
+            column = len(line.encode("utf-8")[:column].decode("utf-8", errors="ignore"))
+        return self.line_index.line_start(row + 1) + column
+
+    def _tree_spans(self) -> List[Span]:
+        spans = []
+        stack = [self.tree.root_node]
+        while stack:
+            node = stack.pop()
+            kind = _SPAN_KINDS.get(node.type)
+            if kind:
+                name_node = node.child_by_field_name("name")
+                name = name_node.text.decode("utf-8", errors="replace") if name_node else ""
+                start = self._point_offset(node.start_point)
+                end = self._point_offset(node.end_point)
+                spans.append(self._span(kind, name, start, end))
+            stack.extend(reversed(node.children))
+        return spans
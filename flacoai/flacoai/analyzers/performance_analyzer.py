@@ -13,7 +13,7 @@ class PerformanceAnalyzer(BaseAnalyzer):
 
         # N+1 query patterns (ORM)
         self.n_plus_one_patterns = [
-            (r'for\s+\w+\s+in\s+\w+.*:\s*\n\s+.*\.get\(', "Potential N+1 query in loop"),
+            (r'for\s+\w+\s+in\s+\w+.*:\s*\n\s+.*\.objects\.get\(', "Potential N+1 query in loop"),
             (r'for\s+\w+\s+in\s+\w+.*:\s*\n\s+.*\.filter\(', "Database query in loop"),
             (r'for\s+\w+\s+in\s+\w+.*:\s*\n\s+.*\.query\(', "Query in loop"),
             (r'\.all\(\).*for.*\sin\s', "Fetching all records then looping"),
@@ -104,72 +104,69 @@ class PerformanceAnalyzer(BaseAnalyzer):
         if not self._is_code_file(file_path):
             return results
 
-        results.extend(self._check_patterns(file_path, content, self.n_plus_one_patterns,
-                                           "N+1 Query Problem", Severity.HIGH,
-                                           "Use select_related() or prefetch_related() for ORMs, or fetch data in batch"))
+        # (patterns, title, severity, recommendation), all matched in one scan
+        checks = []
 
-        results.extend(self._check_patterns(file_path, content, self.algorithm_patterns,
-                                           "Inefficient Algorithm", Severity.MEDIUM,
-                                           "Consider using more efficient algorithms or data structures"))
+        checks.append((self.n_plus_one_patterns, "N+1 Query Problem", Severity.HIGH,
+                       "Use select_related() or prefetch_related() for ORMs, or fetch data in batch"))
 
-        results.extend(self._check_patterns(file_path, content, self.memory_patterns,
-                                           "Potential Memory Leak", Severity.HIGH,
-                                           "Implement proper cleanup, use weak references, or bound caches"))
+        checks.append((self.algorithm_patterns, "Inefficient Algorithm", Severity.MEDIUM,
+                       "Consider using more efficient algorithms or data structures"))
 
-        results.extend(self._check_patterns(file_path, content, self.data_structure_patterns,
-                                           "Inefficient Data Structure", Severity.LOW,
-                                           "Use appropriate data structures (set for membership, dict for lookups)"))
+        checks.append((self.memory_patterns, "Potential Memory Leak", Severity.HIGH,
+                       "Implement proper cleanup, use weak references, or bound caches"))
 
-        results.extend(self._check_patterns(file_path, content, self.io_patterns,
-                                           "I/O Inefficiency", Severity.MEDIUM,
-                                           "Use context managers, buffering, and avoid reading entire files"))
+        checks.append((self.data_structure_patterns, "Inefficient Data Structure", Severity.LOW,
+                       "Use appropriate data structures (set for membership, dict for lookups)"))
 
-        results.extend(self._check_patterns(file_path, content, self.string_patterns,
-                                           "String Inefficiency", Severity.LOW,
-                                           "Use str.join() for concatenating multiple strings"))
+        checks.append((self.io_patterns, "I/O Inefficiency", Severity.MEDIUM,
+                       "Use context managers, buffering, and avoid reading entire files"))
+
+        checks.append((self.string_patterns, "String Inefficiency", Severity.LOW,
+                       "Use str.join() for concatenating multiple strings"))
 
         # iOS-specific checks
         ext = self.get_file_extension(file_path)
         if ext in ('swift', 'm', 'mm'):
-            results.extend(self._check_patterns(file_path, content, self.ios_main_thread_patterns,
-                                               "Main Thread Blocking", Severity.HIGH,
-                                               "Move heavy operations to background queue using DispatchQueue.global()"))
+            checks.append((self.ios_main_thread_patterns, "Main Thread Blocking", Severity.HIGH,
+                           "Move heavy operations to background queue using DispatchQueue.global()"))
+
+            checks.append((self.ios_tableview_patterns, "Inefficient UITableView/UICollectionView", Severity.MEDIUM,
+                           "Use dequeueReusableCell and move heavy operations out of cellForRowAt"))
 
-            results.extend(self._check_patterns(file_path, content, self.ios_tableview_patterns,
-                                               "Inefficient UITableView/UICollectionView", Severity.MEDIUM,
-                                               "Use dequeueReusableCell and move heavy operations out of cellForRowAt"))
+            checks.append((self.ios_memory_patterns, "Potential Retain Cycle", Severity.HIGH,
+                           "Use [weak self] in escaping closures and guard let self = self"))
 
-            results.extend(self._check_patterns(file_path, content, self.ios_memory_patterns,
-                                               "Potential Retain Cycle", Severity.HIGH,
-                                               "Use [weak self] in escaping closures and guard let self = self"))
+            checks.append((self.ios_core_data_patterns, "Inefficient Core Data Usage", Severity.MEDIUM,
+                           "Use fetch limits, predicates, and batch operations"))
 
-            results.extend(self._check_patterns(file_path, content, self.ios_core_data_patterns,
-                                               "Inefficient Core Data Usage", Severity.MEDIUM,
-                                               "Use fetch limits, predicates, and batch operations"))
+            checks.append((self.ios_image_patterns, "Inefficient Image Loading", Severity.MEDIUM,
+                           "Use image caching and decode images on background thread"))
 
-            results.extend(self._check_patterns(file_path, content, self.ios_image_patterns,
-                                               "Inefficient Image Loading", Severity.MEDIUM,
-                                               "Use image caching and decode images on background thread"))
+            checks.append((self.ios_animation_patterns, "Inefficient Animation", Severity.LOW,
+                           "Keep animations short and avoid animating in loops"))
 
-            results.extend(self._check_patterns(file_path, content, self.ios_animation_patterns,
-                                               "Inefficient Animation", Severity.LOW,
-                                               "Keep animations short and avoid animating in loops"))
+            checks.append((self.ios_view_patterns, "Heavy View Operation", Severity.MEDIUM,
+                           "Avoid heavy operations in layoutSubviews, draw(), and view lifecycle methods"))
 
-            results.extend(self._check_patterns(file_path, content, self.ios_view_patterns,
-                                               "Heavy View Operation", Severity.MEDIUM,
-                                               "Avoid heavy operations in layoutSubviews, draw(), and view lifecycle methods"))
+        results.extend(self._check_pattern_groups(file_path, content, checks))
 
         return results
 
     def _check_patterns(self, file_path: str, content: str, patterns: List[tuple],
                        title: str, severity: Severity, recommendation: str) -> List[AnalysisResult]:
         """Check content against performance patterns."""
+        return self._check_pattern_groups(file_path, content,
+                                          [(patterns, title, severity, recommendation)])
+
+    def _check_pattern_groups(self, file_path: str, content: str, checks: List[tuple]) -> List[AnalysisResult]:
+        """Check content against several pattern groups in a single scan."""
         results = []
 
-        for pattern, description in patterns:
-            matches = self.find_pattern(content, pattern, re.MULTILINE)
+        grouped = self.find_pattern_groups(content, [c[0] for c in checks], re.MULTILINE)
 
-            for line_num, column, matched_text in matches:
+        for (_, title, severity, recommendation), matches in zip(checks, grouped):
+            for description, line_num, column, matched_text in matches:
                 code_snippet = self.get_lines_context(content, line_num, context_lines=3)
 
                 result = AnalysisResult(
@@ -3,6 +3,22 @@
 import re
 from typing import List
 from .base_analyzer import BaseAnalyzer, AnalysisResult, Severity, Category
+from .parsed_source import ParsedSource
+
+# Lines a class or function may span before it is reported as too long
+MAX_CLASS_LINES = 200
+MAX_FUNCTION_LINES = 50
+
+# A return (or raise, throw, break, continue) that ends its statement on the line
+_JUMP_LINE = re.compile(r'^([ \t]*)(?:return|raise|throw|break|continue)\b(?!.*[\\([{,]\s*$)')
+# Lines that start the next branch or close the block, so aren't unreachable
+_BLOCK_BOUNDARY = re.compile(r'^[ \t]*(?:[}\])]|(?:elif|else|except|finally|case|default|catch)\b)')
+
+# Keywords that add a decision point, counted once per line they appear on
+DECISION_KEYWORDS = [
+    re.compile(r'\b' + keyword + r'\b')
+    for keyword in ('if', 'elif', 'else', 'for', 'while', 'and', 'or', 'except', 'case')
+]
 
 
 class QualityAnalyzer(BaseAnalyzer):
@@ -32,16 +48,9 @@ class QualityAnalyzer(BaseAnalyzer):
         self.dead_code_patterns = [
             (r'if\s+False:', "Dead code (if False)"),
             (r'if\s+0:', "Dead code (if 0)"),
-            (r'return.*\n.*return', "Unreachable code after return"),
             (r'def\s+\w+.*:\s*\n\s+pass\s*$', "Empty function"),
         ]
 
-        # Complexity patterns
-        self.complexity_patterns = [
-            (r'class\s+\w+.*:\s*\n(?:(?:.*\n){200,})', "Large class (>200 lines)"),
-            (r'def\s+\w+.*:\s*\n(?:(?:.*\n){50,})(?=def\s|\nclass\s|\Z)', "Long function (>50 lines)"),
-        ]
-
         # Poor naming patterns
         self.naming_patterns = [
             (r'\b[a-z]\b\s*=', "Single letter variable"),
@@ -98,69 +107,71 @@ class QualityAnalyzer(BaseAnalyzer):
         if not self._is_code_file(file_path):
             return results
 
-        results.extend(self._check_patterns(file_path, content, self.code_smell_patterns,
-                                           "Code Smell", Severity.MEDIUM,
-                                           "Refactor to improve readability and maintainability"))
-
-        results.extend(self._check_magic_numbers(file_path, content))
+        content = self.parse_source(file_path, content)
 
-        results.extend(self._check_patterns(file_path, content, self.dead_code_patterns,
-                                           "Dead Code", Severity.LOW,
-                                           "Remove unused or unreachable code"))
+        # (patterns, title, severity, recommendation), all matched in one scan
+        checks = []
 
-        results.extend(self._check_patterns(file_path, content, self.complexity_patterns,
-                                           "High Complexity", Severity.MEDIUM,
-                                           "Consider breaking into smaller, more focused units"))
+        checks.append((self.code_smell_patterns, "Code Smell", Severity.MEDIUM,
+                       "Refactor to improve readability and maintainability"))
 
-        results.extend(self._check_patterns(file_path, content, self.naming_patterns,
-                                           "Poor Naming", Severity.LOW,
-                                           "Use descriptive, meaningful names"))
+        checks.append((self.dead_code_patterns, "Dead Code", Severity.LOW,
+                       "Remove unused or unreachable code"))
 
-        # Check cyclomatic complexity
-        results.extend(self._check_cyclomatic_complexity(file_path, content))
+        checks.append((self.naming_patterns, "Poor Naming", Severity.LOW,
+                       "Use descriptive, meaningful names"))
 
         # iOS/Swift-specific checks
         ext = self.get_file_extension(file_path)
         if ext in ('swift',):
-            results.extend(self._check_patterns(file_path, content, self.ios_force_unwrap_patterns,
-                                               "Force Unwrap", Severity.MEDIUM,
-                                               "Use optional binding (if let, guard let) or nil coalescing (??) instead"))
+            checks.append((self.ios_force_unwrap_patterns, "Force Unwrap", Severity.MEDIUM,
+                           "Use optional binding (if let, guard let) or nil coalescing (??) instead"))
+
+            checks.append((self.ios_implicitly_unwrapped_patterns, "Implicitly Unwrapped Optional", Severity.LOW,
+                           "Avoid implicitly unwrapped optionals, use regular optionals instead"))
+
+            checks.append((self.ios_swiftui_patterns, "SwiftUI Code Quality", Severity.MEDIUM,
+                           "Break down large views, extract subviews, use @ViewBuilder"))
+
+            checks.append((self.ios_accessibility_patterns, "Missing Accessibility", Severity.LOW,
+                           "Add accessibility labels/hints for better accessibility support"))
 
-            results.extend(self._check_patterns(file_path, content, self.ios_implicitly_unwrapped_patterns,
-                                               "Implicitly Unwrapped Optional", Severity.LOW,
-                                               "Avoid implicitly unwrapped optionals, use regular optionals instead"))
+            checks.append((self.ios_naming_patterns, "Swift Naming Convention", Severity.LOW,
+                           "Follow Swift naming conventions: UpperCamelCase for types, lowerCamelCase for functions/vars"))
 
-            results.extend(self._check_patterns(file_path, content, self.ios_swiftui_patterns,
-                                               "SwiftUI Code Quality", Severity.MEDIUM,
-                                               "Break down large views, extract subviews, use @ViewBuilder"))
+            checks.append((self.ios_documentation_patterns, "Missing Documentation", Severity.LOW,
+                           "Add documentation comments (///) for public APIs"))
 
-            results.extend(self._check_patterns(file_path, content, self.ios_accessibility_patterns,
-                                               "Missing Accessibility", Severity.LOW,
-                                               "Add accessibility labels/hints for better accessibility support"))
+            checks.append((self.ios_error_handling_patterns, "Poor Error Handling", Severity.MEDIUM,
+                           "Handle specific error cases, don't use empty catch blocks"))
 
-            results.extend(self._check_patterns(file_path, content, self.ios_naming_patterns,
-                                               "Swift Naming Convention", Severity.LOW,
-                                               "Follow Swift naming conventions: UpperCamelCase for types, lowerCamelCase for functions/vars"))
+        results.extend(self._check_pattern_groups(file_path, content, checks))
 
-            results.extend(self._check_patterns(file_path, content, self.ios_documentation_patterns,
-                                               "Missing Documentation", Severity.LOW,
-                                               "Add documentation comments (///) for public APIs"))
+        results.extend(self._check_unreachable_code(file_path, content))
 
-            results.extend(self._check_patterns(file_path, content, self.ios_error_handling_patterns,
-                                               "Poor Error Handling", Severity.MEDIUM,
-                                               "Handle specific error cases, don't use empty catch blocks"))
+        results.extend(self._check_unit_length(file_path, content))
+
+        results.extend(self._check_magic_numbers(file_path, content))
+
+        # Check cyclomatic complexity
+        results.extend(self._check_cyclomatic_complexity(file_path, content))
 
         return results
 
     def _check_patterns(self, file_path: str, content: str, patterns: List[tuple],
                        title: str, severity: Severity, recommendation: str) -> List[AnalysisResult]:
         """Check content against quality patterns."""
+        return self._check_pattern_groups(file_path, content,
+                                          [(patterns, title, severity, recommendation)])
+
+    def _check_pattern_groups(self, file_path: str, content: str, checks: List[tuple]) -> List[AnalysisResult]:
+        """Check content against several pattern groups in a single scan."""
         results = []
 
-        for pattern, description in patterns:
-            matches = self.find_pattern(content, pattern, re.MULTILINE)
+        grouped = self.find_pattern_groups(content, [c[0] for c in checks], re.MULTILINE)
 
-            for line_num, column, matched_text in matches:
+        for (_, title, severity, recommendation), matches in zip(checks, grouped):
+            for description, line_num, column, matched_text in matches:
                 code_snippet = self.get_lines_context(content, line_num, context_lines=2)
 
                 result = AnalysisResult(
@@ -178,16 +189,77 @@ class QualityAnalyzer(BaseAnalyzer):
 
         return results
 
-    def _check_magic_numbers(self, file_path: str, content: str) -> List[AnalysisResult]:
-        """Check for magic numbers (excluding common exceptions)."""
+    def _check_unreachable_code(
+        self, file_path: str, content: ParsedSource
+    ) -> List[AnalysisResult]:
+        """Check for statements after a return in the same block, at the same indent."""
+        results = []
+        # Comments and string literals are blanked out, so they can't end or follow a return
+        code_lines = content.code.split('\n')
+
+        for line_num, line in enumerate(code_lines, 1):
+            jump = _JUMP_LINE.match(line)
+            if not jump:
+                continue
+
+            next_num = line_num + 1
+            while next_num <= len(code_lines) and not code_lines[next_num - 1].strip():
+                next_num += 1
+            if next_num > len(code_lines):
+                continue
+
+            next_line = code_lines[next_num - 1]
+            next_indent = next_line[:len(next_line) - len(next_line.lstrip())]
+            if next_indent != jump.group(1) or _BLOCK_BOUNDARY.match(next_line):
+                continue
+
+            results.append(AnalysisResult(
+                file=file_path,
+                line=next_num,
+                severity=Severity.LOW,
+                category=Category.QUALITY,
+                title="Dead Code",
+                description="Unreachable code after return",
+                recommendation="Remove unused or unreachable code",
+                code_snippet=self.get_lines_context(content, next_num, context_lines=2),
+            ))
+
+        return results
+
+    def _check_unit_length(self, file_path: str, content: ParsedSource) -> List[AnalysisResult]:
+        """Check for classes and functions that span too many lines."""
         results = []
-        lines = content.split('\n')
+        units = [
+            (span, MAX_CLASS_LINES, f"Large class (>{MAX_CLASS_LINES} lines)")
+            for span in content.classes
+        ]
+        units += [
+            (span, MAX_FUNCTION_LINES, f"Long function (>{MAX_FUNCTION_LINES} lines)")
+            for span in content.functions
+        ]
 
-        for line_num, line in enumerate(lines, 1):
-            # Skip comments
-            if re.match(r'^\s*[#/]', line):
+        for span, max_lines, description in units:
+            if span.end_line - span.start_line + 1 <= max_lines:
                 continue
+            results.append(AnalysisResult(
+                file=file_path,
+                line=span.start_line,
+                severity=Severity.MEDIUM,
+                category=Category.QUALITY,
+                title="High Complexity",
+                description=description,
+                recommendation="Consider breaking into smaller, more focused units",
+                code_snippet=self.get_lines_context(content, span.start_line, context_lines=2),
+            ))
 
+        return results
+
+    def _check_magic_numbers(self, file_path: str, content: ParsedSource) -> List[AnalysisResult]:
+        """Check for magic numbers (excluding common exceptions)."""
+        results = []
+
+        # Comments and string literals are blanked out, so numbers in them are skipped
+        for line_num, line in enumerate(content.code.split('\n'), 1):
             # Find numbers that aren't 0, 1, -1
             for match in re.finditer(r'[^a-zA-Z0-9_]([\d]{2,})[^a-zA-Z0-9_.]', line):
                 number = match.group(1)
@@ -217,58 +289,56 @@ class QualityAnalyzer(BaseAnalyzer):
 
         return results
 
-    def _check_cyclomatic_complexity(self, file_path: str, content: str) -> List[AnalysisResult]:
+    def _check_cyclomatic_complexity(self, file_path: str, content: ParsedSource) -> List[AnalysisResult]:
         """Check cyclomatic complexity of functions."""
         results = []
-        lines = content.split('\n')
-
-        current_function = None
-        function_start = 0
-        complexity = 0
-
-        for line_num, line in enumerate(lines, 1):
-            # Detect function definition
-            func_match = re.match(r'^(\s*)def\s+(\w+)', line)
-            if func_match:
-                # Analyze previous function
-                if current_function and complexity > 10:
-                    result = AnalysisResult(
-                        file=file_path,
-                        line=function_start,
-                        severity=Severity.MEDIUM if complexity > 15 else Severity.LOW,
-                        category=Category.QUALITY,
-                        title="High Cyclomatic Complexity",
-                        description=f"Function '{current_function}' has complexity of {complexity}",
-                        recommendation="Simplify function by extracting methods or reducing branching",
-                        code_snippet=f"Complexity: {complexity}",
-                    )
-                    results.append(result)
-
-                # Start new function
-                current_function = func_match.group(2)
-                function_start = line_num
-                complexity = 1
-
-            # Count complexity-adding keywords
-            if current_function:
-                keywords = ['if', 'elif', 'else', 'for', 'while', 'and', 'or', 'except', 'case']
-                for keyword in keywords:
-                    if re.search(r'\b' + keyword + r'\b', line):
-                        complexity += 1
-
-        # Check last function
-        if current_function and complexity > 10:
-            result = AnalysisResult(
-                file=file_path,
-                line=function_start,
-                severity=Severity.MEDIUM if complexity > 15 else Severity.LOW,
-                category=Category.QUALITY,
-                title="High Cyclomatic Complexity",
-                description=f"Function '{current_function}' has complexity of {complexity}",
-                recommendation="Simplify function by extracting methods or reducing branching",
-                code_snippet=f"Complexity: {complexity}",
-            )
-            results.append(result)
+        code_lines = content.code.split('\n')
+        functions = sorted(content.functions, key=lambda span: (span.start, -span.end))
+
+        # Decision points up to each line, so a range of lines is summed in O(1)
+        decisions = [0]
+        for line in code_lines:
+            count = sum(1 for keyword in DECISION_KEYWORDS if keyword.search(line))
+            decisions.append(decisions[-1] + count)
+
+        # Nested functions are measured on their own: find each function's direct
+        # children in one pass, keeping a stack of the functions still open
+        children = {function: [] for function in functions}
+        open_functions = []
+        for function in functions:
+            while open_functions and open_functions[-1].end < function.end:
+                open_functions.pop()
+            if open_functions:
+                children[open_functions[-1]].append(function)
+            open_functions.append(function)
+
+        for function in functions:
+            complexity = 1 + decisions[function.end_line] - decisions[function.start_line - 1]
+
+            # Drop the lines the children cover, merging children that share a line
+            covered_end = function.start_line - 1
+            for child in children[function]:
+                first = max(child.start_line, covered_end + 1)
+                if first <= child.end_line:
+                    complexity -= decisions[child.end_line] - decisions[first - 1]
+                    covered_end = child.end_line
+            # The function's own header line always counts
+            if children[function] and children[function][0].start_line == function.start_line:
+                start = function.start_line
+                complexity += decisions[start] - decisions[start - 1]
+
+            if complexity > 10:
+                result = AnalysisResult(
+                    file=file_path,
+                    line=function.start_line,
+                    severity=Severity.MEDIUM if complexity > 15 else Severity.LOW,
+                    category=Category.QUALITY,
+                    title="High Cyclomatic Complexity",
+                    description=f"Function '{function.name}' has complexity of {complexity}",
+                    recommendation="Simplify function by extracting methods or reducing branching",
+                    code_snippet=f"Complexity: {complexity}",
+                )
+                results.append(result)
 
         return results
 
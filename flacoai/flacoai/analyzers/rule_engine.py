@@ -0,0 +1,374 @@
+"""Shared compiled rule engine for regex-based analyzers.
+
+Analyzers describe their checks as lists of regex strings. Splitting every
+file into lines and running each pattern over each line recompiles and
+rescans constantly. This module compiles each pattern once per process,
+skips patterns whose required literal text is absent, scans whole files,
+and maps match offsets back to line numbers through a newline-offset index.
+
+Rules keep the per-line semantics they were written for: a match never
+crosses a line break unless the rule spells out a newline (``\\n``), which
+is how a rule says it is meant to span lines. See rule_scope().
+"""
+
+import re
+from bisect import bisect_right
+from collections import deque, namedtuple
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Sequence, Set
+
+RuleMatch = namedtuple("RuleMatch", "rule line column text start end")
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+# Shorter literals hit almost every file, so checking for them saves nothing
+MIN_LITERAL_LENGTH = 3
+
+# How a rule is scanned, see rule_scope()
+SCOPE_FILE = "file"
+SCOPE_LINE = "line"
+SCOPE_CHECKED = "checked"
+
+# Up to this many literals, one C-speed substring search each beats walking
+# an Aho-Corasick automaton over the content in Python
+AUTOMATON_MIN_LITERALS = 128
+
+
+class LineIndex:
+    """Newline-offset index over a file's content.
+
+    Built in one pass; offset-to-line lookups are O(log n) via bisect.
+    Line lists are only materialized when asked for, and single lines and
+    snippets are sliced from the content directly.
+    """
+
+    def __init__(self, content: str):
+        self.content = content
+        self.offsets = [0]
+        self.offsets.extend(m.end() for m in re.finditer("\n", content))
+        self._lines = None
+        self._splitlines = None
+
+    @property
+    def line_count(self) -> int:
+        return len(self.offsets)
+
+    @property
+    def lines(self) -> List[str]:
+        """Lines of the file (split on newline), materialized on first use."""
+        if self._lines is None:
+            self._lines = self.content.split("\n")
+        return self._lines
+
+    def splitlines(self) -> List[str]:
+        """content.splitlines(), computed once and shared; do not modify."""
+        if self._splitlines is None:
+            self._splitlines = self.content.splitlines()
+        return self._splitlines
+
+    def line(self, line_num: int) -> str:
+        """Text of a 1-indexed line without its line ending, "" if out of range.
+
+        Sliced straight from content, so looking up a few lines never splits
+        the whole file.
+        """
+        if not 0 < line_num <= len(self.offsets):
+            return ""
+        if self._lines is not None:
+            text = self._lines[line_num - 1]
+        else:
+            end = self.offsets[line_num] - 1 if line_num < len(self.offsets) else len(self.content)
+            text = self.content[self.offsets[line_num - 1]:end]
+        return text[:-1] if text.endswith("\r") else text
+
+    def snippet(self, start_line: int, end_line: int) -> str:
+        """Lines start_line..end_line (1-indexed, inclusive), clamped to the file."""
+        start_line = max(1, start_line)
+        end_line = min(len(self.offsets), end_line)
+        if start_line > end_line:
+            return ""
+        end = self.offsets[end_line] - 1 if end_line < len(self.offsets) else len(self.content)
+        return self.content[self.offsets[start_line - 1]:end]
+
+    def line_of(self, offset: int) -> int:
+        """1-indexed line number containing offset."""
+        return bisect_right(self.offsets, offset)
+
+    def column_of(self, offset: int) -> int:
+        """0-indexed column of offset within its line."""
+        return offset - self.offsets[self.line_of(offset) - 1]
+
+    def line_start(self, line_num: int) -> int:
+        """Offset of the first character of a 1-indexed line."""
+        return self.offsets[line_num - 1]
+
+    def context(self, line_num: int, context_lines: int = 2) -> str:
+        """Lines around line_num, matching BaseAnalyzer.get_lines_context."""
+        lines = self.lines
+        start = max(0, line_num - context_lines - 1)
+        end = min(len(lines), line_num + context_lines)
+        return "\n".join(lines[start:end])
+
+
+@lru_cache(maxsize=4096)
+def compile_pattern(pattern: str, flags: int = 0) -> re.Pattern:
+    """Compile a pattern once per process.
+
+    The re module's own cache is small (512 entries) and analyzers alone
+    define several hundred patterns, so they would otherwise be evicted and
+    recompiled on every file.
+    """
+    return re.compile(pattern, flags)
+
+
+@lru_cache(maxsize=4096)
+def required_literal(pattern: str, flags: int = 0) -> Optional[str]:
+    """Longest literal every match of pattern must contain, if any.
+
+    Only literals at the top level of the pattern are considered: anything
+    inside a group, alternation or optional repeat may be skipped by a match.
+
+    Args:
+        pattern: Regex pattern
+        flags: Regex flags the pattern is compiled with
+
+    Returns:
+        The literal (lowercased under re.IGNORECASE), or None
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except (re.error, TypeError, ValueError):
+        return None
+
+    # An inline (?i) makes the match case-insensitive behind the caller's back
+    if parsed.state.flags & re.IGNORECASE and not flags & re.IGNORECASE:
+        return None
+
+    best = ""
+    run = []
+    for op, arg in list(parsed) + [(None, None)]:
+        if op is sre_parse.LITERAL:
+            run.append(chr(arg))
+            continue
+        if len(run) > len(best):
+            best = "".join(run)
+        run = []
+
+    if len(best) < MIN_LITERAL_LENGTH:
+        return None
+    if flags & re.IGNORECASE:
+        # str.lower() only agrees with the regex engine's case folding for ASCII
+        return best.lower() if best.isascii() else None
+    return best
+
+
+def _subpatterns(value):
+    """SubPatterns nested anywhere in a parsed regex node's argument."""
+    if isinstance(value, sre_parse.SubPattern):
+        yield value
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _subpatterns(item)
+
+
+def _nodes(parsed):
+    """Every (op, arg) node of a parsed regex, depth first."""
+    for op, arg in parsed:
+        yield op, arg
+        for sub in _subpatterns(arg):
+            yield from _nodes(sub)
+
+
+@lru_cache(maxsize=4096)
+def rule_scope(pattern: str, flags: int = 0) -> str:
+    """How a rule has to be scanned to match the way it was written.
+
+    Rules were written to be matched one line at a time. Over the whole
+    file, ``\\s``, ``[^}]`` and the like would carry a match across line
+    breaks, so:
+
+    - SCOPE_FILE: the rule spells out a newline, so it is meant to span
+      lines and runs over the whole file
+    - SCOPE_LINE: the rule has lookarounds or string anchors, which see
+      past the end of a line in the whole file, so it runs line by line
+    - SCOPE_CHECKED: everything else runs over the whole file, and line by
+      line instead if any of its matches crosses a line break. Without
+      lookarounds that gives exactly the per-line matches.
+
+    Args:
+        pattern: Regex pattern
+        flags: Regex flags the pattern is compiled with
+
+    Returns:
+        SCOPE_FILE, SCOPE_LINE or SCOPE_CHECKED
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except (re.error, TypeError, ValueError):
+        return SCOPE_LINE
+
+    newline = ord("\n")
+    scope = SCOPE_CHECKED
+    for op, arg in _nodes(parsed):
+        if op is sre_parse.LITERAL and arg == newline:
+            return SCOPE_FILE
+        if op is sre_parse.IN and (sre_parse.LITERAL, newline) in arg:
+            if (sre_parse.NEGATE, None) not in arg:
+                return SCOPE_FILE
+        if op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            scope = SCOPE_LINE
+        if op is sre_parse.AT and arg in (sre_parse.AT_BEGINNING_STRING, sre_parse.AT_END_STRING):
+            scope = SCOPE_LINE
+    return scope
+
+
+class LiteralMatcher:
+    """Finds which of a set of literals occur in a text, in one pass.
+
+    With many literals the text is scanned once by an Aho-Corasick automaton
+    compiled to a DFA (one dict lookup per character, however many literals
+    there are); with few, each literal is a plain substring search.
+    """
+
+    def __init__(self, literals: Sequence[str]):
+        self.literals = tuple(literals)
+        self._delta: Optional[List[Dict[str, int]]] = None
+        self._output: List[Optional[FrozenSet[int]]] = []
+        if len(self.literals) >= AUTOMATON_MIN_LITERALS:
+            self._build()
+
+    def _build(self):
+        goto: List[Dict[str, int]] = [{}]
+        output: List[Set[int]] = [set()]
+        for i, literal in enumerate(self.literals):
+            state = 0
+            for ch in literal:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    goto.append({})
+                    output.append(set())
+                    nxt = goto[state][ch] = len(goto) - 1
+                state = nxt
+            output[state].add(i)
+
+        # Breadth-first, so every state's failure state is complete before it
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [None] * (len(goto) - 1)
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            delta[state] = {**delta[fail[state]], **goto[state]}
+            output[state] |= output[fail[state]]
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(ch, 0)
+                queue.append(nxt)
+
+        self._delta = delta
+        self._output = [frozenset(out) if out else None for out in output]
+
+    def search(self, text: str) -> Set[int]:
+        """Indexes of the literals that occur in text."""
+        if self._delta is None:
+            return {i for i, literal in enumerate(self.literals) if literal in text}
+
+        delta, output = self._delta, self._output
+        found: Set[int] = set()
+        state = 0
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if output[state] is not None:
+                found |= output[state]
+        return found
+
+
+class RuleSet:
+    """A group of patterns scanned together over one file.
+
+    Each pattern is compiled once per process. Before a pattern is run, the
+    file is checked for the pattern's required literal (a plain substring
+    search, far cheaper than starting the regex engine at every offset), so
+    most rules never scan files they cannot match. Results are identical to
+    running every pattern independently over each line, except for rules
+    that spell out a newline, which match across lines (see rule_scope()).
+    """
+
+    def __init__(self, patterns: Sequence[str], flags: int = 0):
+        self.patterns = tuple(patterns)
+        self.flags = flags
+        self.compiled = [compile_pattern(p, flags) for p in self.patterns]
+        self.literals = [required_literal(p, flags) for p in self.patterns]
+        self.scopes = [rule_scope(p, flags) for p in self.patterns]
+
+    def candidate_rules(self, content: str) -> List[int]:
+        """Indexes of rules whose required literal occurs in content."""
+        haystack = content.lower() if self.flags & re.IGNORECASE else content
+        return [
+            rule for rule, literal in enumerate(self.literals)
+            if literal is None or literal in haystack
+        ]
+
+    def scan(self, content: str, index: Optional[LineIndex] = None) -> List[RuleMatch]:
+        """Find every match of every rule.
+
+        Args:
+            content: File content
+            index: LineIndex for content (built if not supplied)
+
+        Returns:
+            RuleMatch tuples ordered by rule, then position
+        """
+        if index is None:
+            index = LineIndex(content)
+
+        matches = []
+        for rule in self.candidate_rules(content):
+            rule_matches = None
+            if self.scopes[rule] != SCOPE_LINE:
+                rule_matches = self._scan_file(rule, content, index)
+                if self.scopes[rule] == SCOPE_CHECKED and any(
+                    "\n" in m.text for m in rule_matches
+                ):
+                    rule_matches = None
+            if rule_matches is None:
+                rule_matches = self._scan_lines(rule, index)
+            matches.extend(rule_matches)
+        return matches
+
+    def _scan_file(self, rule: int, content: str, index: LineIndex) -> List[RuleMatch]:
+        matches = []
+        for m in self.compiled[rule].finditer(content):
+            start = m.start()
+            line = index.line_of(start)
+            matches.append(RuleMatch(
+                rule,
+                line,
+                start - index.offsets[line - 1],
+                m.group(),
+                start,
+                m.end(),
+            ))
+        return matches
+
+    def _scan_lines(self, rule: int, index: LineIndex) -> List[RuleMatch]:
+        matches = []
+        pattern = self.compiled[rule]
+        for line_num, (line, line_start) in enumerate(zip(index.lines, index.offsets), 1):
+            for m in pattern.finditer(line):
+                matches.append(RuleMatch(
+                    rule,
+                    line_num,
+                    m.start(),
+                    m.group(),
+                    line_start + m.start(),
+                    line_start + m.end(),
+                ))
+        return matches
+
+
+@lru_cache(maxsize=256)
+def get_rule_set(patterns: Sequence[str], flags: int = 0) -> RuleSet:
+    """Shared RuleSet for a tuple of patterns, built once per process."""
+    return RuleSet(patterns, flags)
@@ -0,0 +1,225 @@
+"""Compiled packs of custom team rules.
+
+A rules YAML is parsed and compiled once per process and content hash:
+every regex is compiled up front, rules are grouped by the file extensions
+they apply to, and each group gets a LiteralMatcher over the literal text
+its rules require. Checking a file then costs one dictionary lookup for its
+group and one scan for literals, and only rules whose literal is present
+run at all.
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+import yaml
+
+from .base_analyzer import Category, Severity
+from .rule_engine import LiteralMatcher, compile_pattern, required_literal
+
+MODES = ("regex", "contains", "not_contains")
+
+SEVERITIES = {
+    'critical': Severity.CRITICAL,
+    'high': Severity.HIGH,
+    'medium': Severity.MEDIUM,
+    'low': Severity.LOW,
+}
+
+# There is no iOS category; 'ios' rules fall back to quality like any other
+CATEGORIES = {
+    'security': Category.SECURITY,
+    'performance': Category.PERFORMANCE,
+    'quality': Category.QUALITY,
+    'architecture': Category.ARCHITECTURE,
+}
+
+# Packs by YAML content hash, shared by every analyzer in the process
+_packs: Dict[str, "RulePack"] = {}
+
+
+@dataclass
+class CompiledRule:
+    """One custom rule, ready to run."""
+
+    name: str
+    mode: str
+    pattern: str
+    severity: Severity
+    category: Category
+    message: str
+    recommendation: str
+    regex: Optional[re.Pattern] = None
+    file_pattern: Optional[re.Pattern] = None
+    # None applies the rule to every extension
+    extensions: Optional[FrozenSet[str]] = None
+    # Text every match must contain (the pattern itself for contains modes)
+    literal: Optional[str] = None
+    # Lowercase literal is looked up in lowercased content
+    ignore_case: bool = False
+
+    def applies_to(self, file_path: str) -> bool:
+        return self.file_pattern is None or bool(self.file_pattern.search(file_path))
+
+
+@dataclass
+class RuleGroup:
+    """The rules for one file extension and a matcher over their literals."""
+
+    rules: List[CompiledRule]
+    matcher: LiteralMatcher
+    lower_matcher: LiteralMatcher
+    # Rule position in rules -> index of its literal in matcher/lower_matcher
+    literal_of: Dict[int, Tuple[bool, int]] = field(default_factory=dict)
+
+    @classmethod
+    def of(cls, rules: List[CompiledRule]) -> "RuleGroup":
+        literals: Dict[str, int] = {}
+        lower_literals: Dict[str, int] = {}
+        literal_of = {}
+        for position, rule in enumerate(rules):
+            if rule.literal is None:
+                continue
+            table = lower_literals if rule.ignore_case else literals
+            literal_of[position] = (rule.ignore_case, table.setdefault(rule.literal, len(table)))
+        return cls(
+            rules, LiteralMatcher(list(literals)), LiteralMatcher(list(lower_literals)), literal_of
+        )
+
+    def candidates(self, file_path: str, content: str) -> List[CompiledRule]:
+        """Rules to run on a file, in rules-file order.
+
+        not_contains rules are always returned: they report on the literal
+        being absent, so they must see every file they apply to.
+        """
+        found = self.matcher.search(content) if self.matcher.literals else set()
+        found_lower = set()
+        if self.lower_matcher.literals:
+            found_lower = self.lower_matcher.search(content.lower())
+
+        selected = []
+        for position, rule in enumerate(self.rules):
+            if not rule.applies_to(file_path):
+                continue
+            literal = self.literal_of.get(position)
+            if (
+                literal is not None
+                and rule.mode != "not_contains"
+                and literal[1] not in (found_lower if literal[0] else found)
+            ):
+                continue
+            selected.append(rule)
+        return selected
+
+
+class RulePack:
+    """Every rule of one rules file, compiled and grouped by file extension."""
+
+    def __init__(
+        self, rules: List[CompiledRule], digest: str = "", errors: Optional[List[str]] = None
+    ):
+        self.rules = rules
+        self.digest = digest
+        self.errors = errors or []
+        self._groups: Dict[str, RuleGroup] = {}
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def group(self, file_path: str) -> RuleGroup:
+        """Rules that can apply to file_path's extension, built once per extension."""
+        ext = Path(file_path).suffix.lstrip('.')
+        group = self._groups.get(ext)
+        if group is None:
+            group = self._groups[ext] = RuleGroup.of([
+                rule for rule in self.rules
+                if rule.extensions is None or ext in rule.extensions
+            ])
+        return group
+
+    def candidates(self, file_path: str, content: str) -> List[CompiledRule]:
+        return self.group(file_path).candidates(file_path, content)
+
+    @classmethod
+    def from_rules(cls, rules: List[Dict], digest: str = "") -> "RulePack":
+        """Compile rule dicts as found in a rules file.
+
+        Rules with an unknown mode never report anything and are dropped;
+        rules with an invalid regex are dropped and described in errors.
+        """
+        compiled = []
+        errors = []
+        for rule in rules:
+            if not isinstance(rule, dict):
+                continue
+            try:
+                compiled_rule = compile_rule(rule)
+            except re.error as e:
+                errors.append(f"Invalid regex in rule '{rule.get('name', 'Custom Rule')}': {e}")
+                continue
+            if compiled_rule is not None:
+                compiled.append(compiled_rule)
+        return cls(compiled, digest, errors)
+
+
+def compile_rule(rule: Dict) -> Optional[CompiledRule]:
+    """Compile one rule dict, None if its mode is unknown.
+
+    Raises:
+        re.error: If the pattern or file_pattern is not a valid regex
+    """
+    mode = rule.get('mode', 'regex')
+    if mode not in MODES:
+        return None
+
+    pattern = str(rule.get('pattern', ''))
+    compiled = CompiledRule(
+        name=rule.get('name', 'Custom Rule'),
+        mode=mode,
+        pattern=pattern,
+        severity=SEVERITIES.get(str(rule.get('severity', 'medium')).lower(), Severity.MEDIUM),
+        category=CATEGORIES.get(str(rule.get('category', 'quality')).lower(), Category.QUALITY),
+        message=rule.get('message', 'Custom rule violation'),
+        recommendation=rule.get('recommendation', 'Fix this issue'),
+    )
+
+    if 'file_pattern' in rule:
+        compiled.file_pattern = re.compile(rule['file_pattern'])
+
+    if 'file_extension' in rule:
+        extensions = rule['file_extension']
+        if isinstance(extensions, str):
+            extensions = [extensions]
+        compiled.extensions = frozenset(str(ext) for ext in extensions)
+
+    if mode == 'regex':
+        compiled.regex = compile_pattern(pattern, re.MULTILINE)
+        compiled.literal = required_literal(pattern, re.MULTILINE)
+        if compiled.literal is None and compiled.regex.flags & re.IGNORECASE:
+            compiled.literal = required_literal(pattern, re.MULTILINE | re.IGNORECASE)
+            compiled.ignore_case = compiled.literal is not None
+    elif pattern:
+        compiled.literal = pattern
+
+    return compiled
+
+
+def load_rule_pack(rules_file: str) -> RulePack:
+    """The compiled pack for a rules file, parsed only when its content changes.
+
+    Raises:
+        OSError: If the file cannot be read
+        yaml.YAMLError: If the file is not valid YAML
+    """
+    raw = Path(rules_file).read_bytes()
+    digest = hashlib.sha256(raw).hexdigest()
+
+    pack = _packs.get(digest)
+    if pack is None:
+        data = yaml.safe_load(raw)
+        rules = data.get('rules') if isinstance(data, dict) else None
+        pack = RulePack.from_rules(rules or [], digest)
+        _packs[digest] = pack
+    return pack
@@ -0,0 +1,447 @@
+"""Parallel execution engine for running analyzers over many files."""
+
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .base_analyzer import AnalysisReport, AnalysisResult
+from .cache import AnalysisCache
+from .parsed_source import ParsedSource
+
+# Below this many files a process pool costs more to start than it saves
+MIN_FILES_FOR_POOL = 8
+
+# Shards per worker; more shards smooth out uneven file sizes
+SHARDS_PER_JOB = 4
+
+# When streaming, files are sent to workers in batches of this size, and at
+# most STREAM_BATCHES_PER_JOB batches per worker are in flight at once
+STREAM_BATCH_FILES = 16
+STREAM_BATCHES_PER_JOB = 2
+
+
+@dataclass
+class AnalyzerSpec:
+    """Describes an analyzer to instantiate and run.
+
+    Analyzers are passed by class (not instance) so each worker process can
+    build its own copy; IO objects are not picklable and stay in the parent.
+    """
+    name: str
+    analyzer_class: type
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+
+def resolve_jobs(jobs: Optional[int]) -> int:
+    """Turn a --review-jobs value into a worker count (0 or None means all CPUs)."""
+    if not jobs or jobs < 1:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def shard_files(file_items: List[Tuple[str, str]], num_shards: int) -> List[List[Tuple[str, str]]]:
+    """Split files into contiguous shards of roughly equal total size.
+
+    Contiguous shards keep results in input order once shards are
+    concatenated back together.
+    """
+    if num_shards <= 1 or len(file_items) <= 1:
+        return [file_items]
+
+    num_shards = min(num_shards, len(file_items))
+    total = sum(len(content) for _, content in file_items) or 1
+    target = total / num_shards
+
+    shards = []
+    current = []
+    current_size = 0
+    for item in file_items:
+        current.append(item)
+        current_size += len(item[1])
+        if current_size >= target and len(shards) < num_shards - 1:
+            shards.append(current)
+            current = []
+            current_size = 0
+    if current:
+        shards.append(current)
+    return shards
+
+
+def _analyze_shard(analyzer, file_items: List[Tuple[str, str]]):
+    """Run one analyzer over a shard, collecting errors instead of printing them."""
+    results = []
+    errors = []
+    for file_path, content in file_items:
+        try:
+            results.extend(analyzer.analyze_file_cached(file_path, content))
+        except Exception as e:
+            errors.append(f"Error analyzing {file_path}: {e}")
+    return results, errors
+
+
+# One cache handle per worker process, reused across the tasks it runs
+_worker_caches: Dict[str, AnalysisCache] = {}
+
+
+def _worker_cache(cache_root: Optional[str]) -> Optional[AnalysisCache]:
+    if cache_root is None:
+        return None
+    if cache_root not in _worker_caches:
+        _worker_caches[cache_root] = AnalysisCache(cache_root)
+    return _worker_caches[cache_root]
+
+
+def _run_shard_task(analyzer_class, kwargs, file_items, cache_root=None):
+    """Worker entry point: build the analyzer and analyze one shard."""
+    start = time.perf_counter()
+    analyzer = analyzer_class(**kwargs)
+
+    cache = _worker_cache(cache_root)
+    hits = cache.hits if cache else 0
+    misses = cache.misses if cache else 0
+    analyzer.cache = cache
+
+    results, errors = _analyze_shard(analyzer, file_items)
+    cache_counts = (cache.hits - hits, cache.misses - misses) if cache else (0, 0)
+    return results, errors, time.perf_counter() - start, cache_counts
+
+
+def _run_batch_task(analyzers, file_items, cache_root=None):
+    """Worker entry point for streaming: run several analyzers over one batch.
+
+    Returns per-analyzer (results, errors, elapsed) plus cache hit/miss counts.
+    """
+    cache = _worker_cache(cache_root)
+    hits = cache.hits if cache else 0
+    misses = cache.misses if cache else 0
+
+    outputs = []
+    for analyzer_class, kwargs in analyzers:
+        start = time.perf_counter()
+        analyzer = analyzer_class(**kwargs)
+        analyzer.cache = cache
+        results, errors = _analyze_shard(analyzer, file_items)
+        outputs.append((results, errors, time.perf_counter() - start))
+
+    cache_counts = (cache.hits - hits, cache.misses - misses) if cache else (0, 0)
+    return outputs, cache_counts
+
+
+def _batches(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class AnalyzerScheduler:
+    """Runs the (analyzer x file-shard) matrix, optionally across processes.
+
+    Results are always returned in analyzer order, then file order, then the
+    order each analyzer reported them - regardless of which worker finished
+    first - so reports are identical for any number of jobs.
+    """
+
+    def __init__(
+        self,
+        jobs: Optional[int] = 1,
+        io=None,
+        verbose: bool = False,
+        cache_root: Optional[str] = None,
+        persist_state: bool = True,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            jobs: Number of worker processes (1 runs in-process, 0/None uses all CPUs)
+            io: IO object for output (optional)
+            verbose: Enable verbose logging
+            cache_root: Project root for the findings cache (None disables caching)
+            persist_state: Let cross-file analyzers load and save their state
+                (such as the import graph) in the cache
+        """
+        self.jobs = resolve_jobs(jobs)
+        self.io = io
+        self.verbose = verbose
+        self.cache_root = cache_root
+        self.cache = None
+        if cache_root:
+            self.cache = AnalysisCache(
+                cache_root, io=io, verbose=verbose, persist_state=persist_state
+            )
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.files_analyzed = 0
+        self.timings: Dict[str, float] = {}
+
+    def run(self, specs: List[AnalyzerSpec], files: Dict[str, str]) -> AnalysisReport:
+        """Run every analyzer over every file.
+
+        Args:
+            specs: Analyzers to run, in reporting order
+            files: Dictionary mapping file paths to their contents
+
+        Returns:
+            Combined AnalysisReport with per-analyzer timings
+        """
+        start_time = time.time()
+
+        report = AnalysisReport()
+        report.files_analyzed = len(files)
+
+        # Parse each file once; every in-process analyzer shares the result
+        files = {path: ParsedSource.of(content, path) for path, content in files.items()}
+        file_items = list(files.items())
+        use_pool = self.jobs > 1 and len(file_items) >= MIN_FILES_FOR_POOL
+        shards = shard_files(file_items, self.jobs * SHARDS_PER_JOB if use_pool else 1)
+
+        # slots[spec_index] -> list of per-shard result lists
+        slots: List[List[list]] = [[] for _ in specs]
+        timings: Dict[str, float] = {spec.name: 0.0 for spec in specs}
+
+        if use_pool:
+            if self.verbose and self.io:
+                self.io.tool_output(
+                    f"Analyzing {len(file_items)} files in {len(shards)} shards"
+                    f" with {self.jobs} workers..."
+                )
+            self._run_pooled(specs, files, shards, slots, timings)
+        else:
+            for index, spec in enumerate(specs):
+                self._run_in_process(index, spec, files, shards, slots, timings)
+
+        for shard_results in slots:
+            for results in shard_results:
+                report.results.extend(results)
+
+        report.analyzer_timings = timings
+        if self.cache:
+            report.metadata["cache"] = self.cache_metadata()
+        report.duration_seconds = time.time() - start_time
+        return report
+
+    def stream(self, specs: List[AnalyzerSpec], files: Iterable[Tuple[str, str]]) -> Iterator[AnalysisResult]:
+        """Run every analyzer over files as they arrive, yielding findings as they are found.
+
+        Unlike run(), files may be a lazy iterable and no findings are kept, so
+        memory is bounded by the files in flight rather than the size of the
+        repo. Findings come out file by file (in batches when using workers);
+        cross-file findings from finalize() come last. Once the generator is
+        exhausted, files_analyzed, timings and cache_metadata() describe the run.
+
+        Args:
+            specs: Analyzers to run
+            files: Iterable of (file path, content) pairs
+
+        Yields:
+            AnalysisResult objects
+        """
+        self.files_analyzed = 0
+        self.timings = {spec.name: 0.0 for spec in specs}
+
+        # Cross-file analyzers must see every file in this process
+        local_specs = [spec for spec in specs if not getattr(spec.analyzer_class, "shardable", True)]
+        pooled_specs = [spec for spec in specs if getattr(spec.analyzer_class, "shardable", True)]
+
+        executor = None
+        if self.jobs > 1 and pooled_specs:
+            try:
+                executor = ProcessPoolExecutor(max_workers=self.jobs)
+            except (OSError, NotImplementedError) as e:
+                if self.io:
+                    self.io.tool_warning(f"Parallel review unavailable ({e}), running serially")
+        if executor is None:
+            local_specs = specs
+            pooled_specs = []
+
+        local = [(spec, self._build_analyzer(spec)) for spec in local_specs]
+
+        if executor is None:
+            for file_path, content in files:
+                yield from self._stream_local(local, [(file_path, content)])
+        else:
+            with executor:
+                yield from self._stream_pooled(executor, pooled_specs, local, files)
+
+        for spec, analyzer in local:
+            start = time.perf_counter()
+            yield from analyzer.finalize()
+            self.timings[spec.name] += time.perf_counter() - start
+
+    def _stream_local(self, local, batch) -> Iterator[AnalysisResult]:
+        """Analyze a batch of files with the in-process analyzers."""
+        batch = [(path, ParsedSource.of(content, path)) for path, content in batch]
+        for file_path, source in batch:
+            if not local:
+                self.files_analyzed += 1
+                continue
+            for spec, analyzer in local:
+                start = time.perf_counter()
+                results, errors = self._analyze_shard_counted(analyzer, [(file_path, source)])
+                self.timings[spec.name] += time.perf_counter() - start
+                self._report_errors(errors)
+                yield from results
+            self.files_analyzed += 1
+
+    def _stream_pooled(self, executor, pooled_specs, local, files) -> Iterator[AnalysisResult]:
+        """Keep a bounded window of batches in flight on the pool."""
+        worker_specs = [
+            (spec.analyzer_class, dict(spec.kwargs, io=None, verbose=False)) for spec in pooled_specs
+        ]
+        window = self.jobs * STREAM_BATCHES_PER_JOB
+        in_flight = deque()
+        fallback = None
+
+        def drain_one():
+            nonlocal fallback
+            batch, future = in_flight.popleft()
+            try:
+                outputs, (hits, misses) = future.result()
+                self.cache_hits += hits
+                self.cache_misses += misses
+            except Exception as e:
+                # Broken pool or unpicklable result: redo this batch locally
+                if self.verbose and self.io:
+                    self.io.tool_warning(f"Review worker failed ({e}), retrying in-process")
+                if fallback is None:
+                    fallback = [self._build_analyzer(spec) for spec in pooled_specs]
+                outputs = []
+                for analyzer in fallback:
+                    start = time.perf_counter()
+                    results, errors = self._analyze_shard_counted(analyzer, batch)
+                    outputs.append((results, errors, time.perf_counter() - start))
+
+            for spec, (results, errors, elapsed) in zip(pooled_specs, outputs):
+                self.timings[spec.name] += elapsed
+                self._report_errors(errors)
+                yield from results
+
+        for batch in _batches(files, STREAM_BATCH_FILES):
+            future = executor.submit(_run_batch_task, worker_specs, batch, self.cache_root)
+            in_flight.append((batch, future))
+
+            # Cross-file analyzers run here while the workers handle the batch
+            yield from self._stream_local(local, batch)
+
+            while len(in_flight) >= window:
+                yield from drain_one()
+
+        while in_flight:
+            yield from drain_one()
+
+    def cache_metadata(self) -> Dict[str, Any]:
+        """Cache size plus the hits and misses counted by this scheduler."""
+        stats = self.cache.stats()
+        lookups = self.cache_hits + self.cache_misses
+        stats.update(
+            hits=self.cache_hits,
+            misses=self.cache_misses,
+            hit_ratio=(self.cache_hits / lookups) if lookups else 0.0,
+        )
+        return stats
+
+    def _run_pooled(self, specs, files, shards, slots, timings):
+        """Fan shardable analyzers out to a process pool."""
+        try:
+            executor = ProcessPoolExecutor(max_workers=self.jobs)
+        except (OSError, NotImplementedError) as e:
+            # Some sandboxes forbid multiprocessing; fall back to serial
+            if self.io:
+                self.io.tool_warning(f"Parallel review unavailable ({e}), running serially")
+            for index, spec in enumerate(specs):
+                self._run_in_process(index, spec, files, [list(files.items())], slots, timings)
+            return
+
+        with executor:
+            futures = {}
+            for index, spec in enumerate(specs):
+                if not getattr(spec.analyzer_class, "shardable", True):
+                    continue
+                slots[index] = [None] * len(shards)
+                worker_kwargs = dict(spec.kwargs, io=None, verbose=False)
+                for shard_index, shard in enumerate(shards):
+                    future = executor.submit(
+                        _run_shard_task,
+                        spec.analyzer_class,
+                        worker_kwargs,
+                        shard,
+                        self.cache_root,
+                    )
+                    futures[(index, shard_index)] = future
+
+            # Cross-file analyzers need the whole file set, so run them here
+            # while the pool works through the shards
+            for index, spec in enumerate(specs):
+                if not getattr(spec.analyzer_class, "shardable", True):
+                    self._run_in_process(index, spec, files, [list(files.items())], slots, timings)
+
+            for (index, shard_index), future in futures.items():
+                spec = specs[index]
+                shard = shards[shard_index]
+                try:
+                    results, errors, elapsed, (hits, misses) = future.result()
+                    self.cache_hits += hits
+                    self.cache_misses += misses
+                except Exception as e:
+                    # Broken pool or unpicklable result: redo this shard locally
+                    if self.verbose and self.io:
+                        self.io.tool_warning(f"{spec.name} worker failed ({e}), retrying in-process")
+                    start = time.perf_counter()
+                    analyzer = self._build_analyzer(spec)
+                    results, errors = self._analyze_shard_counted(analyzer, shard)
+                    elapsed = time.perf_counter() - start
+
+                slots[index][shard_index] = results
+                timings[spec.name] += elapsed
+                self._report_errors(errors)
+
+    def _run_in_process(self, index, spec, files, shards, slots, timings):
+        """Run one analyzer in this process, keeping any cross-file behaviour."""
+        start = time.perf_counter()
+        analyzer = self._build_analyzer(spec)
+
+        if getattr(spec.analyzer_class, "shardable", True):
+            shard_results = []
+            for shard in shards:
+                results, errors = self._analyze_shard_counted(analyzer, shard)
+                shard_results.append(results)
+                self._report_errors(errors)
+            slots[index] = shard_results
+        else:
+            hits, misses = self._cache_counts()
+            slots[index] = [analyzer.analyze_files(files).results]
+            self._add_cache_counts(hits, misses)
+
+        timings[spec.name] += time.perf_counter() - start
+
+    def _build_analyzer(self, spec: AnalyzerSpec):
+        analyzer = spec.analyzer_class(**dict(spec.kwargs, io=self.io, verbose=self.verbose))
+        analyzer.cache = self.cache
+        return analyzer
+
+    def _analyze_shard_counted(self, analyzer, shard):
+        hits, misses = self._cache_counts()
+        results, errors = _analyze_shard(analyzer, shard)
+        self._add_cache_counts(hits, misses)
+        return results, errors
+
+    def _cache_counts(self):
+        if not self.cache:
+            return 0, 0
+        return self.cache.hits, self.cache.misses
+
+    def _add_cache_counts(self, hits, misses):
+        if self.cache:
+            self.cache_hits += self.cache.hits - hits
+            self.cache_misses += self.cache.misses - misses
+
+    def _report_errors(self, errors: List[str]):
+        if self.io:
+            for error in errors:
+                self.io.tool_error(error)
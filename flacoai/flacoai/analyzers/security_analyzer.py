@@ -155,93 +155,85 @@ class SecurityAnalyzer(BaseAnalyzer):
         if not self._is_analyzable(content):
             return results
 
-        # Check all security patterns
-        results.extend(self._check_patterns(file_path, content, self.sql_patterns,
-                                           "SQL Injection Risk", Severity.HIGH,
-                                           "Use parameterized queries or prepared statements"))
+        # Check all security patterns: (patterns, title, severity, recommendation),
+        # all matched in one scan
+        checks = []
 
-        results.extend(self._check_patterns(file_path, content, self.xss_patterns,
-                                           "Cross-Site Scripting (XSS) Risk", Severity.HIGH,
-                                           "Sanitize user input and use safe DOM manipulation methods"))
+        checks.append((self.sql_patterns, "SQL Injection Risk", Severity.HIGH,
+                       "Use parameterized queries or prepared statements"))
 
-        results.extend(self._check_patterns(file_path, content, self.credential_patterns,
-                                           "Hardcoded Credentials", Severity.CRITICAL,
-                                           "Use environment variables or secure credential storage"))
+        checks.append((self.xss_patterns, "Cross-Site Scripting (XSS) Risk", Severity.HIGH,
+                       "Sanitize user input and use safe DOM manipulation methods"))
 
-        results.extend(self._check_patterns(file_path, content, self.command_injection_patterns,
-                                           "Command Injection Risk", Severity.CRITICAL,
-                                           "Avoid shell=True and use parameterized commands"))
+        checks.append((self.credential_patterns, "Hardcoded Credentials", Severity.CRITICAL,
+                       "Use environment variables or secure credential storage"))
 
-        results.extend(self._check_patterns(file_path, content, self.path_traversal_patterns,
-                                           "Path Traversal Risk", Severity.HIGH,
-                                           "Validate and sanitize file paths, use os.path.normpath()"))
+        checks.append((self.command_injection_patterns, "Command Injection Risk", Severity.CRITICAL,
+                       "Avoid shell=True and use parameterized commands"))
 
-        results.extend(self._check_patterns(file_path, content, self.crypto_patterns,
-                                           "Weak Cryptography", Severity.MEDIUM,
-                                           "Use SHA-256 or better, AES with secure modes"))
+        checks.append((self.path_traversal_patterns, "Path Traversal Risk", Severity.HIGH,
+                       "Validate and sanitize file paths, use os.path.normpath()"))
 
-        results.extend(self._check_patterns(file_path, content, self.csrf_patterns,
-                                           "Missing CSRF Protection", Severity.MEDIUM,
-                                           "Add CSRF tokens to forms and validate on submission"))
+        checks.append((self.crypto_patterns, "Weak Cryptography", Severity.MEDIUM,
+                       "Use SHA-256 or better, AES with secure modes"))
 
-        results.extend(self._check_patterns(file_path, content, self.deserialization_patterns,
-                                           "Insecure Deserialization", Severity.HIGH,
-                                           "Use safe serialization or validate deserialized data"))
+        checks.append((self.csrf_patterns, "Missing CSRF Protection", Severity.MEDIUM,
+                       "Add CSRF tokens to forms and validate on submission"))
 
-        results.extend(self._check_patterns(file_path, content, self.auth_patterns,
-                                           "Authentication/Authorization Issue", Severity.HIGH,
-                                           "Use secure authentication frameworks and proper access control"))
+        checks.append((self.deserialization_patterns, "Insecure Deserialization", Severity.HIGH,
+                       "Use safe serialization or validate deserialized data"))
 
-        results.extend(self._check_patterns(file_path, content, self.logging_patterns,
-                                           "Sensitive Data in Logs", Severity.MEDIUM,
-                                           "Remove sensitive data from log statements"))
+        checks.append((self.auth_patterns, "Authentication/Authorization Issue", Severity.HIGH,
+                       "Use secure authentication frameworks and proper access control"))
+
+        checks.append((self.logging_patterns, "Sensitive Data in Logs", Severity.MEDIUM,
+                       "Remove sensitive data from log statements"))
 
         # iOS-specific checks
         ext = self.get_file_extension(file_path)
         if ext in ('swift', 'm', 'mm', 'plist', 'xml'):
-            results.extend(self._check_patterns(file_path, content, self.ios_insecure_storage_patterns,
-                                               "Insecure iOS Data Storage", Severity.CRITICAL,
-                                               "Use Keychain for sensitive data instead of UserDefaults or files"))
+            checks.append((self.ios_insecure_storage_patterns, "Insecure iOS Data Storage", Severity.CRITICAL,
+                           "Use Keychain for sensitive data instead of UserDefaults or files"))
+
+            checks.append((self.ios_weak_crypto_patterns, "Weak iOS Cryptography", Severity.HIGH,
+                           "Use AES-256 (kCCAlgorithmAES) and SHA-256 or better"))
 
-            results.extend(self._check_patterns(file_path, content, self.ios_weak_crypto_patterns,
-                                               "Weak iOS Cryptography", Severity.HIGH,
-                                               "Use AES-256 (kCCAlgorithmAES) and SHA-256 or better"))
+            checks.append((self.ios_app_transport_security_patterns, "App Transport Security Issue", Severity.HIGH,
+                           "Enable ATS and use HTTPS for all network requests"))
 
-            results.extend(self._check_patterns(file_path, content, self.ios_app_transport_security_patterns,
-                                               "App Transport Security Issue", Severity.HIGH,
-                                               "Enable ATS and use HTTPS for all network requests"))
+            checks.append((self.ios_url_scheme_patterns, "URL Scheme Vulnerability", Severity.HIGH,
+                           "Validate and sanitize URL schemes before opening"))
 
-            results.extend(self._check_patterns(file_path, content, self.ios_url_scheme_patterns,
-                                               "URL Scheme Vulnerability", Severity.HIGH,
-                                               "Validate and sanitize URL schemes before opening"))
+            checks.append((self.ios_keychain_patterns, "Weak Keychain Protection", Severity.MEDIUM,
+                           "Use kSecAttrAccessibleWhenUnlockedThisDeviceOnly"))
 
-            results.extend(self._check_patterns(file_path, content, self.ios_keychain_patterns,
-                                               "Weak Keychain Protection", Severity.MEDIUM,
-                                               "Use kSecAttrAccessibleWhenUnlockedThisDeviceOnly"))
+            checks.append((self.ios_debug_patterns, "Debug Code in Release", Severity.MEDIUM,
+                           "Wrap debug code in #if DEBUG and remove before release"))
 
-            results.extend(self._check_patterns(file_path, content, self.ios_debug_patterns,
-                                               "Debug Code in Release", Severity.MEDIUM,
-                                               "Wrap debug code in #if DEBUG and remove before release"))
+            checks.append((self.ios_webview_patterns, "WebView Injection Risk", Severity.HIGH,
+                           "Sanitize user input before using in WebView JavaScript or HTML"))
 
-            results.extend(self._check_patterns(file_path, content, self.ios_webview_patterns,
-                                               "WebView Injection Risk", Severity.HIGH,
-                                               "Sanitize user input before using in WebView JavaScript or HTML"))
+            checks.append((self.ios_certificate_pinning_patterns, "Missing Certificate Pinning", Severity.MEDIUM,
+                           "Implement certificate pinning for sensitive network requests"))
 
-            results.extend(self._check_patterns(file_path, content, self.ios_certificate_pinning_patterns,
-                                               "Missing Certificate Pinning", Severity.MEDIUM,
-                                               "Implement certificate pinning for sensitive network requests"))
+        results.extend(self._check_pattern_groups(file_path, content, checks))
 
         return results
 
     def _check_patterns(self, file_path: str, content: str, patterns: List[tuple],
                        title: str, severity: Severity, recommendation: str) -> List[AnalysisResult]:
         """Check content against a list of patterns."""
+        return self._check_pattern_groups(file_path, content,
+                                          [(patterns, title, severity, recommendation)])
+
+    def _check_pattern_groups(self, file_path: str, content: str, checks: List[tuple]) -> List[AnalysisResult]:
+        """Check content against several pattern groups in a single scan."""
         results = []
 
-        for pattern, description in patterns:
-            matches = self.find_pattern(content, pattern, re.IGNORECASE)
+        grouped = self.find_pattern_groups(content, [c[0] for c in checks], re.IGNORECASE)
 
-            for line_num, column, matched_text in matches:
+        for (_, title, severity, recommendation), matches in zip(checks, grouped):
+            for description, line_num, column, matched_text in matches:
                 # Skip comments and strings in some cases
                 if self._is_likely_false_positive(content, line_num, matched_text):
                     continue
@@ -283,7 +275,7 @@ class SecurityAnalyzer(BaseAnalyzer):
 
     def _is_likely_false_positive(self, content: str, line_num: int, matched_text: str) -> bool:
         """Check if a match is likely a false positive."""
-        lines = content.split('\n')
+        lines = self.line_index(content).lines
         if line_num > len(lines):
             return False
 
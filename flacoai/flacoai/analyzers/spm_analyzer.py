@@ -103,7 +103,7 @@ class SPMAnalyzer(BaseAnalyzer):
         # Check each dependency
         for match in matches:
             url = match.group(1)
-            line_num = content[:match.start()].count('\n') + 1
+            line_num = self.line_index(content).line_of(match.start())
 
             # Check for HTTP (insecure) URLs
             if url.startswith('http://'):
@@ -122,8 +122,8 @@ class SPMAnalyzer(BaseAnalyzer):
                 results.append(result)
 
             # Check for dependencies by exact commit (good) vs branch (risky)
-            line_content = content.split('\n')[line_num - 1]
-            next_few_lines = '\n'.join(content.split('\n')[line_num:line_num+5])
+            line_content = self.line_index(content).lines[line_num - 1]
+            next_few_lines = '\n'.join(self.line_index(content).lines[line_num:line_num+5])
 
             # Look for branch-based dependency
             if '.branch(' in next_few_lines:
@@ -203,7 +203,7 @@ class SPMAnalyzer(BaseAnalyzer):
 
         for match in matches:
             version = int(match.group(1))
-            line_num = content[:match.start()].count('\n') + 1
+            line_num = self.line_index(content).line_of(match.start())
 
             # Warn if iOS version is very old
             if version < 14:
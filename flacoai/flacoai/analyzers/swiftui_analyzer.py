@@ -3,6 +3,7 @@
 import re
 from typing import List
 from .base_analyzer import BaseAnalyzer, AnalysisResult, Severity, Category
+from .parsed_source import ParsedSource
 
 
 class SwiftUIAnalyzer(BaseAnalyzer):
@@ -32,6 +33,8 @@ class SwiftUIAnalyzer(BaseAnalyzer):
         if not self._is_swiftui_file(content):
             return results
 
+        content = self.parse_source(file_path, content)
+
         results.extend(self._check_view_body_size(file_path, content))
         results.extend(self._check_state_management(file_path, content))
         results.extend(self._check_view_builder_usage(file_path, content))
@@ -49,7 +52,7 @@ class SwiftUIAnalyzer(BaseAnalyzer):
         """Check if file uses SwiftUI."""
         return 'import SwiftUI' in content or ': View' in content
 
-    def _check_view_body_size(self, file_path: str, content: str) -> List[AnalysisResult]:
+    def _check_view_body_size(self, file_path: str, content: ParsedSource) -> List[AnalysisResult]:
         """Check for overly large View body implementations."""
         results = []
 
@@ -60,22 +63,14 @@ class SwiftUIAnalyzer(BaseAnalyzer):
         for match in matches:
             # Find the closing brace
             start = match.end()
-            brace_count = 1
-            pos = start
-
-            while pos < len(content) and brace_count > 0:
-                if content[pos] == '{':
-                    brace_count += 1
-                elif content[pos] == '}':
-                    brace_count -= 1
-                pos += 1
+            pos = content.block_end(start)
 
             body_content = content[start:pos-1]
             line_count = body_content.count('\n')
 
             # Flag if body is too large
             if line_count > 50:
-                line_num = content[:match.start()].count('\n') + 1
+                line_num = content.line_of(match.start())
                 code_snippet = self.get_lines_context(content, line_num, context_lines=2)
 
                 result = AnalysisResult(
@@ -95,7 +90,7 @@ class SwiftUIAnalyzer(BaseAnalyzer):
 
         return results
 
-    def _check_state_management(self, file_path: str, content: str) -> List[AnalysisResult]:
+    def _check_state_management(self, file_path: str, content: ParsedSource) -> List[AnalysisResult]:
         """Check for state management issues."""
         results = []
 
@@ -104,8 +99,8 @@ class SwiftUIAnalyzer(BaseAnalyzer):
         matches = list(re.finditer(state_class_pattern, content))
 
         for match in matches:
-            line_num = content[:match.start()].count('\n') + 1
-            line_content = content.split('\n')[line_num - 1]
+            line_num = content.line_of(match.start())
+            line_content = content.lines[line_num - 1]
 
             # Check if it's likely a class (starts with uppercase)
             type_match = re.search(r':\s*([A-Z]\w+)', line_content)
@@ -141,7 +136,7 @@ class SwiftUIAnalyzer(BaseAnalyzer):
 
         return results
 
-    def _check_view_builder_usage(self, file_path: str, content: str) -> List[AnalysisResult]:
+    def _check_view_builder_usage(self, file_path: str, content: ParsedSource) -> List[AnalysisResult]:
         """Check for missing @ViewBuilder usage."""
         results = []
 
@@ -151,24 +146,16 @@ class SwiftUIAnalyzer(BaseAnalyzer):
 
         for match in matches:
             func_name = match.group(1)
-            line_num = content[:match.start()].count('\n') + 1
+            line_num = content.line_of(match.start())
 
             # Check if @ViewBuilder is present before the function
-            preceding_lines = content[:match.start()].split('\n')[-3:]
+            preceding_lines = content.lines_before(match.start(), 3)
             has_viewbuilder = any('@ViewBuilder' in line for line in preceding_lines)
 
             if not has_viewbuilder:
                 # Check if function body has conditionals (if/switch)
                 start = match.end()
-                brace_count = 1
-                pos = start
-
-                while pos < len(content) and brace_count > 0:
-                    if content[pos] == '{':
-                        brace_count += 1
-                    elif content[pos] == '}':
-                        brace_count -= 1
-                    pos += 1
+                pos = content.block_end(start)
 
                 func_body = content[start:pos-1]
 
@@ -190,7 +177,7 @@ class SwiftUIAnalyzer(BaseAnalyzer):
 
         return results
 
-    def _check_preview_usage(self, file_path: str, content: str) -> List[AnalysisResult]:
+    def _check_preview_usage(self, file_path: str, content: ParsedSource) -> List[AnalysisResult]:
         """Check for missing or improper #Preview usage."""
         results = []
 
@@ -219,7 +206,7 @@ class SwiftUIAnalyzer(BaseAnalyzer):
         matches = list(re.finditer(old_preview_pattern, content))
 
         for match in matches:
-            line_num = content[:match.start()].count('\n') + 1
+            line_num = content.line_of(match.start())
             code_snippet = self.get_lines_context(content, line_num, context_lines=1)
 
             result = AnalysisResult(
@@ -257,7 +244,7 @@ class SwiftUIAnalyzer(BaseAnalyzer):
 
         return results
 
-    def _check_anyview_usage(self, file_path: str, content: str) -> List[AnalysisResult]:
+    def _check_anyview_usage(self, file_path: str, content: ParsedSource) -> List[AnalysisResult]:
         """Check for AnyView usage (type erasure has performance cost)."""
         results = []
 
@@ -265,7 +252,7 @@ class SwiftUIAnalyzer(BaseAnalyzer):
         matches = list(re.finditer(anyview_pattern, content))
 
         for match in matches:
-            line_num = content[:match.start()].count('\n') + 1
+            line_num = content.line_of(match.start())
             code_snippet = self.get_lines_context(content, line_num, context_lines=1)
 
             result = AnalysisResult(
@@ -282,7 +269,7 @@ class SwiftUIAnalyzer(BaseAnalyzer):
 
         return results
 
-    def _check_onappear_usage(self, file_path: str, content: str) -> List[AnalysisResult]:
+    def _check_onappear_usage(self, file_path: str, content: ParsedSource) -> List[AnalysisResult]:
         """Check for onAppear with heavy operations."""
         results = []
 
@@ -292,15 +279,7 @@ class SwiftUIAnalyzer(BaseAnalyzer):
         for match in matches:
             # Get the onAppear block
             start = match.end()
-            brace_count = 1
-            pos = start
-
-            while pos < len(content) and brace_count > 0:
-                if content[pos] == '{':
-                    brace_count += 1
-                elif content[pos] == '}':
-                    brace_count -= 1
-                pos += 1
+            pos = content.block_end(start)
 
             onappear_content = content[start:pos-1]
 
@@ -308,13 +287,13 @@ class SwiftUIAnalyzer(BaseAnalyzer):
             heavy_ops = [
                 ('URLSession', 'Network requests'),
                 ('fetch', 'Data fetching'),
-                ('try Data(contentsOf:', 'File I/O'),
+                (r'try Data\(contentsOf:', 'File I/O'),
                 ('for.*in.*0\.\.', 'Loops'),
             ]
 
             for pattern, description in heavy_ops:
                 if re.search(pattern, onappear_content):
-                    line_num = content[:match.start()].count('\n') + 1
+                    line_num = content.line_of(match.start())
                     code_snippet = self.get_lines_context(content, line_num, context_lines=2)
 
                     result = AnalysisResult(
@@ -332,7 +311,7 @@ class SwiftUIAnalyzer(BaseAnalyzer):
 
         return results
 
-    def _check_observable_patterns(self, file_path: str, content: str) -> List[AnalysisResult]:
+    def _check_observable_patterns(self, file_path: str, content: ParsedSource) -> List[AnalysisResult]:
         """Check for Observable macro usage (iOS 17+)."""
         results = []
 
@@ -342,7 +321,7 @@ class SwiftUIAnalyzer(BaseAnalyzer):
 
         for match in matches:
             class_name = match.group(1)
-            line_num = content[:match.start()].count('\n') + 1
+            line_num = content.line_of(match.start())
             code_snippet = self.get_lines_context(content, line_num, context_lines=1)
 
             result = AnalysisResult(
@@ -359,7 +338,7 @@ class SwiftUIAnalyzer(BaseAnalyzer):
 
         return results
 
-    def _check_environment_usage(self, file_path: str, content: str) -> List[AnalysisResult]:
+    def _check_environment_usage(self, file_path: str, content: ParsedSource) -> List[AnalysisResult]:
         """Check for environment object usage."""
         results = []
 
@@ -372,7 +351,7 @@ class SwiftUIAnalyzer(BaseAnalyzer):
             has_env_in_preview = bool(re.search(r'\.environmentObject\(', content))
 
             if not has_env_in_preview:
-                line_num = content[:matches[0].start()].count('\n') + 1
+                line_num = content.line_of(matches[0].start())
                 result = AnalysisResult(
                     file=file_path,
                     line=line_num,
@@ -387,7 +366,7 @@ class SwiftUIAnalyzer(BaseAnalyzer):
 
         return results
 
-    def _check_binding_patterns(self, file_path: str, content: str) -> List[AnalysisResult]:
+    def _check_binding_patterns(self, file_path: str, content: ParsedSource) -> List[AnalysisResult]:
         """Check for Binding usage patterns."""
         results = []
 
@@ -397,11 +376,11 @@ class SwiftUIAnalyzer(BaseAnalyzer):
 
         # Only flag if used outside of Previews
         for match in matches:
-            line_num = content[:match.start()].count('\n') + 1
+            line_num = content.line_of(match.start())
 
             # Check if we're in a Preview
-            lines_before = content[:match.start()].split('\n')
-            in_preview = any('#Preview' in line or '_Previews' in line for line in lines_before[-10:])
+            lines_before = content.lines_before(match.start(), 10)
+            in_preview = any('#Preview' in line or '_Previews' in line for line in lines_before)
 
             if not in_preview:
                 code_snippet = self.get_lines_context(content, line_num, context_lines=1)
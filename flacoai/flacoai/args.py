@@ -265,6 +265,45 @@ def get_parser(default_config_files, git_root):
         default=2,
         help="Multiplier for map tokens when no files are specified (default: 2)",
     )
+    group.add_argument(
+        "--map-ranking",
+        choices=["networkx", "sparse"],
+        default="networkx",
+        help=(
+            "PageRank backend for the repo map: networkx, or a vectorized scipy sparse matrix"
+            " that is faster in large repos (default: networkx)"
+        ),
+    )
+
+    ##########
+    group = parser.add_argument_group("Code review settings")
+    group.add_argument(
+        "--review-jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Number of worker processes for /review static analysis, 0 for all CPUs (default: 1)",
+    )
+    group.add_argument(
+        "--review-cache",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Reuse cached /review findings for files that have not changed (default: True)",
+    )
+    group.add_argument(
+        "--review-diff-concurrency",
+        type=int,
+        default=4,
+        metavar="N",
+        help="Number of concurrent LLM requests for /review-diff (default: 4)",
+    )
+    group.add_argument(
+        "--review-diff-chunk-tokens",
+        type=int,
+        default=6000,
+        metavar="TOKENS",
+        help="Diff tokens sent per /review-diff request; larger diffs are split (default: 6000)",
+    )
 
     ##########
     group = parser.add_argument_group("History Files")
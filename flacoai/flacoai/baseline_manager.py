@@ -1,10 +1,180 @@
-"""Baseline manager for tracking code review progress over time."""
+"""Baseline manager for tracking code review progress over time.
 
+Baselines are stored in SQLite with one row per finding, indexed by file, so
+a comparison reads only the files it is shown and never loads the whole
+baseline into memory. Findings are matched by a fingerprint of the flagged
+line's text and the symbol enclosing it rather than by line number, so
+editing code above a finding does not turn it into one new and one fixed
+issue.
+"""
+
+import hashlib
 import json
 import os
-from pathlib import Path
-from typing import Dict, List, Optional
+import re
+import sqlite3
+from bisect import bisect_left
+from collections import OrderedDict, defaultdict
 from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+BASELINE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS findings (
+    file TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+"""
+
+# Created after the rows are inserted, which is faster than maintaining it
+BASELINE_INDEX = "CREATE INDEX IF NOT EXISTS findings_file ON findings (file)"
+
+# Rows inserted per executemany() call while saving
+INSERT_BATCH_SIZE = 1000
+
+# Files whose line text and symbols are kept for fingerprinting; findings
+# arrive file by file, with only cross-file findings revisiting old files
+ANCHOR_CACHE_FILES = 16
+
+# Declarations that name the symbol a finding is in (Swift, Python, JS/TS, Kotlin)
+DECLARATION = re.compile(
+    r'^(?P<indent>[ \t]*)(?:@\w+(?:\([^)]*\))?\s+)*'
+    r'(?:(?:public|private|fileprivate|internal|open|static|final|override|'
+    r'mutating|nonisolated|async|export|default|abstract|class(?=\s+(?:func|var)))\s+)*'
+    r'(?P<kind>func|class|struct|enum|protocol|extension|actor|def|function|interface|fun|object|init)\b'
+    r'\s*(?P<name>[A-Za-z_][\w.]*)?'
+)
+
+
+class SourceAnchors:
+    """Line text and enclosing symbols of one file, for fingerprinting."""
+
+    def __init__(self, content: str):
+        self.lines = content.splitlines()
+        self.decl_lines: List[int] = []
+        self.decls: List[Tuple[int, str]] = []
+
+        for number, text in enumerate(self.lines, start=1):
+            match = DECLARATION.match(text)
+            if match:
+                name = match.group("name") or match.group("kind")
+                self.decl_lines.append(number)
+                self.decls.append((len(match.group("indent").expandtabs(4)), name))
+
+    def line_text(self, line: int) -> str:
+        """Text of a 1-indexed line with whitespace runs collapsed."""
+        if not 0 < line <= len(self.lines):
+            return ""
+        return " ".join(self.lines[line - 1].split())
+
+    def symbol(self, line: int) -> str:
+        """Name of the closest declaration above line that is indented less than it."""
+        if not 0 < line <= len(self.lines):
+            return ""
+        text = self.lines[line - 1]
+        indent = len(text.expandtabs(4)) - len(text.expandtabs(4).lstrip())
+        if not indent:
+            return ""
+
+        index = bisect_left(self.decl_lines, line) - 1
+        while index >= 0:
+            decl_indent, name = self.decls[index]
+            if decl_indent < indent:
+                return name
+            index -= 1
+        return ""
+
+
+class BaselineStore:
+    """Read access to a saved baseline."""
+
+    def __init__(self, path: Path):
+        self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+    def meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @property
+    def timestamp(self) -> Optional[str]:
+        return self.meta("timestamp")
+
+    def files(self) -> List[str]:
+        """Files with findings in the baseline."""
+        return [row[0] for row in self.conn.execute("SELECT DISTINCT file FROM findings ORDER BY file")]
+
+    def fingerprints(self, file_path: str) -> List[Tuple[str, str]]:
+        """(fingerprint, severity) of each baseline finding in one file."""
+        return self.conn.execute(
+            "SELECT fingerprint, severity FROM findings WHERE file = ?", (file_path,)
+        ).fetchall()
+
+    def severity_counts(self) -> Iterator[Tuple[str, str, int]]:
+        """(file, severity, count) for every file, without reading the findings."""
+        yield from self.conn.execute(
+            "SELECT file, severity, COUNT(*) FROM findings GROUP BY file, severity"
+        )
+
+    def results(self, file_path: Optional[str] = None) -> Iterator[Dict]:
+        """Baseline findings as dicts (with their fingerprint), one file or all."""
+        if file_path is None:
+            rows = self.conn.execute("SELECT fingerprint, data FROM findings ORDER BY rowid")
+        else:
+            rows = self.conn.execute(
+                "SELECT fingerprint, data FROM findings WHERE file = ? ORDER BY rowid", (file_path,)
+            )
+        for fingerprint, data in rows:
+            result = json.loads(data)
+            result["fingerprint"] = fingerprint
+            yield result
+
+    def close(self):
+        self.conn.close()
+
+
+class BaselineWriter:
+    """Writes a new baseline, replacing the current one only on commit."""
+
+    def __init__(self, manager: "BaselineManager"):
+        self.manager = manager
+        self.count = 0
+        self.batch = []
+        self.tmp_path = manager.baseline_file.with_suffix(".db.tmp")
+        if self.tmp_path.exists():
+            self.tmp_path.unlink()
+        self.conn = sqlite3.connect(str(self.tmp_path))
+        self.conn.executescript(BASELINE_SCHEMA)
+
+    def add(self, result, fingerprint: Optional[str] = None):
+        """Add one finding (AnalysisResult, or a dict shaped like result_to_dict)."""
+        data = result if isinstance(result, dict) else self.manager.result_to_dict(result)
+        if fingerprint is None:
+            fingerprint = self.manager.fingerprint_result(result)
+        self.batch.append((data["file"], fingerprint, data["severity"], json.dumps(data)))
+        self.count += 1
+        if len(self.batch) >= INSERT_BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        self.conn.executemany("INSERT INTO findings VALUES (?, ?, ?, ?)", self.batch)
+        self.batch = []
+
+    def commit(self, files_analyzed: int, timestamp: Optional[str] = None):
+        self.flush()
+        self.conn.execute(BASELINE_INDEX)
+        self.conn.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [
+                ("timestamp", timestamp or datetime.now().isoformat()),
+                ("files_analyzed", str(files_analyzed)),
+            ],
+        )
+        self.conn.commit()
+        self.conn.close()
+        os.replace(self.tmp_path, self.manager.baseline_file)
 
 
 class BaselineManager:
@@ -19,7 +189,10 @@ class BaselineManager:
         self.project_root = Path(project_root)
         self.baseline_dir = self.project_root / ".flaco" / "baselines"
         self.baseline_dir.mkdir(parents=True, exist_ok=True)
-        self.baseline_file = self.baseline_dir / "current.json"
+        self.baseline_file = self.baseline_dir / "current.db"
+        # Baselines saved before the SQLite store; imported on first use
+        self.legacy_file = self.baseline_dir / "current.json"
+        self._anchors: "OrderedDict[Tuple[str, int, int], Optional[SourceAnchors]]" = OrderedDict()
 
     def save_baseline(self, report) -> None:
         """Save current review results as baseline.
@@ -27,51 +200,149 @@ class BaselineManager:
         Args:
             report: AnalysisReport object to save
         """
-        baseline_data = {
-            "timestamp": datetime.now().isoformat(),
-            "files_analyzed": report.files_analyzed,
-            "results": [
-                {
-                    "file": r.file,
-                    "line": r.line,
-                    "severity": r.severity.value,
-                    "category": r.category.value,
-                    "title": r.title,
-                    "description": r.description,
-                    "recommendation": r.recommendation,
-                    "code_snippet": r.code_snippet,
-                }
-                for r in report.results
-            ],
+        writer = BaselineWriter(self)
+        for result in report.results:
+            writer.add(result)
+        writer.commit(report.files_analyzed)
+
+    def writer(self) -> BaselineWriter:
+        """Start writing a new baseline one finding at a time."""
+        return BaselineWriter(self)
+
+    @staticmethod
+    def result_to_dict(result) -> Dict:
+        """Serialize one finding as stored in the baseline file."""
+        return {
+            "file": result.file,
+            "line": result.line,
+            "severity": result.severity.value,
+            "category": result.category.value,
+            "title": result.title,
+            "description": result.description,
+            "recommendation": result.recommendation,
+            "code_snippet": result.code_snippet,
         }
 
-        with open(self.baseline_file, "w") as f:
-            json.dump(baseline_data, f, indent=2)
+    @staticmethod
+    def fingerprint(result, anchors: Optional[SourceAnchors] = None) -> str:
+        """Fingerprint a result (AnalysisResult or baseline dict) independent of its line number.
+
+        The fingerprint covers the file, the title, the flagged line's text
+        and the symbol enclosing it, so the finding keeps it when lines are
+        added or removed above. Without anchors (the file could not be read)
+        the code snippet stands in for the line. Baseline dicts carry the
+        fingerprint they were saved with.
+
+        Args:
+            result: AnalysisResult or baseline dict
+            anchors: SourceAnchors of the file the result is in
+
+        Returns:
+            Hex digest
+        """
+        if isinstance(result, dict):
+            if result.get("fingerprint"):
+                return result["fingerprint"]
+            file_path, line, title = result["file"], result.get("line"), result["title"]
+            snippet = result.get("code_snippet")
+        else:
+            file_path, line, title, snippet = result.file, result.line, result.title, result.code_snippet
+
+        if anchors is not None and line:
+            text, symbol = anchors.line_text(line), anchors.symbol(line)
+        else:
+            text, symbol = " ".join((snippet or "").split()), ""
+
+        key = "\0".join((str(file_path), title, text, symbol))
+        return hashlib.sha1(key.encode("utf-8", "surrogatepass")).hexdigest()
+
+    def anchors(self, file_path: str) -> Optional[SourceAnchors]:
+        """SourceAnchors for a file on disk, None if it cannot be read."""
+        path = self.project_root / file_path
+        try:
+            stat = path.stat()
+            key = (file_path, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+
+        if key in self._anchors:
+            self._anchors.move_to_end(key)
+            return self._anchors[key]
+
+        try:
+            anchors = SourceAnchors(path.read_text(encoding="utf-8", errors="replace"))
+        except OSError:
+            anchors = None
+
+        self._anchors[key] = anchors
+        if len(self._anchors) > ANCHOR_CACHE_FILES:
+            self._anchors.popitem(last=False)
+        return anchors
+
+    def fingerprint_result(self, result) -> str:
+        """Fingerprint a finding against the current contents of its file."""
+        return self.fingerprint(result, self.anchors(result.file))
+
+    def open_store(self) -> Optional[BaselineStore]:
+        """Open the saved baseline for reading, None if there is none."""
+        if not self.baseline_file.exists() and self.legacy_file.exists():
+            self._import_legacy()
+        if not self.baseline_file.exists():
+            return None
+        return BaselineStore(self.baseline_file)
+
+    def _import_legacy(self):
+        """Convert a JSON baseline into the store.
+
+        Its findings are fingerprinted against the files as they are now,
+        which matches as long as they have not changed since it was saved.
+        """
+        with open(self.legacy_file, "r") as f:
+            legacy = json.load(f)
+
+        writer = BaselineWriter(self)
+        for result in legacy.get("results", []):
+            anchors = self.anchors(result["file"])
+            writer.add(result, self.fingerprint(result, anchors))
+        writer.commit(legacy.get("files_analyzed", 0), legacy.get("timestamp"))
 
     def load_baseline(self) -> Optional[Dict]:
         """Load saved baseline.
 
+        This reads every finding into memory; comparisons use the store
+        directly and do not need it.
+
         Returns:
             Baseline data dict or None if no baseline exists
         """
-        if not self.baseline_file.exists():
+        store = self.open_store()
+        if store is None:
             return None
 
-        with open(self.baseline_file, "r") as f:
-            return json.load(f)
+        try:
+            return {
+                "timestamp": store.timestamp,
+                "files_analyzed": int(store.meta("files_analyzed") or 0),
+                "results": list(store.results()),
+            }
+        finally:
+            store.close()
 
     def compare_with_baseline(self, current_report) -> Dict:
         """Compare current results with baseline.
 
+        Findings are matched per file by fingerprint, each baseline finding
+        matching at most one current finding.
+
         Args:
             current_report: Current AnalysisReport object
 
         Returns:
             Dict with new, fixed, and unchanged issues
         """
-        baseline = self.load_baseline()
+        store = self.open_store()
 
-        if not baseline:
+        if not store:
             return {
                 "new_issues": current_report.results,
                 "fixed_issues": [],
@@ -79,45 +350,37 @@ class BaselineManager:
                 "baseline_exists": False,
             }
 
-        # Create fingerprints for comparison
-        def fingerprint(result):
-            """Create unique fingerprint for a result."""
-            if isinstance(result, dict):
-                return f"{result['file']}:{result['line']}:{result['title']}"
-            else:
-                return f"{result.file}:{result.line}:{result.title}"
+        try:
+            by_file = defaultdict(list)
+            for result in current_report.results:
+                by_file[result.file].append(result)
 
-        baseline_fingerprints = {
-            fingerprint(r): r for r in baseline["results"]
-        }
-        current_fingerprints = {
-            fingerprint(r): r for r in current_report.results
-        }
-
-        # Find new, fixed, and unchanged issues
-        new_issues = [
-            r for r in current_report.results
-            if fingerprint(r) not in baseline_fingerprints
-        ]
-
-        fixed_issues = [
-            baseline_fingerprints[fp]
-            for fp in baseline_fingerprints
-            if fp not in current_fingerprints
-        ]
+            matched = set()
+            fixed_issues = []
+            for file_path, results in by_file.items():
+                remaining = defaultdict(list)
+                for row in store.results(file_path):
+                    remaining[row["fingerprint"]].append(row)
+                for result in results:
+                    rows = remaining.get(self.fingerprint_result(result))
+                    if rows:
+                        rows.pop()
+                        matched.add(id(result))
+                fixed_issues.extend(row for rows in remaining.values() for row in rows)
 
-        unchanged_issues = [
-            r for r in current_report.results
-            if fingerprint(r) in baseline_fingerprints
-        ]
+            for file_path in store.files():
+                if file_path not in by_file:
+                    fixed_issues.extend(store.results(file_path))
 
-        return {
-            "new_issues": new_issues,
-            "fixed_issues": fixed_issues,
-            "unchanged_issues": unchanged_issues,
-            "baseline_exists": True,
-            "baseline_timestamp": baseline.get("timestamp"),
-        }
+            return {
+                "new_issues": [r for r in current_report.results if id(r) not in matched],
+                "fixed_issues": fixed_issues,
+                "unchanged_issues": [r for r in current_report.results if id(r) in matched],
+                "baseline_exists": True,
+                "baseline_timestamp": store.timestamp,
+            }
+        finally:
+            store.close()
 
     def get_stats(self, comparison: Dict) -> Dict:
         """Get statistics from baseline comparison.
@@ -30,13 +30,13 @@ from rich.console import Console
 
 from flacoai import __version__, models, prompts, urls, utils
 from flacoai.analytics import Analytics
-from flacoai.commands import Commands
 from flacoai.exceptions import LiteLLMExceptions
 from flacoai.history import ChatSummary
 from flacoai.io import ConfirmGroup, InputOutput
 from flacoai.linter import Linter
 from flacoai.llm import litellm
 from flacoai.models import RETRY_TIMEOUT
+from flacoai.parse_service import get_parse_service
 from flacoai.reasoning_tags import (
     REASONING_TAG,
     format_reasoning_content,
@@ -390,6 +390,7 @@ class Coder:
         total_cost=0.0,
         analytics=None,
         map_refresh="auto",
+        map_ranking="networkx",
         cache_prompts=False,
         num_cache_warming_pings=0,
         suggest_shell_commands=True,
@@ -492,7 +493,13 @@ class Coder:
 
         self.show_diffs = show_diffs
 
-        self.commands = commands or Commands(self.io, self)
+        if not commands:
+            # The commands and their dependencies load with the first coder,
+            # not with this module (which `flacoai --help` imports)
+            from flacoai.commands import Commands
+
+            commands = Commands(self.io, self)
+        self.commands = commands
         self.commands.coder = self
 
         self.repo = repo
@@ -569,6 +576,7 @@ class Coder:
                 max_inp_tokens,
                 map_mul_no_files=map_mul_no_files,
                 refresh=map_refresh,
+                ranking=map_ranking,
             )
 
         self.summarizer = summarizer or ChatSummary(
@@ -1771,16 +1779,17 @@ class Coder:
 
     def lint_edited(self, fnames):
         res = ""
-        for fname in fnames:
-            if not fname:
-                continue
-            errors = self.linter.lint(self.abs_root_path(fname))
-
+        lint_results = self.linter.lint_many([self.abs_root_path(fname) for fname in fnames if fname])
+        for errors in lint_results.values():
             if errors:
                 res += "\n"
                 res += errors
                 res += "\n"
 
+        if self.verbose:
+            self.io.tool_output(self.linter.last_run.summary())
+            self.io.tool_output(get_parse_service().stats.summary())
+
         if res:
             self.io.tool_warning(res)
 
@@ -3,6 +3,9 @@
 from .ask_coder import AskCoder
 from .review_prompts import ReviewPrompts
 
+# Seconds between progress lines while streaming a review
+PROGRESS_INTERVAL = 5.0
+
 
 class ReviewCoder(AskCoder):
     """Perform comprehensive code review without making changes."""
@@ -10,16 +13,34 @@ class ReviewCoder(AskCoder):
     edit_format = "review"
     gpt_prompts = ReviewPrompts()
 
-    def __init__(self, *args, **kwargs):
-        """Initialize ReviewCoder with analysis capabilities."""
+    def __init__(self, *args, review_jobs=1, review_cache=True, project_root=None, **kwargs):
+        """Initialize ReviewCoder with analysis capabilities.
+
+        Args:
+            review_jobs: Worker processes for static analysis (0 = all CPUs)
+            review_cache: Reuse cached findings for files that have not changed
+            project_root: Root the analysis cache and custom rules live under
+                (default: the coder's root), whatever directory flacoai runs in
+        """
         super().__init__(*args, **kwargs)
         self.review_results = []
+        self.review_skipped = 0
+        self.review_jobs = review_jobs
+        self.review_cache = review_cache
+        self.project_root = project_root or self.root
 
     def run_static_analysis(self, files_to_analyze=None, enable_security=True,
                            enable_performance=True, enable_quality=True,
-                           enable_architecture=True, enable_ios=True):
+                           enable_architecture=True, enable_ios=True, jobs=None, sinks=None,
+                           budget_seconds=None, progress=False):
         """Run static analysis with the analyzer framework.
 
+        With sinks, files are read one at a time as the analyzers get to them
+        and each finding is handed to the sinks as soon as it is found, so
+        memory stays bounded by the files in flight rather than the repo size.
+        A time budget then stops reading new files once it is spent, so pass
+        files in priority order (see SmartContextLoader.rank_files).
+
         Args:
             files_to_analyze: List of file paths to analyze (defaults to all chat files)
             enable_security: Run security analyzer
@@ -27,9 +48,131 @@ class ReviewCoder(AskCoder):
             enable_quality: Run quality analyzer
             enable_architecture: Run architecture analyzer
             enable_ios: Run iOS-specific analyzers (SF Symbols, HIG, Info.plist)
+            jobs: Worker processes for analysis (defaults to self.review_jobs, 0 = all CPUs)
+            sinks: FindingsSink objects to stream findings to (see review_sinks);
+                when None, findings are collected into an AnalysisReport
+            budget_seconds: When streaming, stop starting new files after this
+                long; files are then analyzed in the given order, and the
+                number left unreviewed is in metadata["skipped_files"]
+            progress: When streaming, report how many files are done every few seconds
+
+        Returns:
+            Combined AnalysisReport, or a ReviewSummary when streaming to sinks
+        """
+        from flacoai.analyzers import AnalysisReport, AnalyzerScheduler
+        from flacoai.review_sinks import CollectSink, ReviewSummary
+
+        # Determine files to analyze
+        if files_to_analyze is None:
+            files_to_analyze = self.abs_fnames
+
+        # Read files in a stable order so reports are reproducible; with a
+        # budget, the caller's order is the priority order
+        paths = list(files_to_analyze) if budget_seconds else sorted(files_to_analyze)
+        if sinks is None:
+            files_dict = dict(self._read_files(paths))
+            if not files_dict:
+                if self.io:
+                    self.io.tool_error("No files to analyze")
+                return AnalysisReport()
+        elif not paths:
+            if self.io:
+                self.io.tool_error("No files to analyze")
+            return ReviewSummary()
+
+        # Collect enabled analyzers, then run them all in one scheduling pass
+        specs, premium_enabled, license_tier = self.analyzer_specs(
+            enable_security=enable_security,
+            enable_performance=enable_performance,
+            enable_quality=enable_quality,
+            enable_architecture=enable_architecture,
+            enable_ios=enable_ios,
+        )
+        if jobs is None:
+            jobs = self.review_jobs
+
+        scheduler = AnalyzerScheduler(
+            jobs=jobs,
+            io=self.io,
+            verbose=self.verbose,
+            cache_root=self.project_root if self.review_cache else None,
+        )
+        if sinks is None:
+            combined_report = scheduler.run(specs, files_dict)
+            security_counts = None
+        else:
+            combined_report = self._stream_to_sinks(
+                scheduler, specs, paths, sinks, budget_seconds=budget_seconds, progress=progress
+            )
+            security_counts = combined_report.security_counts
+
+        if premium_enabled:
+            # Calculate security score for summary
+            from flacoai.premium import SecurityScoringAnalyzer
+
+            scoring = SecurityScoringAnalyzer(io=self.io, verbose=self.verbose)
+            if security_counts is None:
+                security_score_data = scoring.calculate_security_score(combined_report.results)
+            else:
+                security_score_data = scoring.score_from_counts(security_counts)
+            combined_report.metadata["security_score"] = security_score_data
+
+            if self.io:
+                self.io.tool_output(f"✓ Premium analysis complete ({license_tier.value.upper()} tier)")
+
+        elif license_tier.value == "free":
+            # Show upgrade prompt for FREE tier users
+            if self.io and enable_quality:  # Only show once
+                self.io.tool_output("")
+                self.io.tool_output("💡 Want more insights? Upgrade to PRO for:")
+                self.io.tool_output("   • Crash Prediction with likelihood scoring")
+                self.io.tool_output("   • Performance Profiler for bottlenecks")
+                self.io.tool_output("   • Memory Leak detection")
+                self.io.tool_output("   • Security Scoring (0-100)")
+                self.io.tool_output("   • Technical Debt metrics")
+                self.io.tool_output("")
+                self.io.tool_output("   Run: /license upgrade")
+
+        if self.verbose and self.io:
+            for name, seconds in combined_report.analyzer_timings.items():
+                self.io.tool_output(f"  {name}: {seconds:.2f}s")
+            cache_stats = combined_report.metadata.get("cache")
+            if cache_stats:
+                self.io.tool_output(
+                    f"  Analysis cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses"
+                    f" ({cache_stats['hit_ratio']:.0%} hit ratio)"
+                )
+
+        if sinks is None:
+            self.review_results = combined_report.results
+            return combined_report
+
+        # Sinks are closed last so they see the final summary (e.g. security score)
+        for sink in sinks:
+            sink.close(combined_report)
+        self.review_results = next(
+            (sink.report.results for sink in sinks if isinstance(sink, CollectSink)), []
+        )
+        return combined_report
+
+    def analyzer_specs(self, enable_security=True, enable_performance=True,
+                       enable_quality=True, enable_architecture=True, enable_ios=True,
+                       announce=True):
+        """Build the analyzer specs for a review.
+
+        Includes the custom rules file found in the project root, and
+        the premium analyzers when the license allows them.
+
+        Args:
+            enable_security: Include the security analyzer
+            enable_performance: Include the performance analyzer
+            enable_quality: Include the quality analyzer
+            enable_architecture: Include the architecture analyzer
+            enable_ios: Include the iOS-specific analyzers
+            announce: Say which analyses are about to run
 
         Returns:
-            Combined AnalysisReport
+            (specs, premium analyzers included, license tier)
         """
         from flacoai.analyzers import (
             SecurityAnalyzer,
@@ -43,106 +186,51 @@ class ReviewCoder(AskCoder):
             IOSVersionAnalyzer,
             SPMAnalyzer,
             DocumentationAnalyzer,
-            AnalysisReport,
+            AnalyzerSpec,
         )
 
-        # Determine files to analyze
-        if files_to_analyze is None:
-            files_to_analyze = self.abs_fnames
-
-        # Load file contents
-        files_dict = {}
-        for fpath in files_to_analyze:
-            try:
-                with open(fpath, 'r', encoding='utf-8') as f:
-                    files_dict[fpath] = f.read()
-            except Exception as e:
-                if self.io:
-                    self.io.tool_error(f"Could not read {fpath}: {e}")
-
-        if not files_dict:
-            if self.io:
-                self.io.tool_error("No files to analyze")
-            return AnalysisReport()
-
-        # Run enabled analyzers
-        combined_report = AnalysisReport()
-        combined_report.files_analyzed = len(files_dict)
+        specs = []
 
         if enable_security:
-            if self.io:
+            if announce and self.io:
                 self.io.tool_output("Running security analysis...")
-            analyzer = SecurityAnalyzer(io=self.io, verbose=self.verbose)
-            report = analyzer.analyze_files(files_dict)
-            combined_report.results.extend(report.results)
+            specs.append(AnalyzerSpec("SecurityAnalyzer", SecurityAnalyzer))
 
         if enable_performance:
-            if self.io:
+            if announce and self.io:
                 self.io.tool_output("Running performance analysis...")
-            analyzer = PerformanceAnalyzer(io=self.io, verbose=self.verbose)
-            report = analyzer.analyze_files(files_dict)
-            combined_report.results.extend(report.results)
+            specs.append(AnalyzerSpec("PerformanceAnalyzer", PerformanceAnalyzer))
 
         if enable_quality:
-            if self.io:
+            if announce and self.io:
                 self.io.tool_output("Running quality analysis...")
-            analyzer = QualityAnalyzer(io=self.io, verbose=self.verbose)
-            report = analyzer.analyze_files(files_dict)
-            combined_report.results.extend(report.results)
+            specs.append(AnalyzerSpec("QualityAnalyzer", QualityAnalyzer))
 
         if enable_architecture:
-            if self.io:
+            if announce and self.io:
                 self.io.tool_output("Running architecture analysis...")
-            analyzer = ArchitectureAnalyzer(io=self.io, verbose=self.verbose)
-            report = analyzer.analyze_files(files_dict)
-            combined_report.results.extend(report.results)
+            specs.append(AnalyzerSpec("ArchitectureAnalyzer", ArchitectureAnalyzer))
 
         # iOS-specific analyzers
         if enable_ios:
-            if self.io:
+            if announce and self.io:
                 self.io.tool_output("Running iOS-specific analysis...")
 
-            # SF Symbols analyzer
-            analyzer = IOSSymbolsAnalyzer(io=self.io, verbose=self.verbose)
-            report = analyzer.analyze_files(files_dict)
-            combined_report.results.extend(report.results)
-
-            # HIG compliance analyzer
-            analyzer = IOSHIGAnalyzer(io=self.io, verbose=self.verbose)
-            report = analyzer.analyze_files(files_dict)
-            combined_report.results.extend(report.results)
-
-            # Info.plist security analyzer
-            analyzer = IOSPlistAnalyzer(io=self.io, verbose=self.verbose)
-            report = analyzer.analyze_files(files_dict)
-            combined_report.results.extend(report.results)
-
-            # SwiftUI best practices analyzer
-            analyzer = SwiftUIAnalyzer(io=self.io, verbose=self.verbose)
-            report = analyzer.analyze_files(files_dict)
-            combined_report.results.extend(report.results)
-
-            # iOS version/API compatibility analyzer
-            analyzer = IOSVersionAnalyzer(io=self.io, verbose=self.verbose)
-            report = analyzer.analyze_files(files_dict)
-            combined_report.results.extend(report.results)
-
-            # Swift Package Manager analyzer
-            analyzer = SPMAnalyzer(io=self.io, verbose=self.verbose)
-            report = analyzer.analyze_files(files_dict)
-            combined_report.results.extend(report.results)
-
-            # Documentation coverage analyzer
-            analyzer = DocumentationAnalyzer(io=self.io, verbose=self.verbose)
-            report = analyzer.analyze_files(files_dict)
-            combined_report.results.extend(report.results)
+            specs.extend([
+                AnalyzerSpec("IOSSymbolsAnalyzer", IOSSymbolsAnalyzer),  # SF Symbols
+                AnalyzerSpec("IOSHIGAnalyzer", IOSHIGAnalyzer),  # HIG compliance
+                AnalyzerSpec("IOSPlistAnalyzer", IOSPlistAnalyzer),  # Info.plist security
+                AnalyzerSpec("SwiftUIAnalyzer", SwiftUIAnalyzer),  # SwiftUI best practices
+                AnalyzerSpec("IOSVersionAnalyzer", IOSVersionAnalyzer),  # API compatibility
+                AnalyzerSpec("SPMAnalyzer", SPMAnalyzer),  # Swift Package Manager
+                AnalyzerSpec("DocumentationAnalyzer", DocumentationAnalyzer),  # Doc coverage
+            ])
 
         # Custom rules analyzer (v2.0.0 feature)
         # Check for .flaco/rules.yaml or .flacoai/rules.yaml
         from pathlib import Path
-        import os
 
-        project_root = os.getcwd()
+        project_root = self.project_root
         custom_rules_paths = [
             Path(project_root) / ".flaco" / "rules.yaml",
             Path(project_root) / ".flacoai" / "rules.yaml",
@@ -151,17 +239,15 @@ class ReviewCoder(AskCoder):
 
         for rules_path in custom_rules_paths:
             if rules_path.exists():
-                if self.io:
+                if announce and self.io:
                     self.io.tool_output(f"Running custom rules from {rules_path.name}...")
 
                 from flacoai.analyzers import CustomRulesAnalyzer
-                analyzer = CustomRulesAnalyzer(
-                    rules_file=str(rules_path),
-                    io=self.io,
-                    verbose=self.verbose
-                )
-                report = analyzer.analyze_files(files_dict)
-                combined_report.results.extend(report.results)
+                specs.append(AnalyzerSpec(
+                    "CustomRulesAnalyzer",
+                    CustomRulesAnalyzer,
+                    {"rules_file": str(rules_path)},
+                ))
                 break  # Only use first found rules file
 
         # Premium analyzers (v3.0.0 - PRO/ENTERPRISE tier only)
@@ -169,10 +255,11 @@ class ReviewCoder(AskCoder):
 
         license_manager = LicenseManager(io=self.io)
         license_tier = license_manager.get_tier()
+        premium_enabled = False
 
         # Check if user has access to premium features
         if license_tier.value in ["pro", "enterprise"]:
-            if self.io:
+            if announce and self.io:
                 self.io.tool_output("")
                 self.io.tool_output(f"🎉 Running premium analyzers ({license_tier.value.upper()} tier)...")
 
@@ -185,47 +272,19 @@ class ReviewCoder(AskCoder):
                     TechnicalDebtAnalyzer,
                 )
 
-                # Crash Prediction Analyzer
-                if self.io:
-                    self.io.tool_output("  • Crash Prediction (likelihood scoring)...")
-                analyzer = CrashPredictionAnalyzer(io=self.io, verbose=self.verbose)
-                report = analyzer.analyze_files(files_dict)
-                combined_report.results.extend(report.results)
-
-                # Performance Profiler Analyzer
-                if self.io:
-                    self.io.tool_output("  • Performance Profiler (bottleneck detection)...")
-                analyzer = PerformanceProfilerAnalyzer(io=self.io, verbose=self.verbose)
-                report = analyzer.analyze_files(files_dict)
-                combined_report.results.extend(report.results)
-
-                # Memory Leak Analyzer
-                if self.io:
-                    self.io.tool_output("  • Memory Leak Detection (retain cycles)...")
-                analyzer = MemoryLeakAnalyzer(io=self.io, verbose=self.verbose)
-                report = analyzer.analyze_files(files_dict)
-                combined_report.results.extend(report.results)
-
-                # Security Scoring Analyzer
-                if self.io:
-                    self.io.tool_output("  • Security Scoring (0-100 with OWASP)...")
-                analyzer = SecurityScoringAnalyzer(io=self.io, verbose=self.verbose)
-                report = analyzer.analyze_files(files_dict)
-                combined_report.results.extend(report.results)
-
-                # Calculate security score for summary
-                security_score_data = analyzer.calculate_security_score(combined_report.results)
-                combined_report.metadata["security_score"] = security_score_data
+                premium_specs = [
+                    ("  • Crash Prediction (likelihood scoring)...", CrashPredictionAnalyzer),
+                    ("  • Performance Profiler (bottleneck detection)...", PerformanceProfilerAnalyzer),
+                    ("  • Memory Leak Detection (retain cycles)...", MemoryLeakAnalyzer),
+                    ("  • Security Scoring (0-100 with OWASP)...", SecurityScoringAnalyzer),
+                    ("  • Technical Debt Analysis (maintainability)...", TechnicalDebtAnalyzer),
+                ]
+                for label, analyzer_class in premium_specs:
+                    if announce and self.io:
+                        self.io.tool_output(label)
+                    specs.append(AnalyzerSpec(analyzer_class.__name__, analyzer_class))
 
-                # Technical Debt Analyzer
-                if self.io:
-                    self.io.tool_output("  • Technical Debt Analysis (maintainability)...")
-                analyzer = TechnicalDebtAnalyzer(io=self.io, verbose=self.verbose)
-                report = analyzer.analyze_files(files_dict)
-                combined_report.results.extend(report.results)
-
-                if self.io:
-                    self.io.tool_output(f"✓ Premium analysis complete ({license_tier.value.upper()} tier)")
+                premium_enabled = True
 
             except ImportError as e:
                 if self.io:
@@ -233,21 +292,71 @@ class ReviewCoder(AskCoder):
                     self.io.tool_output("Premium features require PRO or ENTERPRISE license.")
                     self.io.tool_output("Run /license upgrade for more information.")
 
-        elif license_tier.value == "free":
-            # Show upgrade prompt for FREE tier users
-            if self.io and enable_quality:  # Only show once
-                self.io.tool_output("")
-                self.io.tool_output("💡 Want more insights? Upgrade to PRO for:")
-                self.io.tool_output("   • Crash Prediction with likelihood scoring")
-                self.io.tool_output("   • Performance Profiler for bottlenecks")
-                self.io.tool_output("   • Memory Leak detection")
-                self.io.tool_output("   • Security Scoring (0-100)")
-                self.io.tool_output("   • Technical Debt metrics")
-                self.io.tool_output("")
-                self.io.tool_output("   Run: /license upgrade")
+        return specs, premium_enabled, license_tier
 
-        self.review_results = combined_report.results
-        return combined_report
+    def _read_files(self, paths, deadline=None, progress=None):
+        """Yield (path, content) for each readable file, reporting the rest.
+
+        Args:
+            paths: File paths, in the order to read them
+            deadline: time.monotonic() value after which no more files are read
+            progress: Callable taking (files read, total), called as files are read
+        """
+        import time
+
+        for count, fpath in enumerate(paths):
+            if deadline is not None and time.monotonic() >= deadline:
+                self.review_skipped = len(paths) - count
+                return
+            if progress:
+                progress(count, len(paths))
+            try:
+                with open(fpath, 'r', encoding='utf-8') as f:
+                    content = f.read()
+            except Exception as e:
+                if self.io:
+                    self.io.tool_error(f"Could not read {fpath}: {e}")
+                continue
+            yield fpath, content
+
+    def _stream_to_sinks(self, scheduler, specs, paths, sinks, budget_seconds=None, progress=False):
+        """Run the scheduler over lazily read files, writing findings to sinks.
+
+        Returns:
+            ReviewSummary for the run (the sinks are not closed yet)
+        """
+        import time
+        from flacoai.review_sinks import ReviewSummary
+
+        start_time = time.time()
+        summary = ReviewSummary()
+
+        deadline = time.monotonic() + budget_seconds if budget_seconds else None
+        self.review_skipped = 0
+
+        last_report = time.monotonic()
+
+        def report_progress(done, total):
+            nonlocal last_report
+            now = time.monotonic()
+            if self.io and now - last_report >= PROGRESS_INTERVAL:
+                last_report = now
+                self.io.tool_output(f"  ... {done}/{total} files ({done / total:.0%})")
+
+        files = self._read_files(paths, deadline, report_progress if progress else None)
+        for result in scheduler.stream(specs, files):
+            summary.add(result)
+            for sink in sinks:
+                sink.write(result)
+
+        summary.files_analyzed = scheduler.files_analyzed
+        summary.analyzer_timings = dict(scheduler.timings)
+        if scheduler.cache:
+            summary.metadata["cache"] = scheduler.cache_metadata()
+        if self.review_skipped:
+            summary.metadata["skipped_files"] = self.review_skipped
+        summary.duration_seconds = time.time() - start_time
+        return summary
 
     def export_to_jira(self, project_key, severity_threshold="medium"):
         """Export review findings as Jira issues.
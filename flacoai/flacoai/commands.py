@@ -14,26 +14,6 @@ try:
 except ModuleNotFoundError:  # pragma: no cover
     from importlib import resources as importlib_resources
 
-try:
-    import pyperclip  # type: ignore
-except ModuleNotFoundError:  # pragma: no cover
-    class _MissingPyperclip:
-        class PyperclipException(Exception):
-            pass
-
-        def copy(self, *_args, **_kwargs):
-            raise self.PyperclipException("Clipboard support requires 'pyperclip' to be installed")
-
-        def paste(self, *_args, **_kwargs):
-            raise self.PyperclipException("Clipboard support requires 'pyperclip' to be installed")
-
-    pyperclip = _MissingPyperclip()  # type: ignore
-
-try:
-    from PIL import Image, ImageGrab  # type: ignore
-except ModuleNotFoundError:  # pragma: no cover
-    Image = None  # type: ignore
-    ImageGrab = None  # type: ignore
 from prompt_toolkit.completion import Completion, PathCompleter
 from prompt_toolkit.document import Document
 
@@ -52,6 +32,26 @@ def _missing_callable(message: str):
     return _fn
 
 
+class _MissingPyperclip:
+    class PyperclipException(Exception):
+        pass
+
+    def copy(self, *_args, **_kwargs):
+        raise self.PyperclipException("Clipboard support requires 'pyperclip' to be installed")
+
+    def paste(self, *_args, **_kwargs):
+        raise self.PyperclipException("Clipboard support requires 'pyperclip' to be installed")
+
+
+def _pyperclip():
+    """pyperclip, imported when a clipboard command first runs."""
+    try:
+        import pyperclip  # type: ignore
+    except ModuleNotFoundError:  # pragma: no cover
+        return _MissingPyperclip()
+    return pyperclip
+
+
 def _missing_class(message: str):
     class _Cls:
         def __init__(self, *_args, **_kwargs):
@@ -477,15 +477,13 @@ class Commands:
 
         fnames = [self.coder.abs_root_path(fname) for fname in fnames]
 
+        lint_results = self.coder.linter.lint_many(fnames)
+        if self.coder.verbose:
+            self.io.tool_output(self.coder.linter.last_run.summary())
+
         lint_coder = None
         for fname in fnames:
-            try:
-                errors = self.coder.linter.lint(fname)
-            except FileNotFoundError as err:
-                self.io.tool_error(f"Unable to lint {fname}")
-                self.io.tool_output(str(err))
-                continue
-
+            errors = lint_results.get(fname)
             if not errors:
                 continue
 
@@ -1365,6 +1363,10 @@ class Commands:
         """Paste image/text from the clipboard into the chat.\
         Optionally provide a name for the image."""
         try:
+            from PIL import Image, ImageGrab
+
+            pyperclip = _pyperclip()
+
             # Check for image first
             image = ImageGrab.grabclipboard()
             if isinstance(image, Image.Image):
@@ -1924,24 +1926,34 @@ Make the code production-ready and compilable."""
     def cmd_review(self, args):
         """Perform comprehensive code review
 
-        /review                        - Review entire project automatically
+        /review                        - Review entire project automatically (top 100 files)
+        /review --all                  - Review every file in the project, using all CPUs
+        /review --budget-seconds <N>   - Review highest churn/risk files first, for up to N seconds
+        /review --diff                 - Review only changed lines (working tree vs HEAD)
+        /review --diff-base <ref>      - Review only lines changed since branching from <ref>
         /review <filename>             - Review specific file (can omit extension)
         /review --security             - Only security analysis
         /review --performance          - Only performance analysis
         /review --quality              - Only quality analysis
         /review --architecture         - Only architecture analysis
         /review --save <file>          - Save report to file
+        /review --sarif <file>         - Write findings as a SARIF 2.1.0 log
         /review --ci                   - CI/CD mode (JSON output, exit code 1 if HIGH+ issues)
         /review --fix                  - Interactive fix application
         /review --baseline             - Save current state as baseline
         /review --compare              - Compare against saved baseline (show only new issues)
         /review --export-github        - Export HIGH+ issues to GitHub
         /review --json                 - Output results as JSON
+        /review --jobs <N>             - Analyze with N worker processes (0 = all CPUs)
+        /review --no-cache             - Re-analyze every file, ignoring cached findings
+        /review --trend                - Finding counts per commit from the review history
+        /review --trend --by <dim>     - Trend by severity, category or module
+        /review --trend --since <date> - Only commits since an ISO date
+        /review --trend --backfill [N] - First review the last N commits not yet recorded
         """
         self._track_command("review")
 
         from flacoai.coders.review_coder import ReviewCoder
-        from flacoai.report_generator import ReviewReportGenerator
         import os
         from pathlib import Path
 
@@ -1955,6 +1967,9 @@ Make the code production-ready and compilable."""
         compare_mode = "--compare" in args_parts
         export_github = "--export-github" in args_parts
         json_output = "--json" in args_parts or ci_mode  # CI mode implies JSON
+        review_cache = "--no-cache" not in args_parts and (
+            getattr(self.args, "review_cache", True) if self.args else True
+        )
 
         # Extract flags
         enable_security = "--security" in args_parts or not any(
@@ -1978,36 +1993,109 @@ Make the code production-ready and compilable."""
                 save_file = args_parts[save_idx + 1]
                 args_parts = [a for i, a in enumerate(args_parts) if i not in [save_idx, save_idx + 1]]
 
+        # Extract SARIF output file
+        sarif_file = None
+        if "--sarif" in args_parts:
+            sarif_idx = args_parts.index("--sarif")
+            if sarif_idx + 1 < len(args_parts):
+                sarif_file = args_parts[sarif_idx + 1]
+                args_parts = [a for i, a in enumerate(args_parts) if i not in [sarif_idx, sarif_idx + 1]]
+
+        # Extract worker count (defaults to --review-jobs)
+        review_jobs = getattr(self.args, "review_jobs", 1) if self.args else 1
+        jobs_given = "--jobs" in args_parts
+        if jobs_given:
+            jobs_idx = args_parts.index("--jobs")
+            if jobs_idx + 1 < len(args_parts):
+                try:
+                    review_jobs = int(args_parts[jobs_idx + 1])
+                except ValueError:
+                    self.io.tool_error(f"Invalid --jobs value: {args_parts[jobs_idx + 1]}")
+                    return
+                args_parts = [a for i, a in enumerate(args_parts) if i not in [jobs_idx, jobs_idx + 1]]
+
+        # Trend report from the review history; no review of the tree is run
+        if "--trend" in args_parts:
+            self._review_trend(args_parts, review_jobs, review_cache, json_output)
+            return
+
+        # Extract time budget; files are then reviewed in priority order
+        budget_seconds = None
+        if "--budget-seconds" in args_parts:
+            budget_idx = args_parts.index("--budget-seconds")
+            if budget_idx + 1 < len(args_parts):
+                try:
+                    budget_seconds = float(args_parts[budget_idx + 1])
+                except ValueError:
+                    budget_seconds = -1
+                if budget_seconds <= 0:
+                    self.io.tool_error(f"Invalid --budget-seconds value: {args_parts[budget_idx + 1]}")
+                    return
+                args_parts = [a for i, a in enumerate(args_parts) if i not in [budget_idx, budget_idx + 1]]
+
+        # Diff-scoped mode: only changed files are analyzed and only findings
+        # in or near changed lines are reported
+        diff_base = None
+        if "--diff-base" in args_parts:
+            base_idx = args_parts.index("--diff-base")
+            if base_idx + 1 >= len(args_parts) or args_parts[base_idx + 1].startswith("--"):
+                self.io.tool_error("--diff-base needs a git ref, e.g. /review --diff-base main")
+                return
+            diff_base = args_parts[base_idx + 1]
+            args_parts = [a for i, a in enumerate(args_parts) if i not in [base_idx, base_idx + 1]]
+        diff_mode = "--diff" in args_parts or diff_base is not None
+
+        # Whole-repo mode: no file limit, and all CPUs unless told otherwise
+        review_all = "--all" in args_parts
+        if review_all and not jobs_given and review_jobs == 1:
+            review_jobs = 0
+
         # Remove flags from args to get filename
         filename_args = [a for a in args_parts if not a.startswith("--")]
 
         # Determine files to review
         files_to_review = set()
 
+        # One indexed walk of the project serves file lookups, discovery
+        # and ranking (use current working directory, not git root)
+        from flacoai.smart_context import SmartContextLoader
+        from flacoai.analyzers.cache import AnalysisCache
+
+        # Caches, baselines and custom rules belong to the project, wherever
+        # in it flacoai runs
+        project_root = self.coder.root or os.getcwd()
+        context_loader = SmartContextLoader(
+            os.getcwd(),
+            io=self.io,
+            repo=self.coder.repo,
+            cache=AnalysisCache(project_root, io=self.io) if review_cache else None,
+        )
+
+        diff_scope = None
+        if diff_mode:
+            if not self.coder.repo:
+                self.io.tool_error("No git repository found.")
+                return
+            if baseline_mode:
+                self.io.tool_error("--baseline needs a full review; it cannot be combined with --diff")
+                return
+
+            from flacoai.diff_scope import repo_diff_scope
+
+            try:
+                diff_scope = repo_diff_scope(self.coder.repo, base=diff_base)
+            except ANY_GIT_ERROR as err:
+                self.io.tool_error(f"Unable to diff against {diff_base or 'HEAD'}: {err}")
+                return
+
         if filename_args:
             # Mode 1: Review specific file(s)
             for file_arg in filename_args:
                 # Try to find the file (with or without extension)
-                candidates = []
-
-                # If full path exists
                 if os.path.exists(file_arg):
-                    candidates.append(file_arg)
+                    candidates = [file_arg]
                 else:
-                    # Search for file with any extension
-                    base_name = os.path.splitext(file_arg)[0]
-
-                    # Search in current directory and subdirectories
-                    # Use current working directory (where user ran command) not git root
-                    root_path = os.getcwd()
-                    for root, dirs, files in os.walk(root_path):
-                        # Skip hidden directories and common ignore patterns
-                        dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__', 'venv', 'env']]
-
-                        for f in files:
-                            if f == file_arg or os.path.splitext(f)[0] == base_name:
-                                full_path = os.path.join(root, f)
-                                candidates.append(full_path)
+                    candidates = context_loader.find_files(file_arg)
 
                 if not candidates:
                     self.io.tool_error(f"File not found: {file_arg}")
@@ -2023,25 +2111,41 @@ Make the code production-ready and compilable."""
                     files_to_review.add(os.path.abspath(shortest))
                     self.io.tool_output(f"Found: {shortest} (multiple matches, using shortest path)")
 
+        elif diff_scope is not None:
+            # Mode 3: Review only the files the diff touches
+            files_to_review = {
+                path for path in diff_scope.files()
+                if Path(path).suffix.lstrip('.').lower() in SmartContextLoader.CODE_EXTENSIONS
+            }
+
         else:
             # Mode 2: Review entire project automatically with smart context loading (v2.0.0)
             self.io.tool_output("🔍 Smart file discovery (skipping generated code, build artifacts)...")
 
-            from flacoai.smart_context import SmartContextLoader
-
-            # Use current working directory (where user ran command) not git root
-            root_path = os.getcwd()
-            context_loader = SmartContextLoader(root_path, io=self.io)
-
-            # Use smart context loader
+            # --all and --budget-seconds see every file, otherwise the 100
+            # highest-priority files are reviewed
             files_to_review = context_loader.get_relevant_files(
                 focus_files=None,
                 include_tests=True,
-                max_files=100  # Reasonable limit for performance
+                max_files=None if (review_all or budget_seconds) else 100,
             )
 
             self.io.tool_output(f"📁 Found {len(files_to_review)} relevant code files to analyze")
 
+        if diff_scope is not None:
+            if filename_args:
+                files_to_review = {path for path in files_to_review if path in diff_scope.ranges}
+            self.io.tool_output(
+                f"🔀 Reviewing {diff_scope.changed_line_count()} changed lines"
+                f" in {len(files_to_review)} files"
+            )
+
+        if budget_seconds and files_to_review:
+            files_to_review = context_loader.rank_files(files_to_review)
+            self.io.tool_output(
+                f"⏱  Reviewing highest churn/risk files first, for up to {budget_seconds:g}s"
+            )
+
         if not files_to_review:
             self.io.tool_error("No files to review")
             return
@@ -2056,46 +2160,121 @@ Make the code production-ready and compilable."""
             auto_commits=False,
             stream=False,
             verbose=self.verbose,
+            review_jobs=review_jobs,
+            review_cache=review_cache,
+            project_root=project_root,
         )
 
+        from flacoai.review_sinks import (
+            BaselineCompareSink,
+            BaselineSaveSink,
+            CollectSink,
+            ConsoleSink,
+            DiffScopeSink,
+            MarkdownSink,
+            SarifSink,
+        )
+
+        # Findings stream to the outputs as they are found; only the modes that
+        # need every finding at the end (JSON, fixes, GitHub export) collect them
+        collector = CollectSink() if (json_output or fix_mode or export_github) else None
+        console = None if json_output else ConsoleSink(self.io)
+        report_sinks = [sink for sink in (collector, console) if sink]
+        if save_file and not json_output:
+            report_sinks.append(MarkdownSink(save_file, io=self.io))
+        if sarif_file:
+            report_sinks.append(SarifSink(sarif_file, root=project_root, io=self.io))
+
+        # Baseline comparison (v2.0.0 feature)
+        baseline_manager = None
+        compare_sink = None
+        sinks = report_sinks
+        if compare_mode or baseline_mode:
+            from flacoai.baseline_manager import BaselineManager
+
+            baseline_manager = BaselineManager(project_root)
+
+            if baseline_mode:
+                # Saved after the comparison filter, like the report itself
+                report_sinks.append(BaselineSaveSink(baseline_manager))
+            if compare_mode:
+                compare_sink = BaselineCompareSink(baseline_manager, report_sinks, files=files_to_review)
+                sinks = [compare_sink]
+
+        # Whole-repo reviews of a clean tree at the repo root are appended to
+        # the review history as the summary of the HEAD commit
+        history = None
+        history_sink = None
+        head = self.coder.repo.get_head_commit() if self.coder.repo else None
+        if (
+            head is not None
+            and review_all
+            and not filename_args
+            and not diff_mode
+            and enable_security and enable_performance and enable_quality and enable_architecture
+            and os.path.realpath(os.getcwd()) == os.path.realpath(self.coder.root)
+            and not self.coder.repo.is_dirty()
+        ):
+            from flacoai.review_history import ReviewHistory
+            from flacoai.review_sinks import HistorySink
+
+            history = ReviewHistory(self.coder.root)
+            if not history.has_commit(head.hexsha):
+                history_sink = HistorySink(history, head.hexsha, head.committed_date, self.coder.root)
+                sinks = sinks + [history_sink]
+
+        diff_sink = None
+        if diff_scope is not None:
+            diff_sink = DiffScopeSink(diff_scope, sinks)
+            sinks = [diff_sink]
+
         # Run static analysis
         self.io.tool_output("")
         self.io.tool_output("🔬 Running code analysis...")
 
-        report = review_coder.run_static_analysis(
+        summary = review_coder.run_static_analysis(
             files_to_analyze=files_to_review,
             enable_security=enable_security,
             enable_performance=enable_performance,
             enable_quality=enable_quality,
             enable_architecture=enable_architecture,
+            sinks=sinks,
+            budget_seconds=budget_seconds,
+            progress=review_all or bool(budget_seconds),
         )
 
-        # Baseline comparison (v2.0.0 feature)
-        baseline_comparison = None
-        if compare_mode or baseline_mode:
-            from flacoai.baseline_manager import BaselineManager
+        if history:
+            history.close()
+            if history_sink and history_sink.recorded:
+                self.io.tool_output(f"\n📈 Recorded review of {head.hexsha[:7]} in the review history")
 
-            project_root = self.coder.root if self.coder.root else os.getcwd()
-            baseline_manager = BaselineManager(project_root)
+        if diff_sink and diff_sink.out_of_scope:
+            self.io.tool_output(
+                f"\n🔀 {diff_sink.out_of_scope} findings outside the changed lines were not reported"
+            )
 
-            if compare_mode:
-                baseline_comparison = baseline_manager.compare_with_baseline(report)
+        skipped_files = summary.metadata.get("skipped_files", 0)
+        if skipped_files:
+            self.io.tool_output(
+                f"\n⏱  Time budget reached: reviewed {len(files_to_review) - skipped_files}"
+                f" of {len(files_to_review)} files; {skipped_files} lower-priority files skipped"
+            )
 
-                if baseline_comparison["baseline_exists"]:
-                    comp_stats = baseline_manager.get_stats(baseline_comparison)
-                    self.io.tool_output("\n📊 Baseline Comparison")
-                    self.io.tool_output(f"   New issues: {len(baseline_comparison['new_issues'])} (Critical: {comp_stats['new_critical']}, High: {comp_stats['new_high']}, Medium: {comp_stats['new_medium']}, Low: {comp_stats['new_low']})")
-                    self.io.tool_output(f"   Fixed issues: {len(baseline_comparison['fixed_issues'])} (Critical: {comp_stats['fixed_critical']}, High: {comp_stats['fixed_high']}, Medium: {comp_stats['fixed_medium']}, Low: {comp_stats['fixed_low']})")
-                    self.io.tool_output(f"   Unchanged: {len(baseline_comparison['unchanged_issues'])}")
+        if compare_sink:
+            if compare_sink.baseline_exists:
+                comp_stats = compare_sink.get_stats()
+                fixed_total = sum(comp_stats[f"fixed_{s}"] for s in ("critical", "high", "medium", "low"))
+                self.io.tool_output("\n📊 Baseline Comparison")
+                self.io.tool_output(f"   New issues: {compare_sink.new_issues} (Critical: {comp_stats['new_critical']}, High: {comp_stats['new_high']}, Medium: {comp_stats['new_medium']}, Low: {comp_stats['new_low']})")
+                self.io.tool_output(f"   Fixed issues: {fixed_total} (Critical: {comp_stats['fixed_critical']}, High: {comp_stats['fixed_high']}, Medium: {comp_stats['fixed_medium']}, Low: {comp_stats['fixed_low']})")
+                self.io.tool_output(f"   Unchanged: {compare_sink.unchanged}")
+            else:
+                self.io.tool_output("\n⚠️  No baseline found. Run '/review --baseline' to create one.")
 
-                    # Filter report to show only new issues
-                    report.results = baseline_comparison['new_issues']
-                else:
-                    self.io.tool_output("\n⚠️  No baseline found. Run '/review --baseline' to create one.")
+        if baseline_mode:
+            self.io.tool_output("\n✓ Baseline saved to .flaco/baselines/current.db")
 
-            if baseline_mode:
-                baseline_manager.save_baseline(report)
-                self.io.tool_output("\n✓ Baseline saved to .flaco/baselines/current.json")
+        report = collector.report if collector else None
 
         # JSON output (v2.0.0 feature - for CI/CD)
         if json_output:
@@ -2120,11 +2299,14 @@ Make the code production-ready and compilable."""
                 ],
             }
 
-            if baseline_comparison:
+            if skipped_files:
+                output_data["skipped_files"] = skipped_files
+
+            if compare_sink and compare_sink.baseline_exists:
                 output_data["baseline_comparison"] = {
-                    "new_issues": len(baseline_comparison['new_issues']),
-                    "fixed_issues": len(baseline_comparison['fixed_issues']),
-                    "unchanged_issues": len(baseline_comparison['unchanged_issues']),
+                    "new_issues": compare_sink.new_issues,
+                    "fixed_issues": sum(compare_sink.fixed_counts.values()),
+                    "unchanged_issues": compare_sink.unchanged,
                 }
 
             print(json.dumps(output_data, indent=2))
@@ -2139,18 +2321,11 @@ Make the code production-ready and compilable."""
 
             return  # Don't show regular output in JSON mode
 
-        # Generate and display report
-        generator = ReviewReportGenerator(io=self.io)
-
         self.io.tool_output("")
         self.io.tool_output("=" * 80)
 
-        # Display in console
-        generator.display_console(report)
-
-        # Save to file if requested
-        if save_file:
-            generator.save_to_file(report, save_file)
+        # Display in console (the markdown report, if requested, is already saved)
+        console.display()
 
         # GitHub export (v2.0.0 feature)
         if export_github:
@@ -2187,7 +2362,7 @@ Make the code production-ready and compilable."""
                 self.io.tool_output("\n💡 Don't forget to review the changes and test your code!")
 
         # Summary message
-        stats = report.get_stats()
+        stats = console.summary.get_stats()
         if stats['total'] == 0:
             self.io.tool_output("\n✅ No issues found! Code looks good.")
         else:
@@ -2201,6 +2376,108 @@ Make the code production-ready and compilable."""
                 self.io.tool_output("   • Use '/review --export-github' to create GitHub issues")
                 self.io.tool_output("   • Use '/review --fix' to apply fixes interactively")
 
+    def _review_trend(self, args_parts, review_jobs, review_cache, json_output):
+        """Show finding counts per commit from the review history, backfilling it first if asked."""
+        from flacoai.review_history import (
+            DEFAULT_BACKFILL_COMMITS,
+            DEFAULT_TREND_COMMITS,
+            DIMENSIONS,
+            ReviewHistory,
+            backfill,
+            format_trend,
+        )
+
+        if not self.coder.repo:
+            self.io.tool_error("Review trends need a git repository.")
+            return
+
+        def option(name):
+            if name in args_parts:
+                idx = args_parts.index(name)
+                if idx + 1 < len(args_parts) and not args_parts[idx + 1].startswith("--"):
+                    return args_parts[idx + 1]
+            return None
+
+        by = option("--by") or "severity"
+        if by not in DIMENSIONS:
+            self.io.tool_error(f"Invalid --by value: {by} (use {', '.join(DIMENSIONS)})")
+            return
+
+        since = None
+        if option("--since"):
+            from datetime import datetime
+
+            try:
+                since = int(datetime.fromisoformat(option("--since")).timestamp())
+            except ValueError:
+                self.io.tool_error(f"Invalid --since date: {option('--since')}")
+                return
+
+        try:
+            limit = int(option("--limit") or DEFAULT_TREND_COMMITS)
+            backfill_count = int(option("--backfill") or DEFAULT_BACKFILL_COMMITS)
+        except ValueError:
+            self.io.tool_error("--limit and --backfill take a number of commits")
+            return
+
+        history = ReviewHistory(self.coder.root)
+        try:
+            if "--backfill" in args_parts:
+                from flacoai.coders.review_coder import ReviewCoder
+
+                review_coder = ReviewCoder(
+                    main_model=self.coder.main_model,
+                    io=self.io,
+                    repo=self.coder.repo,
+                    fnames=[],
+                    show_diffs=False,
+                    auto_commits=False,
+                    stream=False,
+                    verbose=self.verbose,
+                    review_jobs=review_jobs,
+                    review_cache=review_cache,
+                    project_root=self.coder.root,
+                )
+                specs, _, _ = review_coder.analyzer_specs(announce=False)
+
+                def progress(done, total, sha):
+                    self.io.tool_output(f"  Reviewing {sha[:7]} ({done + 1}/{total})")
+
+                self.io.tool_output(f"🕰  Backfilling review history for the last {backfill_count} commits...")
+                try:
+                    recorded = backfill(
+                        history,
+                        self.coder.repo,
+                        specs,
+                        limit=backfill_count,
+                        jobs=review_jobs,
+                        cache_root=self.coder.root if review_cache else None,
+                        io=self.io,
+                        progress=progress,
+                    )
+                except ANY_GIT_ERROR as err:
+                    self.io.tool_error(f"Unable to read git history: {err}")
+                    return
+                self.io.tool_output(f"Recorded {recorded} new commits")
+
+            points = history.series(by=by, since=since, limit=limit)
+        finally:
+            history.close()
+
+        if json_output:
+            import json
+            from dataclasses import asdict
+
+            print(json.dumps([asdict(point) for point in points], indent=2))
+            return
+
+        self.io.tool_output(f"\n📈 Review trend by {by} ({len(points)} commits)\n")
+        self.io.tool_output(format_trend(points, by))
+        if not points:
+            self.io.tool_output(
+                "Run '/review --all' on a clean tree, or '/review --trend --backfill', to record some."
+            )
+
     def cmd_jira(self, args):
         """Interact with Jira issue tracker
 
@@ -2904,6 +3181,9 @@ Generate only the commit message, nothing else."""
         """Review uncommitted changes with AI
 
         /review-diff    - Analyze current changes for potential issues
+
+        Large diffs are split by file and hunk into chunks that are reviewed
+        concurrently (see --review-diff-concurrency and --review-diff-chunk-tokens).
         """
         self._track_command("review-diff")
 
@@ -2911,50 +3191,56 @@ Generate only the commit message, nothing else."""
             self.io.tool_error("No git repository found.")
             return
 
+        from flacoai.diff_review import DEFAULT_CHUNK_TOKENS, DEFAULT_CONCURRENCY, DiffReviewer
+
         try:
-            # Get current diff
-            diff = self.coder.repo.diff_commits(
-                self.coder.pretty,
-                "HEAD",
-                include_working_dir=True
-            )
+            # Get current diff (index and working tree vs HEAD)
+            diff = self.coder.repo.get_diffs()
 
             if not diff or not diff.strip():
                 self.io.tool_error("No changes to review.")
                 return
 
-            self.io.tool_output("🔍 Reviewing changes...\n")
-
-            # Build prompt for LLM
-            prompt = f"""Review the following git diff and provide feedback.
-
-Focus on:
-1. Potential bugs or issues
-2. Code quality concerns
-3. Swift/iOS best practices
-4. Performance implications
-5. Security considerations
-
-Git Diff:
-```diff
-{diff[:4000]}  # Limit diff size
-```
+            reviewer = DiffReviewer(
+                self.coder.main_model,
+                max_chunk_tokens=getattr(self.args, "review_diff_chunk_tokens", DEFAULT_CHUNK_TOKENS)
+                if self.args else DEFAULT_CHUNK_TOKENS,
+                concurrency=getattr(self.args, "review_diff_concurrency", DEFAULT_CONCURRENCY)
+                if self.args else DEFAULT_CONCURRENCY,
+            )
 
-Provide a concise review with specific line-by-line feedback where relevant."""
+            chunks = reviewer.chunks(diff)
+            if len(chunks) > 1:
+                self.io.tool_output(
+                    f"🔍 Reviewing changes in {len(chunks)} parts"
+                    f" ({min(reviewer.concurrency, len(chunks))} at a time)...\n"
+                )
+            else:
+                self.io.tool_output("🔍 Reviewing changes...\n")
 
-            # Ask LLM to review
-            response = self.coder.send_message(prompt, system_prompt="You are a code reviewer specializing in Swift/iOS. Provide helpful, constructive feedback.")
+            review = reviewer.review(diff, chunks=chunks)
 
-            if not response:
+            if review.failed_chunks == review.chunks:
                 self.io.tool_error("Failed to review changes.")
                 return
 
             self.io.tool_output("="*75)
             self.io.tool_output("📋 Code Review:")
             self.io.tool_output("="*75)
-            self.io.tool_output(response)
+            self.io.tool_output(review.format())
             self.io.tool_output("="*75 + "\n")
 
+            if review.failed_chunks:
+                self.io.tool_warning(
+                    f"{review.failed_chunks} of {review.chunks} parts of the diff could not be"
+                    " reviewed; their findings are missing above."
+                )
+            if self.verbose:
+                self.io.tool_output(
+                    f"Reviewed {review.chunks} parts in {review.elapsed:.1f}s,"
+                    f" {review.duplicates} duplicate findings merged"
+                )
+
             self.io.tool_output("💡 Tip: Use '/commit-msg' to generate a commit message after addressing feedback")
 
         except Exception as e:
@@ -3413,6 +3699,7 @@ Make it friendly and educational for new developers."""
 
         last_assistant_message = assistant_messages[0]["content"]
 
+        pyperclip = _pyperclip()
         try:
             pyperclip.copy(last_assistant_message)
             preview = (
@@ -3545,6 +3832,7 @@ Just show me the edits I need to make.
 {args}
 """
 
+        pyperclip = _pyperclip()
         try:
             pyperclip.copy(markdown)
             self.io.tool_output("Copied code context to clipboard.")
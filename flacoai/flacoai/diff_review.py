@@ -0,0 +1,359 @@
+"""Map-reduce LLM review of diffs too large for one request.
+
+A diff is split by file and hunk into chunks that fit a token budget, each
+chunk is reviewed by its own request (several in flight at once), and the
+findings from every chunk are merged into one deduplicated review. Nothing
+is truncated, and the wall time is that of the slowest chunk rather than
+the sum of all of them.
+"""
+
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+# Diff tokens per chunk, before the prompt around it
+DEFAULT_CHUNK_TOKENS = 6000
+
+# Chunk requests in flight at once
+DEFAULT_CONCURRENCY = 4
+
+SEVERITIES = ("critical", "high", "medium", "low")
+
+HUNK_HEADER = re.compile(r'^@@ -(\d+)(?:,\d+)? \+(\d+)(?:,\d+)? @@(.*)$')
+
+FINDING_LINE = re.compile(
+    r'^\s*(?:[-*]\s*)?`?(?P<file>[^\s:`]+):(?P<line>\d+)`?:?\s*'
+    r'\[(?P<severity>critical|high|medium|low)\]\s*(?P<message>.+?)\s*$',
+    re.IGNORECASE,
+)
+
+SYSTEM_PROMPT = (
+    "You are a code reviewer specializing in Swift/iOS. "
+    "Provide helpful, constructive feedback."
+)
+
+CHUNK_PROMPT = """Review part {part} of {parts} of a git diff.
+
+Focus on:
+1. Potential bugs or issues
+2. Code quality concerns
+3. Swift/iOS best practices
+4. Performance implications
+5. Security considerations
+
+Report each issue on its own line, exactly in this form, using the file
+path and new-file line number from the diff:
+path/to/file.swift:42: [high] What is wrong and how to fix it
+
+Severities are critical, high, medium and low. Put any remark that is not
+about one line on its own line without that prefix. If there is nothing to
+report, answer NO ISSUES.
+
+Git Diff:
+```diff
+{diff}
+```"""
+
+
+@dataclass
+class DiffChunk:
+    """A piece of a diff small enough for one review request."""
+
+    text: str
+    files: List[str]
+    tokens: int
+
+
+@dataclass
+class Finding:
+    """One issue reported by the reviewer at a file and line."""
+
+    file: str
+    line: int
+    severity: str
+    message: str
+
+    def key(self) -> Tuple[str, int, str]:
+        return self.file, self.line, normalize(self.message)
+
+
+@dataclass
+class DiffReview:
+    """Merged result of reviewing every chunk of a diff."""
+
+    findings: List[Finding] = field(default_factory=list)
+    notes: List[str] = field(default_factory=list)
+    chunks: int = 0
+    failed_chunks: int = 0
+    duplicates: int = 0
+    elapsed: float = 0.0
+
+    def format(self) -> str:
+        """Markdown review: findings by file (most severe first), then remarks."""
+        if not self.findings and not self.notes:
+            return "No issues found."
+
+        lines = []
+        current = None
+        for finding in self.findings:
+            if finding.file != current:
+                if current is not None:
+                    lines.append("")
+                lines.append(f"**{finding.file}**")
+                current = finding.file
+            lines.append(f"- Line {finding.line} [{finding.severity.upper()}]: {finding.message}")
+
+        if self.notes:
+            if lines:
+                lines.append("")
+            lines.append("**General**")
+            lines.extend(f"- {note}" for note in self.notes)
+        return "\n".join(lines)
+
+
+def normalize(text: str) -> str:
+    return " ".join(re.sub(r'[^a-z0-9]+', ' ', text.lower()).split())
+
+
+def split_file_diffs(diff: str) -> List[Tuple[str, str, List[str]]]:
+    """Split a unified diff into (path, file header, hunks) per file."""
+    files = []
+    header: List[str] = []
+    hunks: List[List[str]] = []
+    path = None
+
+    def flush():
+        if header or hunks:
+            files.append((path or "", "\n".join(header), ["\n".join(h) for h in hunks]))
+
+    for line in diff.splitlines():
+        if line.startswith("diff --git "):
+            flush()
+            header, hunks, path = [line], [], None
+            match = re.match(r'diff --git a/(.*) b/(.*)$', line)
+            if match:
+                path = match.group(2)
+        elif line.startswith("@@"):
+            hunks.append([line])
+        elif hunks:
+            hunks[-1].append(line)
+        else:
+            header.append(line)
+            if line.startswith("+++ ") and line[4:].strip() != "/dev/null":
+                path = line[4:].strip()
+                if path.startswith("b/"):
+                    path = path[2:]
+    flush()
+    return files
+
+
+def _split_hunk(hunk: str, count: Callable[[str], int], max_tokens: int) -> List[str]:
+    """Split an oversized hunk into smaller hunks with correct line numbers."""
+    lines = hunk.splitlines()
+    match = HUNK_HEADER.match(lines[0]) if lines else None
+    if not match:
+        return [hunk]
+
+    old_line, new_line = int(match.group(1)), int(match.group(2))
+    pieces = []
+    body: List[str] = []
+    body_tokens = 0
+    start = (old_line, new_line)
+    old_count = new_count = 0
+
+    def emit():
+        header = f"@@ -{start[0]},{old_count} +{start[1]},{new_count} @@{match.group(3)}"
+        pieces.append("\n".join([header] + body))
+
+    for line in lines[1:]:
+        tokens = count(line)
+        if body and body_tokens + tokens > max_tokens:
+            emit()
+            start = (old_line, new_line)
+            body, body_tokens, old_count, new_count = [], 0, 0, 0
+        body.append(line)
+        body_tokens += tokens
+        if line.startswith("\\"):
+            # "\ No newline at end of file"
+            continue
+        if not line.startswith("+"):
+            old_line += 1
+            old_count += 1
+        if not line.startswith("-"):
+            new_line += 1
+            new_count += 1
+    if body:
+        emit()
+    return pieces
+
+
+def chunk_diff(
+    diff: str, token_count: Callable[[str], Optional[int]], max_tokens: int
+) -> List[DiffChunk]:
+    """Pack a diff's hunks into chunks of at most max_tokens tokens.
+
+    Hunks are kept whole and in order where possible; each chunk repeats the
+    file header of every file it has hunks from, so it reads as a diff on
+    its own. A hunk bigger than a whole chunk is split on line boundaries.
+
+    Args:
+        diff: Unified diff
+        token_count: Counts the tokens in a string (e.g. Model.token_count)
+        max_tokens: Diff tokens per chunk
+
+    Returns:
+        Chunks in diff order
+    """
+    def count(text: str) -> int:
+        tokens = token_count(text)
+        return tokens if tokens else len(text) // 4 + 1
+
+    chunks: List[DiffChunk] = []
+    parts: List[str] = []
+    files: List[str] = []
+    used = 0
+
+    def flush():
+        nonlocal parts, files, used
+        if parts:
+            chunks.append(DiffChunk("\n".join(parts), files, used))
+        parts, files, used = [], [], 0
+
+    for path, header, hunks in split_file_diffs(diff):
+        header_tokens = count(header)
+        if not hunks:
+            # Binary files, renames, mode changes: just the header
+            hunks = [""]
+
+        for hunk in hunks:
+            hunk_tokens = count(hunk) if hunk else 0
+            pieces = [(hunk, hunk_tokens)]
+            if hunk_tokens + header_tokens > max_tokens:
+                pieces = [
+                    (piece, count(piece))
+                    for piece in _split_hunk(hunk, count, max(1, max_tokens - header_tokens))
+                ]
+
+            for piece, piece_tokens in pieces:
+                needs_header = not files or files[-1] != path
+                cost = piece_tokens + (header_tokens if needs_header else 0)
+                if parts and used + cost > max_tokens:
+                    flush()
+                    needs_header, cost = True, piece_tokens + header_tokens
+                if needs_header:
+                    parts.append(header)
+                    files.append(path)
+                if piece:
+                    parts.append(piece)
+                used += cost
+    flush()
+    return chunks
+
+
+def parse_findings(text: str) -> Tuple[List[Finding], List[str]]:
+    """Split a chunk review into line findings and general remarks."""
+    findings = []
+    notes = []
+    for line in (text or "").splitlines():
+        stripped = line.strip()
+        if not stripped or normalize(stripped) == "no issues" or stripped.startswith("```"):
+            continue
+        match = FINDING_LINE.match(stripped)
+        if match:
+            findings.append(Finding(
+                match.group("file"),
+                int(match.group("line")),
+                match.group("severity").lower(),
+                match.group("message"),
+            ))
+        else:
+            notes.append(stripped.lstrip("-* ").strip())
+    return findings, [note for note in notes if note]
+
+
+def reduce_reviews(responses: List[Optional[str]]) -> DiffReview:
+    """Merge chunk reviews, dropping repeats of the same finding or remark."""
+    review = DiffReview(chunks=len(responses))
+    seen_findings = set()
+    seen_notes = set()
+
+    for response in responses:
+        if response is None:
+            review.failed_chunks += 1
+            continue
+        findings, notes = parse_findings(response)
+        for finding in findings:
+            if finding.key() in seen_findings:
+                review.duplicates += 1
+                continue
+            seen_findings.add(finding.key())
+            review.findings.append(finding)
+        for note in notes:
+            if normalize(note) in seen_notes:
+                review.duplicates += 1
+                continue
+            seen_notes.add(normalize(note))
+            review.notes.append(note)
+
+    review.findings.sort(key=lambda f: (f.file, SEVERITIES.index(f.severity), f.line))
+    return review
+
+
+class DiffReviewer:
+    """Reviews a diff of any size with concurrent, token-budgeted requests."""
+
+    def __init__(self, model, max_chunk_tokens: int = DEFAULT_CHUNK_TOKENS,
+                 concurrency: int = DEFAULT_CONCURRENCY):
+        """Initialize the reviewer.
+
+        Args:
+            model: Model used to count tokens and review each chunk
+            max_chunk_tokens: Diff tokens per request (capped at half the
+                model's input limit, leaving room for the prompt and answer)
+            concurrency: Requests in flight at once
+        """
+        self.model = model
+        max_input = (getattr(model, "info", None) or {}).get("max_input_tokens")
+        if max_input:
+            max_chunk_tokens = min(max_chunk_tokens, max_input // 2)
+        self.max_chunk_tokens = max(1, max_chunk_tokens)
+        self.concurrency = max(1, concurrency)
+
+    def chunks(self, diff: str) -> List[DiffChunk]:
+        return chunk_diff(diff, self.model.token_count, self.max_chunk_tokens)
+
+    def review_chunk(self, chunk: DiffChunk, part: int, parts: int) -> Optional[str]:
+        messages = [
+            dict(role="system", content=SYSTEM_PROMPT),
+            dict(role="user", content=CHUNK_PROMPT.format(part=part, parts=parts, diff=chunk.text)),
+        ]
+        try:
+            return self.model.simple_send_with_retries(messages)
+        except Exception:
+            return None
+
+    def review(self, diff: str, chunks: Optional[List[DiffChunk]] = None) -> DiffReview:
+        """Review every chunk of diff concurrently and merge the results.
+
+        Args:
+            diff: Unified diff to review
+            chunks: The diff's chunks, if the caller already split it with chunks()
+        """
+        start = time.perf_counter()
+        if chunks is None:
+            chunks = self.chunks(diff)
+        if not chunks:
+            return DiffReview()
+
+        workers = min(self.concurrency, len(chunks))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            responses = list(executor.map(
+                lambda args: self.review_chunk(*args),
+                [(chunk, part, len(chunks)) for part, chunk in enumerate(chunks, start=1)],
+            ))
+
+        review = reduce_reviews(responses)
+        review.elapsed = time.perf_counter() - start
+        return review
@@ -0,0 +1,154 @@
+"""Map git diffs to the line ranges they change, for diff-scoped reviews."""
+
+import os
+import re
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+HUNK_HEADER = re.compile(r'^@@ -\d+(?:,(\d+))? \+(\d+)(?:,(\d+))? @@')
+
+# Findings this many lines from a change still count as near it
+DEFAULT_CONTEXT_LINES = 3
+
+
+def parse_changed_lines(diff: str) -> Dict[str, List[Tuple[int, int]]]:
+    """Changed line ranges on the new side of a unified diff, per file.
+
+    Added and modified lines are changed; a deletion marks the line that now
+    follows it. Context lines are not changed, so the result is the same
+    whatever -U the diff was made with.
+
+    Args:
+        diff: Output of git diff
+
+    Returns:
+        Repo-relative path -> sorted, merged (first line, last line) ranges.
+        Deleted files are left out.
+    """
+    changed: Dict[str, List[int]] = {}
+    lines: Optional[List[int]] = None
+    new_line = 0
+    # Lines left in the current hunk on each side; outside a hunk both are 0
+    old_left = new_left = 0
+
+    for line in diff.splitlines():
+        if old_left > 0 or new_left > 0:
+            if line.startswith('+'):
+                if lines is not None:
+                    lines.append(new_line)
+                new_line += 1
+                new_left -= 1
+            elif line.startswith('-'):
+                if lines is not None:
+                    lines.append(max(new_line, 1))
+                old_left -= 1
+            elif line.startswith(' ') or not line:
+                new_line += 1
+                old_left -= 1
+                new_left -= 1
+            continue
+
+        if line.startswith('+++ '):
+            target = line[4:].strip()
+            if target == '/dev/null':
+                lines = None
+            else:
+                if target.startswith('b/'):
+                    target = target[2:]
+                lines = changed.setdefault(target, [])
+            continue
+
+        match = HUNK_HEADER.match(line)
+        if match:
+            old_left = int(match.group(1) or 1)
+            new_line = int(match.group(2))
+            new_left = int(match.group(3) or 1)
+            # A deletion-only hunk names the line before the deletion
+            if new_left == 0:
+                new_line += 1
+
+    return {path: _merge(numbers) for path, numbers in changed.items() if numbers}
+
+
+def _merge(numbers: List[int]) -> List[Tuple[int, int]]:
+    ranges: List[Tuple[int, int]] = []
+    for number in sorted(set(numbers)):
+        if ranges and number == ranges[-1][1] + 1:
+            ranges[-1] = (ranges[-1][0], number)
+        else:
+            ranges.append((number, number))
+    return ranges
+
+
+class DiffScope:
+    """Which (file, line) positions are in or near a change.
+
+    Args:
+        ranges: Absolute path -> changed (first line, last line) ranges
+        context: Lines either side of a change that still count as in scope
+    """
+
+    def __init__(
+        self, ranges: Dict[str, List[Tuple[int, int]]], context: int = DEFAULT_CONTEXT_LINES
+    ):
+        self.ranges = ranges
+        self.context = context
+        self._starts = {path: [start for start, _ in spans] for path, spans in ranges.items()}
+
+    @classmethod
+    def from_diff(cls, diff: str, root: str, context: int = DEFAULT_CONTEXT_LINES) -> "DiffScope":
+        """Scope of a git diff whose paths are relative to root."""
+        return cls(
+            {
+                os.path.abspath(os.path.join(root, path)): spans
+                for path, spans in parse_changed_lines(diff).items()
+            },
+            context,
+        )
+
+    def files(self) -> List[str]:
+        """Changed files that still exist, sorted."""
+        return sorted(path for path in self.ranges if os.path.isfile(path))
+
+    def changed_line_count(self) -> int:
+        return sum(end - start + 1 for spans in self.ranges.values() for start, end in spans)
+
+    def contains(self, file_path: str, line: Optional[int]) -> bool:
+        """Whether a finding at file_path:line is in or near a changed range.
+
+        Findings without a line number are in scope for any changed file.
+        """
+        spans = self.ranges.get(os.path.abspath(file_path))
+        if not spans:
+            return False
+        if not line:
+            return True
+
+        # The last range starting at or before line + context is the only
+        # one that can reach line
+        index = bisect_right(self._starts[os.path.abspath(file_path)], line + self.context) - 1
+        return index >= 0 and spans[index][1] + self.context >= line
+
+
+def repo_diff_scope(
+    repo, base: Optional[str] = None, context: int = DEFAULT_CONTEXT_LINES
+) -> DiffScope:
+    """Scope of the working tree's changes in a GitRepo.
+
+    Args:
+        repo: GitRepo
+        base: Branch or commit to compare against (through its merge base with
+            HEAD, as a pull request would); None compares against HEAD
+        context: Lines either side of a change that still count as in scope
+
+    Returns:
+        DiffScope with absolute paths
+    """
+    if base is None:
+        diff = repo.get_diffs() or ""
+    else:
+        merge_base = repo.repo.git.merge_base(base, "HEAD").strip()
+        diff = repo.repo.git.diff(merge_base, stdout_as_string=False).decode(
+            repo.io.encoding, "replace"
+        )
+    return DiffScope.from_diff(diff, repo.root, context)
@@ -10,6 +10,8 @@ from enum import Enum
 from typing import Optional, Dict
 import platform
 import subprocess
+import threading
+import time
 
 try:
     import requests  # type: ignore
@@ -31,6 +33,10 @@ class LicenseTier(Enum):
     ENTERPRISE = "enterprise"
 
 
+# Tiers in increasing order of what they unlock
+TIER_ORDER = [LicenseTier.FREE, LicenseTier.PRO, LicenseTier.ENTERPRISE]
+
+
 class LicenseManager:
     """Manages license validation and tier checking."""
 
@@ -43,6 +49,17 @@ class LicenseManager:
         "FLACO_LICENSE_SERVER_URL", "https://flaco-license-server.onrender.com"
     ).rstrip("/")
 
+    # Resolved tiers are reused for this long before the server is asked again.
+    # Older entries are still served (and revalidated in the background) for
+    # as long as the offline grace period allows.
+    TIER_CACHE_TTL = int(os.getenv("FLACO_LICENSE_CACHE_TTL", "3600") or "3600")
+
+    # Resolved tiers shared by every LicenseManager in the process, keyed by
+    # license file path
+    _tier_cache: Dict[str, Dict] = {}
+    _tier_cache_lock = threading.Lock()
+    _revalidating = set()
+
     def __init__(self, io=None):
         """Initialize license manager.
 
@@ -139,6 +156,14 @@ class LicenseManager:
     def get_tier(self) -> LicenseTier:
         """Get current license tier.
 
+        The resolved tier is cached in-process and on disk. Within
+        TIER_CACHE_TTL it is returned without touching the network; after
+        that, a stale tier is still returned immediately (within the offline
+        grace period) while a background thread revalidates it with the server.
+        A cached tier that fails its signature check or claims to be verified
+        in the future is ignored, and the license is validated again. A cached
+        tier never grants more than the tier in the license file.
+
         Returns:
             LicenseTier enum value
         """
@@ -147,6 +172,26 @@ class LicenseManager:
         if not license_data:
             return LicenseTier.FREE
 
+        license_id = self._license_id(license_data)
+        entry = self._get_cached_tier(license_id)
+        if entry:
+            age = time.time() - entry["verified_at"]
+            if age < 0:
+                entry = None
+        if entry:
+            tier = self._cap_tier(LicenseTier(entry["tier"]), license_data)
+            if age <= self.TIER_CACHE_TTL:
+                return tier
+            if age <= self._offline_grace_days() * 86400:
+                self._revalidate_in_background(license_data)
+                return tier
+
+        tier = self._resolve_tier(license_data)
+        self._set_cached_tier(license_id, tier)
+        return tier
+
+    def _resolve_tier(self, license_data: Dict) -> LicenseTier:
+        """Validate license data (server first, then locally) and return its tier."""
         # Prefer server-backed validation when configured.
         if self.LICENSE_SERVER_URL:
             if not self.validate_with_server(license_data):
@@ -167,6 +212,125 @@ class LicenseManager:
         except ValueError:
             return LicenseTier.FREE
 
+    @staticmethod
+    def _cap_tier(tier: LicenseTier, license_data: Dict) -> LicenseTier:
+        """Lower a cached tier to the tier in the license file, if that is lower.
+
+        The tier cache lives in the user's home directory and its signature key
+        is not secret, so it can be forged. It is only trusted to skip the
+        server round trip, never to grant more than the license file claims.
+        """
+        try:
+            claimed = LicenseTier((license_data.get("tier") or "free").lower())
+        except ValueError:
+            claimed = LicenseTier.FREE
+        return min(tier, claimed, key=TIER_ORDER.index)
+
+    def _license_id(self, license_data: Dict) -> str:
+        """Hash identifying the license a cached tier belongs to."""
+        ident = f"{license_data.get('email') or ''}|{license_data.get('key') or ''}"
+        return hashlib.sha256(ident.encode("utf-8")).hexdigest()
+
+    def _tier_cache_file(self) -> Path:
+        return self._cache_dir() / "license_tier.json"
+
+    def _tier_signature(self, license_id: str, tier: str, verified_at: float) -> str:
+        """HMAC of a cached tier, keyed to this install's device id.
+
+        Catches a license_tier.json that was edited or copied from another
+        install. The key is not secret, so this is not a defence against a
+        forged entry; _cap_tier() is what bounds the tier a cache can grant.
+        """
+        key = f"{self.SECRET_KEY}|{self._get_or_create_device_id()}".encode("utf-8")
+        message = f"{license_id}|{tier}|{float(verified_at)!r}".encode("utf-8")
+        return hmac.new(key, message, hashlib.sha256).hexdigest()
+
+    def _get_cached_tier(self, license_id: str) -> Optional[Dict]:
+        """Get the cached tier entry for this license (memory first, then disk)."""
+        cache_key = str(self.license_file)
+        with self._tier_cache_lock:
+            entry = self._tier_cache.get(cache_key)
+        if entry and entry.get("license_id") == license_id:
+            return entry
+
+        try:
+            entry = json.loads(self._tier_cache_file().read_text())
+            LicenseTier(entry["tier"])
+            entry["verified_at"] = float(entry["verified_at"])
+            signature = str(entry["signature"])
+        except Exception:
+            return None
+
+        if entry.get("license_id") != license_id:
+            return None
+        if entry["verified_at"] > time.time():
+            return None
+        expected = self._tier_signature(license_id, entry["tier"], entry["verified_at"])
+        if not hmac.compare_digest(signature, expected):
+            return None
+
+        with self._tier_cache_lock:
+            self._tier_cache[cache_key] = entry
+        return entry
+
+    def _set_cached_tier(self, license_id: str, tier: LicenseTier):
+        """Record a freshly resolved tier in memory and on disk."""
+        verified_at = time.time()
+        entry = {
+            "license_id": license_id,
+            "tier": tier.value,
+            "verified_at": verified_at,
+            "signature": self._tier_signature(license_id, tier.value, verified_at),
+        }
+        with self._tier_cache_lock:
+            self._tier_cache[str(self.license_file)] = entry
+
+        try:
+            cache_file = self._tier_cache_file()
+            tmp_file = cache_file.with_suffix(".tmp")
+            tmp_file.write_text(json.dumps(entry))
+            os.replace(tmp_file, cache_file)
+        except Exception:
+            pass
+
+    def invalidate_tier_cache(self):
+        """Forget the cached tier so the next get_tier() validates again."""
+        with self._tier_cache_lock:
+            self._tier_cache.pop(str(self.license_file), None)
+        try:
+            self._tier_cache_file().unlink()
+        except Exception:
+            pass
+
+    def _revalidate_in_background(self, license_data: Dict):
+        """Refresh the cached tier on a daemon thread (at most one per license file)."""
+        cache_key = str(self.license_file)
+        with self._tier_cache_lock:
+            if cache_key in self._revalidating:
+                return
+            self._revalidating.add(cache_key)
+
+        def revalidate():
+            try:
+                # A quiet manager, so nothing is printed over the user's session
+                manager = LicenseManager(io=None)
+                manager.license_file = self.license_file
+                tier = manager._resolve_tier(dict(license_data))
+                manager._set_cached_tier(self._license_id(license_data), tier)
+            except Exception:
+                pass
+            finally:
+                with self._tier_cache_lock:
+                    self._revalidating.discard(cache_key)
+
+        thread = threading.Thread(target=revalidate, name="flaco-license-revalidate", daemon=True)
+        thread.start()
+        return thread
+
+    @staticmethod
+    def _offline_grace_days() -> int:
+        return int(os.getenv("FLACO_OFFLINE_GRACE_DAYS", "7") or "7")
+
     def has_feature(self, feature_name: str) -> bool:
         """Check if current tier has access to feature.
 
@@ -296,6 +460,7 @@ class LicenseManager:
                 json.dump(license_data, f, indent=2)
 
             self._cached_license = license_data
+            self.invalidate_tier_cache()
 
             if self.io:
                 self.io.tool_output(f"✓ License activated for {email} ({tier} tier)")
@@ -366,7 +531,7 @@ class LicenseManager:
         if not email or not key:
             return False
 
-        grace_days = int(os.getenv("FLACO_OFFLINE_GRACE_DAYS", "7") or "7")
+        grace_days = self._offline_grace_days()
 
         try:
             payload = {
@@ -664,6 +829,7 @@ class LicenseManager:
             try:
                 self.license_file.unlink()
                 self._cached_license = None
+                self.invalidate_tier_cache()
 
                 if self.io:
                     self.io.tool_output("✓ License deactivated. Reverted to FREE tier.")
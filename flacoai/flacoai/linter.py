@@ -1,22 +1,60 @@
+import hashlib
 import os
 import re
 import subprocess
 import sys
+import time
 import traceback
 import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
 import oslex
-from grep_ast import TreeContext, filename_to_lang
-from grep_ast.tsl import get_parser  # noqa: E402
+from grep_ast import filename_to_lang
 
 from flacoai.dump import dump  # noqa: F401
+from flacoai.parse_service import get_parse_service
+from flacoai.parse_service import tree_context as parsed_tree_context
 from flacoai.run_cmd import run_cmd_subprocess  # noqa: F401
 
 # tree_sitter is throwing a FutureWarning
 warnings.simplefilter("ignore", category=FutureWarning)
 
+# Files passed to one flake8 invocation, to stay well under command line limits
+LINT_BATCH_SIZE = 100
+
+# Linters run at once; each lints its own files in one thread
+LINT_WORKERS = 4
+
+# Lint reports kept by content hash, so unchanged files aren't linted again
+LINT_CACHE_SIZE = 1024
+
+FLAKE8_FATAL = "E9,F821,F823,F831,F406,F407,F701,F702,F704,F706"
+
+
+@dataclass
+class LintRun:
+    """Timing of one Linter.lint_many call."""
+
+    files: int = 0
+    cached: int = 0
+    linters: int = 0
+    # Seconds the call took, and the sum of each linter's own time
+    wall: float = 0.0
+    serial: float = 0.0
+    # Seconds the cached files took when they were last linted
+    saved: float = 0.0
+
+    def summary(self):
+        text = f"Linted {self.files} file{'s' if self.files != 1 else ''} in {self.wall:.2f}s"
+        if self.linters > 1:
+            text += f", {self.serial:.2f}s of linting across {self.linters} linters run at once"
+        if self.cached:
+            text += f"; {self.cached} unchanged, reused from cache (saved {self.saved:.2f}s)"
+        return text
+
 
 class Linter:
     def __init__(self, encoding="utf-8", root=None):
@@ -28,6 +66,15 @@ class Linter:
         )
         self.all_lint_cmd = None
 
+        # Linters that lint many files at once: cmd -> fn(items) -> {fname: LintResult}
+        self.batch_linters = {
+            self.py_lint: self.py_lint_batch,
+        }
+
+        # (fname, cmd, content sha1) -> (report, seconds it took)
+        self._cache = OrderedDict()
+        self.last_run = LintRun()
+
     def set_linter(self, lang, cmd):
         if lang:
             self.languages[lang] = cmd
@@ -79,93 +126,197 @@ class Linter:
 
         return LintResult(text=errors, lines=linenums)
 
-    def lint(self, fname, cmd=None):
-        rel_fname = self.get_rel_fname(fname)
-        try:
-            code = Path(fname).read_text(encoding=self.encoding, errors="replace")
-        except OSError as err:
-            print(f"Unable to read {fname}: {err}")
-            return
-
+    def get_cmd(self, fname, cmd=None):
+        """The linter for a file: a command string, a callable, None for
+        basic_lint, or False if the file's language isn't known."""
         if cmd:
             cmd = cmd.strip()
-        if not cmd:
-            lang = filename_to_lang(fname)
-            if not lang:
-                return
-            if self.all_lint_cmd:
-                cmd = self.all_lint_cmd
-            else:
-                cmd = self.languages.get(lang)
-
-        if callable(cmd):
-            lintres = cmd(fname, rel_fname, code)
-        elif cmd:
-            lintres = self.run_cmd(cmd, rel_fname, code)
-        else:
-            lintres = basic_lint(rel_fname, code)
+        if cmd:
+            return cmd
 
-        if not lintres:
-            return
+        lang = filename_to_lang(fname)
+        if not lang:
+            return False
+        if self.all_lint_cmd:
+            return self.all_lint_cmd
+        return self.languages.get(lang)
+
+    def lint(self, fname, cmd=None):
+        return self.lint_many([fname], cmd=cmd).get(fname)
+
+    def lint_many(self, fnames, cmd=None):
+        """Lint files, batching them per linter and running the linters concurrently.
+
+        Files are grouped by the linter that handles them. Linters that can
+        take many files at once (flake8) are run once per group; each group
+        runs in its own thread. Reports are cached by file content, so an
+        unchanged file is not linted again.
+
+        Args:
+            fnames: Files to lint
+            cmd: Lint command to use for every file instead of the configured ones
+
+        Returns:
+            Dict of fname to its lint report, or None if it has no errors
+        """
+        start = time.perf_counter()
+        run = LintRun()
+        reports = {}
+        groups = OrderedDict()
+        keys = {}
+        for fname in dict.fromkeys(fnames):
+            rel_fname = self.get_rel_fname(fname)
+            try:
+                code = Path(fname).read_text(encoding=self.encoding, errors="replace")
+            except OSError as err:
+                print(f"Unable to read {fname}: {err}")
+                continue
+
+            file_cmd = self.get_cmd(fname, cmd)
+            if file_cmd is False:
+                continue
+
+            run.files += 1
+            key = (fname, file_cmd, hashlib.sha1(code.encode(self.encoding, "replace")).hexdigest())
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                reports[fname] = cached[0]
+                run.cached += 1
+                run.saved += cached[1]
+                continue
+
+            keys[fname] = key
+            groups.setdefault(file_cmd, []).append((fname, rel_fname, code))
 
+        run.linters = len(groups)
+        if len(groups) > 1:
+            with ThreadPoolExecutor(max_workers=min(len(groups), LINT_WORKERS)) as executor:
+                done = list(executor.map(lambda group: self.lint_group(*group), groups.items()))
+        else:
+            done = [self.lint_group(*group) for group in groups.items()]
+
+        for group_reports, seconds in done:
+            run.serial += seconds
+            for fname, report in group_reports.items():
+                reports[fname] = report
+                self._cache[keys[fname]] = (report, seconds / len(group_reports))
+        while len(self._cache) > LINT_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+        run.wall = time.perf_counter() - start
+        self.last_run = run
+        return dict((fname, reports[fname]) for fname in fnames if fname in reports)
+
+    def lint_group(self, cmd, items):
+        """Lint the files one linter handles.
+
+        Args:
+            cmd: Linter from get_cmd
+            items: (fname, rel_fname, code) of each file
+
+        Returns:
+            ({fname: report or None}, seconds taken)
+        """
+        start = time.perf_counter()
+        batch = self.batch_linters.get(cmd) if callable(cmd) else None
+        if batch:
+            results = batch(items)
+        else:
+            results = {}
+            for fname, rel_fname, code in items:
+                if callable(cmd):
+                    results[fname] = cmd(fname, rel_fname, code)
+                elif cmd:
+                    results[fname] = self.run_cmd(cmd, rel_fname, code)
+                else:
+                    results[fname] = basic_lint(rel_fname, code, abs_fname=fname)
+
+        reports = {}
+        for fname, rel_fname, code in items:
+            lintres = results.get(fname)
+            reports[fname] = (
+                self.format_lint_result(fname, rel_fname, code, lintres) if lintres else None
+            )
+        return reports, time.perf_counter() - start
+
+    def format_lint_result(self, fname, rel_fname, code, lintres):
         res = "# Fix any errors below, if possible.\n\n"
         res += lintres.text
         res += "\n"
-        res += tree_context(rel_fname, code, lintres.lines)
+        res += tree_context(rel_fname, code, lintres.lines, abs_fname=fname)
 
         return res
 
     def py_lint(self, fname, rel_fname, code):
-        basic_res = basic_lint(rel_fname, code)
-        compile_res = lint_python_compile(fname, code)
-        flake_res = self.flake8_lint(rel_fname)
-
-        text = ""
-        lines = set()
-        for res in [basic_res, compile_res, flake_res]:
-            if not res:
-                continue
-            if text:
-                text += "\n"
-            text += res.text
-            lines.update(res.lines)
-
-        if text or lines:
-            return LintResult(text, lines)
-
-    def flake8_lint(self, rel_fname):
-        fatal = "E9,F821,F823,F831,F406,F407,F701,F702,F704,F706"
-        flake8_cmd = [
+        return self.py_lint_batch([(fname, rel_fname, code)]).get(fname)
+
+    def py_lint_batch(self, items):
+        """Lint python files, running flake8 once for all of them."""
+        flake_results = self.flake8_lint_many([rel_fname for _, rel_fname, _ in items])
+
+        results = {}
+        for fname, rel_fname, code in items:
+            basic_res = basic_lint(rel_fname, code, abs_fname=fname)
+            compile_res = lint_python_compile(fname, code)
+            flake_res = flake_results.get(rel_fname)
+
+            text = ""
+            lines = set()
+            for res in [basic_res, compile_res, flake_res]:
+                if not res:
+                    continue
+                if text:
+                    text += "\n"
+                text += res.text
+                lines.update(res.lines)
+
+            if text or lines:
+                results[fname] = LintResult(text, lines)
+        return results
+
+    def flake8_cmd(self, rel_fnames):
+        return [
             sys.executable,
             "-m",
             "flake8",
-            f"--select={fatal}",
+            f"--select={FLAKE8_FATAL}",
             "--show-source",
             "--isolated",
-            rel_fname,
-        ]
-
-        text = f"## Running: {' '.join(flake8_cmd)}\n\n"
+        ] + list(rel_fnames)
 
-        try:
-            result = subprocess.run(
-                flake8_cmd,
-                capture_output=True,
-                text=True,
-                check=False,
-                encoding=self.encoding,
-                errors="replace",
-                cwd=self.root,
-            )
-            errors = result.stdout + result.stderr
-        except Exception as e:
-            errors = f"Error running flake8: {str(e)}"
+    def flake8_lint(self, rel_fname):
+        return self.flake8_lint_many([rel_fname]).get(rel_fname)
 
-        if not errors:
-            return
+    def flake8_lint_many(self, rel_fnames):
+        """Run flake8 on files, LINT_BATCH_SIZE at a time, and split its output per file."""
+        results = {}
+        for start in range(0, len(rel_fnames), LINT_BATCH_SIZE):
+            batch = rel_fnames[start : start + LINT_BATCH_SIZE]
+            try:
+                result = subprocess.run(
+                    self.flake8_cmd(batch),
+                    capture_output=True,
+                    text=True,
+                    check=False,
+                    encoding=self.encoding,
+                    errors="replace",
+                    cwd=self.root,
+                )
+                errors = result.stdout + result.stderr
+            except Exception as e:
+                errors = f"Error running flake8: {str(e)}"
+
+            if not errors:
+                continue
 
-        text += errors
-        return self.errors_to_lint_result(rel_fname, text)
+            for rel_fname, file_errors in split_output_by_file(errors, batch).items():
+                if not file_errors:
+                    continue
+                text = f"## Running: {' '.join(self.flake8_cmd([rel_fname]))}\n\n"
+                text += file_errors
+                results[rel_fname] = self.errors_to_lint_result(rel_fname, text)
+        return results
 
 
 @dataclass
@@ -198,9 +349,10 @@ def lint_python_compile(fname, code):
     return LintResult(text=res, lines=line_numbers)
 
 
-def basic_lint(fname, code):
+def basic_lint(fname, code, abs_fname=None):
     """
     Use tree-sitter to look for syntax errors, display them with tree context.
+    The tree comes from the shared parse service, kept under abs_fname if given.
     """
 
     lang = filename_to_lang(fname)
@@ -212,13 +364,11 @@ def basic_lint(fname, code):
         return
 
     try:
-        parser = get_parser(lang)
+        tree = get_parse_service().parse(abs_fname or fname, code, lang)
     except Exception as err:
         print(f"Unable to load parser: {err}")
         return
 
-    tree = parser.parse(bytes(code, "utf-8"))
-
     try:
         errors = traverse_tree(tree.root_node)
     except RecursionError:
@@ -231,10 +381,11 @@ def basic_lint(fname, code):
     return LintResult(text="", lines=errors)
 
 
-def tree_context(fname, code, line_nums):
-    context = TreeContext(
+def tree_context(fname, code, line_nums, abs_fname=None):
+    context = parsed_tree_context(
         fname,
         code,
+        abs_fname=abs_fname,
         color=False,
         line_number=True,
         child_context=False,
@@ -269,6 +420,26 @@ def traverse_tree(node):
     return errors
 
 
+def split_output_by_file(text, fnames):
+    """
+    Split the output of a linter run on several files into the part about each.
+    A line starting with "<filename>:" begins a message about that file, and the
+    lines after it (source, caret) belong to it. Output before the first such
+    line isn't about any one file, so every file gets it.
+    """
+    common = []
+    by_file = dict((fname, []) for fname in fnames)
+    current = None
+    for line in text.splitlines(keepends=True):
+        for fname in fnames:
+            if line.startswith(fname + ":"):
+                current = fname
+                break
+        (by_file[current] if current else common).append(line)
+
+    return dict((fname, "".join(common + lines)) for fname, lines in by_file.items())
+
+
 def find_filenames_and_linenums(text, fnames):
     """
     Search text for all occurrences of <filename>:\\d+ and make a list of them
@@ -294,8 +465,7 @@ def main():
         sys.exit(1)
 
     linter = Linter(root=os.getcwd())
-    for file_path in sys.argv[1:]:
-        errors = linter.lint(file_path)
+    for errors in linter.lint_many(sys.argv[1:]).values():
         if errors:
             print(errors)
 
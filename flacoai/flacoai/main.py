@@ -27,23 +27,15 @@ from dotenv import load_dotenv
 from prompt_toolkit.enums import EditingMode
 
 from flacoai import __version__, models, urls, utils
-from flacoai.analytics import Analytics
 from flacoai.args import get_parser
-from flacoai.coders import Coder
-from flacoai.coders.base_coder import UnknownEditFormat
-from flacoai.commands import Commands, SwitchCoder
-from flacoai.copypaste import ClipboardWatcher
 from flacoai.deprecated import handle_deprecated_model_args
 from flacoai.format_settings import format_settings, scrub_sensitive_info
-from flacoai.history import ChatSummary
 from flacoai.io import InputOutput
 from flacoai.llm import litellm  # noqa: F401; properly init litellm on launch
 from flacoai.models import ModelSettings
-from flacoai.onboarding import offer_openrouter_oauth, select_default_model
 from flacoai.repo import ANY_GIT_ERROR, GitRepo
 from flacoai.report import report_uncaught_exceptions
 from flacoai.versioncheck import check_version, install_from_main_branch, install_upgrade
-from flacoai.watch import FileWatcher
 
 from .dump import dump  # noqa: F401
 
@@ -551,6 +543,15 @@ def main(argv=None, input=None, output=None, force_git_root=None, return_coder=F
         print(shtab.complete(parser, shell=args.shell_completions))
         sys.exit(0)
 
+    # Imported once the arguments parse, so --help and --shell-completions
+    # don't pay for the coders, their commands and the analytics clients
+    from flacoai.analytics import Analytics
+    from flacoai.coders import Coder
+    from flacoai.coders.base_coder import UnknownEditFormat
+    from flacoai.commands import Commands, SwitchCoder
+    from flacoai.history import ChatSummary
+    from flacoai.onboarding import offer_openrouter_oauth, select_default_model
+
     if git is None:
         args.git = False
 
@@ -1066,6 +1067,7 @@ def main(argv=None, input=None, output=None, force_git_root=None, return_coder=F
             summarizer=summarizer,
             analytics=analytics,
             map_refresh=args.map_refresh,
+            map_ranking=args.map_ranking,
             cache_prompts=args.cache_prompts,
             map_mul_no_files=args.map_multiplier_no_files,
             num_cache_warming_pings=args.cache_keepalive_pings,
@@ -1098,6 +1100,8 @@ def main(argv=None, input=None, output=None, force_git_root=None, return_coder=F
         ignores.append(args.flacoaiignore)
 
     if args.watch_files:
+        from flacoai.watch import FileWatcher
+
         file_watcher = FileWatcher(
             coder,
             gitignores=ignores,
@@ -1109,6 +1113,8 @@ def main(argv=None, input=None, output=None, force_git_root=None, return_coder=F
 
     if args.copy_paste:
         analytics.event("copy-paste mode")
+        from flacoai.copypaste import ClipboardWatcher
+
         ClipboardWatcher(coder.io, verbose=args.verbose)
 
     coder.show_announcements()
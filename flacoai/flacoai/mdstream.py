@@ -3,14 +3,16 @@
 import io
 import time
 
+from markdown_it import MarkdownIt
 from rich import box
 from rich.console import Console, ConsoleOptions, RenderResult
 from rich.live import Live
-from rich.markdown import CodeBlock, Heading, Markdown, MarkdownContext
+from rich.markdown import CodeBlock, Heading, Markdown, MarkdownContext, UnknownElement
 from rich.panel import Panel
 from rich.style import Style
 from rich.syntax import Syntax
 from rich.text import Text
+from rich.theme import Theme
 
 from flacoai.dump import dump  # noqa: F401
 
@@ -105,6 +107,118 @@ class NoInsetMarkdown(Markdown):
         super().__init__(*args, **kwargs)
 
 
+# Inline code in bold with no background; the default "bold cyan on black"
+# draws a dark box around it
+MARKDOWN_THEME = Theme({"markdown.code": "bold"})
+
+# Small blocks after which rich does, or does not, start the next block with
+# a blank line
+PROBE_NEW_LINE = "x\n\n"
+PROBE_NO_NEW_LINE = "---\n\n"
+
+
+class IncrementalMarkdownRenderer:
+    """Renders a growing markdown document, re-rendering only its open tail.
+
+    A top-level block (paragraph, list, closed code fence, ...) that is
+    followed by another block can no longer change as text is appended, so
+    it is rendered once and frozen; each update parses and renders only the
+    source after the frozen blocks. The output matches rendering the whole
+    document at once. One console and theme serve every render.
+    """
+
+    def __init__(self, mdargs=None):
+        """Initialize the renderer.
+
+        Args:
+            mdargs (dict, optional): Additional arguments to pass to rich Markdown renderer
+        """
+        self.mdargs = mdargs or dict()
+        self.file = io.StringIO()
+        self.console = Console(file=self.file, force_terminal=True, theme=MARKDOWN_THEME)
+        # Configured like rich.markdown.Markdown's parser, so blocks split the same way
+        self.parser = MarkdownIt().enable("strikethrough").enable("table")
+        # Rendered line count of each stand-in block
+        self.probe_lines = {}
+        self.reset()
+
+    def reset(self):
+        self.frozen_lines = []  # Rendered lines of the frozen blocks
+        self.frozen_source = ""  # Markdown source of the frozen blocks
+        # Rich decides whether a block starts with a blank line from the block
+        # before it; None at the start of the document
+        self.new_line = None
+
+    def render_lines(self, text):
+        """Render markdown text to a list of lines with line endings preserved."""
+        self.file.seek(0)
+        self.file.truncate()
+        self.console.print(NoInsetMarkdown(text, **self.mdargs))
+        return self.file.getvalue().splitlines(keepends=True)
+
+    def _render_after_frozen(self, text):
+        """Render text as it would appear following the frozen blocks.
+
+        A short stand-in block that leaves rich in the same state as the
+        last frozen block is rendered first and its lines dropped, so the
+        spacing before text matches a render of the whole document.
+        """
+        if self.new_line is None:
+            return self.render_lines(text)
+        probe = PROBE_NEW_LINE if self.new_line else PROBE_NO_NEW_LINE
+        if probe not in self.probe_lines:
+            self.probe_lines[probe] = len(self.render_lines(probe))
+        return self.render_lines(probe + text)[self.probe_lines[probe]:]
+
+    def render(self, text):
+        """Render text, freezing any blocks that have become stable.
+
+        Args:
+            text (str): The whole document so far
+
+        Returns:
+            list: Rendered lines of the open tail; the lines before them are
+            frozen_lines
+        """
+        if not text.startswith(self.frozen_source):
+            # Earlier text was rewritten, not appended to
+            self.reset()
+
+        tail = text[len(self.frozen_source):]
+        blocks = self._top_level_blocks(tail)
+
+        # markdown-it counts lines after normalizing "\r" to "\n"; only cut
+        # on line numbers when they are plain "\n" offsets
+        if len(blocks) > 1 and "\r" not in tail:
+            offset = self._line_offset(tail, blocks[-1][0])
+            self.frozen_lines.extend(self._render_after_frozen(tail[:offset]))
+            self.frozen_source += tail[:offset]
+            self.new_line = self._new_line_after(blocks[-2][1])
+            tail = tail[offset:]
+
+        return self._render_after_frozen(tail)
+
+    def _top_level_blocks(self, text):
+        """(first line, token type) of each top-level block in text."""
+        return [
+            (token.map[0], token.type)
+            for token in self.parser.parse(text)
+            if token.level == 0 and token.nesting >= 0 and token.map
+        ]
+
+    @staticmethod
+    def _line_offset(text, line):
+        offset = 0
+        for _ in range(line):
+            offset = text.index("\n", offset) + 1
+        return offset
+
+    @staticmethod
+    def _new_line_after(token_type):
+        element_class = NoInsetMarkdown.elements.get(token_type) or UnknownElement
+        return element_class.new_line
+
+
 class MarkdownStream:
     """Streaming markdown renderer that progressively displays content with a live updating window.
 
@@ -124,13 +238,16 @@ class MarkdownStream:
         Args:
             mdargs (dict, optional): Additional arguments to pass to rich Markdown renderer
         """
-        self.printed = []  # Stores lines that have already been printed
+        self.num_printed = 0  # Number of rendered lines already printed above the live window
 
         if mdargs:
             self.mdargs = mdargs
         else:
             self.mdargs = dict()
 
+        # One renderer for the whole reply, so finished blocks are rendered once
+        self.renderer = IncrementalMarkdownRenderer(self.mdargs)
+
         # Defer Live creation until the first update.
         self.live = None
         self._live_started = False
@@ -144,24 +261,7 @@ class MarkdownStream:
         Returns:
             list: List of rendered lines with line endings preserved
         """
-        from rich.theme import Theme
-
-        # Create custom theme to remove background from inline code
-        # The default is "bold cyan on black" which creates a dark background box
-        # We want just bold text with no background at all
-        custom_theme = Theme({
-            "markdown.code": "bold",  # Remove "on black" background
-        })
-
-        # Render the markdown to a string buffer
-        string_io = io.StringIO()
-        console = Console(file=string_io, force_terminal=True, theme=custom_theme)
-        markdown = NoInsetMarkdown(text, **self.mdargs)
-        console.print(markdown)
-        output = string_io.getvalue()
-
-        # Split rendered output into lines
-        return output.splitlines(keepends=True)
+        return self.renderer.render_lines(text)
 
     def __del__(self):
         """Destructor to ensure Live display is properly cleaned up."""
@@ -202,13 +302,21 @@ class MarkdownStream:
 
         # Measure render time and adjust min_delay to maintain smooth rendering
         start = time.time()
-        lines = self._render_markdown_to_lines(text)
+        tail = self.renderer.render(text)
+        frozen = self.renderer.frozen_lines
         render_time = time.time() - start
 
         # Set min_delay to render time plus a small buffer
         self.min_delay = min(max(render_time * 10, 1.0 / 20), 2)
 
-        num_lines = len(lines)
+        def lines(first, last=None):
+            """Rendered lines first..last of the whole reply, without joining the lists."""
+            count = len(frozen)
+            if last is None:
+                last = count + len(tail)
+            return frozen[first:last] + tail[max(first - count, 0):max(last - count, 0)]
+
+        num_lines = len(frozen) + len(tail)
 
         # How many lines have "left" the live window and are now considered stable?
         # Or if final, consider all lines to be stable.
@@ -218,7 +326,7 @@ class MarkdownStream:
         # If we have stable content to display...
         if final or num_lines > 0:
             # How many stable lines do we need to newly show above the live window?
-            num_printed = len(self.printed)
+            num_printed = self.num_printed
             show = num_lines - num_printed
 
             # Skip if no new lines to show above live window
@@ -226,13 +334,13 @@ class MarkdownStream:
                 return
 
             # Get the new lines and display them
-            show = lines[num_printed:num_lines]
+            show = lines(num_printed, num_lines)
             show = "".join(show)
             show = Text.from_ansi(show)
             self.live.console.print(show)  # to the console above the live area
 
             # Update our record of printed lines
-            self.printed = lines[:num_lines]
+            self.num_printed = num_lines
 
         # Handle final update cleanup
         if final:
@@ -242,7 +350,7 @@ class MarkdownStream:
             return
 
         # Update the live window with remaining lines
-        rest = lines[num_lines:]
+        rest = lines(num_lines)
         rest = "".join(rest)
         rest = Text.from_ansi(rest)
         self.live.update(rest)
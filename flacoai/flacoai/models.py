@@ -14,7 +14,6 @@ from typing import Optional, Union
 
 import json5
 import yaml
-from PIL import Image
 
 from flacoai import __version__
 from flacoai.dump import dump  # noqa: F401
@@ -133,10 +132,14 @@ class ModelSettings:
     accepts_settings: Optional[list] = None
 
 
+# libyaml's loader when PyYAML was built with it; the pure python one takes
+# a fifth of a second of startup to read model-settings.yml
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 # Load model settings from package resource
 MODEL_SETTINGS = []
 with importlib.resources.open_text("flacoai.resources", "model-settings.yml") as f:
-    model_settings_list = yaml.safe_load(f)
+    model_settings_list = yaml.load(f, Loader=YAML_LOADER)
     for model_settings_dict in model_settings_list:
         MODEL_SETTINGS.append(ModelSettings(**model_settings_dict))
 
@@ -671,6 +674,8 @@ class Model(ModelSettings):
         :param fname: The filename of the image.
         :return: A tuple (width, height) representing the image size in pixels.
         """
+        from PIL import Image
+
         with Image.open(fname) as img:
             return img.size
 
@@ -13,8 +13,6 @@ import time
 from pathlib import Path
 from typing import Dict
 
-import requests
-
 
 def _cost_per_token(val: str | None) -> float | None:
     """Convert a price string (USD per token) to a float."""
@@ -113,6 +111,8 @@ class OpenRouterModelManager:
 
     def _update_cache(self) -> None:
         try:
+            import requests
+
             response = requests.get(self.MODELS_URL, timeout=10, verify=self.verify_ssl)
             if response.status_code == 200:
                 self.content = response.json()
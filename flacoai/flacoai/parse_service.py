@@ -0,0 +1,287 @@
+"""Tree-sitter trees per file, shared by the linter and the repo map.
+
+The linter's syntax check, its error context, the repo map's tags and its
+rendered snippets all need a file's syntax tree. Each used to parse the file
+with a fresh parser. ParseService keeps the latest tree of each file. When
+a file is asked for again with different content, the old tree is edited
+with the changed byte range and reparsed incrementally, so tree-sitter only
+redoes the part of the file that changed.
+
+Trees live in memory only: tree-sitter has no way to save one. The repo
+map's tags keep their own on-disk cache.
+"""
+
+import os
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Tuple
+
+from grep_ast import TreeContext, filename_to_lang
+
+# tree_sitter is throwing a FutureWarning
+warnings.simplefilter("ignore", category=FutureWarning)
+from grep_ast.tsl import get_parser  # noqa: E402
+
+# Trees kept, by count and by the size of the source they were parsed from;
+# the least recently used are dropped first
+PARSE_CACHE_FILES = 2000
+PARSE_CACHE_BYTES = 16 * 1024 * 1024
+
+
+@dataclass
+class ParseStats:
+    """Counters of a ParseService."""
+
+    hits: int = 0
+    full_parses: int = 0
+    incremental_parses: int = 0
+    evictions: int = 0
+    full_seconds: float = 0.0
+    incremental_seconds: float = 0.0
+
+    def summary(self):
+        def mean_ms(seconds, count):
+            return seconds / count * 1000 if count else 0.0
+
+        return (
+            f"Parse cache: {self.hits} hits, {self.full_parses} full parses"
+            f" ({mean_ms(self.full_seconds, self.full_parses):.2f}ms avg),"
+            f" {self.incremental_parses} incremental"
+            f" ({mean_ms(self.incremental_seconds, self.incremental_parses):.2f}ms avg),"
+            f" {self.evictions} evicted"
+        )
+
+
+@dataclass
+class _Entry:
+    lang: str
+    source: bytes
+    tree: object
+
+
+def _common_prefix(a, b) -> int:
+    """Length of the longest common prefix of two byte strings."""
+    a, b = memoryview(a), memoryview(b)
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[lo:mid] == b[lo:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _point(source: bytes, offset: int) -> Tuple[int, int]:
+    """Tree-sitter (row, byte column) point of a byte offset."""
+    row = source.count(b"\n", 0, offset)
+    return row, offset - (source.rfind(b"\n", 0, offset) + 1)
+
+
+def source_edit(old: bytes, new: bytes) -> dict:
+    """The single edit that turns old into new, as tree.edit() keyword arguments.
+
+    The edit spans from the first byte that differs to the last one, which
+    is all tree-sitter needs to know which parts of the old tree to reuse.
+    """
+    start = _common_prefix(old, new)
+    limit = min(len(old), len(new)) - start
+    suffix = _common_prefix(old[::-1][:limit], new[::-1][:limit])
+    old_end = len(old) - suffix
+    new_end = len(new) - suffix
+    return dict(
+        start_byte=start,
+        old_end_byte=old_end,
+        new_end_byte=new_end,
+        start_point=_point(old, start),
+        old_end_point=_point(old, old_end),
+        new_end_point=_point(new, new_end),
+    )
+
+
+class ParseService:
+    """Latest tree-sitter tree of each file, reparsed incrementally after edits.
+
+    Safe to use from several threads: each thread gets its own parsers, and
+    a cached tree is copied before it is edited, so a tree already handed
+    out never changes.
+    """
+
+    def __init__(self, max_files=PARSE_CACHE_FILES, max_bytes=PARSE_CACHE_BYTES):
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.stats = ParseStats()
+
+        self._trees: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def parser(self, lang):
+        """This thread's parser for a language; raises if the grammar can't load."""
+        parsers = getattr(self._local, "parsers", None)
+        if parsers is None:
+            parsers = self._local.parsers = {}
+        if lang not in parsers:
+            parsers[lang] = get_parser(lang)
+        return parsers[lang]
+
+    def parse(self, fname, code, lang=None):
+        """Syntax tree of a file's content.
+
+        Args:
+            fname: Path of the file; trees are kept per absolute path
+            code: The file's content
+            lang: Tree-sitter language, instead of the one fname implies
+
+        Returns:
+            tree_sitter.Tree, or None if the language isn't known
+        """
+        lang = lang or filename_to_lang(fname)
+        if not lang:
+            return
+
+        key = os.path.abspath(fname)
+        source = bytes(code, "utf-8")
+        with self._lock:
+            entry = self._trees.get(key)
+            if entry is not None:
+                self._trees.move_to_end(key)
+                if entry.lang == lang and entry.source == source:
+                    self.stats.hits += 1
+                    return entry.tree
+
+        parser = self.parser(lang)
+        start = time.perf_counter()
+        if entry is not None and entry.lang == lang:
+            old_tree = entry.tree.copy()
+            old_tree.edit(**source_edit(entry.source, source))
+            tree = parser.parse(source, old_tree)
+            incremental = True
+        else:
+            tree = parser.parse(source)
+            incremental = False
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            if incremental:
+                self.stats.incremental_parses += 1
+                self.stats.incremental_seconds += elapsed
+            else:
+                self.stats.full_parses += 1
+                self.stats.full_seconds += elapsed
+            self._store(key, _Entry(lang, source, tree))
+        return tree
+
+    def _store(self, key, entry):
+        old = self._trees.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old.source)
+        self._trees[key] = entry
+        self._bytes += len(entry.source)
+
+        # Never drop the tree just stored
+        while len(self._trees) > 1 and (
+            len(self._trees) > self.max_files or self._bytes > self.max_bytes
+        ):
+            _, evicted = self._trees.popitem(last=False)
+            self._bytes -= len(evicted.source)
+            self.stats.evictions += 1
+
+    def forget(self, fname):
+        """Drop a file's tree."""
+        with self._lock:
+            entry = self._trees.pop(os.path.abspath(fname), None)
+            if entry is not None:
+                self._bytes -= len(entry.source)
+
+    def __len__(self):
+        return len(self._trees)
+
+
+_service = ParseService()
+
+
+def get_parse_service() -> ParseService:
+    """The ParseService shared by everything in this process."""
+    return _service
+
+
+class SharedTreeContext(TreeContext):
+    """grep_ast's TreeContext, built from an already parsed tree."""
+
+    def __init__(
+        self,
+        filename,
+        code,
+        tree,
+        color=False,
+        verbose=False,
+        line_number=False,
+        parent_context=True,
+        child_context=True,
+        last_line=True,
+        margin=3,
+        mark_lois=True,
+        header_max=10,
+        show_top_of_file_parent_scope=True,
+        loi_pad=1,
+    ):
+        # As TreeContext.__init__, minus parsing the code
+        self.filename = filename
+        self.color = color
+        self.verbose = verbose
+        self.line_number = line_number
+        self.last_line = last_line
+        self.margin = margin
+        self.mark_lois = mark_lois
+        self.header_max = header_max
+        self.loi_pad = loi_pad
+        self.show_top_of_file_parent_scope = show_top_of_file_parent_scope
+
+        self.parent_context = parent_context
+        self.child_context = child_context
+
+        self.lines = code.splitlines()
+        self.num_lines = len(self.lines) + 1
+        self.output_lines = dict()
+        self.scopes = [set() for _ in range(self.num_lines)]
+        self.header = [list() for _ in range(self.num_lines)]
+        self.nodes = [list() for _ in range(self.num_lines)]
+
+        self.walk_tree(tree.root_node)
+
+        for i in range(self.num_lines):
+            header = sorted(self.header[i])
+            if len(header) > 1:
+                size, head_start, head_end = header[0]
+                if size > self.header_max:
+                    head_end = head_start + self.header_max
+            else:
+                head_start = i
+                head_end = i + 1
+
+            self.header[i] = head_start, head_end
+
+        self.show_lines = set()
+        self.lines_of_interest = set()
+
+
+def tree_context(filename, code, abs_fname=None, **kwargs) -> TreeContext:
+    """A TreeContext of a file, over its tree from the shared parse service.
+
+    Args:
+        filename: Name shown in the context, usually relative to the repo
+        code: The file's content
+        abs_fname: Path the tree is kept under, if filename isn't one
+        **kwargs: TreeContext options
+    """
+    lang = filename_to_lang(filename)
+    if not lang:
+        raise ValueError(f"Unknown language for {filename}")
+
+    tree = get_parse_service().parse(abs_fname or filename, code, lang)
+    return SharedTreeContext(filename, code, tree, **kwargs)
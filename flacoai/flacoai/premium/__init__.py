@@ -8,16 +8,27 @@ This code is proprietary and requires a valid Flaco AI Pro or Enterprise license
 See LICENSE for terms.
 """
 
-from .crash_prediction_analyzer import CrashPredictionAnalyzer
-from .performance_profiler_analyzer import PerformanceProfilerAnalyzer
-from .memory_leak_analyzer import MemoryLeakAnalyzer
-from .security_scoring_analyzer import SecurityScoringAnalyzer
-from .technical_debt_analyzer import TechnicalDebtAnalyzer
-
-__all__ = [
-    "CrashPredictionAnalyzer",
-    "PerformanceProfilerAnalyzer",
-    "MemoryLeakAnalyzer",
-    "SecurityScoringAnalyzer",
-    "TechnicalDebtAnalyzer",
-]
+# Exported name -> submodule defining it; imported on first use, once the
+# license check has enabled premium analyzers
+_EXPORTS = {
+    "CrashPredictionAnalyzer": "crash_prediction_analyzer",
+    "PerformanceProfilerAnalyzer": "performance_profiler_analyzer",
+    "MemoryLeakAnalyzer": "memory_leak_analyzer",
+    "SecurityScoringAnalyzer": "security_scoring_analyzer",
+    "TechnicalDebtAnalyzer": "technical_debt_analyzer",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(__import__(module, globals(), None, [name], 1), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -70,7 +70,7 @@ class CrashPredictionAnalyzer(BaseAnalyzer):
         pattern = r'(\w+!)(?:\.\w+!)+'
 
         for match in re.finditer(pattern, content, re.MULTILINE):
-            line_num = content[:match.start()].count('\n') + 1
+            line_num = self.line_index(content).line_of(match.start())
             code = match.group(0)
 
             # Count number of force unwraps
@@ -114,7 +114,7 @@ class CrashPredictionAnalyzer(BaseAnalyzer):
         # Match array subscript access
         pattern = r'(\w+)\[([^\]]+)\]'
 
-        lines = content.splitlines()
+        lines = self.line_index(content).splitlines()
 
         for line_num, line in enumerate(lines, start=1):
             for match in re.finditer(pattern, line):
@@ -173,7 +173,7 @@ class CrashPredictionAnalyzer(BaseAnalyzer):
             depth = chain.count('?.')
 
             if depth >= 4:
-                line_num = content[:match.start()].count('\n') + 1
+                line_num = self.line_index(content).line_of(match.start())
 
                 results.append(AnalysisResult(
                     file=file_path,
@@ -203,7 +203,7 @@ class CrashPredictionAnalyzer(BaseAnalyzer):
         pattern = r'\sas!\s+(\w+)'
 
         for match in re.finditer(pattern, content):
-            line_num = content[:match.start()].count('\n') + 1
+            line_num = self.line_index(content).line_of(match.start())
             target_type = match.group(1)
 
             results.append(AnalysisResult(
@@ -229,10 +229,10 @@ class CrashPredictionAnalyzer(BaseAnalyzer):
         pattern = r'\bawait\s+(?!try\s)(\w+\([^)]*\))'
 
         for match in re.finditer(pattern, content):
-            line_num = content[:match.start()].count('\n') + 1
+            line_num = self.line_index(content).line_of(match.start())
 
             # Check if we're in a throwing context
-            lines = content.splitlines()
+            lines = self.line_index(content).splitlines()
             func_context = self._get_function_context(lines, line_num)
 
             if 'throws' in func_context:
@@ -255,7 +255,7 @@ class CrashPredictionAnalyzer(BaseAnalyzer):
         """Detect collection mutation during iteration."""
         results = []
 
-        lines = content.splitlines()
+        lines = self.line_index(content).splitlines()
 
         for line_num, line in enumerate(lines, start=1):
             # Look for for-in loops
@@ -300,7 +300,7 @@ class CrashPredictionAnalyzer(BaseAnalyzer):
 
         for match in re.finditer(closure_pattern, content, re.DOTALL):
             closure_text = match.group(0)
-            line_num = content[:match.start()].count('\n') + 1
+            line_num = self.line_index(content).line_of(match.start())
 
             # Check if this is in an async context or escaping closure
             is_risky = (
@@ -329,10 +329,7 @@ class CrashPredictionAnalyzer(BaseAnalyzer):
 
     def _get_line(self, content: str, line_num: int) -> str:
         """Get specific line from content."""
-        lines = content.splitlines()
-        if 0 < line_num <= len(lines):
-            return lines[line_num - 1].strip()
-        return ""
+        return self.line_index(content).line(line_num).strip()
 
     def _get_function_context(self, lines: List[str], line_num: int) -> str:
         """Get function signature context for a line."""
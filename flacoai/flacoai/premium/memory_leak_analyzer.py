@@ -67,7 +67,7 @@ class MemoryLeakAnalyzer(BaseAnalyzer):
 
         for match in re.finditer(closure_pattern, content, re.DOTALL):
             closure_start = match.start()
-            line_num = content[:closure_start].count('\n') + 1
+            line_num = self.line_index(content).line_of(closure_start)
 
             # Get closure context
             context_start = max(0, closure_start - 150)
@@ -118,7 +118,7 @@ class MemoryLeakAnalyzer(BaseAnalyzer):
         # Pattern: delegate properties without weak
         delegate_pattern = r'(var|let)\s+(\w*[Dd]elegate\w*)\s*:\s*(\w+)(?!\s*\??\s*=)'
 
-        lines = content.splitlines()
+        lines = self.line_index(content).splitlines()
 
         for line_num, line in enumerate(lines, start=1):
             match = re.search(delegate_pattern, line)
@@ -158,7 +158,7 @@ class MemoryLeakAnalyzer(BaseAnalyzer):
         # Find Timer creation
         timer_pattern = r'Timer\.scheduledTimer|Timer\(timeInterval:'
 
-        lines = content.splitlines()
+        lines = self.line_index(content).splitlines()
 
         for line_num, line in enumerate(lines, start=1):
             if re.search(timer_pattern, line):
@@ -201,7 +201,7 @@ class MemoryLeakAnalyzer(BaseAnalyzer):
         # Find addObserver calls
         observer_pattern = r'NotificationCenter\.default\.addObserver'
 
-        lines = content.splitlines()
+        lines = self.line_index(content).splitlines()
 
         for line_num, line in enumerate(lines, start=1):
             if re.search(observer_pattern, line):
@@ -242,7 +242,7 @@ class MemoryLeakAnalyzer(BaseAnalyzer):
         # Strong references to NSManagedObjectContext
         context_pattern = r'(var|let)\s+(\w*context\w*)\s*:\s*NSManagedObjectContext(?!\?)'
 
-        lines = content.splitlines()
+        lines = self.line_index(content).splitlines()
 
         for line_num, line in enumerate(lines, start=1):
             match = re.search(context_pattern, line, re.IGNORECASE)
@@ -301,7 +301,7 @@ class MemoryLeakAnalyzer(BaseAnalyzer):
             (r'var\s+.*cache.*=.*UIImage', 'Image cache property'),
         ]
 
-        lines = content.splitlines()
+        lines = self.line_index(content).splitlines()
 
         for line_num, line in enumerate(lines, start=1):
             for pattern, description in cache_patterns:
@@ -346,7 +346,7 @@ class MemoryLeakAnalyzer(BaseAnalyzer):
         # Singleton pattern detection
         singleton_pattern = r'static\s+(?:let|var)\s+shared\s*=\s*\w+\('
 
-        lines = content.splitlines()
+        lines = self.line_index(content).splitlines()
 
         for line_num, line in enumerate(lines, start=1):
             if re.search(singleton_pattern, line):
@@ -393,10 +393,7 @@ class MemoryLeakAnalyzer(BaseAnalyzer):
 
     def _get_line(self, content: str, line_num: int) -> str:
         """Get specific line from content."""
-        lines = content.splitlines()
-        if 0 < line_num <= len(lines):
-            return lines[line_num - 1].strip()
-        return ""
+        return self.line_index(content).line(line_num).strip()
 
     def _find_class_start(self, lines: List[str], current_line: int) -> int:
         """Find the start of the class/struct containing current line."""
@@ -36,6 +36,9 @@ class PerformanceProfilerAnalyzer(BaseAnalyzer):
     ARRAY_OPERATION_SIZE_THRESHOLD = 1000  # Large array operations
     IMAGE_SIZE_THRESHOLD = 2048  # Image dimensions
 
+    # Collection-operation patterns no longer match across lines
+    RULES_VERSION = 3
+
     def analyze_file(self, file_path: str, content: str) -> List[AnalysisResult]:
         """Analyze file for performance issues.
 
@@ -77,7 +80,7 @@ class PerformanceProfilerAnalyzer(BaseAnalyzer):
 
         for pattern, description, severity_str, lag_likelihood in blocking_patterns:
             for match in re.finditer(pattern, content, re.MULTILINE | re.DOTALL):
-                line_num = content[:match.start()].count('\n') + 1
+                line_num = self.line_index(content).line_of(match.start())
 
                 # Check if we're in a background queue context
                 context_start = max(0, match.start() - 200)
@@ -122,7 +125,7 @@ class PerformanceProfilerAnalyzer(BaseAnalyzer):
         for match in re.finditer(pattern, content, re.DOTALL):
             body = match.group(0)
             nesting_depth = body.count('{')
-            line_num = content[:match.start()].count('\n') + 1
+            line_num = self.line_index(content).line_of(match.start())
 
             if nesting_depth >= 7:
                 fps_impact = min(95, 50 + (nesting_depth - 7) * 10)
@@ -163,7 +166,7 @@ class PerformanceProfilerAnalyzer(BaseAnalyzer):
 
         for pattern, description, perf_impact in patterns:
             for match in re.finditer(pattern, content):
-                line_num = content[:match.start()].count('\n') + 1
+                line_num = self.line_index(content).line_of(match.start())
 
                 # Check for background queue
                 context_start = max(0, match.start() - 150)
@@ -194,7 +197,7 @@ class PerformanceProfilerAnalyzer(BaseAnalyzer):
         """Detect inefficient Core Data queries."""
         results = []
 
-        lines = content.splitlines()
+        lines = self.line_index(content).splitlines()
 
         for line_num, line in enumerate(lines, start=1):
             # Missing fetchBatchSize
@@ -257,7 +260,7 @@ class PerformanceProfilerAnalyzer(BaseAnalyzer):
         # Count constraints in a single function/view
         constraint_pattern = r'\.constraint\(|NSLayoutConstraint\('
 
-        lines = content.splitlines()
+        lines = self.line_index(content).splitlines()
 
         for line_num, line in enumerate(lines, start=1):
             if 'func' in line or 'var' in line:
@@ -314,15 +317,15 @@ class PerformanceProfilerAnalyzer(BaseAnalyzer):
              'Use lazy or single pass', 60),
             (r'\.sorted\(\)\.sorted\(\)', 'Multiple sorts',
              'Sort once with custom comparator', 75),
-            (r'for\s+\w+\s+in.*\.sorted\(\)', 'Sorting in loop',
+            (r'for\s+\w+\s+in[^\n]*\.sorted\(\)', 'Sorting in loop',
              'Sort outside loop or avoid sorting', 70),
-            (r'\[.*\]\s*\+\s*\[.*\]', 'Array concatenation',
+            (r'\[[^\n]*\]\s*\+\s*\[[^\n]*\]', 'Array concatenation',
              'Use append(contentsOf:) for better performance', 50),
         ]
 
         for pattern, description, recommendation, perf_impact in expensive_patterns:
             for match in re.finditer(pattern, content, re.DOTALL):
-                line_num = content[:match.start()].count('\n') + 1
+                line_num = self.line_index(content).line_of(match.start())
 
                 results.append(AnalysisResult(
                     file=file_path,
@@ -343,7 +346,7 @@ class PerformanceProfilerAnalyzer(BaseAnalyzer):
         results = []
 
         # Look for network requests in loops
-        lines = content.splitlines()
+        lines = self.line_index(content).splitlines()
 
         for line_num, line in enumerate(lines, start=1):
             if re.search(r'for\s+\w+\s+in', line):
@@ -386,7 +389,4 @@ class PerformanceProfilerAnalyzer(BaseAnalyzer):
 
     def _get_line(self, content: str, line_num: int) -> str:
         """Get specific line from content."""
-        lines = content.splitlines()
-        if 0 < line_num <= len(lines):
-            return lines[line_num - 1].strip()
-        return ""
+        return self.line_index(content).line(line_num).strip()
@@ -77,8 +77,6 @@ class SecurityScoringAnalyzer(BaseAnalyzer):
         Returns:
             Dict with score, grade, and breakdown
         """
-        base_score = 100
-
         # Count issues by severity
         issue_counts = defaultdict(int)
         for result in all_results:
@@ -86,6 +84,22 @@ class SecurityScoringAnalyzer(BaseAnalyzer):
                 severity_key = result.severity.value
                 issue_counts[severity_key] += 1
 
+        return self.score_from_counts(issue_counts)
+
+    def score_from_counts(self, issue_counts: Dict[str, int]) -> Dict:
+        """Calculate the security score from security finding counts.
+
+        Lets a streamed review score the project without keeping its findings.
+
+        Args:
+            issue_counts: Number of security findings per severity value
+
+        Returns:
+            Dict with score, grade, and breakdown
+        """
+        base_score = 100
+        issue_counts = defaultdict(int, issue_counts)
+
         # Calculate deductions
         total_deduction = 0
         for severity, count in issue_counts.items():
@@ -140,7 +154,7 @@ class SecurityScoringAnalyzer(BaseAnalyzer):
 
         for pattern, description, severity in secret_patterns:
             for match in re.finditer(pattern, content, re.IGNORECASE):
-                line_num = content[:match.start()].count('\n') + 1
+                line_num = self.line_index(content).line_of(match.start())
 
                 results.append(AnalysisResult(
                     file=file_path,
@@ -169,7 +183,7 @@ class SecurityScoringAnalyzer(BaseAnalyzer):
         http_pattern = r'(?:URL|url)\s*=\s*.*http://(?!localhost|127\.0\.0\.1)'
 
         for match in re.finditer(http_pattern, content):
-            line_num = content[:match.start()].count('\n') + 1
+            line_num = self.line_index(content).line_of(match.start())
 
             results.append(AnalysisResult(
                 file=file_path,
@@ -187,7 +201,7 @@ class SecurityScoringAnalyzer(BaseAnalyzer):
             ))
 
         # SSL pinning check
-        lines = content.splitlines()
+        lines = self.line_index(content).splitlines()
         has_ssl_pinning = any([
             'serverTrustPolicy' in line or
             'pinnedCertificates' in line or
@@ -231,7 +245,7 @@ class SecurityScoringAnalyzer(BaseAnalyzer):
 
         for pattern, description, severity in weak_patterns:
             for match in re.finditer(pattern, content):
-                line_num = content[:match.start()].count('\n') + 1
+                line_num = self.line_index(content).line_of(match.start())
 
                 results.append(AnalysisResult(
                     file=file_path,
@@ -254,7 +268,7 @@ class SecurityScoringAnalyzer(BaseAnalyzer):
         key_pattern = r'(?:let|var)\s+(?:key|iv|salt)\s*=\s*["\']([A-Za-z0-9+/=]{16,})["\']'
 
         for match in re.finditer(key_pattern, content):
-            line_num = content[:match.start()].count('\n') + 1
+            line_num = self.line_index(content).line_of(match.start())
 
             results.append(AnalysisResult(
                 file=file_path,
@@ -280,7 +294,7 @@ class SecurityScoringAnalyzer(BaseAnalyzer):
         # UserDefaults for sensitive data
         sensitive_keywords = ['password', 'token', 'secret', 'key', 'credential', 'auth']
 
-        lines = content.splitlines()
+        lines = self.line_index(content).splitlines()
 
         for line_num, line in enumerate(lines, start=1):
             if 'UserDefaults' in line and 'set' in line:
@@ -384,7 +398,7 @@ class SecurityScoringAnalyzer(BaseAnalyzer):
         sql_pattern = r'(?:execute|query|prepare)\s*\([^)]*".*\+.*"'
 
         for match in re.finditer(sql_pattern, content):
-            line_num = content[:match.start()].count('\n') + 1
+            line_num = self.line_index(content).line_of(match.start())
 
             results.append(AnalysisResult(
                 file=file_path,
@@ -456,10 +470,7 @@ class SecurityScoringAnalyzer(BaseAnalyzer):
 
     def _get_line(self, content: str, line_num: int) -> str:
         """Get specific line from content."""
-        lines = content.splitlines()
-        if 0 < line_num <= len(lines):
-            return lines[line_num - 1].strip()
-        return ""
+        return self.line_index(content).line(line_num).strip()
 
     def _get_top_recommendations(self, issue_counts: Dict) -> List[str]:
         """Generate top security recommendations based on issues."""
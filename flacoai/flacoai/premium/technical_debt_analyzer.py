@@ -8,8 +8,7 @@ Requires: Flaco AI Pro or Enterprise license
 """
 
 import re
-from typing import List, Dict, Set, Tuple
-from collections import defaultdict
+from typing import List, Dict, Optional, Set, Tuple
 import sys
 import os
 
@@ -17,6 +16,12 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from analyzers.base_analyzer import BaseAnalyzer, AnalysisResult, Severity, Category
+from analyzers.parsed_source import ParsedSource
+from analyzers.cache import content_hash
+from analyzers.clone_index import CloneIndex, find_all_clones
+
+# AnalysisCache state name for the clone index saved between runs
+CLONE_INDEX_STATE = "technical_debt.clone_index"
 
 
 class TechnicalDebtAnalyzer(BaseAnalyzer):
@@ -26,7 +31,7 @@ class TechnicalDebtAnalyzer(BaseAnalyzer):
     Provides quantitative metrics:
     - Maintainability Index (0-100)
     - Cyclomatic complexity scores
-    - Code duplication detection
+    - Code duplication detection (across files, including renamed copies)
     - File size and line count warnings
     - Dependency coupling analysis
     - Test coverage gaps
@@ -40,6 +45,19 @@ class TechnicalDebtAnalyzer(BaseAnalyzer):
     MAX_PARAMETERS = 5
     MAX_CLASS_PROPERTIES = 15
 
+    # Duplication is found across files, from finalize()
+    shardable = False
+    RULES_VERSION = 3
+
+    # Copies listed per duplication finding
+    MAX_LISTED_COPIES = 10
+
+    def __init__(self, io=None, verbose=False):
+        super().__init__(io, verbose)
+        # Loaded from the analysis cache on first use, when there is one
+        self.clone_index: Optional[CloneIndex] = None
+        self._clone_files: Set[str] = set()
+
     def analyze_file(self, file_path: str, content: str) -> List[AnalysisResult]:
         """Analyze file for technical debt.
 
@@ -56,9 +74,11 @@ class TechnicalDebtAnalyzer(BaseAnalyzer):
         if not file_path.endswith('.swift'):
             return results
 
+        content = self.parse_source(file_path, content)
+
         results.extend(self._check_file_size(file_path, content))
         results.extend(self._check_function_complexity(file_path, content))
-        results.extend(self._check_code_duplication(file_path, content))
+        self._index_clones(file_path, content)
         results.extend(self._check_class_complexity(file_path, content))
         results.extend(self._check_documentation_debt(file_path, content))
         results.extend(self._check_dependency_coupling(file_path, content))
@@ -66,6 +86,27 @@ class TechnicalDebtAnalyzer(BaseAnalyzer):
 
         return results
 
+    def finalize(self) -> List[AnalysisResult]:
+        """Report code duplicated across (and within) the analyzed files."""
+        return self._check_code_duplication()
+
+    def on_cached_file(self, file_path: str, content: str):
+        """Keep the clone index complete when findings come from the cache."""
+        if file_path.endswith('.swift'):
+            self._index_clones(file_path, content)
+
+    def _get_clone_index(self) -> CloneIndex:
+        """The clone index, starting from the saved one when there is a cache."""
+        if self.clone_index is None:
+            saved = self.cache.get_state(CLONE_INDEX_STATE) if self.cache is not None else None
+            self.clone_index = CloneIndex.from_dict(saved) if saved else CloneIndex()
+        return self.clone_index
+
+    def _index_clones(self, file_path: str, content: str):
+        """Fingerprint the file, unless the index already has this content."""
+        self._get_clone_index().update(file_path, content, content_hash(content))
+        self._clone_files.add(file_path)
+
     def calculate_maintainability_index(self, file_path: str, content: str) -> Dict:
         """Calculate maintainability index for a file.
 
@@ -80,7 +121,7 @@ class TechnicalDebtAnalyzer(BaseAnalyzer):
         Returns:
             Dict with score, grade, and metrics
         """
-        lines = [l for l in content.splitlines() if l.strip() and not l.strip().startswith('//')]
+        lines = [l for l in self.line_index(content).splitlines() if l.strip() and not l.strip().startswith('//')]
         loc = len(lines)
 
         # Approximate cyclomatic complexity
@@ -131,7 +172,7 @@ class TechnicalDebtAnalyzer(BaseAnalyzer):
         """Check for oversized files."""
         results = []
 
-        lines = content.splitlines()
+        lines = self.line_index(content).splitlines()
         code_lines = [l for l in lines if l.strip() and not l.strip().startswith('//')]
         line_count = len(code_lines)
 
@@ -156,29 +197,22 @@ class TechnicalDebtAnalyzer(BaseAnalyzer):
 
         return results
 
-    def _check_function_complexity(self, file_path: str, content: str) -> List[AnalysisResult]:
+    def _check_function_complexity(self, file_path: str, content: ParsedSource) -> List[AnalysisResult]:
         """Check for overly complex functions."""
         results = []
 
         # Find function definitions
         func_pattern = r'func\s+(\w+)\s*\([^)]*\)(?:\s*(?:async|throws|rethrows))?\s*(?:->\s*\w+(?:<[^>]+>)?)?\s*\{'
 
-        lines = content.splitlines()
+        lines = self.line_index(content).splitlines()
 
         for match in re.finditer(func_pattern, content):
             func_name = match.group(1)
-            func_start_line = content[:match.start()].count('\n') + 1
+            func_start_line = self.line_index(content).line_of(match.start())
             func_start_char = match.start()
 
             # Find function end
-            brace_count = 1
-            pos = match.end()
-            while pos < len(content) and brace_count > 0:
-                if content[pos] == '{':
-                    brace_count += 1
-                elif content[pos] == '}':
-                    brace_count -= 1
-                pos += 1
+            pos = content.block_end(match.end())
 
             func_body = content[match.end():pos]
             func_lines = [l for l in func_body.splitlines() if l.strip() and not l.strip().startswith('//')]
@@ -229,50 +263,57 @@ class TechnicalDebtAnalyzer(BaseAnalyzer):
 
         return results
 
-    def _check_code_duplication(self, file_path: str, content: str) -> List[AnalysisResult]:
-        """Detect code duplication within file."""
-        results = []
+    def _check_code_duplication(self) -> List[AnalysisResult]:
+        """Detect code duplication across files.
 
-        lines = [l.strip() for l in content.splitlines() if l.strip() and not l.strip().startswith('//')]
-
-        # Look for repeated code blocks (5+ consecutive similar lines)
-        block_size = 5
-        seen_blocks = defaultdict(list)
-
-        for i in range(len(lines) - block_size + 1):
-            block = tuple(lines[i:i + block_size])
-            block_str = ''.join(block)
-
-            # Skip very short blocks
-            if len(block_str) < 50:
-                continue
-
-            seen_blocks[block].append(i + 1)
-
-        # Report duplicates
-        for block, occurrences in seen_blocks.items():
-            if len(occurrences) > 1:
-                debt_score = len(occurrences) * 10
+        Uses winnowed fingerprints of normalized tokens (see clone_index), so
+        copies with renamed identifiers or changed literals are found too.
+        With an analysis cache the index is kept between runs: only changed
+        files are fingerprinted, and files outside this run still count as
+        copies.
+        """
+        results = []
+        index = self._get_clone_index()
+
+        if self.cache is not None:
+            # Forget files deleted since the index was saved
+            for file_path in index.files():
+                if file_path not in self._clone_files and not os.path.exists(
+                    os.path.join(self.cache.root, file_path)
+                ):
+                    index.remove(file_path)
+
+        for file_path, clones in find_all_clones(index, self._clone_files).items():
+            for clone in clones:
+                instances = len(clone.copies) + 1
+                debt_score = instances * 10
+                copies = [f"{path}:{start}-{end}" for path, start, end in clone.copies]
+                if len(copies) > self.MAX_LISTED_COPIES:
+                    copies = copies[:self.MAX_LISTED_COPIES] + [f"and {len(copies) - self.MAX_LISTED_COPIES} more"]
 
                 results.append(AnalysisResult(
                     file=file_path,
-                    line=occurrences[0],
+                    line=clone.start_line,
                     severity=Severity.MEDIUM,
                     category=Category.QUALITY,
-                    title=f"Code duplication - {len(occurrences)} instances (debt: {debt_score})",
-                    description=f"Found {len(occurrences)} duplicated code blocks. "
+                    title=f"Code duplication - {instances} instances (debt: {debt_score})",
+                    description=f"Lines {clone.start_line}-{clone.end_line} ({clone.tokens} tokens) are duplicated, "
+                               f"possibly with renamed identifiers or changed literals. "
                                f"Duplication increases maintenance burden - bugs must be fixed in multiple places.",
                     recommendation=f"Extract to shared function or method:\n"
                                   f"1. Create private helper function\n"
                                   f"2. Parameterize differences\n"
                                   f"3. Replace all duplicates with calls\n"
                                   f"DRY principle: Don't Repeat Yourself",
-                    code_snippet=f"Duplicated block at lines: {', '.join(map(str, occurrences))}",
+                    code_snippet=f"Duplicated block at: {', '.join(copies)}",
                 ))
 
+        if self.cache is not None:
+            self.cache.set_state(CLONE_INDEX_STATE, index.to_dict())
+
         return results
 
-    def _check_class_complexity(self, file_path: str, content: str) -> List[AnalysisResult]:
+    def _check_class_complexity(self, file_path: str, content: ParsedSource) -> List[AnalysisResult]:
         """Check for overly complex classes."""
         results = []
 
@@ -283,21 +324,14 @@ class TechnicalDebtAnalyzer(BaseAnalyzer):
             class_type = match.group(1)
             class_name = match.group(2)
             class_start = match.start()
-            line_num = content[:class_start].count('\n') + 1
+            line_num = self.line_index(content).line_of(class_start)
 
             # Find class body
             brace_start = content.find('{', class_start)
             if brace_start == -1:
                 continue
 
-            brace_count = 1
-            pos = brace_start + 1
-            while pos < len(content) and brace_count > 0:
-                if content[pos] == '{':
-                    brace_count += 1
-                elif content[pos] == '}':
-                    brace_count -= 1
-                pos += 1
+            pos = content.block_end(brace_start + 1)
 
             class_body = content[brace_start:pos]
 
@@ -350,7 +384,7 @@ class TechnicalDebtAnalyzer(BaseAnalyzer):
         results = []
 
         # Find public functions without doc comments
-        lines = content.splitlines()
+        lines = self.line_index(content).splitlines()
 
         for line_num, line in enumerate(lines, start=1):
             if re.match(r'\s*(public|open)\s+func\s+\w+', line):
@@ -501,7 +535,4 @@ class TechnicalDebtAnalyzer(BaseAnalyzer):
 
     def _get_line(self, content: str, line_num: int) -> str:
         """Get specific line from content."""
-        lines = content.splitlines()
-        if 0 < line_num <= len(lines):
-            return lines[line_num - 1].strip()
-        return ""
+        return self.line_index(content).line(line_num).strip()
@@ -12,18 +12,19 @@ from importlib import resources
 from pathlib import Path
 
 from diskcache import Cache
-from grep_ast import TreeContext, filename_to_lang
+from grep_ast import filename_to_lang
 from pygments.lexers import guess_lexer_for_filename
 from pygments.token import Token
 from tqdm import tqdm
 
 from flacoai.dump import dump
+from flacoai.parse_service import get_parse_service, tree_context
 from flacoai.special import filter_important_files
 from flacoai.waiting import Spinner
 
 # tree_sitter is throwing a FutureWarning
 warnings.simplefilter("ignore", category=FutureWarning)
-from grep_ast.tsl import USING_TSL_PACK, get_language, get_parser  # noqa: E402
+from grep_ast.tsl import USING_TSL_PACK, get_language  # noqa: E402
 import tree_sitter
 
 Tag = namedtuple("Tag", "rel_fname fname line name kind".split())
@@ -38,6 +39,171 @@ if USING_TSL_PACK:
 
 UPDATING_REPO_MAP_MESSAGE = "Updating repo map"
 
+# PageRank backends for get_ranked_tags(): networkx's, or a vectorized power
+# iteration over a scipy sparse matrix that scales to large repos
+RANKING_BACKENDS = ("networkx", "sparse")
+
+
+class TagGraph:
+    """The repo map's reference graph, as parallel edge lists.
+
+    Files and idents are interned to integer ids in the order they are first
+    seen, so the edges can go straight into numpy arrays. Each edge points
+    from a file that references an ident to a file that defines it, and
+    parallel edges are kept, as in a networkx MultiDiGraph.
+    """
+
+    def __init__(self):
+        self.nodes = []
+        self.node_ids = {}
+        self.idents = []
+        self.ident_ids = {}
+
+        self.src = []
+        self.dst = []
+        self.weight = []
+        self.ident = []
+
+    @staticmethod
+    def _intern(name, names, ids):
+        id_ = ids.get(name)
+        if id_ is None:
+            id_ = ids[name] = len(names)
+            names.append(name)
+        return id_
+
+    def add_edge(self, src, dst, weight, ident):
+        self.src.append(self._intern(src, self.nodes, self.node_ids))
+        self.dst.append(self._intern(dst, self.nodes, self.node_ids))
+        self.weight.append(weight)
+        self.ident.append(self._intern(ident, self.idents, self.ident_ids))
+
+    def edges(self):
+        """(src, dst, weight, ident) of each edge, by name, in insertion order."""
+        for src, dst, weight, ident in zip(self.src, self.dst, self.weight, self.ident):
+            yield self.nodes[src], self.nodes[dst], weight, self.idents[ident]
+
+    def __len__(self):
+        return len(self.src)
+
+
+def rank_networkx(graph, personalization, progress=None):
+    """PageRank the graph with networkx, then share each file's rank out over its edges.
+
+    Args:
+        graph: TagGraph to rank
+        personalization: {rel_fname: weight} the random walk restarts at
+        progress: Optional callback, told about each file
+
+    Returns:
+        ({rel_fname: rank}, {(rel_fname, ident): rank}), or None if
+        PageRank fails
+    """
+    import networkx as nx
+
+    G = nx.MultiDiGraph()
+    for src, dst, weight, ident in graph.edges():
+        G.add_edge(src, dst, weight=weight, ident=ident)
+
+    if personalization:
+        pers_args = dict(personalization=personalization, dangling=personalization)
+    else:
+        pers_args = dict()
+
+    try:
+        ranked = nx.pagerank(G, weight="weight", **pers_args)
+    except ZeroDivisionError:
+        # Issue #1536
+        try:
+            ranked = nx.pagerank(G, weight="weight")
+        except ZeroDivisionError:
+            return
+
+    # distribute the rank from each source node, across all of its out edges
+    ranked_definitions = defaultdict(float)
+    for src in G.nodes:
+        if progress:
+            progress(f"{UPDATING_REPO_MAP_MESSAGE}: {src}")
+
+        src_rank = ranked[src]
+        total_weight = sum(data["weight"] for _src, _dst, data in G.out_edges(src, data=True))
+        # dump(src, src_rank, total_weight)
+        for _src, dst, data in G.out_edges(src, data=True):
+            data["rank"] = src_rank * data["weight"] / total_weight
+            ident = data["ident"]
+            ranked_definitions[(dst, ident)] += data["rank"]
+
+    return ranked, ranked_definitions
+
+
+def rank_sparse(graph, personalization, alpha=0.85, max_iter=100, tol=1.0e-6):
+    """rank_networkx(), as array operations over a sparse matrix.
+
+    Runs the same personalized power iteration as nx.pagerank, with the same
+    convergence test, on a CSR transition matrix built from the interned
+    edge lists. The rank of each (file, ident) definition is summed from the
+    edges' shares with a bincount instead of a walk over every edge.
+
+    Args:
+        graph: TagGraph to rank
+        personalization: {rel_fname: weight} the random walk restarts at
+        alpha: Damping factor
+        max_iter: Iterations before giving up on convergence
+        tol: Convergence tolerance, per file
+
+    Returns:
+        ({rel_fname: rank}, {(rel_fname, ident): rank})
+    """
+    import numpy as np
+    import scipy.sparse
+
+    num_nodes = len(graph.nodes)
+    if not num_nodes:
+        return {}, {}
+
+    src = np.asarray(graph.src, dtype=np.int64)
+    dst = np.asarray(graph.dst, dtype=np.int64)
+    weight = np.asarray(graph.weight, dtype=np.float64)
+    ident = np.asarray(graph.ident, dtype=np.int64)
+
+    # Parallel edges are summed into one transition probability, as networkx does
+    out_weight = np.bincount(src, weights=weight, minlength=num_nodes)
+    share = weight / out_weight[src]
+    transitions = scipy.sparse.csr_matrix((share, (dst, src)), shape=(num_nodes, num_nodes))
+    dangling = out_weight == 0
+
+    restart = np.array([personalization.get(node, 0) for node in graph.nodes], dtype=np.float64)
+    total = restart.sum()
+    if total:
+        restart /= total
+    else:
+        # No personalized file is in the graph: networkx's ZeroDivisionError
+        # retry, without personalization
+        restart = np.full(num_nodes, 1.0 / num_nodes)
+
+    rank = np.full(num_nodes, 1.0 / num_nodes)
+    for _ in range(max_iter):
+        last = rank
+        rank = alpha * (transitions @ last + last[dangling].sum() * restart)
+        rank += (1 - alpha) * restart
+        if np.abs(rank - last).sum() < num_nodes * tol:
+            break
+    else:
+        # Let networkx fail the way it always has
+        return rank_networkx(graph, personalization)
+
+    edge_rank = rank[src] * share
+    num_idents = len(graph.idents)
+    keys, inverse = np.unique(dst * num_idents + ident, return_inverse=True)
+    totals = np.bincount(inverse, weights=edge_rank)
+
+    ranked = dict(zip(graph.nodes, rank.tolist()))
+    ranked_definitions = {
+        (graph.nodes[key // num_idents], graph.idents[key % num_idents]): value
+        for key, value in zip(keys.tolist(), totals.tolist())
+    }
+    return ranked, ranked_definitions
+
 
 class RepoMap:
     TAGS_CACHE_DIR = f".flacoai.tags.cache.v{CACHE_VERSION}"
@@ -55,11 +221,16 @@ class RepoMap:
         max_context_window=None,
         map_mul_no_files=8,
         refresh="auto",
+        ranking="networkx",
     ):
         self.io = io
         self.verbose = verbose
         self.refresh = refresh
 
+        if ranking not in RANKING_BACKENDS:
+            raise ValueError(f"Unknown repo map ranking: {ranking}")
+        self.ranking = ranking
+
         if not root:
             root = os.getcwd()
         self.root = root
@@ -75,6 +246,8 @@ class RepoMap:
 
         self.main_model = main_model
 
+        self.parse_service = get_parse_service()
+
         self.tree_cache = {}
         self.tree_context_cache = {}
         self.map_cache = {}
@@ -151,6 +324,7 @@ class RepoMap:
         if self.verbose:
             num_tokens = self.token_count(files_listing)
             self.io.tool_output(f"Repo-map: {num_tokens / 1024:.1f} k-tokens")
+            self.io.tool_output(self.parse_service.stats.summary())
 
         if chat_files:
             other = "other "
@@ -270,7 +444,7 @@ class RepoMap:
 
         try:
             language = get_language(lang)
-            parser = get_parser(lang)
+            self.parse_service.parser(lang)
         except Exception as err:
             print(f"Skipping file {fname}: {err}")
             return
@@ -283,7 +457,7 @@ class RepoMap:
         code = self.io.read_text(fname)
         if not code:
             return
-        tree = parser.parse(bytes(code, "utf-8"))
+        tree = self.parse_service.parse(fname, code, lang)
 
         # Run the tags queries
         query = language.query(query_scm)
@@ -348,8 +522,6 @@ class RepoMap:
     def get_ranked_tags(
         self, chat_fnames, other_fnames, mentioned_fnames, mentioned_idents, progress=None
     ):
-        import networkx as nx
-
         defines = defaultdict(set)
         references = defaultdict(list)
         definitions = defaultdict(set)
@@ -450,7 +622,7 @@ class RepoMap:
 
         idents = set(defines.keys()).intersection(set(references.keys()))
 
-        G = nx.MultiDiGraph()
+        graph = TagGraph()
 
         # Add a small self-edge for every definition that has no references
         # Helps with tree-sitter 0.23.2 with ruby, where "def greet(name)"
@@ -459,7 +631,7 @@ class RepoMap:
             if ident in references:
                 continue
             for definer in defines[ident]:
-                G.add_edge(definer, definer, weight=0.1, ident=ident)
+                graph.add_edge(definer, definer, weight=0.1, ident=ident)
 
         for ident in idents:
             if progress:
@@ -494,38 +666,17 @@ class RepoMap:
                     # scale down so high freq (low value) mentions don't dominate
                     num_refs = math.sqrt(num_refs)
 
-                    G.add_edge(referencer, definer, weight=use_mul * num_refs, ident=ident)
-
-        if not references:
-            pass
-
-        if personalization:
-            pers_args = dict(personalization=personalization, dangling=personalization)
-        else:
-            pers_args = dict()
+                    graph.add_edge(referencer, definer, weight=use_mul * num_refs, ident=ident)
 
-        try:
-            ranked = nx.pagerank(G, weight="weight", **pers_args)
-        except ZeroDivisionError:
-            # Issue #1536
-            try:
-                ranked = nx.pagerank(G, weight="weight")
-            except ZeroDivisionError:
-                return []
-
-        # distribute the rank from each source node, across all of its out edges
-        ranked_definitions = defaultdict(float)
-        for src in G.nodes:
+        if self.ranking == "sparse":
+            ranks = rank_sparse(graph, personalization)
             if progress:
-                progress(f"{UPDATING_REPO_MAP_MESSAGE}: {src}")
-
-            src_rank = ranked[src]
-            total_weight = sum(data["weight"] for _src, _dst, data in G.out_edges(src, data=True))
-            # dump(src, src_rank, total_weight)
-            for _src, dst, data in G.out_edges(src, data=True):
-                data["rank"] = src_rank * data["weight"] / total_weight
-                ident = data["ident"]
-                ranked_definitions[(dst, ident)] += data["rank"]
+                progress(UPDATING_REPO_MAP_MESSAGE)
+        else:
+            ranks = rank_networkx(graph, personalization, progress)
+        if ranks is None:
+            return []
+        ranked, ranked_definitions = ranks
 
         ranked_tags = []
         ranked_definitions = sorted(
@@ -705,9 +856,10 @@ class RepoMap:
             if not code.endswith("\n"):
                 code += "\n"
 
-            context = TreeContext(
+            context = tree_context(
                 rel_fname,
                 code,
+                abs_fname=abs_fname,
                 color=False,
                 line_number=False,
                 child_context=False,
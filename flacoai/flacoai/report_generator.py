@@ -29,16 +29,7 @@ class ReviewReportGenerator:
         Returns:
             Markdown formatted report string
         """
-        lines = []
-
-        # Header
-        lines.append("# Code Review Report")
-        lines.append("")
-
-        # Summary statistics
-        if include_stats:
-            lines.extend(self._generate_stats_section(report))
-            lines.append("")
+        lines = self.markdown_header(report, include_stats)
 
         # Findings
         if group_by == "severity":
@@ -50,13 +41,39 @@ class ReviewReportGenerator:
         else:
             lines.extend(self._generate_flat_list(report, include_snippets))
 
-        # Footer
-        lines.append("")
-        lines.append("---")
-        lines.append(f"*Report generated by FlacoAI - Analyzed {report.files_analyzed} files in {report.duration_seconds:.2f}s*")
+        lines.extend(self.markdown_footer(report))
 
         return "\n".join(lines)
 
+    def markdown_header(self, report, include_stats=True) -> List[str]:
+        """Title and summary lines that open the markdown report.
+
+        Args:
+            report: AnalysisReport, or a ReviewSummary from a streamed review
+            include_stats: Include summary statistics
+
+        Returns:
+            List of markdown lines
+        """
+        lines = ["# Code Review Report", ""]
+        if include_stats:
+            lines.extend(self._generate_stats_section(report))
+            lines.append("")
+        return lines
+
+    def severity_heading(self, severity: Severity, count: int) -> List[str]:
+        """Heading lines for one severity section of the markdown report."""
+        icon = self._severity_icon(severity)
+        return [f"## {icon} {severity.value.upper()} Severity ({count} issues)", ""]
+
+    def markdown_footer(self, report) -> List[str]:
+        """Closing lines of the markdown report."""
+        return [
+            "",
+            "---",
+            f"*Report generated by FlacoAI - Analyzed {report.files_analyzed} files in {report.duration_seconds:.2f}s*",
+        ]
+
     def display_console(self, report: AnalysisReport):
         """Display report in rich console format."""
         if not self.io or not self.io.console:
@@ -66,12 +83,37 @@ class ReviewReportGenerator:
                 self.io.tool_output(markdown)
             return
 
+        samples = {
+            severity: report.get_by_severity(severity)[:10]  # Limit to 10 per severity
+            for severity in [Severity.CRITICAL, Severity.HIGH, Severity.MEDIUM, Severity.LOW]
+        }
+        self.display_summary(report, samples)
+
+    def display_summary(self, report, samples: Dict[Severity, List[AnalysisResult]]):
+        """Display the summary panel and a table of sample findings per severity.
+
+        Args:
+            report: AnalysisReport, or a ReviewSummary from a streamed review
+            samples: Findings to show for each severity
+        """
+        stats = report.get_stats()
+
+        if not self.io or not self.io.console:
+            # Fallback to plain text
+            if self.io:
+                lines = self._generate_stats_section(report)
+                for severity, findings in samples.items():
+                    if findings:
+                        lines.extend(self.severity_heading(severity, stats[severity.value]))
+                        for i, finding in enumerate(findings, 1):
+                            lines.extend(self._format_finding(finding, i, include_snippet=False))
+                self.io.tool_output("\n".join(lines))
+            return
+
         from rich.panel import Panel
         from rich.table import Table
-        from rich.text import Text
 
         # Summary panel
-        stats = report.get_stats()
         summary = f"""
 Files Analyzed: {report.files_analyzed}
 Total Issues: {stats['total']}
@@ -88,14 +130,14 @@ Low: {stats['low']}
 
         # Findings by severity
         for severity in [Severity.CRITICAL, Severity.HIGH, Severity.MEDIUM, Severity.LOW]:
-            findings = report.get_by_severity(severity)
+            findings = samples.get(severity)
 
             if not findings:
                 continue
 
             # Create table for this severity
             color = self._severity_color(severity)
-            table = Table(title=f"{severity.value.upper()} Severity Issues ({len(findings)})",
+            table = Table(title=f"{severity.value.upper()} Severity Issues ({stats[severity.value]})",
                          border_style=color)
 
             table.add_column("File:Line", style="cyan")
@@ -103,7 +145,7 @@ Low: {stats['low']}
             table.add_column("Issue", style="white")
             table.add_column("Recommendation", style="green")
 
-            for finding in findings[:10]:  # Limit to 10 per severity
+            for finding in findings:
                 file_ref = f"{self._short_path(finding.file)}:{finding.line}"
                 table.add_row(
                     file_ref,
@@ -137,7 +179,7 @@ Low: {stats['low']}
             if self.io:
                 self.io.tool_error(f"Failed to save report: {e}")
 
-    def _generate_stats_section(self, report: AnalysisReport) -> List[str]:
+    def _generate_stats_section(self, report) -> List[str]:
         """Generate summary statistics section."""
         stats = report.get_stats()
         lines = []
@@ -168,9 +210,7 @@ Low: {stats['low']}
             if not findings:
                 continue
 
-            icon = self._severity_icon(severity)
-            lines.append(f"## {icon} {severity.value.upper()} Severity ({len(findings)} issues)")
-            lines.append("")
+            lines.extend(self.severity_heading(severity, len(findings)))
 
             for i, finding in enumerate(findings, 1):
                 lines.extend(self._format_finding(finding, i, include_snippets))
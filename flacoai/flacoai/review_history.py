@@ -0,0 +1,342 @@
+"""Append-only history of review summaries, one per commit, for trend reports.
+
+Each recorded commit keeps only counts: findings per (severity, category,
+module), with the label strings interned, so hundreds of commits take a few
+hundred kilobytes and a trend is one indexed range query rather than a
+re-review. Rows are only ever added; a commit already in the history is
+never reviewed or written again, which is what makes backfilling history
+incremental.
+"""
+
+import os
+import sqlite3
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+HISTORY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS labels (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL);
+CREATE TABLE IF NOT EXISTS commits (
+    id INTEGER PRIMARY KEY,
+    sha TEXT UNIQUE NOT NULL,
+    committed_at INTEGER NOT NULL,
+    recorded_at INTEGER NOT NULL,
+    files_analyzed INTEGER NOT NULL,
+    total INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS commits_time ON commits (committed_at);
+CREATE TABLE IF NOT EXISTS counts (
+    commit_id INTEGER NOT NULL,
+    severity INTEGER NOT NULL,
+    category INTEGER NOT NULL,
+    module INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (commit_id, severity, category, module)
+) WITHOUT ROWID;
+"""
+
+DIMENSIONS = ("severity", "category", "module")
+
+# Directory levels of a file's path that name its module ("Sources/App")
+MODULE_DEPTH = 2
+
+# Commits shown by /review --trend, and reviewed by --backfill, by default
+DEFAULT_TREND_COMMITS = 20
+DEFAULT_BACKFILL_COMMITS = 50
+
+# Columns shown for category and module trends; the rest are summed as "other"
+TREND_COLUMNS = 6
+
+SEVERITY_COLUMNS = ("critical", "high", "medium", "low")
+
+
+def module_of(file_path: str, root: str) -> str:
+    """Module of a file: its directory relative to root, MODULE_DEPTH levels deep."""
+    rel = os.path.relpath(os.path.abspath(file_path), root)
+    parts = Path(rel).parts[:-1]
+    if not parts or parts[0] == os.pardir:
+        return "."
+    return "/".join(parts[:MODULE_DEPTH])
+
+
+@dataclass
+class CommitSummary:
+    """Finding counts of one review of one commit."""
+
+    sha: str
+    committed_at: int
+    files_analyzed: int = 0
+    # (severity, category, module) -> findings
+    counts: Dict[Tuple[str, str, str], int] = field(default_factory=lambda: defaultdict(int))
+
+    def add(self, result, root: str):
+        """Count one finding."""
+        self.counts[(result.severity.value, result.category.value, module_of(result.file, root))] += 1
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+
+@dataclass
+class TrendPoint:
+    """Counts for one commit along one dimension."""
+
+    sha: str
+    committed_at: int
+    files_analyzed: int
+    total: int
+    counts: Dict[str, int] = field(default_factory=dict)
+
+
+class ReviewHistory:
+    """SQLite store of per-commit review summaries."""
+
+    def __init__(self, project_root: str):
+        """Initialize the history.
+
+        Args:
+            project_root: Root of the repository; the store is
+                .flaco/history.db below it
+        """
+        self.project_root = Path(project_root)
+        self.path = self.project_root / ".flaco" / "history.db"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.executescript(HISTORY_SCHEMA)
+        self._labels: Dict[str, int] = dict(
+            (name, label_id) for label_id, name in self.conn.execute("SELECT id, name FROM labels")
+        )
+
+    def close(self):
+        self.conn.close()
+
+    def _label(self, name: str) -> int:
+        label_id = self._labels.get(name)
+        if label_id is None:
+            label_id = self.conn.execute("INSERT INTO labels (name) VALUES (?)", (name,)).lastrowid
+            self._labels[name] = label_id
+        return label_id
+
+    def known_commits(self) -> Set[str]:
+        """SHAs of every recorded commit."""
+        return {row[0] for row in self.conn.execute("SELECT sha FROM commits")}
+
+    def has_commit(self, sha: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM commits WHERE sha = ?", (sha,)).fetchone() is not None
+
+    def record(self, summary: CommitSummary) -> bool:
+        """Append a commit's summary.
+
+        Returns:
+            False if the commit was already recorded (it is left as it was)
+        """
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO commits"
+                " (sha, committed_at, recorded_at, files_analyzed, total) VALUES (?, ?, ?, ?, ?)",
+                (summary.sha, summary.committed_at, int(time.time()), summary.files_analyzed, summary.total),
+            )
+            if not cursor.rowcount:
+                return False
+
+            commit_id = cursor.lastrowid
+            self.conn.executemany(
+                "INSERT INTO counts VALUES (?, ?, ?, ?, ?)",
+                [
+                    (commit_id, self._label(severity), self._label(category), self._label(module), count)
+                    for (severity, category, module), count in summary.counts.items()
+                ],
+            )
+        return True
+
+    def series(
+        self,
+        by: str = "severity",
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[TrendPoint]:
+        """Counts per commit along one dimension, oldest first.
+
+        Args:
+            by: "severity", "category" or "module"
+            since: Only commits made at or after this Unix time
+            until: Only commits made at or before this Unix time
+            limit: Only the latest this many commits in the range
+
+        Returns:
+            TrendPoint per commit
+        """
+        if by not in DIMENSIONS:
+            raise ValueError(f"Unknown trend dimension: {by}")
+
+        where = []
+        params: List = []
+        if since is not None:
+            where.append("committed_at >= ?")
+            params.append(since)
+        if until is not None:
+            where.append("committed_at <= ?")
+            params.append(until)
+        commits_query = "SELECT id, sha, committed_at, files_analyzed, total FROM commits"
+        if where:
+            commits_query += " WHERE " + " AND ".join(where)
+        commits_query += " ORDER BY committed_at DESC, id DESC"
+        if limit is not None:
+            commits_query += " LIMIT ?"
+            params.append(limit)
+
+        query = f"""
+            SELECT c.id, c.sha, c.committed_at, c.files_analyzed, c.total, l.name, SUM(n.count)
+            FROM ({commits_query}) c
+            LEFT JOIN counts n ON n.commit_id = c.id
+            LEFT JOIN labels l ON l.id = n.{by}
+            GROUP BY c.id, l.name
+            ORDER BY c.committed_at, c.id
+        """
+        points: Dict[int, TrendPoint] = {}
+        for commit_id, sha, committed_at, files_analyzed, total, name, count in self.conn.execute(query, params):
+            point = points.get(commit_id)
+            if point is None:
+                point = points[commit_id] = TrendPoint(sha, committed_at, files_analyzed, total)
+            if name is not None:
+                point.counts[name] = count
+        return list(points.values())
+
+
+def format_trend(points: List[TrendPoint], by: str = "severity") -> str:
+    """Plain-text table of a trend, one row per commit, with the overall change."""
+    if not points:
+        return "No review history recorded yet."
+
+    if by == "severity":
+        columns = list(SEVERITY_COLUMNS)
+    else:
+        # The labels with the most findings in the latest commit, then any others
+        totals = defaultdict(int)
+        for point in points:
+            for name, count in point.counts.items():
+                totals[name] += count
+        latest = points[-1].counts
+        columns = sorted(totals, key=lambda name: (-latest.get(name, 0), -totals[name], name))
+        if len(columns) > TREND_COLUMNS:
+            columns = columns[:TREND_COLUMNS - 1] + ["other"]
+
+    def row_counts(point):
+        values = [point.counts.get(name, 0) for name in columns]
+        if columns and columns[-1] == "other":
+            values[-1] = point.total - sum(values[:-1])
+        return values
+
+    widths = [max(len(name), 6) for name in columns]
+    header = f"{'Commit':<9} {'Date':<10} {'Files':>6} {'Total':>6}  " + "  ".join(
+        f"{name:>{width}}" for name, width in zip(columns, widths)
+    )
+    lines = [header, "-" * len(header)]
+    for point in points:
+        date = datetime.fromtimestamp(point.committed_at).strftime("%Y-%m-%d")
+        lines.append(
+            f"{point.sha[:7]:<9} {date:<10} {point.files_analyzed:>6} {point.total:>6}  "
+            + "  ".join(f"{value:>{width}}" for value, width in zip(row_counts(point), widths))
+        )
+
+    if len(points) > 1:
+        first, last = points[0], points[-1]
+        changes = [
+            f"{name} {after - before:+d}"
+            for name, before, after in zip(columns, row_counts(first), row_counts(last))
+            if after != before
+        ]
+        lines.append("")
+        lines.append(
+            f"Since {first.sha[:7]}: total {last.total - first.total:+d}"
+            + (f" ({', '.join(changes)})" if changes else "")
+        )
+    return "\n".join(lines)
+
+
+def commit_files(repo, commit, loader) -> Iterator[Tuple[str, str]]:
+    """(absolute path, content) of the reviewable files in a commit's tree.
+
+    Paths are where the files would be in the working tree, so analysis
+    cache entries made by ordinary reviews are reused for unchanged files.
+
+    Args:
+        repo: GitRepo
+        commit: git.Commit
+        loader: SmartContextLoader whose file rules select the files
+    """
+    for blob in commit.tree.traverse():
+        if blob.type != "blob" or not loader.is_code_path(blob.path):
+            continue
+        try:
+            content = blob.data_stream.read().decode("utf-8")
+        except (UnicodeDecodeError, ValueError):
+            continue
+        path = os.path.join(repo.root, blob.path)
+        if loader._is_generated(path, content):
+            continue
+        yield path, content
+
+
+def backfill(
+    history: ReviewHistory,
+    repo,
+    specs,
+    limit: int = DEFAULT_BACKFILL_COMMITS,
+    jobs: int = 1,
+    cache_root: Optional[str] = None,
+    io=None,
+    progress: Optional[Callable[[int, int, str], None]] = None,
+) -> int:
+    """Review and record the commits of recent history not yet in the store.
+
+    Walks the first-parent history of HEAD, newest first, up to limit
+    commits; commits already recorded are skipped without reading them.
+
+    Args:
+        history: ReviewHistory to append to
+        repo: GitRepo
+        specs: AnalyzerSpecs to review each commit with
+        limit: Commits of history to cover
+        jobs: Worker processes for analysis (0 = all CPUs)
+        cache_root: Project root for the analysis cache, None to disable it
+        io: IO object for output
+        progress: Called with (done, to do, sha) before each commit is reviewed
+
+    Returns:
+        Number of commits recorded
+    """
+    from flacoai.analyzers import AnalyzerScheduler
+    from flacoai.smart_context import SmartContextLoader
+
+    known = history.known_commits()
+    pending = [
+        commit
+        for commit in repo.repo.iter_commits("HEAD", max_count=limit, first_parent=True)
+        if commit.hexsha not in known
+    ]
+    # Oldest first, so an interrupted backfill leaves a contiguous recent gap
+    pending.reverse()
+
+    loader = SmartContextLoader(repo.root)
+    # Findings are cached as usual, but each commit's cross-file analysis
+    # starts empty and isn't saved: the saved import graph and clone index
+    # describe the working tree, and other commits' files must not leak into
+    # them, nor working tree files into an old commit's
+    scheduler = AnalyzerScheduler(jobs=jobs, io=io, cache_root=cache_root, persist_state=False)
+    recorded = 0
+    for done, commit in enumerate(pending):
+        if progress:
+            progress(done, len(pending), commit.hexsha)
+        summary = CommitSummary(commit.hexsha, commit.committed_date)
+        for result in scheduler.stream(specs, commit_files(repo, commit, loader)):
+            summary.add(result, repo.root)
+        summary.files_analyzed = scheduler.files_analyzed
+        if history.record(summary):
+            recorded += 1
+    return recorded
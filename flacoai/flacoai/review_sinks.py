@@ -0,0 +1,456 @@
+"""Sinks that receive code review findings as they are produced.
+
+The review pipeline streams findings instead of collecting them, so the
+outputs (console summary, markdown report, SARIF log, baseline) each consume
+one finding at a time and keep only what they need: counts, a few samples
+for display, or a spool file on disk.
+"""
+
+import json
+import os
+import re
+import tempfile
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from flacoai.analyzers import AnalysisReport, AnalysisResult, Category, Severity
+
+SEVERITY_ORDER = [Severity.CRITICAL, Severity.HIGH, Severity.MEDIUM, Severity.LOW]
+
+# Findings above this size are spooled to a temp file instead of memory
+SPOOL_MAX_SIZE = 1024 * 1024
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_LEVELS = {
+    Severity.CRITICAL: "error",
+    Severity.HIGH: "error",
+    Severity.MEDIUM: "warning",
+    Severity.LOW: "note",
+}
+
+
+@dataclass
+class ReviewSummary:
+    """Counts describing a streamed review, without the findings themselves.
+
+    Offers the same summary attributes as AnalysisReport (files_analyzed,
+    duration_seconds, analyzer_timings, metadata, get_stats) so report
+    helpers can take either.
+    """
+    files_analyzed: int = 0
+    duration_seconds: float = 0.0
+    analyzer_timings: Dict[str, float] = field(default_factory=dict)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    severity_counts: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    category_counts: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    security_counts: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    def add(self, result: AnalysisResult):
+        """Count one finding."""
+        self.severity_counts[result.severity.value] += 1
+        self.category_counts[result.category.value] += 1
+        if result.category.value == Category.SECURITY.value:
+            self.security_counts[result.severity.value] += 1
+
+    @property
+    def total(self) -> int:
+        return sum(self.severity_counts.values())
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get summary statistics, shaped like AnalysisReport.get_stats()."""
+        return {
+            "total": self.total,
+            "critical": self.severity_counts[Severity.CRITICAL.value],
+            "high": self.severity_counts[Severity.HIGH.value],
+            "medium": self.severity_counts[Severity.MEDIUM.value],
+            "low": self.severity_counts[Severity.LOW.value],
+        }
+
+
+class FindingsSink:
+    """Receives findings one at a time from the review pipeline."""
+
+    def write(self, result: AnalysisResult):
+        """Consume one finding."""
+        raise NotImplementedError
+
+    def close(self, summary: ReviewSummary):
+        """Called once after the last finding, with the run's summary."""
+        pass
+
+
+class CollectSink(FindingsSink):
+    """Keeps every finding in an AnalysisReport, for callers that need the full list."""
+
+    def __init__(self):
+        self.report = AnalysisReport()
+
+    def write(self, result: AnalysisResult):
+        self.report.add_result(result)
+
+    def close(self, summary: ReviewSummary):
+        self.report.files_analyzed = summary.files_analyzed
+        self.report.duration_seconds = summary.duration_seconds
+        self.report.analyzer_timings = dict(summary.analyzer_timings)
+        self.report.metadata = dict(summary.metadata)
+
+
+class ConsoleSink(FindingsSink):
+    """Keeps the first few findings per severity for the console summary."""
+
+    def __init__(self, io, per_severity: int = 10):
+        """Initialize the sink.
+
+        Args:
+            io: IO object for output
+            per_severity: Findings to keep (and show) for each severity
+        """
+        self.io = io
+        self.per_severity = per_severity
+        self.samples: Dict[Severity, List[AnalysisResult]] = {s: [] for s in SEVERITY_ORDER}
+        self.summary: Optional[ReviewSummary] = None
+
+    def write(self, result: AnalysisResult):
+        samples = self.samples.get(result.severity)
+        if samples is not None and len(samples) < self.per_severity:
+            samples.append(result)
+
+    def close(self, summary: ReviewSummary):
+        self.summary = summary
+
+    def display(self):
+        """Render the summary and sampled findings (call after close)."""
+        from flacoai.report_generator import ReviewReportGenerator
+
+        ReviewReportGenerator(io=self.io).display_summary(self.summary, self.samples)
+
+
+class MarkdownSink(FindingsSink):
+    """Writes the markdown report, spooling findings per severity until close."""
+
+    def __init__(self, file_path: str, io=None, include_snippets: bool = True):
+        from flacoai.report_generator import ReviewReportGenerator
+
+        self.file_path = file_path
+        self.io = io
+        self.include_snippets = include_snippets
+        self.generator = ReviewReportGenerator(io=io)
+        self.spools = {
+            severity: tempfile.SpooledTemporaryFile(SPOOL_MAX_SIZE, mode="w+", encoding="utf-8")
+            for severity in SEVERITY_ORDER
+        }
+        self.counts = defaultdict(int)
+
+    def write(self, result: AnalysisResult):
+        self.counts[result.severity] += 1
+        lines = self.generator._format_finding(
+            result, self.counts[result.severity], self.include_snippets
+        )
+        self.spools[result.severity].write("\n".join(lines) + "\n")
+
+    def close(self, summary: ReviewSummary):
+        try:
+            with open(self.file_path, "w", encoding="utf-8") as f:
+                f.write("\n".join(self.generator.markdown_header(summary)) + "\n")
+
+                for severity in SEVERITY_ORDER:
+                    spool = self.spools[severity]
+                    if not self.counts[severity]:
+                        continue
+                    f.write(
+                        "\n".join(self.generator.severity_heading(severity, self.counts[severity]))
+                        + "\n"
+                    )
+                    spool.seek(0)
+                    for chunk in iter(lambda: spool.read(64 * 1024), ""):
+                        f.write(chunk)
+
+                f.write("\n".join(self.generator.markdown_footer(summary)))
+
+            if self.io:
+                self.io.tool_output(f"Report saved to {self.file_path}")
+        except Exception as e:
+            if self.io:
+                self.io.tool_error(f"Failed to save report: {e}")
+        finally:
+            for spool in self.spools.values():
+                spool.close()
+
+
+def sarif_rule_id(result: AnalysisResult) -> str:
+    """Stable SARIF rule id for a finding, e.g. 'security/sql-injection-risk'."""
+    slug = re.sub(r"[^a-z0-9]+", "-", result.title.lower()).strip("-")
+    return f"{result.category.value}/{slug}"
+
+
+class SarifSink(FindingsSink):
+    """Streams findings into a SARIF 2.1.0 log for code scanning tools."""
+
+    def __init__(self, file_path: str, root: Optional[str] = None, io=None):
+        """Initialize the sink.
+
+        Args:
+            file_path: Where to write the SARIF log
+            root: Project root that result locations are made relative to
+            io: IO object for output (optional)
+        """
+        from flacoai import __version__
+
+        self.file_path = Path(file_path)
+        self.root = Path(root) if root else None
+        self.io = io
+        self.version = __version__
+        self.rules: Dict[str, Dict[str, Any]] = {}
+        self.count = 0
+
+        # Write next to the target and rename on close so a failed run never
+        # leaves a truncated log behind
+        self.tmp_path = self.file_path.with_name(self.file_path.name + ".tmp")
+        self.file = open(self.tmp_path, "w", encoding="utf-8")
+        self.file.write(
+            '{"$schema": "%s", "version": "2.1.0", "runs": [{"results": [\n' % SARIF_SCHEMA
+        )
+
+    def _uri(self, file_path: str) -> str:
+        path = Path(file_path)
+        if self.root:
+            try:
+                path = path.resolve().relative_to(self.root.resolve())
+            except ValueError:
+                pass
+        return path.as_posix()
+
+    def write(self, result: AnalysisResult):
+        rule_id = sarif_rule_id(result)
+        if rule_id not in self.rules:
+            self.rules[rule_id] = {
+                "id": rule_id,
+                "name": result.title,
+                "shortDescription": {"text": result.title},
+                "help": {"text": result.recommendation},
+                "properties": {"category": result.category.value},
+            }
+
+        region = {"startLine": max(result.line or 1, 1)}
+        if result.column is not None:
+            region["startColumn"] = result.column + 1
+
+        entry = {
+            "ruleId": rule_id,
+            "level": SARIF_LEVELS.get(result.severity, "warning"),
+            "message": {"text": result.description},
+            "locations": [{
+                "physicalLocation": {
+                    "artifactLocation": {"uri": self._uri(result.file)},
+                    "region": region,
+                },
+            }],
+            "properties": {"severity": result.severity.value},
+        }
+
+        if self.count:
+            self.file.write(",\n")
+        self.file.write(json.dumps(entry))
+        self.count += 1
+
+    def close(self, summary: ReviewSummary):
+        driver = {
+            "name": "FlacoAI",
+            "version": self.version,
+            "informationUri": "https://github.com/RouraIO/flaco.cli",
+            "rules": list(self.rules.values()),
+        }
+        self.file.write('\n], "tool": {"driver": %s}}]}\n' % json.dumps(driver))
+        self.file.close()
+        os.replace(self.tmp_path, self.file_path)
+
+        if self.io:
+            self.io.tool_output(f"SARIF report saved to {self.file_path}")
+
+
+class BaselineSaveSink(FindingsSink):
+    """Streams findings into a new baseline, replacing the saved one on close."""
+
+    def __init__(self, baseline_manager):
+        self.manager = baseline_manager
+        self.writer = baseline_manager.writer()
+
+    def write(self, result: AnalysisResult):
+        self.writer.add(result)
+
+    @property
+    def count(self) -> int:
+        return self.writer.count
+
+    def close(self, summary: ReviewSummary):
+        self.writer.commit(summary.files_analyzed)
+
+
+class HistorySink(FindingsSink):
+    """Counts findings by severity, category and module into the review history."""
+
+    def __init__(self, history, sha: str, committed_at: int, root: str):
+        """Initialize the sink.
+
+        Args:
+            history: ReviewHistory to record the commit in
+            sha: Commit the reviewed tree matches
+            committed_at: Commit time (Unix time)
+            root: Repository root, which module names are relative to
+        """
+        from flacoai.review_history import CommitSummary
+
+        self.history = history
+        self.root = root
+        self.summary = CommitSummary(sha, committed_at)
+        self.recorded = False
+
+    def write(self, result: AnalysisResult):
+        self.summary.add(result, self.root)
+
+    def close(self, summary: ReviewSummary):
+        # A review cut short by its time budget does not describe the commit
+        if summary.metadata.get("skipped_files"):
+            return
+        self.summary.files_analyzed = summary.files_analyzed
+        self.recorded = self.history.record(self.summary)
+
+
+class DiffScopeSink(FindingsSink):
+    """Passes on only findings in or near the lines a diff changed."""
+
+    def __init__(self, scope, sinks: List[FindingsSink]):
+        """Initialize the sink.
+
+        Args:
+            scope: DiffScope of the changes under review
+            sinks: Downstream sinks that receive the in-scope findings
+        """
+        self.scope = scope
+        self.sinks = sinks
+        self.in_scope = ReviewSummary()
+        self.out_of_scope = 0
+
+    def write(self, result: AnalysisResult):
+        if not self.scope.contains(result.file, result.line):
+            self.out_of_scope += 1
+            return
+
+        self.in_scope.add(result)
+        for sink in self.sinks:
+            sink.write(result)
+
+    def close(self, summary: ReviewSummary):
+        # Downstream sinks see counts for the in-scope findings only
+        self.in_scope.files_analyzed = summary.files_analyzed
+        self.in_scope.duration_seconds = summary.duration_seconds
+        self.in_scope.analyzer_timings = summary.analyzer_timings
+        self.in_scope.metadata = summary.metadata
+        for sink in self.sinks:
+            sink.close(self.in_scope)
+
+
+class BaselineCompareSink(FindingsSink):
+    """Passes on only findings that are not in the saved baseline.
+
+    Baseline findings are looked up file by file as the review reaches each
+    file, so memory grows with the files reviewed rather than the size of
+    the baseline; new and fixed counts by severity are tracked as findings
+    stream past.
+    """
+
+    def __init__(
+        self, baseline_manager, sinks: List[FindingsSink], files: Optional[List[str]] = None
+    ):
+        """Initialize the sink.
+
+        Args:
+            baseline_manager: BaselineManager for the project
+            sinks: Downstream sinks that receive the new findings
+            files: Files under review. Baseline findings in other files that
+                still exist are neither fixed nor unchanged; None counts
+                every unmatched baseline finding as fixed.
+        """
+        self.manager = baseline_manager
+        self.sinks = sinks
+        self.files = set(files) if files is not None else None
+        # File -> fingerprint -> severities of baseline findings not yet matched
+        self.remaining: Dict[str, Dict[str, List[str]]] = {}
+        self.new_counts = defaultdict(int)
+        self.unchanged = 0
+        self._fixed_counts = defaultdict(int)
+
+        self.store = baseline_manager.open_store()
+        self.baseline_exists = self.store is not None
+        self.baseline_timestamp = self.store.timestamp if self.store else None
+
+    def _baseline_for(self, file_path: str) -> Dict[str, List[str]]:
+        if file_path not in self.remaining:
+            table = defaultdict(list)
+            if self.store:
+                for fp, severity in self.store.fingerprints(file_path):
+                    table[fp].append(severity)
+            self.remaining[file_path] = table
+        return self.remaining[file_path]
+
+    def write(self, result: AnalysisResult):
+        severities = self._baseline_for(result.file).get(self.manager.fingerprint_result(result))
+        if severities:
+            severities.pop()
+            self.unchanged += 1
+            return
+
+        self.new_counts[result.severity.value] += 1
+        for sink in self.sinks:
+            sink.write(result)
+
+    def _count_fixed(self):
+        for table in self.remaining.values():
+            for severities in table.values():
+                for severity in severities:
+                    self._fixed_counts[severity] += 1
+
+        for file_path, severity, count in self.store.severity_counts():
+            if file_path in self.remaining:
+                continue
+            if self.files is not None and file_path not in self.files:
+                if (self.manager.project_root / file_path).exists():
+                    continue
+            self._fixed_counts[severity] += count
+
+    def close(self, summary: ReviewSummary):
+        if self.store:
+            self._count_fixed()
+            self.store.close()
+            self.store = None
+
+        # Downstream sinks see counts for the new findings only
+        filtered = ReviewSummary(
+            files_analyzed=summary.files_analyzed,
+            duration_seconds=summary.duration_seconds,
+            analyzer_timings=summary.analyzer_timings,
+            metadata=summary.metadata,
+        )
+        filtered.severity_counts.update(self.new_counts)
+        for sink in self.sinks:
+            sink.close(filtered)
+
+    @property
+    def new_issues(self) -> int:
+        return sum(self.new_counts.values())
+
+    @property
+    def fixed_counts(self) -> Dict[str, int]:
+        """Baseline findings by severity that were not found again (once closed)."""
+        return self._fixed_counts
+
+    def get_stats(self) -> Dict[str, int]:
+        """Counts by severity, shaped like BaselineManager.get_stats()."""
+        stats = {}
+        fixed = self.fixed_counts
+        for severity in ("critical", "high", "medium", "low"):
+            stats[f"new_{severity}"] = self.new_counts[severity]
+            stats[f"fixed_{severity}"] = fixed[severity]
+        return stats
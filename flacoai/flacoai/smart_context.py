@@ -1,9 +1,64 @@
 """Smart context loading for automatic file detection."""
 
+import math
 import os
 import re
+import subprocess
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Set, List, Optional
+from typing import Dict, Set, List, Optional
+
+# Bytes read from the top of a file when looking for generation markers
+GENERATED_HEAD_BYTES = 4096
+
+# Generation markers only count in comments, not in code or strings
+COMMENT_PREFIXES = ('//', '#', '/*', '*', '--', '<!--', ';')
+
+# File indexes built in this process, by project root
+_file_indexes: Dict[str, "FileIndex"] = {}
+
+
+@dataclass
+class FileIndex:
+    """Every file of a project from one directory walk, indexed by name and stem.
+
+    The index stays valid while no walked directory's mtime changes (files
+    added, removed or renamed all touch their directory) and, in a git
+    repository, while the git index is untouched (files added or committed).
+    """
+
+    root: str
+    # Absolute paths, sorted
+    files: List[str]
+    dir_mtimes: Dict[str, int]
+    # Only git-tracked files are listed; git_stamp is the git index mtime
+    tracked_only: bool = False
+    git_stamp: int = 0
+    by_name: Dict[str, List[str]] = field(default_factory=dict)
+    by_stem: Dict[str, List[str]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if not self.by_name:
+            by_name = defaultdict(list)
+            by_stem = defaultdict(list)
+            for path in self.files:
+                name = os.path.basename(path)
+                by_name[name].append(path)
+                by_stem[os.path.splitext(name)[0]].append(path)
+            self.by_name = dict(by_name)
+            self.by_stem = dict(by_stem)
+
+    def is_current(self, tracked_only: bool = False, git_stamp: int = 0) -> bool:
+        if tracked_only != self.tracked_only or git_stamp != self.git_stamp:
+            return False
+        for path, mtime in self.dir_mtimes.items():
+            try:
+                if os.stat(path).st_mtime_ns != mtime:
+                    return False
+            except OSError:
+                return False
+        return True
 
 
 class SmartContextLoader:
@@ -66,28 +121,139 @@ class SmartContextLoader:
         'yml', 'yaml',
     }
 
-    def __init__(self, project_root: str, io=None):
+    # Commits of history counted for churn
+    CHURN_COMMITS = 300
+
+    # Path fragments of code where a bug costs more (auth, money, persistence)
+    RISKY_PATH_PATTERNS = re.compile(
+        r'auth|login|password|credential|secret|token|session|crypt|keychain|security'
+        r'|payment|billing|purchase|checkout|network|api|client|sql|database|storage|migration',
+        re.IGNORECASE,
+    )
+
+    def __init__(self, project_root: str, io=None, repo=None, cache=None):
         """Initialize smart context loader.
 
         Args:
             project_root: Root directory of project
             io: IO object for output
+            repo: GitRepo; when given, only its tracked files are considered,
+                so anything .gitignore'd is skipped
+            cache: AnalysisCache to keep the file index in between runs
         """
         self.project_root = Path(project_root)
         self.io = io
+        self.repo = repo
+        self.cache = cache
+        self._index: Optional[FileIndex] = None
+
+    def file_index(self) -> FileIndex:
+        """The project's FileIndex, rebuilt only if the tree has changed."""
+        tracked_only = self.repo is not None
+        git_stamp = self._git_stamp()
+        if self._index is not None and self._index.is_current(tracked_only, git_stamp):
+            return self._index
+
+        root = str(self.project_root.resolve())
+        index = _file_indexes.get(root)
+        if index is None and self.cache is not None:
+            index = self.cache.get_state(f"smart_context.file_index|{root}")
+            if not isinstance(index, FileIndex):
+                index = None
+
+        if index is None or not index.is_current(tracked_only, git_stamp):
+            index = self._build_index(root, git_stamp)
+            if self.cache is not None:
+                self.cache.set_state(f"smart_context.file_index|{root}", index)
+
+        _file_indexes[root] = index
+        self._index = index
+        return index
+
+    def _git_stamp(self) -> int:
+        """mtime of the git index, which changes whenever files are added or committed."""
+        if self.repo is None or not getattr(self.repo, "repo", None):
+            return 0
+        try:
+            return os.stat(os.path.join(self.repo.repo.git_dir, "index")).st_mtime_ns
+        except OSError:
+            return 0
+
+    def _tracked_files(self, root: str) -> Optional[Set[str]]:
+        """Absolute paths of the repo's tracked files, None without a repo."""
+        if self.repo is None:
+            return None
+        repo_root = self.repo.root
+        return {
+            os.path.normpath(os.path.join(repo_root, fname))
+            for fname in self.repo.get_tracked_files()
+        }
+
+    def _build_index(self, root: str, git_stamp: int) -> FileIndex:
+        """Walk the project once, recording every file and directory mtime.
+
+        With a repo, directories holding no tracked files are not entered.
+        """
+        from flacoai.analyzers.cache import ANALYSIS_CACHE_DIR
+
+        tracked = self._tracked_files(root)
+        tracked_dirs = None
+        if tracked is not None:
+            tracked_dirs = set()
+            for path in tracked:
+                parent = os.path.dirname(path)
+                while parent not in tracked_dirs and len(parent) >= len(root):
+                    tracked_dirs.add(parent)
+                    parent = os.path.dirname(parent)
+
+        skip = self.SKIP_DIRS | {ANALYSIS_CACHE_DIR}
+        files = []
+        dir_mtimes = {}
+        for dirpath, dirs, names in os.walk(root):
+            try:
+                dir_mtimes[dirpath] = os.stat(dirpath).st_mtime_ns
+            except OSError:
+                continue
+
+            dirs[:] = [
+                d for d in dirs
+                if d not in skip
+                and (tracked_dirs is None or os.path.join(dirpath, d) in tracked_dirs)
+            ]
+            for name in names:
+                path = os.path.join(dirpath, name)
+                if tracked is None or path in tracked:
+                    files.append(path)
+
+        files.sort()
+        return FileIndex(root, files, dir_mtimes, tracked is not None, git_stamp)
+
+    def find_files(self, name: str) -> List[str]:
+        """Project files named name, or with name as their stem if none are.
+
+        Args:
+            name: File name, with or without extension
+
+        Returns:
+            Absolute paths, sorted
+        """
+        index = self.file_index()
+        matches = index.by_name.get(name) or index.by_stem.get(os.path.splitext(name)[0], [])
+        return list(matches)
 
     def get_relevant_files(
         self,
         focus_files: Optional[List[str]] = None,
         include_tests: bool = True,
-        max_files: int = 100
+        max_files: Optional[int] = 100
     ) -> Set[str]:
         """Get relevant files for review.
 
         Args:
             focus_files: Optional list of files to focus on
             include_tests: Whether to include test files
-            max_files: Maximum number of files to return
+            max_files: Maximum number of files to return (None for no limit);
+                when there are more, the highest-priority ones are kept
 
         Returns:
             Set of absolute file paths
@@ -113,8 +279,8 @@ class SmartContextLoader:
             if not self._is_generated(f)
         }
 
-        # Limit to max_files (prioritize by git changes if available)
-        if len(relevant_files) > max_files:
+        # Limit to max_files (prioritize by churn and risk)
+        if max_files is not None and len(relevant_files) > max_files:
             relevant_files = self._prioritize_files(relevant_files, max_files)
 
         return relevant_files
@@ -130,29 +296,38 @@ class SmartContextLoader:
         """
         code_files = set()
 
-        for root, dirs, files in os.walk(self.project_root):
-            # Skip directories in SKIP_DIRS
-            dirs[:] = [d for d in dirs if d not in self.SKIP_DIRS]
-
-            for file in files:
-                # Check extension
-                ext = Path(file).suffix.lstrip('.').lower()
-                if ext not in self.CODE_EXTENSIONS:
-                    continue
+        for full_path in self.file_index().files:
+            file = os.path.basename(full_path)
 
-                # Skip test files if requested
-                if not include_tests and self._is_test_file(file):
-                    continue
+            if not self.is_code_file_name(file):
+                continue
 
-                # Skip files in SKIP_FILES
-                if file in self.SKIP_FILES:
-                    continue
+            # Skip test files if requested
+            if not include_tests and self._is_test_file(file):
+                continue
 
-                full_path = os.path.join(root, file)
-                code_files.add(os.path.abspath(full_path))
+            code_files.add(full_path)
 
         return code_files
 
+    def is_code_file_name(self, file_name: str) -> bool:
+        """Whether discovery reviews files with this name (extension and SKIP_FILES)."""
+        ext = Path(file_name).suffix.lstrip('.').lower()
+        return ext in self.CODE_EXTENSIONS and file_name not in self.SKIP_FILES
+
+    def is_code_path(self, rel_path: str) -> bool:
+        """Whether a project-relative path is one discovery would review.
+
+        Applies the directory, name and generated-name rules without touching
+        the file, e.g. for paths listed from a commit's tree.
+        """
+        parts = Path(rel_path).parts
+        if not parts or any(part in self.SKIP_DIRS for part in parts[:-1]):
+            return False
+        if not self.is_code_file_name(parts[-1]):
+            return False
+        return not any(re.search(pattern, parts[-1], re.IGNORECASE) for pattern in self.GENERATED_PATTERNS)
+
     def _find_related_files(self, file_path: str) -> Set[str]:
         """Find files related to the given file through imports.
 
@@ -245,21 +420,23 @@ class SmartContextLoader:
             path_parts = import_str.split('.')
             base_name = path_parts[-1]
 
-            # Search for file with this name
-            for root, dirs, files in os.walk(self.project_root):
-                dirs[:] = [d for d in dirs if d not in self.SKIP_DIRS]
-
-                for file in files:
-                    if Path(file).stem == base_name:
-                        return os.path.abspath(os.path.join(root, file))
+            # Look the name up in the file index, preferring code files
+            matches = self.file_index().by_stem.get(base_name, [])
+            for match in matches:
+                if Path(match).suffix.lstrip('.').lower() in self.CODE_EXTENSIONS:
+                    return match
+            if matches:
+                return matches[0]
 
         return None
 
-    def _is_generated(self, file_path: str) -> bool:
+    def _is_generated(self, file_path: str, content: Optional[str] = None) -> bool:
         """Check if file is generated/auto-generated.
 
         Args:
             file_path: Path to file
+            content: File content, if already read (otherwise the head of the
+                file is read from disk)
 
         Returns:
             True if file appears to be generated
@@ -271,30 +448,34 @@ class SmartContextLoader:
             if re.search(pattern, file_name, re.IGNORECASE):
                 return True
 
-        # Check file content for generation markers
-        try:
-            with open(file_path, 'r') as f:
-                # Read first few lines
-                head = ''.join([next(f) for _ in range(min(10, sum(1 for _ in f)))])
-
-                # Common generation markers
-                generation_markers = [
-                    'auto-generated',
-                    'autogenerated',
-                    'do not edit',
-                    'do not modify',
-                    'generated by',
-                    'code generator',
-                    '@generated',
-                ]
-
-                head_lower = head.lower()
-                for marker in generation_markers:
-                    if marker in head_lower:
-                        return True
-
-        except Exception:
-            pass
+        # Check comments in the first few lines for generation markers
+        if content is not None:
+            head = content[:GENERATED_HEAD_BYTES].splitlines()[:10]
+        else:
+            try:
+                with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                    head = f.read(GENERATED_HEAD_BYTES).splitlines()[:10]
+            except OSError:
+                return False
+
+        # Common generation markers
+        generation_markers = [
+            'auto-generated',
+            'autogenerated',
+            'do not edit',
+            'do not modify',
+            'generated by',
+            'code generator',
+            '@generated',
+        ]
+
+        for line in head:
+            line = line.lstrip().lower()
+            if not line.startswith(COMMENT_PREFIXES):
+                continue
+            for marker in generation_markers:
+                if marker in line:
+                    return True
 
         return False
 
@@ -323,12 +504,7 @@ class SmartContextLoader:
         return False
 
     def _prioritize_files(self, files: Set[str], max_files: int) -> Set[str]:
-        """Prioritize files when limiting to max_files.
-
-        Prioritizes:
-        1. Recently changed files (git)
-        2. Smaller files
-        3. Non-test files
+        """Keep the max_files highest-priority files (see rank_files).
 
         Args:
             files: Set of file paths
@@ -337,35 +513,82 @@ class SmartContextLoader:
         Returns:
             Prioritized subset of files
         """
-        import subprocess
+        return set(self.rank_files(files)[:max_files])
+
+    def rank_files(self, files) -> List[str]:
+        """Order files by review priority, highest first.
+
+        A file's priority is its churn (commits touching it in recent history,
+        plus uncommitted changes) and its risk: a path naming sensitive code
+        (auth, payments, persistence...), size, and not being a test. Ties are
+        broken by path, so the order is stable across runs.
+
+        Args:
+            files: File paths
+
+        Returns:
+            The same paths, sorted by priority
+        """
+        churn = self._git_churn()
+
+        def priority(file_path: str):
+            return -(2 * churn.get(os.path.abspath(file_path), 0) + self._risk_score(file_path)), file_path
+
+        return sorted(files, key=priority)
 
-        # Try to get recently changed files from git
+    def _git_churn(self) -> Dict[str, int]:
+        """Recent commit counts per absolute file path; uncommitted files count 3 extra.
+
+        Returns:
+            Empty if the project is not a git repository
+        """
+        top = self._git('rev-parse', '--show-toplevel')
+        if top is None:
+            return {}
+        top = top.strip()
+
+        # git reports paths relative to the repository root
+        churn: Counter = Counter()
+        log = self._git('log', f'-n{self.CHURN_COMMITS}', '--name-only', '--format=') or ''
+        dirty = self._git('diff', '--name-only', 'HEAD') or ''
+        for output, weight in ((log, 1), (dirty, 3)):
+            for line in output.splitlines():
+                if line.strip():
+                    churn[os.path.abspath(os.path.join(top, line.strip()))] += weight
+        return dict(churn)
+
+    def _git(self, *args) -> Optional[str]:
+        """Output of a git command run in the project, None if it failed."""
         try:
             result = subprocess.run(
-                ['git', 'diff', '--name-only', 'HEAD~10..HEAD'],
+                ['git', *args],
                 cwd=self.project_root,
                 capture_output=True,
                 text=True,
-                check=False
+                check=False,
             )
+        except OSError:
+            return None
+        return result.stdout if result.returncode == 0 else None
 
-            if result.returncode == 0:
-                changed_files = set(
-                    os.path.abspath(os.path.join(self.project_root, f.strip()))
-                    for f in result.stdout.splitlines()
-                )
-
-                # Prioritize changed files
-                prioritized = list(files & changed_files)
-                remaining = list(files - changed_files)
-
-                # Fill up to max_files
-                prioritized.extend(remaining[:max_files - len(prioritized)])
-
-                return set(prioritized[:max_files])
+    def _risk_score(self, file_path: str) -> float:
+        """Heuristic risk of a file, from its path and size.
 
-        except Exception:
-            pass
+        Args:
+            file_path: Path to file
 
-        # Fallback: just take first max_files
-        return set(list(files)[:max_files])
+        Returns:
+            Score in [0, 8]: 3 for a sensitive path, 1 for non-test code,
+            and up to 4 for size (log-scaled; a 100 KB file scores 4)
+        """
+        score = 0.0
+        rel_path = os.path.relpath(file_path, self.project_root)
+        if self.RISKY_PATH_PATTERNS.search(rel_path):
+            score += 3
+        if not self._is_test_file(Path(file_path).name):
+            score += 1
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            size = 0
+        return score + min(4.0, math.log10(size + 1) - 1) if size > 10 else score
@@ -0,0 +1,43 @@
+from flacoai.analyzers import CustomRulesAnalyzer, SecurityAnalyzer
+from flacoai.analyzers.cache import AnalysisCache
+
+CONTENT = "password = 'hunter2'\neval(user_input)\n"
+
+
+def test_second_run_is_served_from_cache(tmp_path):
+    cache = AnalysisCache(str(tmp_path))
+
+    analyzer = SecurityAnalyzer()
+    analyzer.cache = cache
+    first = analyzer.analyze_files({"app.py": CONTENT})
+    assert cache.misses == 1 and cache.hits == 0
+
+    analyzer = SecurityAnalyzer()
+    analyzer.cache = cache
+    second = analyzer.analyze_files({"app.py": CONTENT})
+    assert cache.hits == 1
+
+    assert [r.to_dict() for r in first.results] == [r.to_dict() for r in second.results]
+    assert cache.stats()["hit_ratio"] == 0.5
+
+
+def test_changed_content_misses(tmp_path):
+    cache = AnalysisCache(str(tmp_path))
+    analyzer = SecurityAnalyzer()
+    analyzer.cache = cache
+
+    analyzer.analyze_files({"app.py": CONTENT})
+    analyzer.analyze_files({"app.py": CONTENT + "\n"})
+
+    assert cache.misses == 2
+
+
+def test_custom_rules_hash_is_part_of_key(tmp_path):
+    rules = tmp_path / "rules.yaml"
+    rules.write_text("rules:\n  - name: No eval\n    pattern: eval\n    mode: contains\n")
+    before = AnalysisCache.make_key(CustomRulesAnalyzer(rules_file=str(rules)), "app.py", CONTENT)
+
+    rules.write_text("rules:\n  - name: No exec\n    pattern: exec\n    mode: contains\n")
+    after = AnalysisCache.make_key(CustomRulesAnalyzer(rules_file=str(rules)), "app.py", CONTENT)
+
+    assert before != after
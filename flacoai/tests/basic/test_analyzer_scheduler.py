@@ -0,0 +1,51 @@
+from flacoai.analyzers import (
+    AnalyzerScheduler,
+    AnalyzerSpec,
+    ArchitectureAnalyzer,
+    PerformanceAnalyzer,
+    SecurityAnalyzer,
+)
+from flacoai.analyzers.scheduler import shard_files
+
+
+def _sample_files():
+    files = {}
+    for i in range(12):
+        files[f"/tmp/mod{i}.py"] = (
+            f"import mod{(i + 1) % 12}\n"
+            "password = 'hunter2'\n"
+            "for x in items:\n"
+            "    if x in [1, 2, 3]:\n"
+            "        eval(x)\n"
+        )
+    return files
+
+
+def _signature(report):
+    return [(r.file, r.line, r.title, r.description) for r in report.results]
+
+
+def test_shard_files_is_contiguous_and_complete():
+    items = [(f"f{i}", "x" * (i + 1)) for i in range(10)]
+    shards = shard_files(items, 3)
+
+    assert len(shards) == 3
+    assert [item for shard in shards for item in shard] == items
+
+
+def test_results_identical_for_any_job_count():
+    files = _sample_files()
+    specs = [
+        AnalyzerSpec("SecurityAnalyzer", SecurityAnalyzer),
+        AnalyzerSpec("PerformanceAnalyzer", PerformanceAnalyzer),
+        AnalyzerSpec("ArchitectureAnalyzer", ArchitectureAnalyzer),
+    ]
+
+    serial = AnalyzerScheduler(jobs=1).run(specs, files)
+    parallel = AnalyzerScheduler(jobs=2).run(specs, files)
+
+    assert serial.results
+    assert _signature(serial) == _signature(parallel)
+    assert set(parallel.analyzer_timings) == {spec.name for spec in specs}
+    assert serial.files_analyzed == len(files)
+
@@ -0,0 +1,96 @@
+from flacoai.analyzers.cache import AnalysisCache
+from flacoai.analyzers.clone_index import CloneIndex, tokenize
+from flacoai.premium import TechnicalDebtAnalyzer
+
+PROFILE = """import UIKit
+
+class ProfileViewController: UIViewController {
+    let tableView = UITableView()
+    var items: [String] = []
+
+    override func viewDidLoad() {
+        super.viewDidLoad()
+        tableView.delegate = self
+        tableView.dataSource = self
+        view.addSubview(tableView)
+        let url = URL(string: "https://api.example.com/profile")!
+        URLSession.shared.dataTask(with: url) { data, response, error in
+            guard let data = data, error == nil else { return }
+            self.items = try! JSONDecoder().decode([String].self, from: data)
+            DispatchQueue.main.async { self.tableView.reloadData() }
+        }.resume()
+    }
+}
+"""
+
+# The same controller, copied with every name and the URL changed
+SETTINGS = (
+    PROFILE.replace("ProfileViewController", "SettingsViewController")
+    .replace("items", "options")
+    .replace("tableView", "listView")
+    .replace("/profile", "/settings")
+)
+
+POINT = """struct Point {
+    var x: Int
+    var y: Int
+
+    func distance(to other: Point) -> Double {
+        let dx = Double(x - other.x)
+        let dy = Double(y - other.y)
+        return (dx * dx + dy * dy).squareRoot()
+    }
+}
+"""
+
+
+def duplication(report):
+    return [r for r in report.results if r.title.startswith("Code duplication")]
+
+
+def test_tokens_ignore_names_and_literals_but_keep_members():
+    tokens, lines = tokenize('let total = price * 2 // tax\nlabel.text = "hi"\n')
+    assert tokens == ["let", "$id", "=", "$id", "*", "$num", "$id", ".", "text", "=", "$str"]
+    assert lines == [1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2]
+
+
+def test_renamed_copy_in_another_file_is_reported_once():
+    files = {"Profile.swift": PROFILE, "Settings.swift": SETTINGS, "Point.swift": POINT}
+    (finding,) = duplication(TechnicalDebtAnalyzer().analyze_files(files))
+
+    assert finding.file == "Profile.swift"
+    assert finding.title == "Code duplication - 2 instances (debt: 20)"
+    assert finding.code_snippet.startswith("Duplicated block at: Settings.swift:")
+
+
+def test_index_is_updated_per_file_and_kept_between_runs(tmp_path):
+    for name, content in (("Profile.swift", PROFILE), ("Settings.swift", SETTINGS)):
+        (tmp_path / name).write_text(content)
+    cache = AnalysisCache(str(tmp_path))
+
+    analyzer = TechnicalDebtAnalyzer()
+    analyzer.cache = cache
+    assert duplication(analyzer.analyze_files({"Profile.swift": PROFILE, "Settings.swift": SETTINGS}))
+
+    # Reviewing just the copy still finds the original through the saved index
+    analyzer = TechnicalDebtAnalyzer()
+    analyzer.cache = cache
+    (finding,) = duplication(analyzer.analyze_files({"Settings.swift": SETTINGS}))
+    assert finding.file == "Settings.swift"
+    assert "Profile.swift:" in finding.code_snippet
+
+    # Rewriting the copy replaces its fingerprints
+    analyzer = TechnicalDebtAnalyzer()
+    analyzer.cache = cache
+    assert duplication(analyzer.analyze_files({"Settings.swift": POINT})) == []
+
+
+def test_copy_within_one_file_is_reported():
+    content = POINT + "\n" + POINT.replace("Point", "Vector")
+    index = CloneIndex()
+    index.update("Geometry.swift", content)
+
+    (clone,) = index.find_clones("Geometry.swift")
+    assert clone.start_line < 10
+    ((path, start, end),) = clone.copies
+    assert path == "Geometry.swift" and start > clone.end_line
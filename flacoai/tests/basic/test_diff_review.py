@@ -0,0 +1,127 @@
+import re
+import threading
+import time
+from unittest import mock
+
+from flacoai.diff_review import DiffReviewer, chunk_diff, parse_findings, reduce_reviews
+
+
+def file_diff(name, hunks=3, lines=40):
+    out = [
+        f"diff --git a/{name} b/{name}",
+        "index 1111111..2222222 100644",
+        f"--- a/{name}",
+        f"+++ b/{name}",
+    ]
+    for h in range(hunks):
+        start = 1 + h * 100
+        out.append(f"@@ -{start},{lines} +{start},{lines} @@")
+        out.extend(f"+let value{h}_{i} = compute({i})" for i in range(lines))
+    return "\n".join(out) + "\n"
+
+
+def count(text):
+    return len(text) // 4
+
+
+class FakeModel:
+    info = {"max_input_tokens": 100000}
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def token_count(self, text):
+        return count(text)
+
+    def simple_send_with_retries(self, messages):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+
+        diff = messages[-1]["content"]
+        files = re.findall(r"^\+\+\+ b/(\S+)", diff, re.M)
+        return "\n".join(
+            [f"{name}:1: [high] Force unwrap can crash" for name in files]
+            + ["Consider adding tests for these changes."]
+        )
+
+
+def test_chunks_fit_the_budget_and_keep_every_line():
+    diff = "".join(file_diff(f"Sources/File{i}.swift") for i in range(6))
+    chunks = chunk_diff(diff, count, 800)
+
+    assert len(chunks) > 6
+    assert all(count(chunk.text) <= 800 for chunk in chunks)
+    added = [line for chunk in chunks for line in chunk.text.splitlines() if line.startswith("+let")]
+    assert added == [line for line in diff.splitlines() if line.startswith("+let")]
+    # Every chunk reads as a diff on its own
+    assert all(chunk.text.startswith("diff --git") for chunk in chunks)
+
+
+def test_oversized_hunk_is_split_with_correct_line_numbers():
+    diff = file_diff("Big.swift", hunks=1, lines=400)
+    chunks = chunk_diff(diff, count, 500)
+
+    headers = [line for chunk in chunks for line in chunk.text.splitlines() if line.startswith("@@")]
+    starts = [int(re.match(r"@@ -\d+,\d+ \+(\d+),(\d+)", h).group(1)) for h in headers]
+    sizes = [int(re.match(r"@@ -\d+,\d+ \+(\d+),(\d+)", h).group(2)) for h in headers]
+    assert len(headers) > 1
+    assert starts == [1 + sum(sizes[:i]) for i in range(len(sizes))]
+    assert sum(sizes) == 400
+
+
+def test_chunks_are_reviewed_concurrently_and_merged():
+    diff = "".join(file_diff(f"Sources/File{i}.swift") for i in range(6))
+    model = FakeModel(delay=0.2)
+    reviewer = DiffReviewer(model, max_chunk_tokens=800, concurrency=4)
+    chunks = reviewer.chunks(diff)
+    parts = len(chunks)
+
+    review = reviewer.review(diff)
+
+    assert review.chunks == parts and review.failed_chunks == 0
+    assert model.max_in_flight == 4
+    # Bounded by the slowest wave of requests, not the sum of all of them
+    assert review.elapsed < 0.2 * parts * 0.75
+
+    # Files split across chunks are reported once; the shared remark once
+    assert sorted(f.file for f in review.findings) == [f"Sources/File{i}.swift" for i in range(6)]
+    assert review.notes == ["Consider adding tests for these changes."]
+    reported = sum(len(chunk.files) for chunk in chunks) + parts
+    assert review.duplicates == reported - 7
+
+
+
+def test_review_reuses_precomputed_chunks():
+    diff = "".join(file_diff(f"Sources/File{i}.swift") for i in range(6))
+    reviewer = DiffReviewer(FakeModel(), max_chunk_tokens=800)
+    chunks = reviewer.chunks(diff)
+
+    with mock.patch.object(reviewer, "chunks") as rechunk:
+        review = reviewer.review(diff, chunks=chunks)
+
+    rechunk.assert_not_called()
+    assert review.chunks == len(chunks)
+
+def test_reduce_parses_findings_and_counts_failures():
+    findings, notes = parse_findings(
+        "- `App.swift:12`: [HIGH] Retain cycle in closure\nNO ISSUES\n* General remark\n"
+    )
+    assert [(f.file, f.line, f.severity) for f in findings] == [("App.swift", 12, "high")]
+    assert notes == ["General remark"]
+
+    review = reduce_reviews([
+        "App.swift:12: [low] Minor style",
+        None,
+        "App.swift:12: [critical] Crash on nil\napp.swift:3: [low] x",
+    ])
+    assert review.failed_chunks == 1
+    assert [(f.file, f.severity) for f in review.findings] == [
+        ("App.swift", "critical"), ("App.swift", "low"), ("app.swift", "low"),
+    ]
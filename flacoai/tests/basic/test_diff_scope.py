@@ -0,0 +1,102 @@
+from pathlib import Path
+from unittest import mock
+
+from flacoai.analyzers import AnalyzerScheduler, AnalyzerSpec, SecurityAnalyzer
+from flacoai.commands import Commands
+from flacoai.diff_scope import DiffScope, parse_changed_lines, repo_diff_scope
+from flacoai.io import InputOutput
+from flacoai.repo import GitRepo
+from flacoai.review_sinks import CollectSink, DiffScopeSink, ReviewSummary
+from flacoai.utils import GitTemporaryDirectory, make_repo
+
+DIFF = """diff --git a/app/views.py b/app/views.py
+index 1111111..2222222 100644
+--- a/app/views.py
++++ b/app/views.py
+@@ -10,7 +10,8 @@ def index():
+     a = 1
+     b = 2
+     c = 3
+-    d = 4
++    d = 5
++    e = 6
+     f = 7
+     g = 8
+     h = 9
+@@ -40,0 +42,2 @@ def other():
++-- not a header
++++ nor this
+@@ -60,2 +63,0 @@
+-    gone = 1
+-    gone = 2
+diff --git a/old.py b/old.py
+deleted file mode 100644
+--- a/old.py
++++ /dev/null
+@@ -1,2 +0,0 @@
+-x = 1
+-y = 2
+diff --git a/new.py b/new.py
+new file mode 100644
+--- /dev/null
++++ b/new.py
+@@ -0,0 +1,3 @@
++x = 1
++y = 2
++z = 3
+"""
+
+
+def test_hunks_map_to_changed_new_lines():
+    assert parse_changed_lines(DIFF) == {
+        "app/views.py": [(13, 14), (42, 43), (64, 64)],
+        "new.py": [(1, 3)],
+    }
+
+
+def test_scope_includes_nearby_lines_only():
+    scope = DiffScope({"/src/a.py": [(10, 12), (40, 40)]}, context=2)
+    assert [line for line in range(1, 50) if scope.contains("/src/a.py", line)] == (
+        list(range(8, 15)) + list(range(38, 43))
+    )
+    assert scope.contains("/src/a.py", None)
+    assert not scope.contains("/src/b.py", 10)
+
+
+def test_review_reports_only_findings_near_the_change():
+    with GitTemporaryDirectory() as root:
+        repo = make_repo(root)
+        old = 'password = "hunter2"\n' + "x = 1\n" * 30
+        Path(root, "app.py").write_text(old)
+        Path(root, "other.py").write_text(old)
+        repo.git.add(".")
+        repo.git.commit("-m", "initial")
+
+        Path(root, "app.py").write_text(old + 'api_key = "sk-live-123456789"\n')
+        scope = repo_diff_scope(GitRepo(InputOutput(), None, root))
+        assert scope.files() == [str(Path(root, "app.py").resolve())]
+
+        collector = CollectSink()
+        sink = DiffScopeSink(scope, [collector])
+        specs = [AnalyzerSpec("SecurityAnalyzer", SecurityAnalyzer)]
+        for result in AnalyzerScheduler().stream(specs, [(f, Path(f).read_text()) for f in scope.files()]):
+            sink.write(result)
+        sink.close(ReviewSummary(files_analyzed=1))
+
+        lines = {result.line for result in collector.report.results}
+        assert lines == {32}
+        assert sink.out_of_scope > 0
+        assert collector.report.get_stats()["total"] == len(collector.report.results)
+
+
+def test_diff_base_without_a_ref_is_an_error():
+    io = InputOutput(pretty=False, fancy_input=False, yes=True)
+    commands = Commands(io, mock.MagicMock())
+    for args in ["--diff-base", "--diff-base --all"]:
+        with mock.patch.object(io, "tool_error") as tool_error, mock.patch(
+            "flacoai.smart_context.SmartContextLoader"
+        ) as loader:
+            commands.cmd_review(args)
+        tool_error.assert_called_once()
+        assert "--diff-base" in tool_error.call_args[0][0]
+        loader.assert_not_called()
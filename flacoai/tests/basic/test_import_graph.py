@@ -0,0 +1,79 @@
+from flacoai.analyzers import ArchitectureAnalyzer
+from flacoai.analyzers.cache import AnalysisCache
+from flacoai.analyzers.import_graph import ImportGraph
+
+FILES = {
+    "app/models.py": "from app import views\n",
+    "app/views.py": "from .services import load\n",
+    "app/services.py": "import app.models\nimport os\n",
+    "app/util.py": "from app import models\n",
+    "web/index.ts": "import { api } from './api';\n",
+    "web/api.ts": "export { x } from './index';\n",
+}
+
+
+def circular(report):
+    return [r for r in report.results if r.title == "Circular Dependency"]
+
+
+def test_each_cycle_is_reported_once_with_a_path():
+    findings = circular(ArchitectureAnalyzer().analyze_files(FILES))
+
+    assert [f.description for f in findings] == [
+        "Circular dependency: app/models.py -> app/views.py -> app/services.py -> app/models.py",
+        "Circular dependency: web/api.ts -> web/index.ts -> web/api.ts",
+    ]
+    assert [f.file for f in findings] == ["app/models.py", "web/api.ts"]
+
+
+def test_deep_import_chain_does_not_recurse():
+    files = {f"pkg/m{i}.py": f"from pkg import m{i + 1}\n" for i in range(5000)}
+    files["pkg/m5000.py"] = "from pkg import m0\n"
+
+    (finding,) = circular(ArchitectureAnalyzer().analyze_files(files))
+    assert finding.description.count("->") == 5001
+
+
+def test_incremental_updates_match_a_rebuild():
+    graph = ImportGraph()
+    for i in range(200):
+        graph.update(f"m{i}.py", [f"m{i + 1}"])
+    assert graph.cycles() == []
+
+    graph.update("m199.py", ["m100"])
+    graph.update("m50.py", ["m51", "m40"])
+    assert graph.cycles() == sorted([
+        sorted(f"m{i}.py" for i in range(40, 51)),
+        sorted(f"m{i}.py" for i in range(100, 200)),
+    ])
+    assert graph.full_rebuilds == 1 and graph.incremental_updates == 2
+
+    graph.remove("m150.py")
+    assert graph.cycles() == [sorted(f"m{i}.py" for i in range(40, 51))]
+
+    restored = ImportGraph.from_dict(graph.to_dict())
+    assert restored.cycles() == graph.cycles()
+    assert restored.full_rebuilds == 0
+
+
+def test_import_graph_is_kept_between_cached_runs(tmp_path):
+    for path, content in FILES.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(content)
+    cache = AnalysisCache(str(tmp_path))
+
+    analyzer = ArchitectureAnalyzer()
+    analyzer.cache = cache
+    assert len(circular(analyzer.analyze_files(FILES))) == 2
+
+    # Reviewing one file still sees the cycle it closes through the others
+    analyzer = ArchitectureAnalyzer()
+    analyzer.cache = cache
+    (finding,) = circular(analyzer.analyze_files({"app/views.py": FILES["app/views.py"]}))
+    assert finding.file == "app/views.py"
+    assert analyzer.import_graph.full_rebuilds == 0
+
+    # Breaking the cycle clears it
+    analyzer = ArchitectureAnalyzer()
+    analyzer.cache = cache
+    assert circular(analyzer.analyze_files({"app/views.py": "import json\n"})) == []
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from flacoai.licensing import license_manager as lm_module
+from flacoai.licensing.license_manager import LicenseManager, LicenseTier
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+class FakeRequests:
+    def __init__(self, tier="pro"):
+        self.tier = tier
+        self.valid = True
+        self.calls = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def post(self, url, json=None, timeout=None):
+        self.release.wait(5)
+        self.calls += 1
+        return FakeResponse({"success": True, "valid": self.valid, "tier": self.tier})
+
+
+@pytest.fixture
+def server(monkeypatch, tmp_path):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(LicenseManager, "_tier_cache", {})
+    monkeypatch.setattr(LicenseManager, "_revalidating", set())
+    fake = FakeRequests()
+    monkeypatch.setattr(lm_module, "requests", fake)
+
+    license_file = tmp_path / ".flaco" / "license.json"
+    license_file.parent.mkdir(parents=True)
+    expires = (datetime.now() + timedelta(days=30)).date().isoformat()
+    license_file.write_text(json.dumps({
+        "email": "dev@example.com",
+        "key": "FLACO-00000000-00000000-00000000",
+        "tier": "pro",
+        "expires": expires,
+    }))
+    return fake
+
+
+def test_tier_is_cached_across_managers(server):
+    assert LicenseManager().get_tier() == LicenseTier.PRO
+    assert LicenseManager().get_tier() == LicenseTier.PRO
+    assert server.calls == 1
+
+
+def test_tier_cache_survives_restart(server, monkeypatch):
+    LicenseManager().get_tier()
+
+    # A new process starts with an empty in-memory cache
+    monkeypatch.setattr(LicenseManager, "_tier_cache", {})
+    assert LicenseManager().get_tier() == LicenseTier.PRO
+    assert server.calls == 1
+
+
+def test_stale_tier_is_served_while_revalidating(server):
+    manager = LicenseManager()
+    manager.get_tier()
+    entry = LicenseManager._tier_cache[str(manager.license_file)]
+    entry["verified_at"] = time.time() - LicenseManager.TIER_CACHE_TTL - 1
+
+    # The stale tier comes back without waiting on the (blocked) server
+    server.tier = "enterprise"
+    server.release.clear()
+    assert manager.get_tier() == LicenseTier.PRO
+    assert LicenseManager._revalidating
+
+    server.release.set()
+    deadline = time.time() + 5
+    while LicenseManager._revalidating and time.time() < deadline:
+        time.sleep(0.01)
+    assert server.calls == 2
+    assert LicenseManager().get_tier() == LicenseTier.ENTERPRISE
+
+
+def test_deactivate_invalidates_tier_cache(server):
+    manager = LicenseManager()
+    manager.get_tier()
+
+    manager.deactivate_license()
+    assert manager.get_tier() == LicenseTier.FREE
+    assert not (manager._cache_dir() / "license_tier.json").exists()
+
+
+@pytest.mark.parametrize(
+    "tamper",
+    [
+        lambda entry: entry.update(tier="enterprise"),
+        lambda entry: entry.pop("signature"),
+        lambda entry: entry.update(verified_at=9e12),
+    ],
+    ids=["tier-edited", "unsigned", "verified-in-future"],
+)
+def test_tampered_tier_cache_is_revalidated(server, monkeypatch, tamper):
+    manager = LicenseManager()
+    assert manager.get_tier() == LicenseTier.PRO
+    cache_file = manager._cache_dir() / "license_tier.json"
+    entry = json.loads(cache_file.read_text())
+    tamper(entry)
+    cache_file.write_text(json.dumps(entry))
+
+    # A new process only has the file to go on, so the server is asked again
+    monkeypatch.setattr(LicenseManager, "_tier_cache", {})
+    assert LicenseManager().get_tier() == LicenseTier.PRO
+    assert server.calls == 2
+
+
+def test_hand_written_tier_cache_grants_nothing(server, monkeypatch):
+    manager = LicenseManager()
+    license_id = manager._license_id(manager.load_license())
+    (manager._cache_dir() / "license_tier.json").write_text(json.dumps({
+        "license_id": license_id,
+        "tier": "enterprise",
+        "verified_at": 9e12,
+        "signature": "0" * 64,
+    }))
+
+    server.valid = False
+    assert manager.get_tier() == LicenseTier.FREE
+    assert server.calls == 1
+
+
+def test_forged_tier_cache_grants_no_more_than_the_license(server, monkeypatch):
+    manager = LicenseManager()
+    license_id = manager._license_id(manager.load_license())
+    verified_at = time.time()
+    # Everything that goes into the signature is readable on this machine
+    (manager._cache_dir() / "license_tier.json").write_text(json.dumps({
+        "license_id": license_id,
+        "tier": "enterprise",
+        "verified_at": verified_at,
+        "signature": manager._tier_signature(license_id, "enterprise", verified_at),
+    }))
+
+    assert manager.get_tier() == LicenseTier.PRO
@@ -1,9 +1,11 @@
 import os
 import unittest
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
-from aider.dump import dump  # noqa
-from aider.linter import Linter
+from flacoai.dump import dump  # noqa
+from flacoai.linter import Linter, split_output_by_file
+from flacoai.utils import GitTemporaryDirectory
 
 
 class TestLinter(unittest.TestCase):
@@ -79,6 +81,68 @@ class TestLinter(unittest.TestCase):
             self.assertIsNotNone(result)
             self.assertIn("Error message", result.text)
 
+    def test_split_output_by_file(self):
+        output = (
+            "warning: config ignored\n"
+            "a.py:1:1: F821 undefined name 'x'\n"
+            "    x\n"
+            "    ^\n"
+            "sub/b.py:2:5: E999 SyntaxError\n"
+            "a.py:3:1: F821 undefined name 'y'\n"
+        )
+        parts = split_output_by_file(output, ["a.py", "sub/b.py", "c.py"])
+        self.assertEqual(
+            parts["a.py"],
+            "warning: config ignored\na.py:1:1: F821 undefined name 'x'\n    x\n    ^\n"
+            "a.py:3:1: F821 undefined name 'y'\n",
+        )
+        self.assertEqual(parts["sub/b.py"], "warning: config ignored\nsub/b.py:2:5: E999 SyntaxError\n")
+        self.assertEqual(parts["c.py"], "warning: config ignored\n")
+
+    def test_lint_many_batches_flake8_and_caches(self):
+        with GitTemporaryDirectory() as root:
+            linter = Linter(encoding="utf-8", root=root)
+            fnames = []
+            for i in range(3):
+                fname = Path(root, f"mod{i}.py")
+                fname.write_text(f"def f{i}():\n    return {i}\n")
+                fnames.append(str(fname))
+            Path(root, "broken.js").write_text("function f( {\n")
+            fnames.append(str(Path(root, "broken.js")))
+            fnames.append(str(Path(root, "notes.txt")))
+            Path(fnames[-1]).write_text("hello\n")
+
+            with patch("subprocess.run") as mock_run:
+                mock_run.return_value = MagicMock(
+                    stdout="mod1.py:2:12: F821 undefined name 'z'\n", stderr=""
+                )
+                results = linter.lint_many(fnames)
+
+                # One flake8 run for all the python files
+                mock_run.assert_called_once()
+                self.assertEqual(mock_run.call_args[0][0][-3:], ["mod0.py", "mod1.py", "mod2.py"])
+
+            self.assertIsNone(results[fnames[0]])
+            self.assertIn("F821 undefined name 'z'", results[fnames[1]])
+            # The report names only its own file
+            self.assertIn("--isolated mod1.py\n", results[fnames[1]])
+            self.assertNotIn("mod0.py", results[fnames[1]])
+            self.assertIn("broken.js", results[fnames[3]])
+            self.assertNotIn(fnames[4], results)
+            self.assertEqual(linter.last_run.files, 4)
+            self.assertEqual(linter.last_run.linters, 2)
+
+            # Only the changed file is linted again
+            Path(fnames[2]).write_text("def f2():\n    return 3\n")
+            with patch("subprocess.run") as mock_run:
+                mock_run.return_value = MagicMock(stdout="", stderr="")
+                again = linter.lint_many(fnames)
+                self.assertEqual(mock_run.call_args[0][0][-1:], ["mod2.py"])
+
+            self.assertEqual(again[fnames[1]], results[fnames[1]])
+            self.assertEqual(linter.last_run.cached, 3)
+            self.assertIn("3 unchanged", linter.last_run.summary())
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,74 @@
+import random
+
+from flacoai.mdstream import IncrementalMarkdownRenderer
+
+DOC = """# Title
+
+Intro paragraph
+over two lines.
+
+- one
+- two
+  - nested
+
+## Section
+
+```python
+def f():
+    return 1
+```
+Text right after the fence.
+
+---
+Setext heading
+==============
+
+> quote
+lazy continuation
+
+| a | b |
+|---|---|
+| 1 | 2 |
+
+1. first
+2. second
+
+    indented code
+
+Closing paragraph with `code` and **bold**.
+"""
+
+
+def test_streamed_render_matches_full_render():
+    doc = DOC * 2
+    for seed in range(10):
+        rng = random.Random(seed)
+        renderer = IncrementalMarkdownRenderer()
+        end = 0
+        while end < len(doc):
+            end = min(len(doc), end + rng.randint(1, 40))
+            tail = renderer.render(doc[:end])
+            expected = IncrementalMarkdownRenderer().render_lines(doc[:end])
+            assert renderer.frozen_lines + tail == expected, (seed, end)
+
+
+def test_finished_blocks_are_frozen():
+    renderer = IncrementalMarkdownRenderer()
+    renderer.render(DOC)
+    frozen = len(renderer.frozen_lines)
+    assert DOC.startswith(renderer.frozen_source)
+    assert renderer.frozen_source.endswith("\n\n")
+    assert frozen > 20
+
+    # Appending only re-renders from the open tail on
+    tail = renderer.render(DOC + "More text")
+    assert renderer.frozen_lines[:frozen] == IncrementalMarkdownRenderer().render_lines(DOC)[:frozen]
+    assert len(tail) < 5
+
+
+def test_rewritten_text_starts_over():
+    renderer = IncrementalMarkdownRenderer()
+    renderer.render(DOC)
+    changed = DOC.replace("Intro", "Changed")
+    tail = renderer.render(changed)
+    assert renderer.frozen_lines + tail == IncrementalMarkdownRenderer().render_lines(changed)
@@ -0,0 +1,107 @@
+from flacoai.parse_service import (
+    ParseService,
+    get_parse_service,
+    source_edit,
+    tree_context,
+)
+
+
+class FakeTree:
+    def __init__(self, source, old_tree=None):
+        self.source = source
+        self.old_tree = old_tree
+        self.edits = []
+
+    def copy(self):
+        return FakeTree(self.source)
+
+    def edit(self, **edit):
+        self.edits.append(edit)
+
+
+class FakeParser:
+    def parse(self, source, old_tree=None):
+        return FakeTree(source, old_tree)
+
+
+class FakeParseService(ParseService):
+    def parser(self, lang):
+        return FakeParser()
+
+
+def test_source_edit_spans_the_changed_bytes():
+    old = b"def f():\n    return 1\n\ndef g():\n    pass\n"
+    new = b"def f():\n    return 12345\n\ndef g():\n    pass\n"
+    assert source_edit(old, new) == dict(
+        start_byte=21,
+        old_end_byte=21,
+        new_end_byte=25,
+        start_point=(1, 12),
+        old_end_point=(1, 12),
+        new_end_point=(1, 16),
+    )
+
+    # Lines removed
+    edit = source_edit(b"a\nb\nc\n", b"a\nc\n")
+    assert (edit["start_byte"], edit["old_end_byte"], edit["new_end_byte"]) == (2, 4, 2)
+    assert edit["old_end_point"] == (2, 0)
+
+    # Repeated text doesn't make the prefix and suffix overlap
+    edit = source_edit(b"aaaa", b"aaaaaa")
+    assert (edit["start_byte"], edit["old_end_byte"], edit["new_end_byte"]) == (4, 4, 6)
+    assert source_edit(b"same", b"same")["new_end_byte"] == 4
+
+
+def test_trees_are_reused_and_reparsed_incrementally():
+    service = FakeParseService()
+    first = service.parse("/r/a.py", "x = 1\n")
+    assert service.parse("/r/a.py", "x = 1\n") is first
+    assert (service.stats.full_parses, service.stats.hits) == (1, 1)
+
+    second = service.parse("/r/a.py", "x = 2\n")
+    assert service.stats.incremental_parses == 1
+    assert second.old_tree.edits == [source_edit(b"x = 1\n", b"x = 2\n")]
+    # The tree handed out earlier is not edited
+    assert first.edits == []
+
+    # Unknown languages aren't parsed
+    assert service.parse("/r/notes.unknown", "hello") is None
+    assert "1 incremental" in service.stats.summary()
+
+
+def test_least_recently_used_trees_are_evicted():
+    service = FakeParseService(max_files=2, max_bytes=100)
+    service.parse("/r/a.py", "a = 1\n")
+    service.parse("/r/b.py", "b = 1\n")
+    service.parse("/r/a.py", "a = 1\n")
+    service.parse("/r/c.py", "c = 1\n")
+    assert len(service) == 2
+    assert service.stats.evictions == 1
+
+    # b.py was least recently used, so it is parsed from scratch
+    service.parse("/r/b.py", "b = 1\n")
+    assert service.stats.full_parses == 4
+
+    # A file over the byte budget is still kept, alone
+    service.parse("/r/big.py", "x" * 200)
+    assert len(service) == 1
+
+
+def test_incremental_tree_matches_full_parse(tmp_path):
+    service = get_parse_service()
+    fname = str(tmp_path / "mod.py")
+    code = "def f(a):\n    return a\n\n\nclass C:\n    def m(self):\n        pass\n"
+    service.parse(fname, code)
+    incremental = service.stats.incremental_parses
+    edited = code.replace("return a", "return a + 1  # changed")
+    tree = service.parse(fname, edited)
+    assert service.stats.incremental_parses == incremental + 1
+    assert str(tree.root_node) == str(ParseService().parse(fname, edited).root_node)
+
+    # The linter's and repo map's contexts reuse the same tree
+    hits = service.stats.hits
+    context = tree_context("mod.py", edited, abs_fname=fname, line_number=True)
+    context.add_lines_of_interest({1})
+    context.add_context()
+    assert "return a + 1" in context.format()
+    assert service.stats.hits == hits + 1
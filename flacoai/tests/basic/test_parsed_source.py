@@ -0,0 +1,121 @@
+import pickle
+
+from flacoai.analyzers import AnalyzerScheduler, AnalyzerSpec, ParsedSource, SwiftUIAnalyzer
+from flacoai.analyzers.base_analyzer import BaseAnalyzer
+
+SWIFT = """import SwiftUI
+// func commented() { }
+struct V: View {
+    let s = "a { brace"
+    var body: some View {
+        Text("x").onAppear {
+            load()
+        }
+    }
+    func load() {
+        items.map { item in
+            item.name
+        }
+        if self.isOn {
+            print("}")
+        }
+    }
+}
+"""
+
+PYTHON = '''def outer(x):
+    """def not_a_function():"""
+    square = lambda v: v * v  # def nope():
+
+    def inner():
+        return 1
+
+    return square(x)
+'''
+
+
+def test_is_a_str():
+    source = ParsedSource(SWIFT, "V.swift")
+    assert source == SWIFT
+    assert "struct V" in source
+    assert ParsedSource.of(source) is source
+
+
+def test_comment_and_string_masks():
+    source = ParsedSource(SWIFT, "V.swift")
+    assert source.in_comment(SWIFT.index("func commented"))
+    assert source.in_string(SWIFT.index("a { brace"))
+    assert source.is_code(SWIFT.index("struct V"))
+    assert len(source.code) == len(SWIFT)
+    assert "brace" not in source.code
+    assert source.code.count("\n") == SWIFT.count("\n")
+
+
+def test_block_end_ignores_braces_in_strings():
+    source = ParsedSource(SWIFT, "V.swift")
+    start = SWIFT.index("func load() {") + len("func load() {")
+    body = SWIFT[start:source.block_end(start)]
+    assert body.rstrip().endswith("}\n    }")
+    assert "print" in body and "struct" not in body
+
+
+def test_swift_function_and_closure_spans():
+    source = ParsedSource(SWIFT, "V.swift")
+    assert [(f.name, f.start_line, f.end_line) for f in source.functions] == [("load", 10, 17)]
+    assert [(c.start_line, c.end_line) for c in source.closures] == [(6, 8), (11, 13)]
+
+
+def test_python_function_spans():
+    source = ParsedSource(PYTHON, "a.py")
+    assert [(f.name, f.start_line, f.end_line) for f in source.functions] == [
+        ("outer", 1, 8),
+        ("inner", 5, 6),
+    ]
+    assert [c.start_line for c in source.closures] == [3]
+    assert source.enclosing_function(PYTHON.index("return 1")).name == "inner"
+
+
+
+def test_class_spans():
+    source = ParsedSource(SWIFT, "V.swift")
+    assert [(c.name, c.start_line, c.end_line) for c in source.classes] == [("V", 3, 18)]
+    source = ParsedSource("class A:\n    x = 1\n\n\ndef f():\n    pass\n", "a.py")
+    assert [(c.name, c.start_line, c.end_line) for c in source.classes] == [("A", 1, 2)]
+
+def test_lines_before_matches_split():
+    source = ParsedSource(SWIFT, "V.swift")
+    for offset in (0, 40, SWIFT.index("func load"), len(SWIFT)):
+        assert source.lines_before(offset, 3) == SWIFT[:offset].split("\n")[-3:]
+
+
+def test_pickles_without_derived_state():
+    source = ParsedSource(PYTHON, "a.py")
+    source.functions
+    copy = pickle.loads(pickle.dumps(source))
+    assert copy == source and copy.path == "a.py"
+    assert "_spans" not in copy.__dict__
+
+
+class RecordingAnalyzer(BaseAnalyzer):
+    seen = []
+
+    def analyze_file(self, file_path, content):
+        self.seen.append(content)
+        return []
+
+
+def test_scheduler_shares_one_parse_per_file():
+    RecordingAnalyzer.seen = []
+    specs = [AnalyzerSpec("a", RecordingAnalyzer), AnalyzerSpec("b", RecordingAnalyzer)]
+    AnalyzerScheduler(jobs=1).run(specs, {"V.swift": SWIFT})
+
+    first, second = RecordingAnalyzer.seen
+    assert isinstance(first, ParsedSource)
+    assert first is second
+
+
+def test_swiftui_analyzer_accepts_plain_str_and_parsed_source():
+    analyzer = SwiftUIAnalyzer()
+    plain = analyzer.analyze_file("V.swift", SWIFT)
+    parsed = analyzer.analyze_file("V.swift", ParsedSource(SWIFT, "V.swift"))
+    assert [r.to_dict() for r in plain] == [r.to_dict() for r in parsed]
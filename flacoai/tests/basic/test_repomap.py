@@ -1,5 +1,6 @@
 import difflib
 import os
+import random
 import re
 import time
 import unittest
@@ -7,11 +8,11 @@ from pathlib import Path
 
 import git
 
-from aider.dump import dump  # noqa: F401
-from aider.io import InputOutput
-from aider.models import Model
-from aider.repomap import RepoMap
-from aider.utils import GitTemporaryDirectory, IgnorantTemporaryDirectory
+from flacoai.dump import dump  # noqa: F401
+from flacoai.io import InputOutput
+from flacoai.models import Model
+from flacoai.repomap import RepoMap, TagGraph, rank_networkx, rank_sparse
+from flacoai.utils import GitTemporaryDirectory, IgnorantTemporaryDirectory
 
 
 class TestRepoMap(unittest.TestCase):
@@ -274,6 +275,85 @@ print(my_function(3, 4))
             del repo_map
 
 
+class TestRepoMapRanking(unittest.TestCase):
+    def random_graph(self, seed, num_files=60, num_idents=200):
+        rng = random.Random(seed)
+        files = [f"dir{i % 4}/file{i}.py" for i in range(num_files)]
+        graph = TagGraph()
+        for i in range(num_idents):
+            definers = rng.sample(files, rng.choice([1, 1, 2, 6]))
+            referencers = rng.choices(files, k=rng.randint(0, 5))
+            if not referencers:
+                for definer in definers:
+                    graph.add_edge(definer, definer, 0.1, f"ident{i}")
+            for referencer in referencers:
+                for definer in definers:
+                    graph.add_edge(referencer, definer, rng.uniform(0.1, 50), f"ident{i}")
+        return graph, files
+
+    def assertRanksEqual(self, expected, actual):
+        self.assertEqual(set(expected), set(actual))
+        for key, rank in expected.items():
+            self.assertAlmostEqual(rank, actual[key], places=9, msg=key)
+
+    def test_sparse_ranking_matches_networkx(self):
+        for seed in range(5):
+            graph, files = self.random_graph(seed)
+            rng = random.Random(seed)
+            for personalization in [
+                {},
+                {fname: 100 / len(files) for fname in rng.sample(files, 3)},
+                # Files outside the graph, as for a chat file with no tags
+                {"not/in/graph.py": 1.0},
+            ]:
+                ranked, definitions = rank_networkx(graph, personalization)
+                sparse_ranked, sparse_definitions = rank_sparse(graph, personalization)
+                self.assertRanksEqual(ranked, sparse_ranked)
+                self.assertRanksEqual(definitions, sparse_definitions)
+
+    def test_tag_graph_interns_names(self):
+        graph = TagGraph()
+        graph.add_edge("a.py", "b.py", 1.0, "foo")
+        graph.add_edge("b.py", "b.py", 0.1, "bar")
+        graph.add_edge("a.py", "b.py", 2.0, "foo")
+        self.assertEqual(graph.nodes, ["a.py", "b.py"])
+        self.assertEqual(graph.idents, ["foo", "bar"])
+        self.assertEqual((graph.src, graph.dst, graph.ident), ([0, 1, 0], [1, 1, 1], [0, 1, 0]))
+        self.assertEqual(len(graph), 3)
+        self.assertEqual(list(graph.edges())[1], ("b.py", "b.py", 0.1, "bar"))
+
+        self.assertEqual(rank_sparse(TagGraph(), {}), ({}, {}))
+
+    def test_backends_rank_tags_alike(self):
+        files = {
+            "models.py": "class UserAccount:\n    def save_account(self):\n        pass\n",
+            "views.py": "from models import UserAccount\n\nUserAccount().save_account()\n",
+            "utils.py": "def format_name(name):\n    return UserAccount(name)\n",
+            "cli.py": "from utils import format_name\n\nformat_name('x')\n",
+        }
+        with IgnorantTemporaryDirectory() as temp_dir:
+            for fname, content in files.items():
+                with open(os.path.join(temp_dir, fname), "w") as f:
+                    f.write(content)
+            fnames = [os.path.join(temp_dir, fname) for fname in files]
+
+            io = InputOutput()
+            ranked_tags = {}
+            for ranking in ["networkx", "sparse"]:
+                repo_map = RepoMap(root=temp_dir, io=io, ranking=ranking)
+                ranked_tags[ranking] = repo_map.get_ranked_tags(
+                    fnames[:1], fnames[1:], set(), {"format_name"}
+                )
+                del repo_map
+
+            self.assertTrue(ranked_tags["networkx"])
+            self.assertEqual(ranked_tags["networkx"], ranked_tags["sparse"])
+
+    def test_unknown_ranking_backend(self):
+        with self.assertRaises(ValueError):
+            RepoMap(ranking="igraph", io=InputOutput())
+
+
 class TestRepoMapTypescript(unittest.TestCase):
     def setUp(self):
         self.GPT35 = Model("gpt-3.5-turbo")
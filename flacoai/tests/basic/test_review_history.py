@@ -0,0 +1,153 @@
+from pathlib import Path
+
+from flacoai.analyzers import (
+    AnalysisResult,
+    AnalyzerScheduler,
+    AnalyzerSpec,
+    ArchitectureAnalyzer,
+    Category,
+    QualityAnalyzer,
+    SecurityAnalyzer,
+    Severity,
+)
+from flacoai.io import InputOutput
+from flacoai.repo import GitRepo
+from flacoai.review_history import (
+    CommitSummary,
+    ReviewHistory,
+    backfill,
+    format_trend,
+    module_of,
+)
+from flacoai.utils import GitTemporaryDirectory, make_repo
+
+SPECS = [
+    AnalyzerSpec("SecurityAnalyzer", SecurityAnalyzer),
+    AnalyzerSpec("QualityAnalyzer", QualityAnalyzer),
+]
+
+
+def finding(root, path, severity, category=Category.SECURITY):
+    return AnalysisResult(str(Path(root, path)), 1, severity, category, "t", "d", "r")
+
+
+def test_summaries_are_appended_and_queried_by_range(tmp_path):
+    root = str(tmp_path)
+    history = ReviewHistory(root)
+    for i in range(5):
+        summary = CommitSummary(f"{i:040x}", 1000 + i, files_analyzed=10)
+        for _ in range(i):
+            summary.add(finding(root, "Sources/App/Login.swift", Severity.HIGH), root)
+        summary.add(finding(root, "Sources/Core/Util.swift", Severity.LOW, Category.QUALITY), root)
+        assert history.record(summary)
+
+    # Append-only: a recorded commit is never replaced
+    assert not history.record(CommitSummary(f"{0:040x}", 1000, files_analyzed=99))
+
+    points = history.series()
+    assert [p.total for p in points] == [1, 2, 3, 4, 5]
+    assert points[0].files_analyzed == 10
+    assert points[-1].counts == {"high": 4, "low": 1}
+
+    assert [p.committed_at for p in history.series(since=1002)] == [1002, 1003, 1004]
+    assert [p.committed_at for p in history.series(limit=2)] == [1003, 1004]
+    assert history.series(by="module")[-1].counts == {"Sources/App": 4, "Sources/Core": 1}
+    assert history.series(by="category", until=1000)[0].counts == {"quality": 1}
+    history.close()
+
+    # Reopened from disk
+    assert len(ReviewHistory(root).known_commits()) == 5
+
+
+def test_module_names():
+    assert module_of("/r/Sources/App/Views/Home.swift", "/r") == "Sources/App"
+    assert module_of("/r/main.py", "/r") == "."
+    assert module_of("/elsewhere/x.py", "/r") == "."
+
+
+def test_format_trend_shows_change():
+    history_points = [
+        type("P", (), dict(sha="a" * 40, committed_at=0, files_analyzed=3, total=4, counts={"high": 4}))(),
+        type("P", (), dict(sha="b" * 40, committed_at=0, files_analyzed=3, total=1, counts={"low": 1}))(),
+    ]
+    text = format_trend(history_points)
+    assert "aaaaaaa" in text and "bbbbbbb" in text
+    assert text.splitlines()[-1] == "Since aaaaaaa: total -3 (high -4, low +1)"
+
+
+def test_backfill_reviews_only_unseen_commits():
+    with GitTemporaryDirectory() as root:
+        repo = make_repo(root)
+        app = Path(root, "app", "handler.py")
+        app.parent.mkdir()
+        for i in range(3):
+            app.write_text("def handler(request):\n" + "    eval(request.body)\n" * i + "    return 1\n")
+            Path(root, "README.md").write_text(f"v{i}\n")
+            repo.git.add(".")
+            repo.git.commit("-m", f"change {i}")
+
+        git_repo = GitRepo(InputOutput(), None, root)
+        history = ReviewHistory(root)
+        seen = []
+
+        def progress(done, total, sha):
+            seen.append(sha)
+
+        assert backfill(history, git_repo, SPECS, limit=10, progress=progress) == 3
+        points = history.series(by="module")
+        assert [p.files_analyzed for p in points] == [1, 1, 1]
+        assert points[0].total < points[1].total < points[2].total
+        assert set(points[-1].counts) == {"app"}
+
+        # Nothing new to review
+        seen.clear()
+        assert backfill(history, git_repo, SPECS, limit=10, progress=progress) == 0
+        assert seen == []
+
+        app.write_text("def handler(request):\n    return 1\n")
+        repo.git.commit("-am", "fix")
+        assert backfill(history, git_repo, SPECS, limit=10, progress=progress) == 1
+        assert seen == [repo.head.commit.hexsha]
+        assert history.series()[-1].total == points[0].total
+        history.close()
+
+
+def test_backfill_keeps_cross_file_state_out_of_the_working_tree():
+    specs = [AnalyzerSpec("ArchitectureAnalyzer", ArchitectureAnalyzer)]
+
+    def cycles(results):
+        return sum(1 for r in results if r.title == "Circular Dependency")
+
+    with GitTemporaryDirectory() as root:
+        repo = make_repo(root)
+        a, b, c = (Path(root, name) for name in ("a.py", "b.py", "c.py"))
+
+        # a -> c, but c isn't committed yet
+        a.write_text("import c\n")
+        repo.git.add(".")
+        repo.git.commit("-m", "a")
+
+        # a -> b -> a
+        a.write_text("import b\n")
+        b.write_text("import a\n")
+        repo.git.add(".")
+        repo.git.commit("-m", "cycle")
+
+        # Working tree: the cycle is fixed, and an untracked c imports a
+        b.write_text("x = 1\n")
+        c.write_text("import a\n")
+        files = {str(path): path.read_text() for path in (a, b, c)}
+        assert cycles(AnalyzerScheduler(cache_root=root).run(specs, files).results) == 0
+
+        history = ReviewHistory(root)
+        git_repo = GitRepo(InputOutput(), None, root)
+        assert backfill(history, git_repo, specs, limit=10, cache_root=root) == 2
+
+        # c.py exists on disk but not in the first commit, so no a <-> c cycle there
+        counts = [p.counts.get("architecture", 0) for p in history.series(by="category")]
+        assert counts == [0, 1]
+        history.close()
+
+        # The next review of the working tree still sees b.py without its import
+        report = AnalyzerScheduler(cache_root=root).run(specs, {str(a): files[str(a)]})
+        assert cycles(report.results) == 0
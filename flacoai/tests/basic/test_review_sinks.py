@@ -0,0 +1,173 @@
+import json
+
+from flacoai.analyzers import (
+    AnalyzerScheduler,
+    AnalyzerSpec,
+    ArchitectureAnalyzer,
+    QualityAnalyzer,
+    SecurityAnalyzer,
+)
+from flacoai.baseline_manager import BaselineManager
+from flacoai.report_generator import ReviewReportGenerator
+from flacoai.review_sinks import (
+    BaselineCompareSink,
+    BaselineSaveSink,
+    CollectSink,
+    MarkdownSink,
+    ReviewSummary,
+    SarifSink,
+)
+
+SOURCE = '''import os
+password = "hunter2"
+
+def handler(request):
+    return eval(request.args["code"])
+'''
+
+SPECS = [
+    AnalyzerSpec("SecurityAnalyzer", SecurityAnalyzer),
+    AnalyzerSpec("QualityAnalyzer", QualityAnalyzer),
+    AnalyzerSpec("ArchitectureAnalyzer", ArchitectureAnalyzer),
+]
+
+
+def make_files(count=20):
+    return {f"pkg/mod{i:02}.py": SOURCE + f"value = {i}\n" for i in range(count)}
+
+
+def key(result):
+    return (result.file, result.line, result.title)
+
+
+def stream_all(sinks, files):
+    summary = ReviewSummary()
+    for result in AnalyzerScheduler(jobs=1).stream(SPECS, iter(files.items())):
+        summary.add(result)
+        for sink in sinks:
+            sink.write(result)
+    summary.files_analyzed = len(files)
+    for sink in sinks:
+        sink.close(summary)
+    return summary
+
+
+def test_stream_matches_run():
+    files = make_files()
+    report = AnalyzerScheduler(jobs=1).run(SPECS, files)
+
+    for jobs in (1, 2):
+        scheduler = AnalyzerScheduler(jobs=jobs)
+        streamed = list(scheduler.stream(SPECS, iter(files.items())))
+        assert sorted(map(key, streamed)) == sorted(map(key, report.results))
+        assert scheduler.files_analyzed == len(files)
+
+
+def test_markdown_sink_matches_generate_markdown(tmp_path):
+    files = make_files(3)
+    out = tmp_path / "report.md"
+    collector = CollectSink()
+    summary = stream_all([collector, MarkdownSink(str(out))], files)
+
+    report = collector.report
+    assert report.get_stats() == summary.get_stats()
+    assert out.read_text(encoding="utf-8") == ReviewReportGenerator().generate_markdown(report)
+
+
+def test_sarif_sink(tmp_path):
+    files = make_files(3)
+    out = tmp_path / "review.sarif"
+    summary = stream_all([SarifSink(str(out))], files)
+
+    log = json.loads(out.read_text())
+    run = log["runs"][0]
+    assert log["version"] == "2.1.0"
+    assert len(run["results"]) == summary.total
+    rule_ids = {rule["id"] for rule in run["tool"]["driver"]["rules"]}
+    assert {r["ruleId"] for r in run["results"]} == rule_ids
+    assert not (tmp_path / "review.sarif.tmp").exists()
+
+
+def test_baseline_sinks_match_manager(tmp_path):
+    manager = BaselineManager(str(tmp_path))
+    first = make_files(2)
+    stream_all([BaselineSaveSink(manager)], first)
+    assert len(manager.load_baseline()["results"]) > 0
+
+    # One file fixed, one file added
+    second = {"pkg/mod00.py": first["pkg/mod00.py"], "pkg/new.py": SOURCE}
+    collector = CollectSink()
+    compare = BaselineCompareSink(manager, [collector])
+    stream_all([compare], second)
+
+    comparison = manager.compare_with_baseline(AnalyzerScheduler(jobs=1).run(SPECS, second))
+    assert sorted(map(key, collector.report.results)) == sorted(map(key, comparison["new_issues"]))
+    assert compare.get_stats() == manager.get_stats(comparison)
+    assert compare.unchanged == len(comparison["unchanged_issues"])
+
+
+def test_baseline_matches_findings_after_lines_shift(tmp_path):
+    manager = BaselineManager(str(tmp_path))
+    files = {}
+    for i in range(2):
+        path = tmp_path / f"mod{i}.py"
+        path.write_text(SOURCE)
+        files[str(path)] = SOURCE
+    stream_all([BaselineSaveSink(manager)], files)
+
+    # Lines inserted above every finding, and one new finding
+    shifted = "import sys\nimport json\n\n" + SOURCE + "\ndef other(request):\n    return eval(request.form['x'])\n"
+    first = str(tmp_path / "mod0.py")
+    (tmp_path / "mod0.py").write_text(shifted)
+    files[first] = shifted
+
+    collector = CollectSink()
+    compare = BaselineCompareSink(manager, [collector], files=list(files))
+    stream_all([compare], files)
+
+    assert compare.new_issues == len(collector.report.results) > 0
+    assert all(r.file == first and "request.form" in r.code_snippet for r in collector.report.results)
+    assert sum(compare.fixed_counts.values()) == 0
+
+    comparison = manager.compare_with_baseline(AnalyzerScheduler(jobs=1).run(SPECS, files))
+    assert compare.get_stats() == manager.get_stats(comparison)
+    assert compare.unchanged == len(comparison["unchanged_issues"])
+
+
+def test_baseline_compare_reads_only_reviewed_files(tmp_path):
+    manager = BaselineManager(str(tmp_path))
+    files = {}
+    for i in range(3):
+        path = tmp_path / f"mod{i}.py"
+        path.write_text(SOURCE)
+        files[str(path)] = SOURCE
+    stream_all([BaselineSaveSink(manager)], files)
+    per_file = len(manager.load_baseline()["results"]) // 3
+
+    # mod0 reviewed and fixed, mod1 not reviewed, mod2 deleted
+    reviewed = {str(tmp_path / "mod0.py"): "value = 1\n"}
+    (tmp_path / "mod2.py").unlink()
+    compare = BaselineCompareSink(manager, [], files=list(reviewed))
+    stream_all([compare], reviewed)
+
+    assert set(compare.remaining) <= set(reviewed)
+    assert sum(compare.fixed_counts.values()) == 2 * per_file
+
+
+def test_legacy_json_baseline_is_imported(tmp_path):
+    path = tmp_path / "app.py"
+    path.write_text(SOURCE)
+    files = {str(path): SOURCE}
+    report = AnalyzerScheduler(jobs=1).run(SPECS, files)
+
+    manager = BaselineManager(str(tmp_path))
+    manager.legacy_file.write_text(json.dumps({
+        "timestamp": "2024-01-01T00:00:00",
+        "files_analyzed": 1,
+        "results": [manager.result_to_dict(r) for r in report.results],
+    }))
+
+    comparison = manager.compare_with_baseline(report)
+    assert comparison["baseline_timestamp"] == "2024-01-01T00:00:00"
+    assert len(comparison["unchanged_issues"]) == len(report.results)
+    assert not comparison["new_issues"] and not comparison["fixed_issues"]
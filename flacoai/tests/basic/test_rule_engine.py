@@ -0,0 +1,203 @@
+import re
+
+from flacoai.analyzers import PerformanceAnalyzer, QualityAnalyzer, SecurityAnalyzer
+from flacoai.analyzers.rule_engine import (
+    SCOPE_CHECKED,
+    SCOPE_FILE,
+    SCOPE_LINE,
+    LineIndex,
+    RuleSet,
+    required_literal,
+    rule_scope,
+)
+
+CONTENT = """import os
+password = "hunter2"
+def handler(request):
+    return os.system("ls " + request.args["dir"])
+# TODO: eval(password)
+"""
+
+PATTERNS = [
+    r"password\s*=\s*[\"'][^\"']+[\"']",
+    r"os\.system\s*\(",
+    r"eval\(",
+    r"(?P<name>request)\.args",
+    r"never_matches_anything",
+    r"^def\s+\w+",
+]
+
+
+def independent_matches(patterns, content, flags):
+    index = LineIndex(content)
+    matches = []
+    for rule, pattern in enumerate(patterns):
+        for m in re.finditer(pattern, content, flags):
+            matches.append((rule, index.line_of(m.start()), m.group()))
+    return matches
+
+
+def test_rule_set_matches_independent_scans():
+    for flags in (re.MULTILINE, re.MULTILINE | re.IGNORECASE):
+        rule_set = RuleSet(PATTERNS, flags)
+        got = [(m.rule, m.line, m.text) for m in rule_set.scan(CONTENT)]
+        assert got == independent_matches(PATTERNS, CONTENT, flags)
+
+
+def test_required_literal():
+    assert required_literal(r"os\.system\s*\(") == "os.system"
+    assert required_literal(r"SELECT.*FROM", re.IGNORECASE) == "select"
+    assert required_literal(r"(log|print).*x") is None
+    assert required_literal(r"a?bc") is None
+
+
+def test_line_index():
+    index = LineIndex("a\nbc\n\nd")
+    assert [index.line_of(i) for i in range(7)] == [1, 1, 2, 2, 2, 3, 4]
+    assert index.column_of(3) == 1
+    assert index.context(2, context_lines=1) == "a\nbc\n"
+
+
+def test_line_index_lines_and_snippets():
+    index = LineIndex("a\r\nbc\n\nd")
+    assert [index.line(n) for n in range(6)] == ["", "a", "bc", "", "d", ""]
+    assert index.snippet(2, 4) == "bc\n\nd"
+    assert index.snippet(0, 1) == "a\r"
+    assert index.snippet(5, 9) == ""
+    assert index.splitlines() is index.splitlines()
+    assert index.splitlines() == ["a", "bc", "", "d"]
+
+
+def test_patterns_can_span_lines():
+    content = "def a():\n    return 1\n    return 2\n"
+    results = QualityAnalyzer().analyze_file("app.py", content)
+    assert any(r.description == "Unreachable code after return" for r in results)
+
+
+
+def test_unreachable_code_needs_the_same_block():
+    content = (
+        "def a(x):\n"
+        "    if x:\n"
+        "        return 1\n"
+        "    else:\n"
+        "        return 2\n"
+        "    return 3\n"
+        "\n"
+        "def b(x):\n"
+        "    for item in x:\n"
+        "        if item:\n"
+        "            return item\n"
+        "        print(item)\n"
+        "    return (\n"
+        "        None\n"
+        "    )\n"
+    )
+    results = QualityAnalyzer().analyze_file("app.py", content)
+    assert not [r for r in results if r.description == "Unreachable code after return"]
+
+
+def test_lengths_are_measured_from_spans():
+    functions = "".join(f"def f{i}():\n    return {i}\n\n" for i in range(120))
+    content = "class Small:\n    x = 1\n\n" + functions
+    results = QualityAnalyzer().analyze_file("app.py", content)
+    assert not [r for r in results if r.title == "High Complexity"]
+
+    body = "".join(f"    x{i} = {i}\n" for i in range(60))
+    results = QualityAnalyzer().analyze_file("app.py", "def long():\n" + body)
+    assert [r.line for r in results if r.description == "Long function (>50 lines)"] == [1]
+
+
+
+def test_nested_functions_are_measured_on_their_own():
+    branches = "".join(f"        if x == {i}:\n            return {i}\n" for i in range(12))
+    content = "def outer(x):\n    def inner(x):\n" + branches + "    return inner(x)\n"
+    results = QualityAnalyzer().analyze_file("app.py", content)
+    assert [r.description for r in results if r.title == "High Cyclomatic Complexity"] == [
+        "Function 'inner' has complexity of 13"
+    ]
+
+def test_dict_get_in_loop_is_not_n_plus_one():
+    content = "for key in keys:\n    total += counts.get(key, 0)\n"
+    results = PerformanceAnalyzer().analyze_file("app.py", content)
+    assert not [r for r in results if r.title == "N+1 Query Problem"]
+
+    content = "for pk in ids:\n    users.append(User.objects.get(pk=pk))\n"
+    results = PerformanceAnalyzer().analyze_file("app.py", content)
+    assert [r.line for r in results if r.title == "N+1 Query Problem"] == [1]
+
+SWIFT = """import SwiftUI
+
+struct LoginView: View {
+    @State var password = ""
+    var body: some View {
+        VStack {
+            Button(
+                "Log in",
+                action: login
+            )
+            .accessibilityLabel("Log in")
+            Image("logo").accessibilityLabel("Logo")
+        }
+    }
+
+    func login() {
+        do {
+            try api.login(password: password)
+        } catch {
+            logger.error("login failed: \\(error)")
+            showAlert(error)
+        }
+        let request = URLRequest(url: URL(string: "http://example.com")!)
+        DispatchQueue.main.sync {
+            UserDefaults.standard.set(password, forKey: "password")
+        }
+    }
+}
+"""
+
+
+def per_line_matches(pattern, content, flags):
+    """The matches of the per-line scan analyzers used before the rule engine."""
+    matches = []
+    for line_num, line in enumerate(content.split("\n"), 1):
+        for m in re.finditer(pattern, line, flags):
+            matches.append((line_num, m.start(), m.group()))
+    return matches
+
+
+def analyzer_patterns(analyzer):
+    for name, value in vars(analyzer).items():
+        if name.endswith("_patterns") and isinstance(value, list):
+            for pattern, _ in value:
+                yield pattern
+
+
+def test_rules_match_as_the_per_line_scan_did():
+    content = SWIFT + CONTENT
+    for analyzer, flags in [
+        (QualityAnalyzer(), re.MULTILINE),
+        (PerformanceAnalyzer(), re.MULTILINE),
+        (SecurityAnalyzer(), re.IGNORECASE),
+    ]:
+        for pattern in analyzer_patterns(analyzer):
+            if rule_scope(pattern, flags) == SCOPE_FILE:
+                continue
+            expected = per_line_matches(pattern, content, flags)
+            assert analyzer.find_pattern(content, pattern, flags) == expected, pattern
+
+
+def test_multi_line_swift_has_no_cross_line_false_positives():
+    results = QualityAnalyzer().analyze_file("LoginView.swift", SWIFT)
+    titles = {r.title for r in results}
+    assert "Poor Error Handling" not in titles
+    assert "Missing Accessibility" not in titles
+
+
+def test_rule_scope():
+    assert rule_scope(r"return.*\n.*return") == SCOPE_FILE
+    assert rule_scope(r'"""(?:.|\n)*?"""') == SCOPE_FILE
+    assert rule_scope(r"catch\s*\{[^}]*\}") == SCOPE_CHECKED
+    assert rule_scope(r'"[^"\n]*"') == SCOPE_CHECKED
+    assert rule_scope(r"Button\([^)]*\)(?!.*accessibility)") == SCOPE_LINE
+    assert rule_scope(r"end\Z") == SCOPE_LINE
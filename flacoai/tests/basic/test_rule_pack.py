@@ -0,0 +1,82 @@
+import random
+
+from flacoai.analyzers import CustomRulesAnalyzer
+from flacoai.analyzers.rule_engine import AUTOMATON_MIN_LITERALS, LiteralMatcher
+from flacoai.analyzers.rule_pack import load_rule_pack
+
+RULES = """rules:
+  - name: Force try
+    pattern: 'try!\\s*\\w+'
+    file_extension: swift
+  - name: Shouting SQL
+    pattern: '(?i)select \\* from'
+    severity: high
+    category: security
+  - name: Debug print
+    pattern: 'print('
+    mode: contains
+    file_pattern: '^Sources/'
+  - name: Copyright header
+    pattern: Copyright
+    mode: not_contains
+    file_extension: [swift, m]
+  - name: Broken
+    pattern: '(unclosed'
+"""
+
+SWIFT = """let data = try! load()
+let rows = db.query("Select * FROM users")
+print(rows)
+"""
+
+
+def titles(results):
+    return [(r.title, r.line) for r in results]
+
+
+def test_rules_dispatch_by_extension_pattern_and_literal(tmp_path):
+    rules = tmp_path / "rules.yaml"
+    rules.write_text(RULES)
+    analyzer = CustomRulesAnalyzer(rules_file=str(rules))
+    assert [rule.name for rule in analyzer.rules] == [
+        "Force try", "Shouting SQL", "Debug print", "Copyright header",
+    ]
+    assert analyzer.rule_pack.errors[0].startswith("Invalid regex in rule 'Broken'")
+
+    assert titles(analyzer.analyze_file("Sources/App.swift", SWIFT)) == [
+        ("Force try", 1), ("Shouting SQL", 2), ("Debug print", 3), ("Copyright header", 1),
+    ]
+    assert titles(analyzer.analyze_file("Tests/App.py", SWIFT)) == [("Shouting SQL", 2)]
+    assert titles(analyzer.analyze_file("Sources/App.swift", "// Copyright\n")) == []
+
+    # Rules without their literal in the file are not run at all
+    group = analyzer.rule_pack.group("App.swift")
+    assert [rule.name for rule in group.candidates("App.swift", "// Copyright\n")] == [
+        "Copyright header",
+    ]
+
+
+def test_pack_is_compiled_once_per_content(tmp_path):
+    rules = tmp_path / "rules.yaml"
+    rules.write_text(RULES)
+    first = load_rule_pack(str(rules))
+    assert load_rule_pack(str(rules)) is first
+    assert CustomRulesAnalyzer(rules_file=str(rules)).rule_pack is first
+
+    rules.write_text(RULES.replace("Force try", "Forced try"))
+    assert load_rule_pack(str(rules)) is not first
+
+
+def test_automaton_agrees_with_substring_search():
+    rng = random.Random(3)
+    literals = [
+        "".join(rng.choice("abcd") for _ in range(rng.randint(1, 6)))
+        for _ in range(AUTOMATON_MIN_LITERALS * 2)
+    ]
+    matcher = LiteralMatcher(literals)
+    assert matcher._delta is not None
+
+    for _ in range(20):
+        text = "".join(rng.choice("abcde") for _ in range(200))
+        expected = {i for i, literal in enumerate(literals) if literal in text}
+        assert matcher.search(text) == expected
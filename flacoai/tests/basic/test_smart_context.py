@@ -0,0 +1,88 @@
+from pathlib import Path
+
+from flacoai.analyzers.cache import AnalysisCache
+from flacoai.io import InputOutput
+from flacoai.repo import GitRepo
+from flacoai.smart_context import SmartContextLoader
+from flacoai.utils import GitTemporaryDirectory, make_repo
+
+
+def write(root, name, text="x = 1\n"):
+    path = Path(root) / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return str(path.resolve())
+
+
+def test_files_are_ranked_by_churn_then_risk():
+    with GitTemporaryDirectory() as root:
+        repo = make_repo(root)
+        plain = write(root, "app/views.py", "x = 1\n" * 200)
+        risky = write(root, "app/auth/login.py")
+        churned = write(root, "app/models.py")
+        test = write(root, "tests/test_views.py", "x = 1\n" * 200)
+        repo.git.add(".")
+        repo.git.commit("-m", "initial")
+
+        for i in range(3):
+            write(root, "app/models.py", f"x = {i}\n")
+            repo.git.commit("-am", f"change {i}")
+
+        loader = SmartContextLoader(root)
+        files = {plain, risky, churned, test}
+        assert loader.rank_files(files) == [churned, risky, plain, test]
+        assert loader.rank_files(sorted(files, reverse=True)) == loader.rank_files(files)
+
+        # Uncommitted edits count as fresh churn
+        write(root, "tests/test_views.py", "x = 2\n" * 200)
+        assert loader.rank_files(files)[0] == test
+
+
+def test_file_limit_keeps_the_highest_priority_files():
+    with GitTemporaryDirectory() as root:
+        for i in range(5):
+            write(root, f"lib/util{i}.py")
+        important = write(root, "lib/payment.py")
+
+        loader = SmartContextLoader(root)
+        assert loader.get_relevant_files(max_files=1) == {important}
+        assert len(loader.get_relevant_files(max_files=None)) == 6
+
+
+def test_index_skips_ignored_files_and_is_reused_until_the_tree_changes():
+    with GitTemporaryDirectory() as root:
+        repo = make_repo(root)
+        app = write(root, "Sources/App.swift")
+        write(root, ".gitignore", "out/\n")
+        write(root, "out/Bundle.swift")
+        repo.git.add(".")
+        repo.git.commit("-m", "initial")
+
+        cache = AnalysisCache(root)
+        git_repo = GitRepo(InputOutput(), None, root)
+        loader = SmartContextLoader(root, repo=git_repo, cache=cache)
+        index = loader.file_index()
+        assert loader.get_relevant_files() == {app}
+        assert loader.find_files("App") == [app]
+
+        # Unchanged tree: the same index, from memory or the cache
+        assert loader.file_index() is index
+        assert SmartContextLoader(root, repo=git_repo, cache=cache).file_index() is index
+
+        # A new tracked file invalidates it
+        view = write(root, "Sources/View.swift")
+        repo.git.add(".")
+        assert loader.get_relevant_files() == {app, view}
+        assert loader._resolve_import("MyApp.View", app) == view
+
+        # Without a repo every file is listed
+        assert len(SmartContextLoader(root).get_relevant_files()) == 3
+
+
+def test_generated_markers_are_read_from_the_head_only(tmp_path):
+    loader = SmartContextLoader(str(tmp_path))
+    generated = write(tmp_path, "Models.swift", "// Generated by protoc. DO NOT EDIT.\n" + "x\n" * 10000)
+    marked_late = write(tmp_path, "Late.swift", "x\n" * 20 + "// @generated\n")
+
+    assert loader._is_generated(generated)
+    assert not loader._is_generated(marked_late)
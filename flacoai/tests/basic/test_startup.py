@@ -0,0 +1,106 @@
+import importlib.util
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# Import time budgets (ms); benchmark/startup.py reports against the same ones
+HELP_BUDGET_MS = 1000
+FIRST_PROMPT_BUDGET_MS = 2500
+
+# Modules `flacoai --help` must not import: each is only needed by a command,
+# an optional feature, or once a coder exists
+NOT_FOR_HELP = [
+    "PIL",
+    "pyperclip",
+    "posthog",
+    "mixpanel",
+    "requests",
+    "flacoai.commands",
+    "flacoai.watch",
+    "flacoai.copypaste",
+    "flacoai.onboarding",
+    "flacoai.analyzers",
+]
+
+
+def importtime(args, cwd):
+    """Run python -X importtime; returns (exit code, {module: cumulative ms}, total ms)."""
+    env = dict(os.environ, HOME=str(cwd), FLACO_ANALYTICS="false")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT), env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime"] + args,
+        cwd=cwd,
+        env=env,
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        text=True,
+    )
+
+    modules = {}
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        try:
+            _, cumulative, name = line[len("import time:") :].split("|")
+            cumulative = int(cumulative)
+        except ValueError:
+            continue
+        modules[name.strip()] = cumulative / 1000
+        if not name.startswith("  "):
+            total += cumulative / 1000
+    return result.returncode, modules, total
+
+
+def best_of(runs, args, cwd):
+    results = [importtime(args, cwd) for _ in range(runs)]
+    return min(results, key=lambda result: result[2])
+
+
+def test_help_import_budget(tmp_path):
+    code, modules, total = best_of(3, ["-m", "flacoai", "--help"], tmp_path)
+    assert code == 0
+
+    loaded = [name for name in NOT_FOR_HELP if name in modules]
+    assert not loaded, f"flacoai --help imported {loaded}"
+    assert total <= HELP_BUDGET_MS, f"flacoai --help spent {total:.0f}ms importing"
+
+
+@pytest.mark.skipif(importlib.util.find_spec("litellm") is None, reason="needs litellm")
+def test_first_prompt_import_budget(tmp_path):
+    args = [
+        "-m",
+        "flacoai",
+        "--exit",
+        "--no-git",
+        "--model",
+        "gpt-4o",
+        "--openai-api-key",
+        "sk-startup-test",
+        "--no-check-update",
+        "--no-show-release-notes",
+        "--no-analytics",
+        "--no-pretty",
+        "--yes-always",
+    ]
+    code, modules, total = best_of(3, args, tmp_path)
+    assert code == 0
+    assert "flacoai.analyzers" not in modules
+    assert total <= FIRST_PROMPT_BUDGET_MS, f"startup spent {total:.0f}ms importing"
+
+
+def test_analyzers_load_on_first_use(tmp_path):
+    code, modules, _ = importtime(["-c", "from flacoai.analyzers import Severity"], tmp_path)
+    assert code == 0
+    assert "flacoai.analyzers.base_analyzer" in modules
+    assert "flacoai.analyzers.custom_rules_analyzer" not in modules
+    assert "flacoai.analyzers.scheduler" not in modules
+
+    code, modules, _ = importtime(["-c", "import flacoai.premium"], tmp_path)
+    assert code == 0
+    assert "flacoai.premium.security_scoring_analyzer" not in modules